@@ -0,0 +1,106 @@
+import asyncio
+from typing import Any, AsyncIterator, Callable
+
+from fastapi import Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import Session
+
+from app.infrastructure.core.config import settings
+from app.infrastructure.db.budget import (
+    BUDGETS,
+    DEFAULT_BUDGET_NAME,
+    QueryBudget,
+    QueryCanceller,
+    budget_stats,
+    get_budget,
+    is_query_canceled,
+    rows_capped,
+    session_budget,
+)
+
+# Set on list responses cut at the route's max_rows; exposed through CORS
+TRUNCATED_HEADER = "X-Results-Truncated"
+
+
+def budget(
+    name: str, watch_disconnect: bool = True
+) -> Callable[..., AsyncIterator[None]]:
+    """
+    Route dependency selecting the database budget class `name` (see
+    DB_BUDGETS). Add it to the route's `dependencies` so it runs before
+    get_db. With `watch_disconnect`, the statement running when the client
+    goes away is cancelled; leave it off for routes that read the body
+    themselves, since the watcher listens on the same channel.
+    """
+    query_budget = get_budget(name)  # unknown names fail at import time
+
+    async def dependency(request: Request) -> AsyncIterator[None]:
+        request.state.db_budget = query_budget
+        if not watch_disconnect:
+            yield
+            return
+        canceller = QueryCanceller()
+        request.state.query_canceller = canceller
+        watcher = asyncio.ensure_future(
+            _watch_disconnect(request, canceller, query_budget)
+        )
+        try:
+            yield
+        finally:
+            watcher.cancel()
+
+    return dependency
+
+
+async def _watch_disconnect(
+    request: Request, canceller: QueryCanceller, query_budget: QueryBudget
+) -> None:
+    while True:
+        await asyncio.sleep(settings.DB_DISCONNECT_POLL_SECONDS)
+        if await request.is_disconnected():
+            # Only counts if a statement was still running
+            if await run_in_threadpool(canceller.cancel):
+                budget_stats.record(query_budget.name, "client_disconnects")
+            return
+
+
+def set_truncated_header(response: Response, db: Session) -> None:
+    """Flag a list that stopped at the budget's max_rows, with the cap as value."""
+    if rows_capped(db):
+        response.headers[TRUNCATED_HEADER] = str(session_budget(db).max_rows)
+
+
+def _request_budget(request: Request) -> QueryBudget:
+    return getattr(request.state, "db_budget", None) or BUDGETS[DEFAULT_BUDGET_NAME]
+
+
+async def query_canceled_handler(request: Request, exc: DBAPIError) -> Any:
+    """504 for statements stopped by the route's statement_timeout."""
+    if not is_query_canceled(exc):
+        raise exc
+    query_budget = _request_budget(request)
+    canceller = getattr(request.state, "query_canceller", None)
+    if canceller is not None and canceller.cancelled:
+        detail = "Query cancelled because the client disconnected"
+    else:
+        budget_stats.record(query_budget.name, "statement_timeouts")
+        detail = (
+            f"Database query exceeded the {query_budget.statement_timeout_ms} ms "
+            f"budget of this route; narrow the request"
+        )
+    return JSONResponse(
+        status_code=status.HTTP_504_GATEWAY_TIMEOUT, content={"detail": detail}
+    )
+
+
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError) -> Any:
+    """503 when no database connection frees up within DB_POOL_TIMEOUT_SECONDS."""
+    budget_stats.record(_request_budget(request).name, "pool_timeouts")
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Database is busy, retry shortly"},
+        headers={"Retry-After": "1"},
+    )
@@ -0,0 +1,22 @@
+import json
+
+from fastapi import Response
+
+from app.domain.common.schemas.counts import CountsResponse
+
+TOTAL_COUNT_HEADER = "X-Total-Count"
+ESTIMATED_COUNT_HEADER = "X-Total-Count-Estimated"
+FACET_COUNTS_HEADER = "X-Facet-Counts"
+# Exposed to browsers through CORS
+COUNT_HEADERS = [TOTAL_COUNT_HEADER, ESTIMATED_COUNT_HEADER, FACET_COUNTS_HEADER]
+
+
+def set_count_headers(response: Response, counts: CountsResponse) -> None:
+    """Counts as response metadata, leaving list bodies unchanged."""
+    response.headers[TOTAL_COUNT_HEADER] = str(counts.total)
+    response.headers[ESTIMATED_COUNT_HEADER] = "true" if counts.estimated else "false"
+    if counts.facets:
+        # ASCII JSON, e.g. {"is_active":{"true":120,"false":4}}
+        response.headers[FACET_COUNTS_HEADER] = json.dumps(
+            counts.facets, separators=(",", ":")
+        )
@@ -1,13 +1,14 @@
 from typing import Annotated, Optional
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 
 from app.infrastructure.core.config import settings
-from app.infrastructure.core.security import verify_password
+from app.infrastructure.core.security import token_claims, verify_password
+from app.infrastructure.db.audit import set_actor
 from app.infrastructure.db.session import get_db
+from app.infrastructure.tracing.tracer import traced
 from app.domain.user.models.user import User
 from app.domain.auth.schemas.auth import TokenPayload
 from app.domain.user.services.user import user_service
@@ -17,7 +18,9 @@ oauth2_scheme = OAuth2PasswordBearer(
 )
 
 
+@traced("get_current_user")
 def get_current_user(
+    request: Request,
     db: Annotated[Session, Depends(get_db)],
     token: Annotated[Optional[str], Depends(oauth2_scheme)],
 ) -> Optional[User]:
@@ -28,21 +31,20 @@ def get_current_user(
     if not token:
         return None
 
-    try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-        token_data = TokenPayload(**payload)
-
-        if token_data.sub is None:
-            return None
-    except JWTError:
+    # Already decoded while routing the request to its tenant
+    payload = token_claims(request)
+    if payload is None:
+        return None
+    token_data = TokenPayload(**payload)
+    if token_data.sub is None:
         return None
 
     user = user_service.get_user(db, user_id=token_data.sub)
     if not user:
         return None
 
+    # Changes made by the request are recorded as made by this user
+    set_actor(db, user.id)
     return user
 
 
@@ -0,0 +1,313 @@
+import asyncio
+import hashlib
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import HTTPConnection
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.domain.idempotency.schemas.idempotency import IdempotencyClaim, StoredResponse
+from app.domain.idempotency.services.idempotency import idempotency_service
+from app.infrastructure.core.config import settings
+from app.infrastructure.core.security import token_claims
+from app.infrastructure.db.session import open_session, tenant_router
+from app.infrastructure.db.sharding import (
+    TenantMismatchError,
+    TenantNotFoundError,
+    TenantRoute,
+    TenantUnavailableError,
+    tenant_from_connection,
+)
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_KEY_HEADER = b"idempotency-key"
+REPLAYED_HEADER = b"idempotent-replayed"
+UNSAFE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+MAX_KEY_LENGTH = 255
+# Outcomes a retry could change are not stored: the retry runs again
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429}
+
+
+class _ClientDisconnected(Exception):
+    pass
+
+
+async def _read_body(receive: Receive, limit: int) -> Tuple[List[Message], bool]:
+    """
+    The request messages received until the body ends or exceeds `limit`
+    bytes, and whether it ended.
+    """
+    messages: List[Message] = []
+    size = 0
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            raise _ClientDisconnected()
+        messages.append(message)
+        size += len(message.get("body", b""))
+        if size > limit:
+            return messages, False
+        if not message.get("more_body", False):
+            return messages, True
+
+
+def _content_length(scope: Scope) -> Optional[int]:
+    value = _header(scope, b"content-length")
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _header(scope: Scope, name: bytes) -> Optional[bytes]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value
+    return None
+
+
+def _resolve_route(scope: Scope) -> Optional[TenantRoute]:
+    try:
+        return tenant_router.resolve(tenant_from_connection(HTTPConnection(scope)))
+    except (TenantMismatchError, TenantNotFoundError, TenantUnavailableError):
+        # The request fails the same way once it reaches get_db
+        return None
+
+
+def _caller(scope: Scope) -> bytes:
+    """
+    The user the request's token was issued to, so a retry sent with a
+    refreshed token still finds its key. Anonymous callers share b"".
+    """
+    claims = token_claims(HTTPConnection(scope))
+    return str(claims.get("sub") or "").encode() if claims else b""
+
+
+def _claim(route: TenantRoute, key: bytes, request_hash: bytes) -> IdempotencyClaim:
+    db = open_session(route)
+    try:
+        return idempotency_service.claim(db, key, request_hash)
+    finally:
+        db.close()
+
+
+def _finish(route: TenantRoute, key: bytes, response: Optional[StoredResponse]) -> None:
+    db = open_session(route)
+    try:
+        if response is None:
+            idempotency_service.release(db, key)
+        else:
+            idempotency_service.complete(db, key, response)
+    finally:
+        db.close()
+
+
+class IdempotencyMiddleware:
+    """
+    Idempotency-Key support for unsafe methods. The first request with a key
+    runs; its status and body are stored (see IdempotencyService) and replayed,
+    with Idempotent-Replayed: true, to later requests with the same key from
+    the same caller, without reaching the endpoint. Duplicates arriving while
+    it runs wait for it: on an in-process future when it runs in this worker,
+    by polling the table otherwise. Server errors are not stored, so their
+    retries run again. Requests without the header, and requests whose body
+    exceeds IDEMPOTENCY_MAX_BODY_BYTES (streamed uploads such as CSV imports),
+    pass straight through.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        # Executions running in this worker, by scoped key
+        self._running: Dict[bytes, asyncio.Future] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in UNSAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+        raw_key = _header(scope, IDEMPOTENCY_KEY_HEADER)
+        if raw_key is None:
+            await self.app(scope, receive, send)
+            return
+        if not raw_key.strip() or len(raw_key) > MAX_KEY_LENGTH:
+            await self._error(
+                scope,
+                receive,
+                send,
+                400,
+                f"Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters",
+            )
+            return
+
+        limit = settings.IDEMPOTENCY_MAX_BODY_BYTES
+        content_length = _content_length(scope)
+        if content_length is not None and content_length > limit:
+            # Too large to store for replay (e.g. a CSV import): runs unprotected
+            await self.app(scope, receive, send)
+            return
+        try:
+            messages, complete = await _read_body(receive, limit)
+        except _ClientDisconnected:
+            return
+
+        async def replay_receive() -> Message:
+            if messages:
+                return messages.pop(0)
+            return await receive()
+
+        if not complete:
+            # A streamed body without Content-Length that turned out too large
+            await self.app(scope, replay_receive, send)
+            return
+        body = b"".join(message.get("body", b"") for message in messages)
+
+        route = await run_in_threadpool(_resolve_route, scope)
+        if route is None:
+            await self.app(scope, replay_receive, send)
+            return
+
+        # Scoped to the tenant and user, so keys never collide across callers
+        key = hashlib.sha256(
+            b"\n".join(
+                [
+                    route.key.encode(),
+                    _caller(scope),
+                    scope["method"].encode(),
+                    scope["path"].encode(),
+                    raw_key,
+                ]
+            )
+        ).digest()
+        request_hash = hashlib.sha256(
+            scope.get("query_string", b"") + b"\n" + body
+        ).digest()
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.IDEMPOTENCY_WAIT_SECONDS
+        while True:
+            running = self._running.get(key)
+            if running is not None:
+                # A duplicate in this worker: wait for it without polling
+                await asyncio.wait({running}, timeout=max(0.0, deadline - loop.time()))
+                if not running.done():
+                    await self._in_progress(scope, receive, send)
+                    return
+                continue
+            claim = await run_in_threadpool(_claim, route, key, request_hash)
+            if claim.response is not None:
+                await self._replay(scope, receive, send, claim.response, request_hash)
+                return
+            if claim.acquired:
+                break
+            # Running in another worker
+            if loop.time() >= deadline:
+                await self._in_progress(scope, receive, send)
+                return
+            await asyncio.sleep(settings.IDEMPOTENCY_POLL_INTERVAL_MS / 1000)
+
+        self._running[key] = loop.create_future()
+        status_code: Optional[int] = None
+        content_type: Optional[str] = None
+        chunks: List[bytes] = []
+        size = 0
+
+        async def capture_send(message: Message) -> None:
+            nonlocal status_code, content_type, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                for name, value in message.get("headers", []):
+                    if name.lower() == b"content-type":
+                        content_type = value.decode("latin-1")
+            elif message["type"] == "http.response.body":
+                chunk = message.get("body", b"")
+                size += len(chunk)
+                if size <= settings.IDEMPOTENCY_MAX_RESPONSE_BYTES:
+                    chunks.append(chunk)
+            await send(message)
+
+        response: Optional[StoredResponse] = None
+        try:
+            await self.app(scope, replay_receive, capture_send)
+            if (
+                status_code is not None
+                and status_code < 500
+                and status_code not in RETRYABLE_STATUS_CODES
+            ):
+                if size <= settings.IDEMPOTENCY_MAX_RESPONSE_BYTES:
+                    response = StoredResponse(
+                        request_hash, status_code, content_type, b"".join(chunks)
+                    )
+                else:
+                    logger.warning(
+                        "Response of %s %s too large to store for replay",
+                        scope["method"],
+                        scope["path"],
+                    )
+        finally:
+            try:
+                await run_in_threadpool(_finish, route, key, response)
+            except Exception:
+                # The lease lapses and a retry runs the request again
+                logger.exception(
+                    "Could not record the outcome of an idempotent request"
+                )
+            finally:
+                self._running.pop(key).set_result(None)
+
+    async def _replay(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        response: StoredResponse,
+        request_hash: bytes,
+    ) -> None:
+        if response.request_hash != request_hash:
+            await self._error(
+                scope,
+                receive,
+                send,
+                422,
+                "Idempotency-Key was already used with a different request",
+            )
+            return
+        headers = [
+            (b"content-length", str(len(response.body)).encode()),
+            (REPLAYED_HEADER, b"true"),
+        ]
+        if response.content_type:
+            headers.append((b"content-type", response.content_type.encode("latin-1")))
+        await send(
+            {
+                "type": "http.response.start",
+                "status": response.status_code,
+                "headers": headers,
+            }
+        )
+        await send({"type": "http.response.body", "body": response.body})
+
+    async def _in_progress(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self._error(
+            scope,
+            receive,
+            send,
+            409,
+            "A request with this Idempotency-Key is still being processed",
+            headers={"Retry-After": "1"},
+        )
+
+    async def _error(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        status_code: int,
+        detail: str,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        response = JSONResponse(
+            {"detail": detail}, status_code=status_code, headers=headers
+        )
+        await response(scope, receive, send)
@@ -0,0 +1,174 @@
+import asyncio
+import codecs
+import contextvars
+from typing import AsyncIterator, Callable, Dict, Iterator, List, TypeVar
+
+from fastapi import Request
+from multipart.multipart import MultipartParser, parse_options_header
+
+T = TypeVar("T")
+
+# Decoded pieces buffered between the upload and its consumer; with request
+# chunks of ~64 KiB this bounds the memory held per upload
+UPLOAD_QUEUE_SIZE = 16
+# A line longer than this means the upload is not the CSV we expect
+MAX_LINE_LENGTH = 1024 * 1024
+
+_END = object()
+_ABORT = object()
+
+
+class UploadAbortedError(Exception):
+    pass
+
+
+class _MultipartFilePart:
+    """Pulls the bytes of the first file part out of a streamed multipart body."""
+
+    def __init__(self, boundary: bytes):
+        self.found = False
+        self._in_file = False
+        self._done = False
+        self._header_field = b""
+        self._header_value = b""
+        self._headers: Dict[bytes, bytes] = {}
+        self._output: List[bytes] = []
+        self._parser = MultipartParser(
+            boundary,
+            {
+                "on_part_begin": self._on_part_begin,
+                "on_header_field": self._on_header_field,
+                "on_header_value": self._on_header_value,
+                "on_header_end": self._on_header_end,
+                "on_headers_finished": self._on_headers_finished,
+                "on_part_data": self._on_part_data,
+                "on_part_end": self._on_part_end,
+            },
+        )
+
+    def feed(self, chunk: bytes) -> List[bytes]:
+        self._parser.write(chunk)
+        output, self._output = self._output, []
+        return output
+
+    def _on_part_begin(self) -> None:
+        self._headers = {}
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = self._header_value = b""
+
+    def _on_headers_finished(self) -> None:
+        _, options = parse_options_header(
+            self._headers.get(b"content-disposition", b"")
+        )
+        self._in_file = not self._done and b"filename" in options
+        self.found = self.found or self._in_file
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._in_file:
+            self._output.append(data[start:end])
+
+    def _on_part_end(self) -> None:
+        if self._in_file:
+            self._in_file = False
+            self._done = True
+
+
+async def _upload_text(request: Request) -> AsyncIterator[str]:
+    """
+    Decoded text of an uploaded file, as it arrives. Accepts multipart/form-data
+    (the first file field) or a raw text/csv body. Raises ValueError otherwise.
+    """
+    content_type, options = parse_options_header(
+        request.headers.get("content-type", "")
+    )
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    if content_type == b"multipart/form-data":
+        boundary = options.get(b"boundary")
+        if not boundary:
+            raise ValueError("Multipart upload without a boundary")
+        part = _MultipartFilePart(boundary)
+        async for chunk in request.stream():
+            for data in part.feed(chunk):
+                yield decoder.decode(data)
+        if not part.found:
+            raise ValueError("The upload contains no file")
+    elif content_type in (b"text/csv", b"text/plain"):
+        async for chunk in request.stream():
+            yield decoder.decode(chunk)
+    else:
+        raise ValueError("Upload the file as multipart/form-data or text/csv")
+    yield decoder.decode(b"", final=True)
+
+
+def _iter_lines(
+    pieces: "asyncio.Queue[object]", loop: asyncio.AbstractEventLoop
+) -> Iterator[str]:
+    """Lines of the upload, with their line endings, for the worker thread."""
+    buffer = ""
+    while True:
+        piece = asyncio.run_coroutine_threadsafe(pieces.get(), loop).result()
+        if piece is _ABORT:
+            raise UploadAbortedError("The upload was interrupted")
+        if piece is _END:
+            break
+        buffer += piece
+        lines = buffer.splitlines(keepends=True)
+        # The last line may continue in the next piece
+        buffer = lines.pop() if lines and not lines[-1].endswith(("\n", "\r")) else ""
+        if len(buffer) > MAX_LINE_LENGTH:
+            raise ValueError(f"Line longer than {MAX_LINE_LENGTH} characters")
+        yield from lines
+    if buffer:
+        yield buffer
+
+
+async def consume_upload_lines(
+    request: Request, consume: Callable[[Iterator[str]], T]
+) -> T:
+    """
+    Run `consume` in a worker thread over the lines of the uploaded file while
+    the body is still streaming in. The bounded queue between the two applies
+    backpressure to the client, so memory use does not grow with the file.
+    """
+    loop = asyncio.get_running_loop()
+    pieces: "asyncio.Queue[object]" = asyncio.Queue(maxsize=UPLOAD_QUEUE_SIZE)
+    # Like run_in_threadpool, keep the request's context variables (trace span)
+    context = contextvars.copy_context()
+    consumer = loop.run_in_executor(
+        None, context.run, consume, _iter_lines(pieces, loop)
+    )
+
+    async def put(item: object) -> bool:
+        # Stop feeding as soon as the consumer gives up (e.g. a bad header)
+        put_task = asyncio.ensure_future(pieces.put(item))
+        await asyncio.wait({put_task, consumer}, return_when=asyncio.FIRST_COMPLETED)
+        if not put_task.done():
+            put_task.cancel()
+            return False
+        return True
+
+    try:
+        async for piece in _upload_text(request):
+            if piece and not await put(piece):
+                break
+        else:
+            await put(_END)
+    except BaseException:
+        # Unblock the consumer, then report the original error
+        while not pieces.empty():
+            pieces.get_nowait()
+        pieces.put_nowait(_ABORT)
+        try:
+            await consumer
+        except Exception:
+            pass
+        raise
+    return await consumer
@@ -1,8 +1,24 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import users, auth, sectors
+from app.api.v1.endpoints import (
+    users,
+    auth,
+    sectors,
+    events,
+    live,
+    jobs,
+    internal,
+    search,
+    audit,
+)
 
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(sectors.router, prefix="/sectors", tags=["sectors"])
+api_router.include_router(events.router, prefix="/events", tags=["events"])
+api_router.include_router(live.router, prefix="/live", tags=["live"])
+api_router.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
+api_router.include_router(search.router, prefix="/search", tags=["search"])
+api_router.include_router(audit.router, prefix="/audit", tags=["audit"])
+api_router.include_router(internal.router, prefix="/internal", tags=["internal"])
@@ -0,0 +1,39 @@
+from datetime import datetime
+from typing import Annotated, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.api.dependencies import get_current_active_user
+from app.infrastructure.db.session import get_db
+from app.domain.user.models.user import User
+from app.domain.audit.schemas.audit import AuditEntity, AuditLogResponse
+from app.domain.audit.services.audit import audit_service
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[AuditLogResponse])
+def list_audit_entries(
+    entity: AuditEntity,
+    entity_id: Optional[int] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: Annotated[User, Depends(get_current_active_user)] = None,
+):
+    """
+    List the recorded changes to users or sectors (one of them with entity_id)
+    in a time range, newest first. Defaults to the last 30 days. Changes show
+    up within about a second of being made.
+    """
+    try:
+        return audit_service.list_entries(
+            db, entity.value, entity_id, start, end, limit
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
@@ -1,5 +1,5 @@
 from datetime import timedelta
-from typing import Annotated
+from typing import Annotated, Any, Dict
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 from app.infrastructure.core.config import settings
 from app.infrastructure.core.security import create_access_token
 from app.infrastructure.db.session import get_db
+from app.infrastructure.db.sharding import session_route
 from app.domain.auth.schemas.auth import LoginRequest, Token
 from app.domain.user.schemas.user import UserCreate, UserResponse
 from app.domain.user.services.user import user_service
@@ -15,6 +16,15 @@ from app.domain.user.services.user import user_service
 router = APIRouter()
 
 
+def _token_claims(db: Session, user_id: int) -> Dict[str, Any]:
+    # Tokens are bound to the tenant they were issued for; get_db routes on it
+    claims: Dict[str, Any] = {"sub": user_id}
+    tenant = session_route(db).tenant
+    if tenant:
+        claims["tenant"] = tenant
+    return claims
+
+
 @router.post("/login", response_model=Token)
 def login_access_token(
     db: Annotated[Session, Depends(get_db)],
@@ -37,7 +47,7 @@ def login_access_token(
 
     return Token(
         access_token=create_access_token(
-            data={"sub": user.id}, expires_delta=access_token_expires
+            data=_token_claims(db, user.id), expires_delta=access_token_expires
         ),
         token_type="bearer",
     )
@@ -65,7 +75,7 @@ def login_access_token_json(
 
     return Token(
         access_token=create_access_token(
-            data={"sub": user.id}, expires_delta=access_token_expires
+            data=_token_claims(db, user.id), expires_delta=access_token_expires
         ),
         token_type="bearer",
     )
@@ -0,0 +1,130 @@
+from datetime import datetime
+from typing import Annotated, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.api.dependencies import get_current_active_user
+from app.infrastructure.core.config import settings
+from app.infrastructure.db.batch_writer import QueueFullError
+from app.infrastructure.db.session import get_db
+from app.domain.user.models.user import User
+from app.domain.event.schemas.event import (
+    ErrorEventAck,
+    ErrorEventBatch,
+    ErrorEventCreate,
+    ErrorEventResponse,
+    ErrorIssueResponse,
+    EventAckMode,
+)
+from app.domain.event.services.event import event_service
+from app.domain.event.services.issue import error_issue_service
+
+router = APIRouter()
+
+
+def _ingest(
+    db: Session,
+    events_in: List[ErrorEventCreate],
+    current_user: User,
+    ack: Optional[EventAckMode],
+) -> ErrorEventAck:
+    try:
+        ack_mode = event_service.ingest_events(
+            db, events_in, reporter_id=current_user.id, ack_mode=ack
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    except QueueFullError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Event queue is full, retry later",
+            headers={"Retry-After": "1"},
+        )
+    except TimeoutError as e:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail=str(e),
+        )
+    return ErrorEventAck(accepted=len(events_in), ack_mode=ack_mode)
+
+
+@router.post("/", response_model=ErrorEventAck, status_code=status.HTTP_202_ACCEPTED)
+def create_event(
+    event_in: ErrorEventCreate,
+    ack: Optional[EventAckMode] = None,
+    db: Session = Depends(get_db),
+    current_user: Annotated[User, Depends(get_current_active_user)] = None,
+):
+    """Report a single error event."""
+    return _ingest(db, [event_in], current_user, ack)
+
+
+@router.post(
+    "/batch", response_model=ErrorEventAck, status_code=status.HTTP_202_ACCEPTED
+)
+def create_events_batch(
+    batch_in: ErrorEventBatch,
+    ack: Optional[EventAckMode] = None,
+    db: Session = Depends(get_db),
+    current_user: Annotated[User, Depends(get_current_active_user)] = None,
+):
+    """Report a batch of error events. The batch is accepted or rejected as a whole."""
+    if len(batch_in.events) > settings.EVENT_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batches are limited to {settings.EVENT_BATCH_MAX_SIZE} events",
+        )
+    return _ingest(db, batch_in.events, current_user, ack)
+
+
+@router.get("/", response_model=List[ErrorEventResponse])
+def list_sector_events(
+    sector_id: int,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: Annotated[User, Depends(get_current_active_user)] = None,
+):
+    """
+    List the events of a sector in a time range, newest first. Defaults to the
+    last 24 hours.
+    """
+    try:
+        return event_service.list_sector_events(db, sector_id, start, end, limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+
+@router.get("/issues", response_model=List[ErrorIssueResponse])
+def list_sector_issues(
+    sector_id: int,
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: Annotated[User, Depends(get_current_active_user)] = None,
+):
+    """List the deduplicated issues of a sector, most recently seen first."""
+    return error_issue_service.list_sector_issues(db, sector_id, limit)
+
+
+@router.get("/{event_id}", response_model=ErrorEventResponse)
+def get_event(
+    event_id: int,
+    db: Session = Depends(get_db),
+    current_user: Annotated[User, Depends(get_current_active_user)] = None,
+):
+    """Get an error event by ID."""
+    event = event_service.get_event(db, event_id)
+    if event is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Event with ID {event_id} not found",
+        )
+    return event
@@ -0,0 +1,71 @@
+from typing import Annotated, Any, Dict, List
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+
+from app.api.dependencies import get_current_active_user
+from app.domain.user.models.user import User
+from app.infrastructure.db.budget import BUDGETS, budget_stats
+from app.infrastructure.profiling.store import (
+    ProfileDetail,
+    ProfileSummary,
+    profile_store,
+)
+
+router = APIRouter()
+
+
+@router.get("/profiles", response_model=List[ProfileSummary])
+def list_profiles(
+    current_user: Annotated[User, Depends(get_current_active_user)] = None,
+):
+    """List the request profiles recorded by this worker, newest first."""
+    return profile_store.list()
+
+
+@router.get("/profiles/{profile_id}", response_model=ProfileDetail)
+def get_profile(
+    profile_id: str,
+    current_user: Annotated[User, Depends(get_current_active_user)] = None,
+):
+    """Get a profile's request details and the timings of its SQL statements."""
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Profile {profile_id} not found",
+        )
+    return profile
+
+
+@router.get("/profiles/{profile_id}/collapsed")
+def download_profile_stacks(
+    profile_id: str,
+    current_user: Annotated[User, Depends(get_current_active_user)] = None,
+):
+    """
+    Download the stack samples in collapsed format, for flamegraph.pl or
+    https://www.speedscope.app.
+    """
+    path = profile_store.collapsed_path(profile_id)
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Profile {profile_id} not found",
+        )
+    return FileResponse(path, media_type="text/plain", filename=path.name)
+
+
+@router.get("/db-budgets")
+def get_db_budgets(
+    current_user: Annotated[User, Depends(get_current_active_user)] = None,
+) -> Dict[str, Any]:
+    """
+    Database budget classes and, per class, this worker's request count and
+    budget violations (statement timeouts, pool timeouts, capped result sets,
+    queries cancelled on client disconnect).
+    """
+    return {
+        "budgets": {name: budget._asdict() for name, budget in BUDGETS.items()},
+        "counters": budget_stats.snapshot(),
+    }
@@ -0,0 +1,50 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.api.dependencies import get_current_active_user
+from app.infrastructure.db.session import get_db
+from app.domain.user.models.user import User
+from app.domain.job.schemas.job import JobCreate, JobResponse
+from app.domain.job.services.job import job_service
+
+router = APIRouter()
+
+
+@router.post("/", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+def create_job(
+    job_in: JobCreate,
+    db: Session = Depends(get_db),
+    current_user: Annotated[User, Depends(get_current_active_user)] = None,
+):
+    """
+    Queue a background job (bulk imports, password hash audits, partition
+    maintenance). Poll GET /jobs/{id} for progress and the result.
+    """
+    try:
+        return job_service.enqueue_job(db, job_in, created_by=current_user.id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+def get_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: Annotated[User, Depends(get_current_active_user)] = None,
+):
+    """
+    Get the status, progress and result of a background job queued by the
+    current user. Other users' jobs are reported as not found.
+    """
+    job = job_service.get_job(db, job_id, created_by=current_user.id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job with ID {job_id} not found",
+        )
+    return job
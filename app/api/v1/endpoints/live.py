@@ -0,0 +1,108 @@
+import asyncio
+import json
+from typing import AsyncIterator, Optional
+
+from fastapi import (
+    APIRouter,
+    Header,
+    HTTPException,
+    Request,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from app.infrastructure.core.config import settings
+from app.infrastructure.db.session import resolve_route
+from app.infrastructure.live.broker import Subscriber
+from app.infrastructure.live.listener import live_feed_broker
+
+router = APIRouter()
+
+
+def _parse_event_id(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
+async def _next_message(subscriber: Subscriber) -> Optional[dict]:
+    """Next message for the subscriber, or None when a heartbeat is due."""
+    try:
+        return await asyncio.wait_for(
+            subscriber.queue.get(), timeout=settings.LIVE_FEED_HEARTBEAT_SECONDS
+        )
+    except asyncio.TimeoutError:
+        return None
+
+
+@router.get("/sectors/{sector_id}")
+async def sector_live_feed(
+    request: Request,
+    sector_id: int,
+    last_event_id: Optional[str] = Header(None),
+) -> StreamingResponse:
+    """
+    Server-sent events for a sector: sector updates and new error events.
+    Reconnecting clients resume after the `Last-Event-ID` header; a `resync`
+    event means the gap was too old and state should be refetched.
+    This endpoint is not protected.
+    """
+    # Resolving may reload the routing table, which blocks
+    route = await run_in_threadpool(resolve_route, request)
+    subscriber = live_feed_broker.subscribe(
+        sector_id, _parse_event_id(last_event_id), tenant=route.tenant
+    )
+
+    async def stream() -> AsyncIterator[str]:
+        try:
+            yield "retry: 3000\n\n"
+            while not subscriber.dropped:
+                message = await _next_message(subscriber)
+                if message is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield (
+                    f"id: {message['id']}\n"
+                    f"event: {message['type']}\n"
+                    f"data: {json.dumps(message, default=str)}\n\n"
+                )
+        finally:
+            live_feed_broker.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/sectors/{sector_id}/ws")
+async def sector_live_socket(
+    websocket: WebSocket,
+    sector_id: int,
+    last_event_id: Optional[str] = None,
+) -> None:
+    """WebSocket variant of the sector live feed; resume with ?last_event_id=."""
+    try:
+        route = await run_in_threadpool(resolve_route, websocket)
+    except HTTPException:
+        await websocket.close(code=1008)  # policy violation
+        return
+    await websocket.accept()
+    subscriber = live_feed_broker.subscribe(
+        sector_id, _parse_event_id(last_event_id), tenant=route.tenant
+    )
+    try:
+        while not subscriber.dropped:
+            message = await _next_message(subscriber)
+            await websocket.send_text(
+                json.dumps(message or {"type": "ping"}, default=str)
+            )
+        await websocket.close(code=1013)  # try again later
+    except WebSocketDisconnect:
+        pass
+    finally:
+        live_feed_broker.unsubscribe(subscriber)
@@ -0,0 +1,74 @@
+from datetime import datetime
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.api.budget import budget
+from app.api.dependencies import get_current_active_user
+from app.infrastructure.db.session import get_db
+from app.domain.user.models.user import User
+from app.domain.search.schemas.search import EventSearchHit, SearchPage, SectorSearchHit
+from app.domain.search.services.search import MAX_QUERY_LENGTH, search_service
+
+router = APIRouter()
+
+
+@router.get(
+    "/events",
+    response_model=SearchPage[EventSearchHit],
+    dependencies=[Depends(budget("search"))],
+)
+def search_events(
+    q: str = Query(..., min_length=1, max_length=MAX_QUERY_LENGTH),
+    sector_id: Optional[int] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: Annotated[User, Depends(get_current_active_user)] = None,
+):
+    """
+    Full-text search over error event messages and categories, in English and
+    Portuguese. Supports "quoted phrases", `or` and -exclusions. Results are
+    ranked best first with highlighted snippets; pass `next_cursor` back as
+    `cursor` for the next page.
+    """
+    try:
+        return search_service.search_events(
+            db, q, sector_id=sector_id, start=start, end=end, cursor=cursor, limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+
+@router.get(
+    "/sectors",
+    response_model=SearchPage[SectorSearchHit],
+    dependencies=[Depends(budget("search"))],
+)
+def search_sectors(
+    q: str = Query(..., min_length=1, max_length=MAX_QUERY_LENGTH),
+    within_sector_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: Annotated[User, Depends(get_current_active_user)] = None,
+):
+    """
+    Full-text search over sector names and descriptions, optionally within
+    the subtree of `within_sector_id`. Ranked and paginated like event search.
+    """
+    try:
+        return search_service.search_sectors(
+            db, q, within_sector_id=within_sector_id, cursor=cursor, limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
@@ -1,13 +1,27 @@
-from typing import List, Annotated
+from datetime import datetime
+from typing import List, Annotated, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
+from app.api.budget import budget, set_truncated_header
+from app.api.counts import set_count_headers
 from app.api.dependencies import get_current_active_user
+from app.infrastructure.core.config import settings
 from app.infrastructure.db.session import get_db
+from app.domain.common.schemas.changes import ChangesPage
+from app.domain.common.schemas.counts import CountMode, CountsResponse
 from app.domain.user.models.user import User
-from app.domain.sector.schemas.sector import SectorCreate, SectorResponse, SectorSearch, SectorUpdate
+from app.domain.sector.schemas.sector import (
+    SectorCreate,
+    SectorMove,
+    SectorResponse,
+    SectorSearch,
+    SectorUpdate,
+)
 from app.domain.sector.services.sector import sector_service
+from app.domain.event.schemas.rollup import RollupGranularity, SectorStatsResponse
+from app.domain.event.services.rollup import event_rollup_service
 
 router = APIRouter()
 
@@ -31,11 +45,21 @@ def create_sector(
 
 @router.get("/all", response_model=List[SectorResponse])
 def get_all_sectors(
+    response: Response,
+    count: Optional[CountMode] = None,
     db: Session = Depends(get_db),
 ):
-    """Get all hospital sectors. This endpoint is not protected."""
+    """
+    Get all hospital sectors. With `count`, the X-Total-Count headers carry
+    the sector counts, and no sectors is an empty list rather than a 404.
+    This endpoint is not protected.
+    """
+    if count is not None:
+        set_count_headers(response, sector_service.count_sectors(db, count))
     sectors = sector_service.get_all_sectors(db)
-    if not sectors:
+    set_truncated_header(response, db)
+    # An exception response would drop the count headers set above
+    if not sectors and count is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No sectors found",
@@ -43,13 +67,45 @@ def get_all_sectors(
     return sectors
 
 
+@router.get("/changes", response_model=ChangesPage[SectorResponse])
+def get_sector_changes(
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=settings.CHANGE_FEED_MAX_LIMIT),
+    db: Session = Depends(get_db),
+):
+    """
+    Get sectors created, updated or (de)activated since `cursor`, oldest first.
+    This endpoint is not protected.
+    """
+    try:
+        return sector_service.get_sector_changes(db, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+
+@router.get("/counts", response_model=CountsResponse)
+def count_sectors(
+    mode: CountMode = CountMode.AUTO,
+    db: Session = Depends(get_db),
+):
+    """
+    Count hospital sectors, by status. "estimated" reads the planner's
+    statistics instead of scanning and has no breakdowns; "auto" estimates
+    only for large tables. This endpoint is not protected.
+    """
+    return sector_service.count_sectors(db, mode)
+
+
 @router.get("/{sector_id}", response_model=SectorResponse)
 def get_sector(
     sector_id: int,
     db: Session = Depends(get_db),
 ):
     """Get a hospital sector by ID. This endpoint is not protected."""
-    sector = sector_service.get_sector(db, sector_id)
+    sector = sector_service.read_sector(db, sector_id)
     if sector is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -58,6 +114,91 @@ def get_sector(
     return sector
 
 
+@router.get("/{sector_id}/subtree", response_model=List[SectorResponse])
+def get_sector_subtree(
+    sector_id: int,
+    max_depth: Optional[int] = Query(None, ge=0),
+    db: Session = Depends(get_db),
+):
+    """
+    Get a hospital sector and everything under it, parents before children.
+    `max_depth` limits how many levels below the sector are returned.
+    This endpoint is not protected.
+    """
+    sectors = sector_service.get_subtree(db, sector_id, max_depth)
+    if sectors is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Sector with ID {sector_id} not found",
+        )
+    return sectors
+
+
+@router.get("/{sector_id}/ancestors", response_model=List[SectorResponse])
+def get_sector_ancestors(
+    sector_id: int,
+    db: Session = Depends(get_db),
+):
+    """
+    Get the sectors above a hospital sector, root first. This endpoint is not
+    protected.
+    """
+    sectors = sector_service.get_ancestors(db, sector_id)
+    if sectors is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Sector with ID {sector_id} not found",
+        )
+    return sectors
+
+
+@router.post("/{sector_id}/move", response_model=SectorResponse)
+def move_sector(
+    sector_id: int,
+    move_in: SectorMove,
+    db: Session = Depends(get_db),
+    current_user: Annotated[User, Depends(get_current_active_user)] = None,
+):
+    """Move a hospital sector, with everything under it, to a new parent."""
+    try:
+        sector = sector_service.move_sector(db, sector_id, move_in)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    if sector is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Sector with ID {sector_id} not found",
+        )
+    return sector
+
+
+@router.get("/{sector_id}/stats", response_model=SectorStatsResponse)
+def get_sector_stats(
+    sector_id: int,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    granularity: Optional[RollupGranularity] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    Get error event counts of a sector by time bucket and severity.
+    Served from pre-aggregated rollups; defaults to the last 24 hours.
+    This endpoint is not protected.
+    """
+    try:
+        return event_rollup_service.get_sector_stats(
+            db, sector_id, start, end, granularity
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+
 @router.put("/{sector_id}", response_model=SectorResponse)
 def update_sector(
     sector_id: int,
@@ -81,13 +222,28 @@ def update_sector(
         )
 
 
-@router.post("/search", response_model=List[SectorResponse])
+@router.post(
+    "/search",
+    response_model=List[SectorResponse],
+    dependencies=[Depends(budget("search"))],
+)
 def search_sectors(
     search_params: SectorSearch,
+    response: Response,
+    count: Optional[CountMode] = None,
     db: Session = Depends(get_db),
 ):
-    """Search for hospital sectors by ID or name. This endpoint is not protected."""
+    """
+    Search for hospital sectors by ID or name. With `count`, the X-Total-Count
+    headers carry the counts of all matching sectors. This endpoint is not
+    protected.
+    """
+    if count is not None:
+        set_count_headers(
+            response, sector_service.count_sectors(db, count, search_params)
+        )
     sectors = sector_service.search_sectors(db, search_params)
+    set_truncated_header(response, db)
     return sectors
 
 
@@ -1,13 +1,26 @@
-from typing import Annotated, List
+from typing import Annotated, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
 
+from app.api.budget import budget, set_truncated_header
+from app.api.counts import set_count_headers
 from app.api.dependencies import get_current_active_user
+from app.api.streaming import consume_upload_lines
+from app.infrastructure.core.config import settings
 from app.infrastructure.db.session import get_db
+from app.domain.common.schemas.changes import ChangesPage
+from app.domain.common.schemas.counts import CountMode, CountsResponse
 from app.domain.user.models.user import User
-from app.domain.user.schemas.user import UserCreate, UserResponse, UserSearch, UserUpdate
+from app.domain.user.schemas.user import (
+    UserCreate,
+    UserImportReport,
+    UserResponse,
+    UserSearch,
+    UserUpdate,
+)
 from app.domain.user.services.user import user_service
+from app.domain.user.services.user_import import user_import_service
 
 router = APIRouter()
 
@@ -29,14 +42,50 @@ def create_user(
         )
 
 
+@router.post(
+    "/import",
+    response_model=UserImportReport,
+    dependencies=[Depends(budget("bulk", watch_disconnect=False))],
+)
+async def import_users(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: Annotated[User, Depends(get_current_active_user)] = None,
+):
+    """
+    Create users from a CSV file with name, email, password and optionally
+    is_active columns, sent as multipart/form-data or as a text/csv body.
+    The file is processed while it uploads; rows that fail are reported with
+    their line number and skipped.
+    """
+    try:
+        return await consume_upload_lines(
+            request, lambda lines: user_import_service.import_csv(db, lines)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+
 @router.get("/all", response_model=List[UserResponse])
 def get_all_users(
+    response: Response,
+    count: Optional[CountMode] = None,
     db: Session = Depends(get_db),
     current_user: Annotated[User, Depends(get_current_active_user)] = None,
 ):
-    """Get all users."""
+    """
+    Get all users. With `count`, the X-Total-Count headers carry the user
+    counts, and no users is an empty list rather than a 404.
+    """
+    if count is not None:
+        set_count_headers(response, user_service.count_users(db, count))
     users = user_service.get_all_users(db)
-    if not users:
+    set_truncated_header(response, db)
+    # An exception response would drop the count headers set above
+    if not users and count is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No users found",
@@ -44,13 +93,47 @@ def get_all_users(
     return users
 
 
+@router.get("/changes", response_model=ChangesPage[UserResponse])
+def get_user_changes(
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=settings.CHANGE_FEED_MAX_LIMIT),
+    db: Session = Depends(get_db),
+    current_user: Annotated[User, Depends(get_current_active_user)] = None,
+):
+    """
+    Get users created, updated or (de)activated since `cursor`, oldest first.
+    Omit the cursor for a full initial sync, then keep passing `next_cursor`.
+    """
+    try:
+        return user_service.get_user_changes(db, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+
+@router.get("/counts", response_model=CountsResponse)
+def count_users(
+    mode: CountMode = CountMode.AUTO,
+    db: Session = Depends(get_db),
+    current_user: Annotated[User, Depends(get_current_active_user)] = None,
+):
+    """
+    Count users, by status and email domain. "estimated" reads the planner's
+    statistics instead of scanning and has no breakdowns; "auto" estimates
+    only for large tables. Counts may be a few seconds old.
+    """
+    return user_service.count_users(db, mode)
+
+
 @router.get("/{user_id}", response_model=UserResponse)
 def get_user(
     user_id: int,
     db: Session = Depends(get_db),
 ):
     """Get a user by ID. This endpoint is not protected."""
-    user = user_service.get_user(db, user_id)
+    user = user_service.read_user(db, user_id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -76,14 +159,26 @@ def update_user(
     return user
 
 
-@router.post("/search", response_model=List[UserResponse])
+@router.post(
+    "/search",
+    response_model=List[UserResponse],
+    dependencies=[Depends(budget("search"))],
+)
 def search_users(
     search_params: UserSearch,
+    response: Response,
+    count: Optional[CountMode] = None,
     db: Session = Depends(get_db),
     current_user: Annotated[User, Depends(get_current_active_user)] = None,
 ):
-    """Search for users by ID, name, or email."""
+    """
+    Search for users by ID, name, or email. With `count`, the X-Total-Count
+    headers carry the counts of all matching users.
+    """
+    if count is not None:
+        set_count_headers(response, user_service.count_users(db, count, search_params))
     users = user_service.search_users(db, search_params)
+    set_truncated_header(response, db)
     return users
 
 
@@ -1,3 +1,7 @@
 # Import all models for Alembic migrations
 from app.domain.user.models.user import User
 from app.domain.sector.models.sector import Sector
+from app.domain.event.models.event import ErrorEvent
+from app.domain.event.models.rollup import SectorEventRollup
+from app.domain.event.models.issue import ErrorIssue
+from app.domain.job.models.job import Job
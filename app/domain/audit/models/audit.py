@@ -0,0 +1,31 @@
+from sqlalchemy import JSON, BigInteger, Column, DateTime, Index, Integer, String
+
+from app.infrastructure.db.session import Base
+
+
+class AuditLog(Base):
+    """
+    One change to an audited row: who made it, when, and the old and new value
+    of each changed field. Written behind the change by AuditService.
+    """
+
+    __tablename__ = "audit_log"
+    __table_args__ = (
+        Index(
+            "ix_audit_log_entity_entity_id_occurred_at",
+            "entity",
+            "entity_id",
+            "occurred_at",
+        ),
+        Index("ix_audit_log_entity_occurred_at", "entity", "occurred_at"),
+    )
+
+    id = Column(BigInteger, primary_key=True)
+    entity = Column(String(50), nullable=False)
+    entity_id = Column(BigInteger, nullable=False)
+    action = Column(String(16), nullable=False)
+    # field -> [old, new]; redacted fields carry a placeholder
+    changes = Column(JSON, nullable=False)
+    # No foreign key: the trail outlives the users it mentions
+    actor_id = Column(Integer, nullable=True)
+    occurred_at = Column(DateTime(timezone=True), nullable=False)
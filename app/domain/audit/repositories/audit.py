@@ -0,0 +1,45 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.domain.audit.models.audit import AuditLog
+
+
+class AuditLogRepository:
+    def bulk_create(self, db: Session, rows: Sequence[Dict[str, Any]]) -> int:
+        """
+        Insert rows with multi-row INSERT statements. The caller owns the
+        transaction.
+        """
+        if not rows:
+            return 0
+        db.execute(insert(AuditLog), list(rows))
+        return len(rows)
+
+    def list_for_entity(
+        self,
+        db: Session,
+        *,
+        entity: str,
+        entity_id: Optional[int],
+        start: datetime,
+        end: datetime,
+        limit: int,
+    ) -> List[AuditLog]:
+        query = db.query(AuditLog).filter(
+            AuditLog.entity == entity,
+            AuditLog.occurred_at >= start,
+            AuditLog.occurred_at < end,
+        )
+        if entity_id is not None:
+            query = query.filter(AuditLog.entity_id == entity_id)
+        return (
+            query.order_by(AuditLog.occurred_at.desc(), AuditLog.id.desc())
+            .limit(limit)
+            .all()
+        )
+
+
+audit_log_repository = AuditLogRepository()
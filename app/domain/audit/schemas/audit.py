@@ -0,0 +1,28 @@
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class AuditEntity(str, Enum):
+    USER = "user"
+    SECTOR = "sector"
+
+
+class AuditAction(str, Enum):
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+
+
+class AuditLogResponse(BaseModel):
+    id: int
+    entity: AuditEntity
+    entity_id: int
+    action: AuditAction
+    changes: Dict[str, List[Any]]
+    actor_id: Optional[int] = None
+    occurred_at: datetime
+
+    model_config = {"from_attributes": True}
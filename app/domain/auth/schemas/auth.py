@@ -10,6 +10,7 @@ class Token(BaseModel):
 
 class TokenPayload(BaseModel):
     sub: Optional[int] = None
+    tenant: Optional[str] = None
 
 
 class LoginRequest(BaseModel):
@@ -1,43 +1,182 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from datetime import datetime, timedelta
+from typing import (
+    Any,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import func, inspect, literal_column, text, tuple_
+from sqlalchemy.orm import InstrumentedAttribute, Query, Session
 
+from app.infrastructure.db.budget import budget_stats, session_budget
 from app.infrastructure.db.session import Base
+from app.infrastructure.tracing.tracer import traced_methods
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
+Columns = Optional[Sequence[InstrumentedAttribute]]
 
 
+@traced_methods
 class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    """
+    Generic data access. Write methods only flush: the surrounding UnitOfWork
+    decides when to commit.
+
+    Read methods take an optional `columns` projection (see `columns_for`). With
+    it they select just those columns and return plain rows, which skip ORM
+    hydration and the identity map; without it they return model instances.
+    """
+
     def __init__(self, model: Type[ModelType]):
         self.model = model
 
-    def get(self, db: Session, id: Any) -> Optional[ModelType]:
-        return db.query(self.model).filter(self.model.id == id).first()
+    def _query(self, db: Session, columns: Columns = None) -> Query:
+        if columns:
+            return db.query(*columns)
+        return db.query(self.model)
+
+    def get(self, db: Session, id: Any, *, columns: Columns = None) -> Optional[Any]:
+        return self._query(db, columns).filter(self.model.id == id).first()
 
-    def get_all(self, db: Session) -> List[ModelType]:
-        return db.query(self.model).all()
+    def get_existing_ids(self, db: Session, ids: Iterable[Any]) -> Set[Any]:
+        ids = set(ids)
+        if not ids:
+            return set()
+        rows = db.query(self.model.id).filter(self.model.id.in_(ids)).all()
+        return {row.id for row in rows}
 
-    def get_by_filter(self, db: Session, **kwargs) -> List[ModelType]:
-        query = db.query(self.model)
-        for key, value in kwargs.items():
+    def _capped(self, db: Session, query: Query) -> List[Any]:
+        """
+        All rows of `query`, up to the request budget's max_rows. Capped reads
+        are in id order, so the rows kept are the same on every call; a cut
+        is flagged on the session (see rows_capped).
+        """
+        budget = session_budget(db)
+        if budget is None or not budget.max_rows:
+            return query.all()
+        rows = query.order_by(self.model.id).limit(budget.max_rows + 1).all()
+        if len(rows) > budget.max_rows:
+            budget_stats.record(budget.name, "rows_capped")
+            db.info["rows_capped"] = True
+            del rows[budget.max_rows :]
+        return rows
+
+    def get_all(self, db: Session, *, columns: Columns = None) -> List[Any]:
+        return self._capped(db, self._query(db, columns))
+
+    def _filtered(self, query: Query, filters: Dict[str, Any]) -> Query:
+        for key, value in filters.items():
             if value is not None:
                 # Support for partial text search for string fields
                 if isinstance(value, str) and hasattr(self.model, key):
                     query = query.filter(getattr(self.model, key).ilike(f"%{value}%"))
                 else:
                     query = query.filter(getattr(self.model, key) == value)
-        return query.all()
+        return query
+
+    def get_by_filter(
+        self, db: Session, *, columns: Columns = None, **kwargs
+    ) -> List[Any]:
+        return self._capped(db, self._filtered(self._query(db, columns), kwargs))
+
+    def count_by_filter(
+        self, db: Session, *, facets: Optional[Dict[str, Any]] = None, **kwargs
+    ) -> Tuple[int, Dict[str, Dict[Any, int]]]:
+        """
+        Exact number of rows matching the get_by_filter filters, and of those
+        rows per value of each `facets` expression, in one GROUPING SETS query.
+        """
+        facets = facets or {}
+        if not facets:
+            query = db.query(func.count()).select_from(self.model)
+            return self._filtered(query, kwargs).scalar(), {}
+        expressions = list(facets.values())
+        query = db.query(
+            *(func.grouping(e) for e in expressions),
+            *expressions,
+            func.count(),
+        ).select_from(self.model)
+        query = self._filtered(query, kwargs).group_by(
+            # (): the total row; one grouping set per facet
+            func.grouping_sets(literal_column("()"), *(tuple_(e) for e in expressions))
+        )
+        total = 0
+        counts: Dict[str, Dict[Any, int]] = {name: {} for name in facets}
+        width = len(expressions)
+        for row in query.all():
+            grouped_out, values, count = row[:width], row[width:-1], row[-1]
+            if all(grouped_out):
+                total = count
+                continue
+            index = list(grouped_out).index(0)
+            counts[list(facets)[index]][values[index]] = count
+        return total, counts
+
+    def estimate_count(self, db: Session, **kwargs) -> Optional[int]:
+        """
+        The planner's estimate of the rows matching the get_by_filter filters,
+        without scanning: pg_class.reltuples when unfiltered, the EXPLAIN row
+        estimate otherwise. None if the table has no statistics yet.
+        """
+        filters = {key: value for key, value in kwargs.items() if value is not None}
+        if not filters:
+            reltuples = db.execute(
+                text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:table)"),
+                {"table": self.model.__tablename__},
+            ).scalar()
+            # -1: never vacuumed or analyzed
+            return int(reltuples) if reltuples and reltuples > 0 else None
+        statement = self._filtered(db.query(self.model.id), filters).statement
+        compiled = statement.compile(dialect=db.get_bind().dialect)
+        plan = (
+            db.connection()
+            .exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params)
+            .scalar()
+        )
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def get_changes(
+        self,
+        db: Session,
+        *,
+        after: Optional[Tuple[datetime, Any]],
+        settle_seconds: float,
+        limit: int,
+        columns: Columns = None,
+    ) -> List[Any]:
+        """
+        Rows ordered by (updated_at, id) strictly after the `after` keyset.
+        updated_at is the writing transaction's start time, so rows younger
+        than `settle_seconds` are held back until slower transactions commit.
+        """
+        query = self._query(db, columns).filter(
+            self.model.updated_at < func.now() - timedelta(seconds=settle_seconds)
+        )
+        if after is not None:
+            query = query.filter(
+                tuple_(self.model.updated_at, self.model.id) > tuple_(*after)
+            )
+        return query.order_by(self.model.updated_at, self.model.id).limit(limit).all()
 
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
         obj_in_data = jsonable_encoder(obj_in)
         db_obj = self.model(**obj_in_data)
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        # Models use eager_defaults, so server defaults come back on the INSERT
+        db.flush()
         return db_obj
 
     def update(
@@ -47,21 +186,20 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db_obj: ModelType,
         obj_in: Union[UpdateSchemaType, Dict[str, Any]],
     ) -> ModelType:
-        obj_data = jsonable_encoder(db_obj)
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
             update_data = obj_in.dict(exclude_unset=True)
-        for field in obj_data:
+        # Mapped columns rather than loaded attributes, so deferred ones update too
+        for field in inspect(self.model).column_attrs.keys():
             if field in update_data:
                 setattr(db_obj, field, update_data[field])
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        db.flush()
         return db_obj
 
     def delete(self, db: Session, *, id: int) -> ModelType:
-        obj = db.query(self.model).get(id)
+        obj = db.get(self.model, id)
         db.delete(obj)
-        db.commit()
+        db.flush()
         return obj 
\ No newline at end of file
@@ -0,0 +1,21 @@
+from functools import lru_cache
+from typing import Tuple, Type
+
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.infrastructure.db.session import Base
+
+
+@lru_cache(maxsize=None)
+def columns_for(
+    model: Type[Base], schema: Type[BaseModel]
+) -> Tuple[InstrumentedAttribute, ...]:
+    """
+    Model columns backing the fields of `schema`, in schema field order.
+    Passed as `columns=` to the repositories, so read paths select only what the
+    response serializes and get plain row tuples instead of ORM instances.
+    """
+    mapped = inspect(model).column_attrs
+    return tuple(getattr(model, name) for name in schema.model_fields if name in mapped)
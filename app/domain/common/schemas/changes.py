@@ -0,0 +1,12 @@
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel
+
+ItemType = TypeVar("ItemType")
+
+
+class ChangesPage(BaseModel, Generic[ItemType]):
+    items: List[ItemType]
+    # Pass back as `cursor` to resume after the last item; stays put when idle
+    next_cursor: Optional[str] = None
+    has_more: bool = False
@@ -0,0 +1,20 @@
+from enum import Enum
+from typing import Dict
+
+from pydantic import BaseModel
+
+
+class CountMode(str, Enum):
+    # COUNT(*) with facet breakdowns
+    EXACT = "exact"
+    # The planner's estimate of the total, without facets
+    ESTIMATED = "estimated"
+    # Estimated for large tables (COUNT_EXACT_MAX_ROWS), exact otherwise
+    AUTO = "auto"
+
+
+class CountsResponse(BaseModel):
+    total: int
+    estimated: bool = False
+    # facet -> value -> rows; empty for estimated counts
+    facets: Dict[str, Dict[str, int]] = {}
@@ -0,0 +1,41 @@
+from typing import Optional, Type
+
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app.domain.common.cursor import decode_change_cursor, encode_cursor
+from app.domain.common.repositories.base import BaseRepository
+from app.domain.common.repositories.projection import columns_for
+from app.domain.common.schemas.changes import ChangesPage
+from app.infrastructure.core.config import settings
+
+
+def get_changes_page(
+    repository: BaseRepository,
+    item_schema: Type[BaseModel],
+    db: Session,
+    cursor: Optional[str],
+    limit: int,
+) -> ChangesPage:
+    """
+    Rows created or updated after `cursor`, oldest first.
+    Raises ValueError if the cursor is malformed.
+    """
+    after = decode_change_cursor(cursor) if cursor else None
+    rows = repository.get_changes(
+        db,
+        after=after,
+        settle_seconds=settings.CHANGE_FEED_SETTLE_SECONDS,
+        limit=limit + 1,
+        columns=columns_for(repository.model, item_schema),
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if rows:
+        last = rows[-1]
+        cursor = encode_cursor(last.updated_at, last.id)
+    return ChangesPage[item_schema](
+        items=[item_schema.model_validate(row) for row in rows],
+        next_cursor=cursor,
+        has_more=has_more,
+    )
@@ -0,0 +1,115 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.domain.common.repositories.base import BaseRepository
+from app.domain.common.schemas.counts import CountMode, CountsResponse
+from app.infrastructure.core.config import settings
+from app.infrastructure.db.sharding import session_route
+from app.infrastructure.tracing.tracer import traced_methods
+
+
+class CountCache:
+    """Bounded LRU of recent counts; a count may be up to `ttl` seconds stale."""
+
+    def __init__(self, max_size: int, ttl: float):
+        self._max_size = max_size
+        self._ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[CountsResponse, float]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[CountsResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            counts, stored_at = entry
+            if time.monotonic() - stored_at > self._ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return counts
+
+    def put(self, key: Hashable, counts: CountsResponse) -> None:
+        with self._lock:
+            self._entries[key] = (counts, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+
+def _facet_key(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+@traced_methods
+class CountService:
+    """
+    Row counts for list and search responses, so clients need not fetch a
+    whole table to count it. Counts are cached per tenant, table, mode and
+    filters for COUNT_CACHE_TTL_SECONDS.
+    """
+
+    def __init__(self) -> None:
+        self._cache = CountCache(
+            settings.COUNT_CACHE_SIZE, settings.COUNT_CACHE_TTL_SECONDS
+        )
+
+    def count(
+        self,
+        db: Session,
+        repository: BaseRepository,
+        mode: CountMode,
+        *,
+        facets: Optional[Dict[str, Any]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> CountsResponse:
+        filters = {
+            key: value for key, value in (filters or {}).items() if value is not None
+        }
+        key = (
+            session_route(db).key,
+            repository.model.__tablename__,
+            mode,
+            tuple(sorted(filters.items())),
+        )
+        counts = self._cache.get(key)
+        if counts is not None:
+            return counts
+
+        if mode != CountMode.EXACT:
+            estimate = repository.estimate_count(db, **filters)
+            if estimate is not None and (
+                mode == CountMode.ESTIMATED or estimate > settings.COUNT_EXACT_MAX_ROWS
+            ):
+                counts = CountsResponse(total=estimate, estimated=True)
+        if counts is None:
+            total, facet_counts = repository.count_by_filter(
+                db, facets=facets, **filters
+            )
+            counts = CountsResponse(
+                total=total,
+                facets={
+                    name: {
+                        _facet_key(value): rows
+                        for value, rows in sorted(
+                            values.items(), key=lambda item: item[1], reverse=True
+                        )[: settings.COUNT_MAX_FACET_VALUES]
+                    }
+                    for name, values in facet_counts.items()
+                },
+            )
+        self._cache.put(key, counts)
+        return counts
+
+
+count_service = CountService()
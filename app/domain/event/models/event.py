@@ -0,0 +1,55 @@
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Column,
+    Computed,
+    DateTime,
+    ForeignKey,
+    Integer,
+    Sequence,
+    String,
+    Text,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
+from sqlalchemy.sql import func
+
+from app.infrastructure.db.session import Base
+
+
+# Indexed in English and Portuguese, since hospitals write in both; the
+# message outranks the category
+EVENT_SEARCH_VECTOR = (
+    "setweight(to_tsvector('english'::regconfig, message), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, category), 'B') || "
+    "setweight(to_tsvector('portuguese'::regconfig, message), 'A') || "
+    "setweight(to_tsvector('portuguese'::regconfig, category), 'B')"
+)
+
+
+class ErrorEvent(Base):
+    __tablename__ = "error_events"
+    # Range partitioned by occurred_at. Indexes live on the individual partitions
+    # (btree while recent, BRIN once cold) and are managed by EventPartitionService.
+    __table_args__ = {"postgresql_partition_by": "RANGE (occurred_at)"}
+
+    id = Column(
+        BigInteger,
+        Sequence("error_events_id_seq"),
+        primary_key=True,
+        autoincrement=True,
+    )
+    sector_id = Column(Integer, ForeignKey("sectors.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    issue_id = Column(BigInteger, ForeignKey("error_issues.id"), nullable=True)
+    severity = Column(String(16), nullable=False)
+    category = Column(String(100), nullable=False)
+    message = Column(Text, nullable=False)
+    source = Column(String(255), nullable=True)
+    details = Column(JSON, nullable=True)
+    occurred_at = Column(DateTime(timezone=True), primary_key=True)
+    received_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Full-text search; GIN indexed per partition by EventPartitionRepository
+    search_vector = deferred(
+        Column(TSVECTOR, Computed(EVENT_SEARCH_VECTOR, persisted=True))
+    )
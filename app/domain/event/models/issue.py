@@ -0,0 +1,33 @@
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+)
+
+from app.infrastructure.db.session import Base
+
+
+class ErrorIssue(Base):
+    """A group of error events sharing the same fingerprint."""
+
+    __tablename__ = "error_issues"
+    __table_args__ = (
+        Index("ix_error_issues_sector_id_last_seen", "sector_id", "last_seen"),
+    )
+
+    id = Column(BigInteger, primary_key=True)
+    fingerprint = Column(String(40), unique=True, index=True, nullable=False)
+    sector_id = Column(Integer, ForeignKey("sectors.id"), nullable=False)
+    category = Column(String(100), nullable=False)
+    message_template = Column(Text, nullable=False)
+    severity = Column(String(16), nullable=False)
+    occurrence_count = Column(BigInteger, nullable=False, default=0)
+    # Occurrences whose full row was kept in error_events
+    stored_count = Column(BigInteger, nullable=False, default=0)
+    first_seen = Column(DateTime(timezone=True), nullable=False)
+    last_seen = Column(DateTime(timezone=True), nullable=False)
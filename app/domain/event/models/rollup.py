@@ -0,0 +1,15 @@
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Integer, String
+
+from app.infrastructure.db.session import Base
+
+
+class SectorEventRollup(Base):
+    """Event counts per sector, time bucket and severity, maintained on ingestion."""
+
+    __tablename__ = "sector_event_rollups"
+
+    sector_id = Column(Integer, ForeignKey("sectors.id"), primary_key=True)
+    granularity = Column(String(8), primary_key=True)
+    bucket_start = Column(DateTime(timezone=True), primary_key=True)
+    severity = Column(String(16), primary_key=True)
+    event_count = Column(BigInteger, nullable=False, default=0)
@@ -0,0 +1,175 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.domain.event.models.event import ErrorEvent
+from app.domain.event.repositories.partition import EventPartition
+from app.infrastructure.archive.segment import (
+    DICT,
+    INT,
+    JSON,
+    TEXT,
+    TIME,
+    SegmentWriter,
+    to_micros,
+)
+from app.infrastructure.archive.store import segment_store
+from app.infrastructure.db.sharding import TenantRoute
+from app.infrastructure.tracing.tracer import traced_methods
+
+# Rows fetched per round trip while streaming a partition out
+ARCHIVE_FETCH_SIZE = 5_000
+
+# Every column of error_events but the derived search_vector; sector_id is the
+# group column of the segments
+ARCHIVE_COLUMNS = (
+    ("id", INT),
+    ("user_id", INT),
+    ("issue_id", INT),
+    ("severity", DICT),
+    ("category", DICT),
+    ("message", TEXT),
+    ("source", DICT),
+    ("details", JSON),
+    ("occurred_at", TIME),
+    ("received_at", TIME),
+)
+
+
+@dataclass
+class ArchivedEvent:
+    id: int
+    sector_id: int
+    user_id: Optional[int]
+    issue_id: Optional[int]
+    severity: str
+    category: str
+    message: str
+    source: Optional[str]
+    details: Optional[Any]
+    occurred_at: datetime
+    received_at: Optional[datetime]
+
+
+def _namespace(route: TenantRoute) -> Tuple[str, str]:
+    return route.shard, route.schema or "_default"
+
+
+@traced_methods
+class EventArchiveRepository:
+    """
+    Archived error events: segment files of a tenant, one per archived
+    partition and month, with the events grouped by sector.
+    """
+
+    def write_partition(
+        self, db: Session, route: TenantRoute, partition: EventPartition
+    ) -> int:
+        """
+        Copy the rows of `partition` to segment files, replacing any left by an
+        earlier attempt. Returns the number of rows written.
+        """
+        columns = [getattr(ErrorEvent, name) for name, _ in ARCHIVE_COLUMNS]
+        rows = db.execute(
+            select(ErrorEvent.sector_id, *columns)
+            .where(
+                ErrorEvent.occurred_at >= partition.start,
+                ErrorEvent.occurred_at < partition.end,
+            )
+            .order_by(ErrorEvent.sector_id, ErrorEvent.occurred_at),
+            execution_options={"yield_per": ARCHIVE_FETCH_SIZE},
+        )
+        writers: Dict[str, SegmentWriter] = {}
+        # Rows of the current sector, by month
+        pending: Dict[str, List[Dict[str, Any]]] = {}
+        sector_id = None
+        total = 0
+        try:
+            for row in rows:
+                if row.sector_id != sector_id:
+                    self._flush(writers, sector_id, pending)
+                    sector_id = row.sector_id
+                month_start = row.occurred_at.astimezone(timezone.utc).replace(
+                    day=1, hour=0, minute=0, second=0, microsecond=0
+                )
+                month = f"{month_start:%Y-%m}"
+                if month not in writers:
+                    writers[month] = SegmentWriter(
+                        segment_store.segment_path(
+                            _namespace(route), month_start, partition.name
+                        ),
+                        ARCHIVE_COLUMNS,
+                        group_column="sector_id",
+                        time_column="occurred_at",
+                        id_column="id",
+                    )
+                pending.setdefault(month, []).append(row._asdict())
+                total += 1
+            self._flush(writers, sector_id, pending)
+        except BaseException:
+            for writer in writers.values():
+                writer.abort()
+            raise
+        for writer in writers.values():
+            writer.close()
+        return total
+
+    def _flush(
+        self,
+        writers: Dict[str, SegmentWriter],
+        sector_id: Optional[int],
+        pending: Dict[str, List[Dict[str, Any]]],
+    ) -> None:
+        for month, group in pending.items():
+            writers[month].add_group(sector_id, group)
+        pending.clear()
+
+    def list_for_sector(
+        self,
+        route: TenantRoute,
+        *,
+        sector_id: int,
+        start: datetime,
+        end: datetime,
+        limit: int,
+    ) -> List[ArchivedEvent]:
+        events: List[ArchivedEvent] = []
+        for path in segment_store.segment_paths(_namespace(route), start, end):
+            reader = segment_store.reader(path)
+            if reader is None or not reader.overlaps(start, end):
+                continue
+            rows = reader.read_group(sector_id, start, end, newest=limit)
+            events.extend(ArchivedEvent(**row) for row in rows)
+        events.sort(key=lambda e: e.occurred_at, reverse=True)
+        return events[:limit]
+
+    def get(self, route: TenantRoute, event_id: int) -> Optional[ArchivedEvent]:
+        # Ids grow with time, so the newest segments are the likeliest. Only
+        # those whose id range covers event_id are opened
+        for path in reversed(segment_store.segment_paths(_namespace(route))):
+            id_range = segment_store.id_range(path)
+            if id_range is None or not id_range[0] <= event_id <= id_range[1]:
+                continue
+            reader = segment_store.reader(path)
+            if reader is None:
+                continue
+            row = reader.find(event_id)
+            if row is not None:
+                return ArchivedEvent(**row)
+        return None
+
+    def delete_before(self, route: TenantRoute, before: datetime) -> List[str]:
+        """Delete the segments holding only events older than `before`."""
+        deleted = []
+        for path in segment_store.segment_paths(_namespace(route), end=before):
+            reader = segment_store.reader(path)
+            if reader is not None and reader.max_time < to_micros(before):
+                segment_store.remove(path)
+                deleted.append(f"{path.parent.name}/{path.stem}")
+        return deleted
+
+
+event_archive_repository = EventArchiveRepository()
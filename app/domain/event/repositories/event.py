@@ -0,0 +1,50 @@
+from datetime import datetime
+from typing import Any, Dict, List
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.domain.common.repositories.base import BaseRepository
+from app.domain.event.models.event import ErrorEvent
+from app.domain.event.schemas.event import ErrorEventCreate
+from app.infrastructure.tracing.tracer import traced_methods
+
+
+@traced_methods
+class ErrorEventRepository(
+    BaseRepository[ErrorEvent, ErrorEventCreate, ErrorEventCreate]
+):
+    def bulk_create(self, db: Session, rows: List[Dict[str, Any]]) -> int:
+        """
+        Insert rows with multi-row INSERT statements, bypassing the ORM unit of work.
+        The caller owns the transaction.
+        """
+        if not rows:
+            return 0
+        db.execute(insert(ErrorEvent), rows)
+        return len(rows)
+
+    def list_for_sector(
+        self,
+        db: Session,
+        *,
+        sector_id: int,
+        start: datetime,
+        end: datetime,
+        limit: int,
+    ) -> List[ErrorEvent]:
+        # Both time bounds are required so the planner prunes to the partitions in range
+        return (
+            db.query(ErrorEvent)
+            .filter(
+                ErrorEvent.sector_id == sector_id,
+                ErrorEvent.occurred_at >= start,
+                ErrorEvent.occurred_at < end,
+            )
+            .order_by(ErrorEvent.occurred_at.desc())
+            .limit(limit)
+            .all()
+        )
+
+
+error_event_repository = ErrorEventRepository(ErrorEvent)
@@ -0,0 +1,52 @@
+from typing import Any, Dict, List
+
+from sqlalchemy import case, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.domain.event.models.issue import ErrorIssue
+
+
+class ErrorIssueRepository:
+    def record_occurrences(
+        self, db: Session, occurrences: List[Dict[str, Any]]
+    ) -> Dict[str, int]:
+        """
+        Create or bump one issue per fingerprint with a single multi-row upsert
+        and return the issue id of every fingerprint. As within a batch, the
+        severity is that of the latest occurrence, so a delayed batch of older
+        events does not overwrite it. The caller owns the transaction.
+        """
+        if not occurrences:
+            return {}
+        values = sorted(occurrences, key=lambda o: o["fingerprint"])
+        stmt = insert(ErrorIssue).values(values)
+        new = stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["fingerprint"],
+            set_={
+                "severity": case(
+                    (new.last_seen >= ErrorIssue.last_seen, new.severity),
+                    else_=ErrorIssue.severity,
+                ),
+                "occurrence_count": ErrorIssue.occurrence_count + new.occurrence_count,
+                "stored_count": ErrorIssue.stored_count + new.stored_count,
+                "first_seen": func.least(ErrorIssue.first_seen, new.first_seen),
+                "last_seen": func.greatest(ErrorIssue.last_seen, new.last_seen),
+            },
+        ).returning(ErrorIssue.id, ErrorIssue.fingerprint)
+        return {row.fingerprint: row.id for row in db.execute(stmt)}
+
+    def list_for_sector(
+        self, db: Session, *, sector_id: int, limit: int
+    ) -> List[ErrorIssue]:
+        return (
+            db.query(ErrorIssue)
+            .filter(ErrorIssue.sector_id == sector_id)
+            .order_by(ErrorIssue.last_seen.desc())
+            .limit(limit)
+            .all()
+        )
+
+
+error_issue_repository = ErrorIssueRepository()
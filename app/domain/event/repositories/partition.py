@@ -0,0 +1,151 @@
+import re
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterator, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.domain.event.models.event import ErrorEvent
+from app.infrastructure.db.sharding import session_route
+
+# Arbitrary key for the advisory lock serializing maintenance runs; the second
+# key is the hash of the tenant route, so tenants sharing a shard do not wait
+MAINTENANCE_LOCK_KEY = 0x3E7A
+
+_BOUND_RE = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+
+@dataclass
+class EventPartition:
+    name: str
+    start: datetime
+    end: datetime
+    has_brin: bool
+
+
+def _parse_timestamp(value: str) -> datetime:
+    # Postgres renders "+00" offsets, which fromisoformat only accepts as "+00:00"
+    if re.search(r"[+-]\d\d$", value):
+        value += ":00"
+    return datetime.fromisoformat(value)
+
+
+class EventPartitionRepository:
+    """DDL and catalog access for the range partitions of `error_events`."""
+
+    parent = ErrorEvent.__tablename__
+
+    @contextmanager
+    def maintenance_lock(self, db: Session) -> Iterator[bool]:
+        """
+        Try to take the lock on maintaining the partitions of `db`'s schema and
+        yield whether it was taken. Held on a connection of its own, as `db`
+        commits (and may change connections) while maintaining.
+        """
+        params = {"key": MAINTENANCE_LOCK_KEY, "route": session_route(db).key}
+        with db.get_bind().connect() as connection:
+            taken = connection.execute(
+                text("SELECT pg_try_advisory_lock(:key, hashtext(:route))"), params
+            ).scalar_one()
+            # Session-level lock: end the implicit transaction but keep the lock
+            connection.commit()
+            try:
+                yield taken
+            finally:
+                if taken:
+                    connection.execute(
+                        text("SELECT pg_advisory_unlock(:key, hashtext(:route))"),
+                        params,
+                    )
+                    connection.commit()
+
+    def list_partitions(self, db: Session) -> List[EventPartition]:
+        rows = db.execute(
+            text(
+                """
+                SELECT c.relname AS name,
+                       pg_get_expr(c.relpartbound, c.oid) AS bound,
+                       EXISTS (
+                           SELECT 1
+                           FROM pg_index i
+                           JOIN pg_class ic ON ic.oid = i.indexrelid
+                           JOIN pg_am am ON am.oid = ic.relam
+                           WHERE i.indrelid = c.oid AND am.amname = 'brin'
+                       ) AS has_brin
+                FROM pg_inherits inh
+                JOIN pg_class c ON c.oid = inh.inhrelid
+                WHERE inh.inhparent = CAST(:parent AS regclass)
+                """
+            ),
+            {"parent": self.parent},
+        )
+        partitions = []
+        for row in rows:
+            match = _BOUND_RE.search(row.bound or "")
+            if match is None:
+                continue
+            partitions.append(
+                EventPartition(
+                    name=row.name,
+                    start=_parse_timestamp(match.group(1)),
+                    end=_parse_timestamp(match.group(2)),
+                    has_brin=row.has_brin,
+                )
+            )
+        return sorted(partitions, key=lambda p: p.start)
+
+    def create_partition(
+        self, db: Session, name: str, start: datetime, end: datetime
+    ) -> None:
+        db.execute(
+            text(
+                f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{self.parent}" '
+                "FOR VALUES FROM (:start) TO (:end)"
+            ),
+            {"start": start, "end": end},
+        )
+        db.execute(
+            text(
+                f'CREATE INDEX IF NOT EXISTS "{name}_sector_id_occurred_at_idx" '
+                f'ON "{name}" (sector_id, occurred_at)'
+            )
+        )
+        # Kept when the partition goes cold, so old events stay searchable
+        db.execute(
+            text(
+                f'CREATE INDEX IF NOT EXISTS "{name}_search_vector_idx" '
+                f'ON "{name}" USING gin (search_vector)'
+            )
+        )
+
+    def convert_to_brin(self, db: Session, partition: EventPartition) -> None:
+        """Swap the btree index of a cold partition for a much smaller BRIN index."""
+        name = partition.name
+        db.execute(
+            text(
+                f'CREATE INDEX IF NOT EXISTS "{name}_occurred_at_brin" '
+                f'ON "{name}" USING brin (occurred_at)'
+            )
+        )
+        db.execute(text(f'DROP INDEX IF EXISTS "{name}_sector_id_occurred_at_idx"'))
+
+    def detach_partition(self, db: Session, partition: EventPartition) -> None:
+        db.execute(
+            text(f'ALTER TABLE "{self.parent}" DETACH PARTITION "{partition.name}"')
+        )
+
+    def drop_partition(self, db: Session, partition: EventPartition) -> None:
+        db.execute(text(f'DROP TABLE IF EXISTS "{partition.name}"'))
+
+    def find_partition(
+        self, partitions: List[EventPartition], ts: datetime
+    ) -> Optional[EventPartition]:
+        for partition in partitions:
+            if partition.start <= ts < partition.end:
+                return partition
+        return None
+
+
+event_partition_repository = EventPartitionRepository()
@@ -0,0 +1,65 @@
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.domain.event.models.rollup import SectorEventRollup
+
+# (sector_id, granularity, bucket_start, severity)
+RollupKey = Tuple[int, str, datetime, str]
+
+
+class SectorEventRollupRepository:
+    def increment(self, db: Session, counts: Dict[RollupKey, int]) -> None:
+        """
+        Add counts to their buckets with a single multi-row upsert.
+        Keys are sorted so concurrent writers lock rows in the same order.
+        The caller owns the transaction.
+        """
+        if not counts:
+            return
+        values = [
+            {
+                "sector_id": sector_id,
+                "granularity": granularity,
+                "bucket_start": bucket_start,
+                "severity": severity,
+                "event_count": count,
+            }
+            for (sector_id, granularity, bucket_start, severity), count in sorted(
+                counts.items()
+            )
+        ]
+        stmt = insert(SectorEventRollup).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["sector_id", "granularity", "bucket_start", "severity"],
+            set_={
+                "event_count": SectorEventRollup.event_count + stmt.excluded.event_count
+            },
+        )
+        db.execute(stmt)
+
+    def list_buckets(
+        self,
+        db: Session,
+        *,
+        sector_id: int,
+        granularity: str,
+        start: datetime,
+        end: datetime,
+    ) -> List[SectorEventRollup]:
+        return (
+            db.query(SectorEventRollup)
+            .filter(
+                SectorEventRollup.sector_id == sector_id,
+                SectorEventRollup.granularity == granularity,
+                SectorEventRollup.bucket_start >= start,
+                SectorEventRollup.bucket_start < end,
+            )
+            .order_by(SectorEventRollup.bucket_start)
+            .all()
+        )
+
+
+sector_event_rollup_repository = SectorEventRollupRepository()
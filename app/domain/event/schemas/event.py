@@ -0,0 +1,65 @@
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class EventSeverity(str, Enum):
+    LOW = "low"
+    MEDIUM = "medium"
+    HIGH = "high"
+    CRITICAL = "critical"
+
+
+class EventAckMode(str, Enum):
+    ENQUEUE = "enqueue"
+    FLUSH = "flush"
+
+
+class ErrorEventBase(BaseModel):
+    sector_id: int
+    user_id: Optional[int] = None
+    severity: EventSeverity = EventSeverity.MEDIUM
+    category: str = Field(..., min_length=1, max_length=100)
+    message: str = Field(..., min_length=1, max_length=4000)
+    source: Optional[str] = Field(None, max_length=255)
+    details: Optional[Dict[str, Any]] = None
+
+
+class ErrorEventCreate(ErrorEventBase):
+    # Defaults to the time the API received the event
+    occurred_at: Optional[datetime] = None
+
+
+class ErrorEventBatch(BaseModel):
+    events: List[ErrorEventCreate] = Field(..., min_length=1)
+
+
+class ErrorEventAck(BaseModel):
+    accepted: int
+    ack_mode: EventAckMode
+
+
+class ErrorEventResponse(ErrorEventBase):
+    id: int
+    issue_id: Optional[int] = None
+    occurred_at: datetime
+    received_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class ErrorIssueResponse(BaseModel):
+    id: int
+    fingerprint: str
+    sector_id: int
+    category: str
+    message_template: str
+    severity: EventSeverity
+    occurrence_count: int
+    stored_count: int
+    first_seen: datetime
+    last_seen: datetime
+
+    model_config = {"from_attributes": True}
@@ -0,0 +1,27 @@
+from datetime import datetime
+from enum import Enum
+from typing import Dict, List
+
+from pydantic import BaseModel
+
+
+class RollupGranularity(str, Enum):
+    MINUTE = "minute"
+    HOUR = "hour"
+    DAY = "day"
+
+
+class SectorStatsBucket(BaseModel):
+    bucket_start: datetime
+    total: int
+    by_severity: Dict[str, int]
+
+
+class SectorStatsResponse(BaseModel):
+    sector_id: int
+    granularity: RollupGranularity
+    start: datetime
+    end: datetime
+    total: int
+    by_severity: Dict[str, int]
+    buckets: List[SectorStatsBucket]
@@ -0,0 +1,74 @@
+import logging
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.domain.event.repositories.archive import (
+    ArchivedEvent,
+    event_archive_repository,
+)
+from app.domain.event.repositories.partition import (
+    EventPartition,
+    event_partition_repository,
+)
+from app.infrastructure.core.config import settings
+from app.infrastructure.db.sharding import session_route
+from app.infrastructure.tracing.tracer import traced_methods
+
+logger = logging.getLogger(__name__)
+
+
+@traced_methods
+class EventArchiveService:
+    """
+    Cold storage for error events. Partitions older than
+    EVENT_ARCHIVE_AFTER_DAYS leave Postgres for compressed segment files; reads
+    over older time ranges are answered from both.
+    """
+
+    @property
+    def enabled(self) -> bool:
+        return settings.EVENT_ARCHIVE_ENABLED
+
+    def cutoff(self, now: datetime) -> datetime:
+        """Events older than this are (or are about to be) archived."""
+        return now - timedelta(days=settings.EVENT_ARCHIVE_AFTER_DAYS)
+
+    def is_archived(self, ts: datetime, now: datetime) -> bool:
+        return self.enabled and ts < self.cutoff(now)
+
+    def archive_partition(self, db: Session, partition: EventPartition) -> int:
+        """
+        Move the rows of `partition` to segment files, then drop it. Commits.
+        Safe to retry: the files of an interrupted attempt are rewritten.
+        """
+        rows = event_archive_repository.write_partition(
+            db, session_route(db), partition
+        )
+        event_partition_repository.detach_partition(db, partition)
+        event_partition_repository.drop_partition(db, partition)
+        db.commit()
+        logger.info(
+            "Archived %d events of %s for %s",
+            rows,
+            partition.name,
+            session_route(db).key,
+        )
+        return rows
+
+    def expire(self, db: Session, before: datetime) -> List[str]:
+        return event_archive_repository.delete_before(session_route(db), before)
+
+    def list_sector_events(
+        self, db: Session, sector_id: int, start: datetime, end: datetime, limit: int
+    ) -> List[ArchivedEvent]:
+        return event_archive_repository.list_for_sector(
+            session_route(db), sector_id=sector_id, start=start, end=end, limit=limit
+        )
+
+    def get_event(self, db: Session, event_id: int) -> Optional[ArchivedEvent]:
+        return event_archive_repository.get(session_route(db), event_id)
+
+
+event_archive_service = EventArchiveService()
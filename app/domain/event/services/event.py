@@ -0,0 +1,256 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Union
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.domain.event.models.event import ErrorEvent
+from app.domain.event.repositories.archive import ArchivedEvent
+from app.domain.event.repositories.event import error_event_repository
+from app.domain.event.schemas.event import EventAckMode, ErrorEventCreate
+from app.domain.event.services.archive import event_archive_service
+from app.domain.event.services.issue import error_issue_service
+from app.domain.event.services.partition import event_partition_service
+from app.domain.event.services.rollup import event_rollup_service
+from app.domain.sector.repositories.sector import sector_repository
+from app.domain.user.repositories.user import user_repository
+from app.infrastructure.core.config import settings
+from app.infrastructure.db.batch_writer import BatchWriter
+from app.infrastructure.db.session import open_session
+from app.infrastructure.db.sharding import TenantRoute, session_route
+from app.infrastructure.live.notify import publish_live_messages
+from app.infrastructure.tracing.tracer import traced_methods
+
+logger = logging.getLogger(__name__)
+
+# How long a stale sector id set may be reused before an unknown id forces a reload
+SECTOR_IDS_REFRESH_SECONDS = 5.0
+# Events stamped further ahead than this are rejected as clock errors
+MAX_FUTURE_SKEW = timedelta(days=1)
+
+
+@traced_methods
+class EventService:
+    def __init__(self) -> None:
+        # Queued rows carry the route of the tenant they belong to
+        self._writer: Optional[BatchWriter[Tuple[TenantRoute, Dict[str, Any]]]] = None
+        # Known sector ids and when they were loaded, per tenant
+        self._sector_ids: Dict[str, Tuple[Set[int], float]] = {}
+        self._sector_ids_lock = threading.Lock()
+
+    def start(self) -> None:
+        if self._writer is None:
+            self._writer = BatchWriter(
+                "error-events",
+                self._write_events,
+                max_size=settings.EVENT_QUEUE_MAX_SIZE,
+                batch_size=settings.EVENT_FLUSH_BATCH_SIZE,
+                flush_interval=settings.EVENT_FLUSH_INTERVAL_MS / 1000,
+            )
+        self._writer.start()
+
+    def stop(self) -> None:
+        if self._writer is not None:
+            self._writer.stop()
+
+    def ingest_events(
+        self,
+        db: Session,
+        events_in: Sequence[ErrorEventCreate],
+        *,
+        reporter_id: Optional[int] = None,
+        ack_mode: Optional[EventAckMode] = None,
+    ) -> EventAckMode:
+        """
+        Validate and queue events for the background writer.
+        Raises ValueError for unknown sectors or out-of-range timestamps,
+        QueueFullError under backpressure and TimeoutError if a flush
+        acknowledgement does not arrive in time.
+        """
+        if self._writer is None:
+            raise RuntimeError("Event ingestion has not been started")
+        ack_mode = ack_mode or EventAckMode(settings.EVENT_ACK_MODE)
+
+        unknown = self._unknown_sector_ids(db, {e.sector_id for e in events_in})
+        if unknown:
+            raise ValueError(f"Unknown sector ID(s): {sorted(unknown)}")
+
+        received_at = datetime.now(timezone.utc)
+        rows = []
+        for event_in in events_in:
+            occurred_at = event_in.occurred_at or received_at
+            if occurred_at.tzinfo is None:
+                occurred_at = occurred_at.replace(tzinfo=timezone.utc)
+            if occurred_at > received_at + MAX_FUTURE_SKEW:
+                raise ValueError(f"occurred_at {occurred_at} is in the future")
+            if not event_partition_service.is_within_retention(
+                occurred_at, received_at
+            ):
+                raise ValueError(
+                    f"occurred_at {occurred_at} is past the retention window"
+                )
+            if event_archive_service.is_archived(occurred_at, received_at):
+                raise ValueError(
+                    f"occurred_at {occurred_at} is past the archive cutoff"
+                )
+
+            row = event_in.model_dump()
+            row["severity"] = event_in.severity.value
+            row["occurred_at"] = occurred_at
+            row["received_at"] = received_at
+            if row["user_id"] is None:
+                row["user_id"] = reporter_id
+            rows.append(row)
+
+        route = session_route(db)
+        ticket = self._writer.submit(
+            [(route, row) for row in rows],
+            timeout=settings.EVENT_ENQUEUE_TIMEOUT_MS / 1000,
+            track=ack_mode == EventAckMode.FLUSH,
+        )
+        if ticket is not None and not ticket.wait(settings.EVENT_FLUSH_TIMEOUT_SECONDS):
+            raise TimeoutError("Timed out waiting for events to be written")
+        return ack_mode
+
+    def get_event(
+        self, db: Session, event_id: int
+    ) -> Optional[Union[ErrorEvent, ArchivedEvent]]:
+        event = error_event_repository.get(db, id=event_id)
+        if event is None and event_archive_service.enabled:
+            return event_archive_service.get_event(db, event_id)
+        return event
+
+    def list_sector_events(
+        self,
+        db: Session,
+        sector_id: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: int = 100,
+    ) -> List[Union[ErrorEvent, ArchivedEvent]]:
+        end = end or datetime.now(timezone.utc)
+        start = start or end - timedelta(hours=24)
+        if start >= end:
+            raise ValueError("start must be before end")
+        if end - start > timedelta(days=settings.EVENT_QUERY_MAX_RANGE_DAYS):
+            raise ValueError(
+                f"Time range cannot exceed {settings.EVENT_QUERY_MAX_RANGE_DAYS} days"
+            )
+        events = error_event_repository.list_for_sector(
+            db, sector_id=sector_id, start=start, end=end, limit=limit
+        )
+        if not event_archive_service.is_archived(start, datetime.now(timezone.utc)):
+            return events
+        # Partitions are archived by the maintenance run after they pass the
+        # cutoff, so the range may be split between both stores
+        archived = event_archive_service.list_sector_events(
+            db, sector_id, start, end, limit
+        )
+        ids = {event.id for event in events}
+        merged = events + [event for event in archived if event.id not in ids]
+        merged.sort(key=lambda event: event.occurred_at, reverse=True)
+        return merged[:limit]
+
+    def _unknown_sector_ids(self, db: Session, sector_ids: Set[int]) -> Set[int]:
+        key = session_route(db).key
+        known, loaded_at = self._sector_ids.get(key, (set(), 0.0))
+        unknown = sector_ids - known
+        if not unknown:
+            return unknown
+        with self._sector_ids_lock:
+            known, loaded_at = self._sector_ids.get(key, (known, loaded_at))
+            if time.monotonic() - loaded_at > SECTOR_IDS_REFRESH_SECONDS:
+                known = {row.id for row in db.query(sector_repository.model.id)}
+                self._sector_ids[key] = (known, time.monotonic())
+        return sector_ids - known
+
+    def _write_events(self, items: List[Tuple[TenantRoute, Dict[str, Any]]]) -> None:
+        by_route: Dict[TenantRoute, List[Dict[str, Any]]] = {}
+        for route, row in items:
+            by_route.setdefault(route, []).append(row)
+        # One tenant's failure must not keep the others' events from landing
+        error: Optional[Exception] = None
+        for route, rows in by_route.items():
+            try:
+                self._write_tenant_events(route, rows)
+            except Exception as exc:
+                logger.exception(
+                    "Failed to write %d events for %s", len(rows), route.key
+                )
+                error = error or exc
+        if error is not None:
+            raise error
+
+    def _write_tenant_events(
+        self, route: TenantRoute, rows: List[Dict[str, Any]]
+    ) -> None:
+        db = open_session(route)
+        try:
+            event_partition_service.ensure_partitions_for(
+                db, (row["occurred_at"] for row in rows)
+            )
+            try:
+                self._insert(db, rows)
+            except IntegrityError:
+                # A sector or user disappeared between validation and flush;
+                # drop only the orphaned rows instead of losing the whole batch.
+                db.rollback()
+                self._insert(db, self._drop_orphans(db, rows))
+        finally:
+            db.close()
+
+    def _insert(self, db: Session, rows: List[Dict[str, Any]]) -> None:
+        deduplicated = error_issue_service.deduplicate(db, rows)
+        error_event_repository.bulk_create(db, deduplicated.kept)
+        # Rollups count every occurrence, stored or not
+        event_rollup_service.record(db, rows)
+        publish_live_messages(db, self._live_messages(rows))
+        db.commit()
+        error_issue_service.remember(db, deduplicated.issue_ids)
+
+    def _live_messages(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """One summary message per sector and flush rather than one per event."""
+        summaries: Dict[int, Dict[str, Any]] = {}
+        for row in rows:
+            summary = summaries.get(row["sector_id"])
+            if summary is None:
+                summary = summaries[row["sector_id"]] = {
+                    "type": "events.created",
+                    "sector_id": row["sector_id"],
+                    "data": {
+                        "count": 0,
+                        "by_severity": {},
+                        "last_occurred_at": row["occurred_at"],
+                    },
+                }
+            data = summary["data"]
+            data["count"] += 1
+            data["by_severity"][row["severity"]] = (
+                data["by_severity"].get(row["severity"], 0) + 1
+            )
+            data["last_occurred_at"] = max(data["last_occurred_at"], row["occurred_at"])
+        return list(summaries.values())
+
+    def _drop_orphans(
+        self, db: Session, rows: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        sector_ids = sector_repository.get_existing_ids(
+            db, {r["sector_id"] for r in rows}
+        )
+        user_ids = user_repository.get_existing_ids(
+            db, {r["user_id"] for r in rows if r["user_id"] is not None}
+        )
+        valid = [
+            r
+            for r in rows
+            if r["sector_id"] in sector_ids
+            and (r["user_id"] is None or r["user_id"] in user_ids)
+        ]
+        logger.warning("Dropped %d orphaned error events", len(rows) - len(valid))
+        return valid
+
+
+event_service = EventService()
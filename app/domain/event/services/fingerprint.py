@@ -0,0 +1,68 @@
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+# Order matters: strip the most specific identifiers before bare numbers
+_NORMALIZERS = (
+    (
+        re.compile(r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b"),
+        "<uuid>",
+    ),
+    (re.compile(r"\b\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?\b"), "<ip>"),
+    (re.compile(r"\b0x[0-9a-f]+\b"), "<hex>"),
+    (re.compile(r"\b[0-9a-f]{12,}\b"), "<hex>"),
+    (re.compile(r"(?<![\w.])\d+(?:[.,]\d+)*(?![\w.])"), "<n>"),
+    (re.compile(r"(?<![\w-])(?=[\w-]*\d)[\w-]+(?![\w-])"), "<id>"),
+    (re.compile(r"\s+"), " "),
+)
+
+
+def message_template(message: str) -> str:
+    """Reduce a message to its template by stripping numbers, ids and addresses."""
+    template = message.lower()
+    for pattern, replacement in _NORMALIZERS:
+        template = pattern.sub(replacement, template)
+    return template.strip()
+
+
+def compute_fingerprint(sector_id: int, category: str, template: str) -> str:
+    key = f"{sector_id}\x1f{category.strip().lower()}\x1f{template}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+class FingerprintCache:
+    """Bounded LRU of recently seen fingerprints and their issue ids."""
+
+    def __init__(self, max_size: int, ttl: float):
+        self._max_size = max_size
+        self._ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, fingerprint: str) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is None:
+                return None
+            issue_id, stored_at = entry
+            if time.monotonic() - stored_at > self._ttl:
+                del self._entries[fingerprint]
+                return None
+            self._entries.move_to_end(fingerprint)
+            return issue_id
+
+    def update(self, entries: Dict[str, int]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            for fingerprint, issue_id in entries.items():
+                self._entries[fingerprint] = (issue_id, now)
+                self._entries.move_to_end(fingerprint)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,125 @@
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.domain.event.models.issue import ErrorIssue
+from app.domain.event.repositories.issue import error_issue_repository
+from app.domain.event.services.fingerprint import (
+    FingerprintCache,
+    compute_fingerprint,
+    message_template,
+)
+from app.domain.sector.repositories.sector import sector_repository
+from app.infrastructure.core.config import settings
+from app.infrastructure.db.sharding import session_route
+
+SAMPLE_RATES_REFRESH_SECONDS = 30.0
+
+
+@dataclass
+class DeduplicationResult:
+    # Rows whose full copy should be stored, tagged with their issue_id
+    kept: List[Dict[str, Any]]
+    # Issue id per fingerprint, to be cached once the transaction commits
+    issue_ids: Dict[str, int]
+
+
+class ErrorIssueService:
+    def __init__(self) -> None:
+        self._cache = FingerprintCache(
+            settings.EVENT_FINGERPRINT_CACHE_SIZE,
+            settings.EVENT_FINGERPRINT_CACHE_TTL_SECONDS,
+        )
+        # Per tenant: sector sample rates and when they were loaded
+        self._sample_rates: Dict[str, Tuple[Dict[int, float], float]] = {}
+        self._lock = threading.Lock()
+
+    def deduplicate(
+        self, db: Session, rows: List[Dict[str, Any]]
+    ) -> DeduplicationResult:
+        """
+        Group rows by fingerprint and bump their issues in one upsert.
+        The first sighting of a fingerprint keeps its full row; repeats are only
+        counted, except for a sample kept at the sector's raw sampling rate.
+        Fingerprints found in the hot cache are known repeats and never need a
+        lookup of their own.
+        """
+        sample_rates = self._get_sample_rates(db)
+        # Issue ids are only meaningful within the tenant's own tables
+        cache_prefix = session_route(db).key
+        groups: Dict[str, Dict[str, Any]] = {}
+        kept = []
+        for row in rows:
+            template = message_template(row["message"])
+            fingerprint = compute_fingerprint(
+                row["sector_id"], row["category"], template
+            )
+            occurred_at = row["occurred_at"]
+
+            group = groups.get(fingerprint)
+            if group is None:
+                store = self._cache.get(f"{cache_prefix}:{fingerprint}") is None
+                group = groups[fingerprint] = {
+                    "fingerprint": fingerprint,
+                    "sector_id": row["sector_id"],
+                    "category": row["category"],
+                    "message_template": template,
+                    "severity": row["severity"],
+                    "occurrence_count": 0,
+                    "stored_count": 0,
+                    "first_seen": occurred_at,
+                    "last_seen": occurred_at,
+                }
+            else:
+                store = False
+            if not store:
+                rate = sample_rates.get(
+                    row["sector_id"], settings.EVENT_DEFAULT_SAMPLE_RATE
+                )
+                store = random.random() < rate
+
+            group["occurrence_count"] += 1
+            group["first_seen"] = min(group["first_seen"], occurred_at)
+            if occurred_at >= group["last_seen"]:
+                group["last_seen"] = occurred_at
+                group["severity"] = row["severity"]
+            if store:
+                group["stored_count"] += 1
+                kept.append((fingerprint, row))
+
+        issue_ids = error_issue_repository.record_occurrences(db, list(groups.values()))
+        for fingerprint, row in kept:
+            row["issue_id"] = issue_ids[fingerprint]
+        return DeduplicationResult(kept=[row for _, row in kept], issue_ids=issue_ids)
+
+    def remember(self, db: Session, issue_ids: Dict[str, int]) -> None:
+        cache_prefix = session_route(db).key
+        self._cache.update(
+            {
+                f"{cache_prefix}:{fingerprint}": issue_id
+                for fingerprint, issue_id in issue_ids.items()
+            }
+        )
+
+    def list_sector_issues(
+        self, db: Session, sector_id: int, limit: int = 100
+    ) -> List[ErrorIssue]:
+        return error_issue_repository.list_for_sector(
+            db, sector_id=sector_id, limit=limit
+        )
+
+    def _get_sample_rates(self, db: Session) -> Dict[int, float]:
+        key = session_route(db).key
+        with self._lock:
+            sample_rates, loaded_at = self._sample_rates.get(key, ({}, 0.0))
+            if time.monotonic() - loaded_at > SAMPLE_RATES_REFRESH_SECONDS:
+                sample_rates = sector_repository.get_event_sample_rates(db)
+                self._sample_rates[key] = (sample_rates, time.monotonic())
+            return sample_rates
+
+
+error_issue_service = ErrorIssueService()
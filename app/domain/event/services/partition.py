@@ -0,0 +1,167 @@
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.domain.event.repositories.partition import (
+    EventPartition,
+    event_partition_repository,
+)
+from app.domain.event.services.archive import event_archive_service
+from app.infrastructure.core.config import settings
+from app.infrastructure.db.sharding import session_route
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PartitionMaintenanceReport:
+    created: List[str] = field(default_factory=list)
+    converted_to_brin: List[str] = field(default_factory=list)
+    expired: List[str] = field(default_factory=list)
+    archived: List[str] = field(default_factory=list)
+    # Another run was maintaining the same schema
+    skipped: bool = False
+
+
+def partition_bounds(ts: datetime, interval: str) -> Tuple[datetime, datetime]:
+    """Natural [start, end) bounds in UTC of the partition holding `ts`."""
+    ts = ts.astimezone(timezone.utc)
+    start = ts.replace(hour=0, minute=0, second=0, microsecond=0)
+    if interval == "week":
+        start -= timedelta(days=start.weekday())
+        return start, start + timedelta(days=7)
+    return start, start + timedelta(days=1)
+
+
+def partition_name(start: datetime) -> str:
+    return f"error_events_p{start:%Y%m%d}"
+
+
+class EventPartitionService:
+    def __init__(self) -> None:
+        # Partition ranges known to exist per tenant, so the write path rarely
+        # touches the catalog
+        self._known: Dict[str, List[Tuple[datetime, datetime]]] = {}
+        self._lock = threading.Lock()
+
+    def maintain(
+        self, db: Session, now: Optional[datetime] = None, *, archive: bool = True
+    ) -> PartitionMaintenanceReport:
+        """
+        Pre-create upcoming partitions, move cold partitions to BRIN indexes,
+        archive partitions past the archive cutoff when archiving is enabled and
+        detach or drop partitions past the retention window (deleting archived
+        segments past it). Commits as it goes.
+
+        Runs for a schema one at a time: while another run holds the lock, this
+        one is skipped. With `archive` False, partitions due for archiving are
+        left for a later run, keeping the run short (e.g. at boot).
+        """
+        with event_partition_repository.maintenance_lock(db) as locked:
+            if not locked:
+                logger.info(
+                    "Skipped event partition maintenance for %s: already running",
+                    session_route(db).key,
+                )
+                return PartitionMaintenanceReport(skipped=True)
+            return self._maintain(db, now or datetime.now(timezone.utc), archive)
+
+    def _maintain(
+        self, db: Session, now: datetime, archive: bool
+    ) -> PartitionMaintenanceReport:
+        interval = settings.EVENT_PARTITION_INTERVAL
+        report = PartitionMaintenanceReport()
+
+        step = timedelta(days=7 if interval == "week" else 1)
+        for i in range(settings.EVENT_PARTITION_PREMAKE + 1):
+            name = self._ensure_partition(db, now + i * step)
+            if name:
+                report.created.append(name)
+        db.commit()
+
+        brin_before = now - timedelta(days=settings.EVENT_PARTITION_BTREE_DAYS)
+        retention_before = now - timedelta(days=settings.EVENT_RETENTION_DAYS)
+        archive_before = event_archive_service.cutoff(now)
+        for partition in event_partition_repository.list_partitions(db):
+            if event_archive_service.enabled and partition.end <= archive_before:
+                if archive:
+                    event_archive_service.archive_partition(db, partition)
+                    report.archived.append(partition.name)
+            elif partition.end <= retention_before:
+                self._expire(db, partition)
+                report.expired.append(partition.name)
+            elif partition.end <= brin_before and not partition.has_brin:
+                event_partition_repository.convert_to_brin(db, partition)
+                report.converted_to_brin.append(partition.name)
+            db.commit()
+        if event_archive_service.enabled and archive:
+            report.expired.extend(event_archive_service.expire(db, retention_before))
+
+        with self._lock:
+            self._known.pop(session_route(db).key, None)
+        logger.info(
+            "Event partitions for %s: created=%s brin=%s archived=%s expired=%s",
+            session_route(db).key,
+            report.created,
+            report.converted_to_brin,
+            report.archived,
+            report.expired,
+        )
+        return report
+
+    def ensure_partitions_for(
+        self, db: Session, timestamps: Iterable[datetime]
+    ) -> None:
+        """Make sure every timestamp has a partition to land in. Commits any DDL."""
+        key = session_route(db).key
+        missing = {ts for ts in timestamps if not self._is_known(key, ts)}
+        if not missing:
+            return
+        created = False
+        for ts in sorted(missing):
+            if self._is_known(key, ts):
+                continue
+            created = self._ensure_partition(db, ts) is not None or created
+        if created:
+            db.commit()
+
+    def is_within_retention(self, ts: datetime, now: datetime) -> bool:
+        return ts > now - timedelta(days=settings.EVENT_RETENTION_DAYS)
+
+    def _is_known(self, key: str, ts: datetime) -> bool:
+        with self._lock:
+            return any(start <= ts < end for start, end in self._known.get(key, ()))
+
+    def _ensure_partition(self, db: Session, ts: datetime) -> Optional[str]:
+        key = session_route(db).key
+        partitions = event_partition_repository.list_partitions(db)
+        with self._lock:
+            self._known[key] = [(p.start, p.end) for p in partitions]
+        if event_partition_repository.find_partition(partitions, ts):
+            return None
+
+        # Clip to neighbours so a change of interval never produces overlaps
+        start, end = partition_bounds(ts, settings.EVENT_PARTITION_INTERVAL)
+        for partition in partitions:
+            if partition.end <= ts:
+                start = max(start, partition.end)
+            elif partition.start > ts:
+                end = min(end, partition.start)
+
+        name = partition_name(start)
+        event_partition_repository.create_partition(db, name, start, end)
+        with self._lock:
+            self._known.setdefault(key, []).append((start, end))
+        return name
+
+    def _expire(self, db: Session, partition: EventPartition) -> None:
+        event_partition_repository.detach_partition(db, partition)
+        if settings.EVENT_RETENTION_ACTION == "drop":
+            event_partition_repository.drop_partition(db, partition)
+
+
+event_partition_service = EventPartitionService()
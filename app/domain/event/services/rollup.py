@@ -0,0 +1,144 @@
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.domain.event.repositories.rollup import (
+    RollupKey,
+    sector_event_rollup_repository,
+)
+from app.domain.event.schemas.rollup import (
+    RollupGranularity,
+    SectorStatsBucket,
+    SectorStatsResponse,
+)
+from app.infrastructure.core.config import settings
+
+# Coarsest first, so the first matching granularity wins
+GRANULARITY_STEPS = (
+    (RollupGranularity.DAY, timedelta(days=1)),
+    (RollupGranularity.HOUR, timedelta(hours=1)),
+    (RollupGranularity.MINUTE, timedelta(minutes=1)),
+)
+# Unaligned ranges get the coarsest granularity that still yields this many points
+MIN_BUCKETS = 24
+
+
+def as_utc(ts: datetime) -> datetime:
+    if ts.tzinfo is None:
+        return ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(timezone.utc)
+
+
+def truncate(ts: datetime, granularity: RollupGranularity) -> datetime:
+    ts = as_utc(ts)
+    if granularity == RollupGranularity.DAY:
+        return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+    if granularity == RollupGranularity.HOUR:
+        return ts.replace(minute=0, second=0, microsecond=0)
+    return ts.replace(second=0, microsecond=0)
+
+
+def _ceil(ts: datetime, granularity: RollupGranularity, step: timedelta) -> datetime:
+    floor = truncate(ts, granularity)
+    return floor if floor == ts else floor + step
+
+
+def bucket_count(start: datetime, end: datetime, granularity: RollupGranularity) -> int:
+    """Buckets of `granularity` covering [start, end) once widened to whole buckets."""
+    step = dict(GRANULARITY_STEPS)[granularity]
+    return (_ceil(end, granularity, step) - truncate(start, granularity)) // step
+
+
+class EventRollupService:
+    def record(self, db: Session, rows: Iterable[Dict[str, Any]]) -> None:
+        """
+        Fold freshly written events into the rollup tables.
+        Runs inside the writer's transaction so counts and events commit together.
+        """
+        counts: Dict[RollupKey, int] = Counter()
+        for row in rows:
+            for granularity, _ in GRANULARITY_STEPS:
+                key = (
+                    row["sector_id"],
+                    granularity.value,
+                    truncate(row["occurred_at"], granularity),
+                    row["severity"],
+                )
+                counts[key] += 1
+        sector_event_rollup_repository.increment(db, counts)
+
+    def choose_granularity(self, start: datetime, end: datetime) -> RollupGranularity:
+        """
+        Coarsest granularity whose buckets tile [start, end) exactly within
+        EVENT_STATS_MAX_BUCKETS, or else the coarsest one that still gives
+        MIN_BUCKETS points.
+        """
+        max_buckets = settings.EVENT_STATS_MAX_BUCKETS
+        for granularity, _ in GRANULARITY_STEPS:
+            if (
+                truncate(start, granularity) == start
+                and truncate(end, granularity) == end
+                and bucket_count(start, end, granularity) <= max_buckets
+            ):
+                return granularity
+        for granularity, step in GRANULARITY_STEPS:
+            if end - start >= step * MIN_BUCKETS:
+                return granularity
+        return RollupGranularity.MINUTE
+
+    def get_sector_stats(
+        self,
+        db: Session,
+        sector_id: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        granularity: Optional[RollupGranularity] = None,
+    ) -> SectorStatsResponse:
+        end = as_utc(end or datetime.now(timezone.utc))
+        start = as_utc(start or end - timedelta(hours=24))
+        if start >= end:
+            raise ValueError("start must be before end")
+        if end - start > timedelta(days=settings.EVENT_STATS_MAX_RANGE_DAYS):
+            raise ValueError(
+                f"Time range cannot exceed {settings.EVENT_STATS_MAX_RANGE_DAYS} days"
+            )
+
+        granularity = granularity or self.choose_granularity(start, end)
+        if bucket_count(start, end, granularity) > settings.EVENT_STATS_MAX_BUCKETS:
+            raise ValueError(
+                f"Time range cannot exceed {settings.EVENT_STATS_MAX_BUCKETS} "
+                f"{granularity.value} buckets; use a coarser granularity"
+            )
+        step = dict(GRANULARITY_STEPS)[granularity]
+        # Widen unaligned bounds to whole buckets
+        start = truncate(start, granularity)
+        end = _ceil(end, granularity, step)
+
+        buckets: Dict[datetime, SectorStatsBucket] = {}
+        by_severity: Dict[str, int] = Counter()
+        for rollup in sector_event_rollup_repository.list_buckets(
+            db, sector_id=sector_id, granularity=granularity.value, start=start, end=end
+        ):
+            bucket = buckets.get(rollup.bucket_start)
+            if bucket is None:
+                bucket = buckets[rollup.bucket_start] = SectorStatsBucket(
+                    bucket_start=rollup.bucket_start, total=0, by_severity={}
+                )
+            bucket.by_severity[rollup.severity] = rollup.event_count
+            bucket.total += rollup.event_count
+            by_severity[rollup.severity] += rollup.event_count
+
+        return SectorStatsResponse(
+            sector_id=sector_id,
+            granularity=granularity,
+            start=start,
+            end=end,
+            total=sum(by_severity.values()),
+            by_severity=dict(by_severity),
+            buckets=list(buckets.values()),
+        )
+
+
+event_rollup_service = EventRollupService()
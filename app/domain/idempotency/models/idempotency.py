@@ -0,0 +1,28 @@
+from sqlalchemy import Column, DateTime, Index, LargeBinary, SmallInteger, String
+from sqlalchemy.sql import func
+
+from app.infrastructure.db.session import Base
+
+
+class IdempotencyKey(Base):
+    """
+    The outcome of the first request sent with an Idempotency-Key, replayed to
+    its retries until it expires. status_code is NULL while that request runs.
+    """
+
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (Index("ix_idempotency_keys_expires_at", "expires_at"),)
+
+    # SHA-256 of the key scoped to tenant, credentials, method and path
+    key = Column(LargeBinary(32), primary_key=True)
+    # SHA-256 of the request body and query string, to catch reused keys
+    request_hash = Column(LargeBinary(32), nullable=False)
+    status_code = Column(SmallInteger, nullable=True)
+    content_type = Column(String(100), nullable=True)
+    body = Column(LargeBinary, nullable=True)
+    # Lease of the running request; a lapsed lease (crashed worker) is taken over
+    locked_until = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    expires_at = Column(DateTime(timezone=True), nullable=False)
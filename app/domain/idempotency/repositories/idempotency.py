@@ -0,0 +1,103 @@
+from datetime import timedelta
+from typing import Optional
+
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.domain.idempotency.models.idempotency import IdempotencyKey
+
+
+class IdempotencyRepository:
+    def claim(
+        self,
+        db: Session,
+        *,
+        key: bytes,
+        request_hash: bytes,
+        lock_seconds: float,
+        ttl_seconds: float,
+    ) -> bool:
+        """
+        Record `key` as running, unless a live entry holds it. Expired entries
+        and lapsed leases are taken over. Returns True if claimed. The caller
+        owns the transaction.
+        """
+        stmt = insert(IdempotencyKey).values(
+            key=key,
+            request_hash=request_hash,
+            locked_until=func.now() + timedelta(seconds=lock_seconds),
+            expires_at=func.now() + timedelta(seconds=ttl_seconds),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[IdempotencyKey.key],
+            set_={
+                "request_hash": stmt.excluded.request_hash,
+                "status_code": None,
+                "content_type": None,
+                "body": None,
+                "locked_until": stmt.excluded.locked_until,
+                "created_at": func.now(),
+                "expires_at": stmt.excluded.expires_at,
+            },
+            where=or_(
+                IdempotencyKey.expires_at <= func.now(),
+                and_(
+                    IdempotencyKey.status_code.is_(None),
+                    IdempotencyKey.locked_until <= func.now(),
+                ),
+            ),
+        ).returning(IdempotencyKey.key)
+        return db.execute(stmt).first() is not None
+
+    def get(self, db: Session, key: bytes) -> Optional[IdempotencyKey]:
+        return db.execute(
+            select(IdempotencyKey).where(
+                IdempotencyKey.key == key, IdempotencyKey.expires_at > func.now()
+            )
+        ).scalar_one_or_none()
+
+    def complete(
+        self,
+        db: Session,
+        *,
+        key: bytes,
+        status_code: int,
+        content_type: Optional[str],
+        body: bytes,
+    ) -> None:
+        db.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.key == key, IdempotencyKey.status_code.is_(None))
+            .values(
+                status_code=status_code,
+                content_type=content_type,
+                body=body,
+                locked_until=None,
+            )
+        )
+
+    def release(self, db: Session, key: bytes) -> None:
+        """Forget a running key, so the next retry runs the request again."""
+        db.execute(
+            delete(IdempotencyKey)
+            .where(IdempotencyKey.key == key, IdempotencyKey.status_code.is_(None))
+            .execution_options(synchronize_session=False)
+        )
+
+    def delete_expired(self, db: Session, *, limit: int) -> int:
+        expired = (
+            select(IdempotencyKey.key)
+            .where(IdempotencyKey.expires_at <= func.now())
+            .limit(limit)
+            .scalar_subquery()
+        )
+        result = db.execute(
+            delete(IdempotencyKey)
+            .where(IdempotencyKey.key.in_(expired))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+
+idempotency_repository = IdempotencyRepository()
@@ -0,0 +1,17 @@
+from typing import NamedTuple, Optional
+
+
+class StoredResponse(NamedTuple):
+    """A completed response, as replayed to retries."""
+
+    request_hash: bytes
+    status_code: int
+    content_type: Optional[str]
+    body: bytes
+
+
+class IdempotencyClaim(NamedTuple):
+    # True: the caller runs the request and must complete or release the key
+    acquired: bool
+    # The stored response when the key has already completed
+    response: Optional[StoredResponse] = None
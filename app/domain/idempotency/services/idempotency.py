@@ -0,0 +1,132 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.domain.idempotency.repositories.idempotency import idempotency_repository
+from app.domain.idempotency.schemas.idempotency import IdempotencyClaim, StoredResponse
+from app.infrastructure.core.config import settings
+from app.infrastructure.db.sharding import session_route
+from app.infrastructure.db.unit_of_work import unit_of_work
+from app.infrastructure.tracing.tracer import traced_methods
+
+logger = logging.getLogger(__name__)
+
+# Expired keys deleted per purge, so a purge never holds up the request running it
+PURGE_BATCH_SIZE = 1_000
+
+
+class ResponseCache:
+    """Bounded LRU of completed responses, in front of the idempotency_keys table."""
+
+    def __init__(self, max_size: int, ttl: float):
+        self._max_size = max_size
+        self._ttl = ttl
+        self._entries: "OrderedDict[bytes, Tuple[StoredResponse, float]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: bytes) -> Optional[StoredResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            response, stored_at = entry
+            if time.monotonic() - stored_at > self._ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return response
+
+    def put(self, key: bytes, response: StoredResponse) -> None:
+        with self._lock:
+            self._entries[key] = (response, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+
+@traced_methods
+class IdempotencyService:
+    """
+    Stores the outcome of requests sent with an Idempotency-Key so retries get
+    the same response without running the request again. Keys are claimed in
+    the idempotency_keys table before the request runs, which makes duplicates
+    arriving at other workers wait instead of running concurrently.
+    """
+
+    def __init__(self) -> None:
+        self.cache = ResponseCache(
+            settings.IDEMPOTENCY_CACHE_SIZE, settings.IDEMPOTENCY_CACHE_TTL_SECONDS
+        )
+        self._last_purge: Dict[str, float] = {}
+        self._purge_lock = threading.Lock()
+
+    def claim(self, db: Session, key: bytes, request_hash: bytes) -> IdempotencyClaim:
+        """
+        Claim `key` for a new execution, or return the stored response. Neither
+        (acquired False, no response) means another execution is running.
+        """
+        cached = self.cache.get(key)
+        if cached is not None:
+            return IdempotencyClaim(acquired=False, response=cached)
+        self._purge_expired(db)
+        with unit_of_work(db):
+            acquired = idempotency_repository.claim(
+                db,
+                key=key,
+                request_hash=request_hash,
+                lock_seconds=settings.IDEMPOTENCY_LOCK_SECONDS,
+                ttl_seconds=settings.IDEMPOTENCY_TTL_SECONDS,
+            )
+            if acquired:
+                return IdempotencyClaim(acquired=True)
+            entry = idempotency_repository.get(db, key)
+        if entry is None or entry.status_code is None:
+            return IdempotencyClaim(acquired=False)
+        response = StoredResponse(
+            request_hash=entry.request_hash,
+            status_code=entry.status_code,
+            content_type=entry.content_type,
+            body=entry.body or b"",
+        )
+        self.cache.put(key, response)
+        return IdempotencyClaim(acquired=False, response=response)
+
+    def complete(self, db: Session, key: bytes, response: StoredResponse) -> None:
+        with unit_of_work(db):
+            idempotency_repository.complete(
+                db,
+                key=key,
+                status_code=response.status_code,
+                content_type=response.content_type,
+                body=response.body,
+            )
+        self.cache.put(key, response)
+
+    def release(self, db: Session, key: bytes) -> None:
+        with unit_of_work(db):
+            idempotency_repository.release(db, key)
+
+    def _purge_expired(self, db: Session) -> None:
+        # At most once per interval per tenant and worker
+        route_key = session_route(db).key
+        now = time.monotonic()
+        with self._purge_lock:
+            if (
+                now - self._last_purge.get(route_key, float("-inf"))
+                < settings.IDEMPOTENCY_PURGE_INTERVAL_SECONDS
+            ):
+                return
+            self._last_purge[route_key] = now
+        with unit_of_work(db):
+            deleted = idempotency_repository.delete_expired(db, limit=PURGE_BATCH_SIZE)
+        if deleted:
+            logger.info("Purged %d expired idempotency keys for %s", deleted, route_key)
+
+
+idempotency_service = IdempotencyService()
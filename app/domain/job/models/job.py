@@ -0,0 +1,63 @@
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+)
+from sqlalchemy.sql import func
+
+from app.infrastructure.db.session import Base
+
+
+class Job(Base):
+    """A unit of background work, claimed by runners with FOR UPDATE SKIP LOCKED."""
+
+    __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_status_run_after", "status", "run_after"),
+        # Retention purges finished jobs by age
+        Index("ix_jobs_finished_at", "finished_at"),
+    )
+    # Fetch server-generated columns with RETURNING instead of a refresh SELECT
+    __mapper_args__ = {"eager_defaults": True}
+
+    id = Column(BigInteger, primary_key=True)
+    type = Column(String(50), nullable=False)
+    # queued -> running -> succeeded | failed; failed attempts go back to queued
+    status = Column(String(16), nullable=False, default="queued")
+    params = Column(JSON, nullable=False, default=dict)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    progress_done = Column(Integer, nullable=False, default=0)
+    progress_total = Column(Integer, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False)
+    run_after = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    # Lease of the worker running the job; lapsed leases are claimed again
+    locked_until = Column(DateTime(timezone=True), nullable=True)
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class JobInput(Base):
+    """
+    Params staged apart from their job (see STAGED_PARAMS): uploads too large
+    or sensitive to keep on the job row. Deleted as soon as the job finishes.
+    """
+
+    __tablename__ = "job_inputs"
+
+    job_id = Column(
+        BigInteger, ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True
+    )
+    params = Column(JSON, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,152 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.domain.job.models.job import Job, JobInput
+from app.domain.job.schemas.job import JobStatus
+
+FINISHED_STATUSES = (JobStatus.SUCCEEDED.value, JobStatus.FAILED.value)
+
+
+class JobRepository:
+    def create(
+        self,
+        db: Session,
+        *,
+        type: str,
+        params: Dict[str, Any],
+        max_attempts: int,
+        created_by: Optional[int],
+    ) -> Job:
+        job = Job(
+            type=type,
+            status=JobStatus.QUEUED.value,
+            params=params,
+            max_attempts=max_attempts,
+            created_by=created_by,
+        )
+        db.add(job)
+        db.flush()
+        return job
+
+    def get(self, db: Session, id: int) -> Optional[Job]:
+        return db.get(Job, id)
+
+    def stage_input(self, db: Session, *, job_id: int, params: Dict[str, Any]) -> None:
+        db.add(JobInput(job_id=job_id, params=params))
+        db.flush()
+
+    def get_input(self, db: Session, job_id: int) -> Dict[str, Any]:
+        """Staged params of a job; empty if it has none or they were deleted."""
+        params = db.execute(
+            select(JobInput.params).where(JobInput.job_id == job_id)
+        ).scalar()
+        return params or {}
+
+    def _delete_input(self, db: Session, job_id: int) -> None:
+        db.execute(delete(JobInput).where(JobInput.job_id == job_id))
+
+    def claim(self, db: Session, *, lease_seconds: float) -> Optional[Job]:
+        """
+        Lock the next runnable job, skipping rows other workers hold, and lease
+        it to the caller. Jobs whose lease lapsed are runnable again. The caller
+        commits to release the row lock.
+        """
+        job = (
+            db.query(Job)
+            .filter(
+                or_(
+                    and_(
+                        Job.status == JobStatus.QUEUED.value,
+                        Job.run_after <= func.now(),
+                    ),
+                    and_(
+                        Job.status == JobStatus.RUNNING.value,
+                        Job.locked_until < func.now(),
+                    ),
+                )
+            )
+            .order_by(Job.run_after)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+        if job is None:
+            return None
+        now = datetime.now(timezone.utc)
+        job.status = JobStatus.RUNNING.value
+        job.attempts += 1
+        job.started_at = now
+        job.locked_until = now + timedelta(seconds=lease_seconds)
+        db.flush()
+        return job
+
+    def set_progress(
+        self,
+        db: Session,
+        *,
+        job_id: int,
+        done: int,
+        total: Optional[int],
+        lease_seconds: float,
+    ) -> None:
+        """Record progress and extend the lease of a running job."""
+        values: Dict[str, Any] = {
+            "progress_done": done,
+            "locked_until": datetime.now(timezone.utc)
+            + timedelta(seconds=lease_seconds),
+        }
+        if total is not None:
+            values["progress_total"] = total
+        db.execute(update(Job).where(Job.id == job_id).values(**values))
+
+    def mark_succeeded(self, db: Session, job: Job, *, result: Dict[str, Any]) -> Job:
+        job.status = JobStatus.SUCCEEDED.value
+        job.result = result
+        job.error = None
+        job.locked_until = None
+        job.finished_at = datetime.now(timezone.utc)
+        self._delete_input(db, job.id)
+        db.flush()
+        return job
+
+    def mark_failed(self, db: Session, job: Job, *, error: str) -> Job:
+        job.status = JobStatus.FAILED.value
+        job.error = error
+        job.locked_until = None
+        job.finished_at = datetime.now(timezone.utc)
+        self._delete_input(db, job.id)
+        db.flush()
+        return job
+
+    def retry_later(
+        self, db: Session, job: Job, *, error: str, delay_seconds: float
+    ) -> Job:
+        job.status = JobStatus.QUEUED.value
+        job.error = error
+        job.locked_until = None
+        job.run_after = datetime.now(timezone.utc) + timedelta(seconds=delay_seconds)
+        db.flush()
+        return job
+
+    def delete_finished_before(
+        self, db: Session, before: datetime, *, limit: int
+    ) -> int:
+        """Delete up to `limit` jobs that finished before `before`."""
+        expired = (
+            select(Job.id)
+            .where(Job.status.in_(FINISHED_STATUSES), Job.finished_at < before)
+            .limit(limit)
+            .scalar_subquery()
+        )
+        result = db.execute(
+            delete(Job)
+            .where(Job.id.in_(expired))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+
+job_repository = JobRepository()
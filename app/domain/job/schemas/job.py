@@ -0,0 +1,70 @@
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, Field, field_validator
+
+
+# Params too large or sensitive to keep on the job row (an import's CSV holds
+# plaintext passwords). They are staged in job_inputs until the job finishes
+# and never returned by the API
+STAGED_PARAMS = frozenset({"csv"})
+REDACTED = "[redacted]"
+
+
+class JobType(str, Enum):
+    IMPORT_USERS = "import_users"
+    IMPORT_SECTORS = "import_sectors"
+    AUDIT_PASSWORD_HASHES = "audit_password_hashes"
+    MAINTAIN_PARTITIONS = "maintain_partitions"
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class JobCreate(BaseModel):
+    type: JobType
+    params: Dict[str, Any] = {}
+    max_attempts: Optional[int] = Field(None, ge=1, le=10)
+
+
+class JobResponse(BaseModel):
+    id: int
+    type: JobType
+    status: JobStatus
+    params: Dict[str, Any]
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    progress_done: int
+    progress_total: Optional[int] = None
+    attempts: int
+    max_attempts: int
+    run_after: datetime
+    created_by: Optional[int] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    model_config = {"from_attributes": True}
+
+    @field_validator("params")
+    @classmethod
+    def redact_staged_params(cls, params: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            key: REDACTED if key in STAGED_PARAMS else value
+            for key, value in params.items()
+        }
+
+
+class ImportCsvParams(BaseModel):
+    # CSV text with a header row; columns match the create schema. Staged
+    # apart from the job (STAGED_PARAMS)
+    csv: str = Field(..., min_length=1)
+
+
+class NoParams(BaseModel):
+    pass
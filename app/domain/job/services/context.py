@@ -0,0 +1,50 @@
+import time
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.domain.job.repositories.job import job_repository
+from app.infrastructure.core.config import settings
+from app.infrastructure.db.session import open_session
+from app.infrastructure.db.sharding import ShardEngines, TenantRoute
+
+# Progress is written at most this often, however fast a handler reports it
+PROGRESS_INTERVAL_SECONDS = 1.0
+
+
+class JobContext:
+    """
+    Passed to job handlers: a session on the tenant's shard (from the runner's
+    own pool) and progress reporting, which also keeps the job's lease alive.
+    """
+
+    def __init__(
+        self, db: Session, job_id: int, route: TenantRoute, engines: ShardEngines
+    ):
+        self.db = db
+        self.job_id = job_id
+        self._route = route
+        self._engines = engines
+        self._reported_at = 0.0
+
+    def progress(
+        self, done: int, total: Optional[int] = None, force: bool = False
+    ) -> None:
+        now = time.monotonic()
+        if not force and now - self._reported_at < PROGRESS_INTERVAL_SECONDS:
+            return
+        self._reported_at = now
+        # Own short transaction, so progress is visible while the handler's
+        # work is still uncommitted and survives its rollback
+        db = open_session(self._route, self._engines)
+        try:
+            job_repository.set_progress(
+                db,
+                job_id=self.job_id,
+                done=done,
+                total=total,
+                lease_seconds=settings.JOB_LEASE_SECONDS,
+            )
+            db.commit()
+        finally:
+            db.close()
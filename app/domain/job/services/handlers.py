@@ -0,0 +1,108 @@
+import csv
+import io
+from dataclasses import asdict
+from typing import Any, Callable, Dict, Tuple, Type
+
+from pydantic import BaseModel
+
+from app.domain.event.services.partition import event_partition_service
+from app.domain.job.schemas.job import ImportCsvParams, JobType, NoParams
+from app.domain.job.services.context import JobContext
+from app.domain.sector.schemas.sector import SectorCreate
+from app.domain.sector.services.sector import sector_service
+from app.domain.user.repositories.user import user_repository
+from app.domain.user.services.user_import import user_import_service
+from app.infrastructure.core.security import password_needs_rehash
+
+# Keep results small: only the first errors of an import are reported
+MAX_REPORTED_ERRORS = 100
+AUDIT_BATCH_SIZE = 1_000
+
+Handler = Callable[[JobContext, Any], Dict[str, Any]]
+
+
+def _import_csv(
+    ctx: JobContext,
+    text: str,
+    schema: Type[BaseModel],
+    create: Callable[[BaseModel], Any],
+) -> Dict[str, Any]:
+    """
+    Create one record per CSV row through the regular service, so imports
+    apply the same checks as the API. Rows the service rejects (e.g. an email
+    already registered) are reported and skipped, which also makes retries of
+    a partially applied import safe.
+    """
+    rows = list(csv.DictReader(io.StringIO(text)))
+    ctx.progress(0, len(rows), force=True)
+    created = 0
+    errors = []
+    for done, row in enumerate(rows, start=1):
+        try:
+            # Empty cells fall back to the schema defaults
+            create(
+                schema.model_validate({k: v for k, v in row.items() if k and v != ""})
+            )
+            created += 1
+        except ValueError as e:
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append({"line": done + 1, "error": str(e)})
+        ctx.progress(done, len(rows))
+    ctx.progress(len(rows), len(rows), force=True)
+    return {
+        "total": len(rows),
+        "created": created,
+        "failed": len(rows) - created,
+        "errors": errors,
+    }
+
+
+def import_users(ctx: JobContext, params: ImportCsvParams) -> Dict[str, Any]:
+    # Chunked bulk path; already registered emails are reported, so retries are safe
+    report = user_import_service.import_csv(
+        ctx.db, io.StringIO(params.csv), progress=ctx.progress
+    )
+    return report.model_dump()
+
+
+def import_sectors(ctx: JobContext, params: ImportCsvParams) -> Dict[str, Any]:
+    return _import_csv(
+        ctx,
+        params.csv,
+        SectorCreate,
+        lambda sector_in: sector_service.create_sector(ctx.db, sector_in),
+    )
+
+
+def audit_password_hashes(ctx: JobContext, params: NoParams) -> Dict[str, Any]:
+    """
+    Count hashes made with outdated settings (e.g. before a BCRYPT_ROUNDS
+    change). Hashes cannot be upgraded without the plain password, so they
+    are replaced as each user next logs in.
+    """
+    checked = outdated = 0
+    last_id = 0
+    while True:
+        rows = user_repository.get_password_hashes(
+            ctx.db, after_id=last_id, limit=AUDIT_BATCH_SIZE
+        )
+        if not rows:
+            break
+        checked += len(rows)
+        outdated += sum(1 for row in rows if password_needs_rehash(row.password))
+        last_id = rows[-1].id
+        ctx.db.rollback()  # end the read transaction between batches
+        ctx.progress(checked)
+    return {"checked": checked, "outdated": outdated}
+
+
+def maintain_partitions(ctx: JobContext, params: NoParams) -> Dict[str, Any]:
+    return asdict(event_partition_service.maintain(ctx.db))
+
+
+JOB_HANDLERS: Dict[JobType, Tuple[Type[BaseModel], Handler]] = {
+    JobType.IMPORT_USERS: (ImportCsvParams, import_users),
+    JobType.IMPORT_SECTORS: (ImportCsvParams, import_sectors),
+    JobType.AUDIT_PASSWORD_HASHES: (NoParams, audit_password_hashes),
+    JobType.MAINTAIN_PARTITIONS: (NoParams, maintain_partitions),
+}
@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.domain.job.models.job import Job
+from app.domain.job.repositories.job import job_repository
+from app.domain.job.schemas.job import STAGED_PARAMS, JobCreate
+from app.domain.job.services.handlers import JOB_HANDLERS
+from app.infrastructure.core.config import settings
+from app.infrastructure.db.unit_of_work import unit_of_work
+from app.infrastructure.tracing.tracer import traced_methods
+
+PURGE_BATCH_SIZE = 1_000
+
+
+@traced_methods
+class JobService:
+    def enqueue_job(
+        self, db: Session, job_in: JobCreate, created_by: Optional[int] = None
+    ) -> Job:
+        """Queue a job for the runner. Raises ValueError if its params are invalid."""
+        params_schema, _ = JOB_HANDLERS[job_in.type]
+        params = params_schema.model_validate(job_in.params).model_dump(mode="json")
+        staged = {key: params.pop(key) for key in STAGED_PARAMS & params.keys()}
+        with unit_of_work(db):
+            job = job_repository.create(
+                db,
+                type=job_in.type.value,
+                params=params,
+                max_attempts=job_in.max_attempts or settings.JOB_MAX_ATTEMPTS,
+                created_by=created_by,
+            )
+            if staged:
+                job_repository.stage_input(db, job_id=job.id, params=staged)
+            return job
+
+    def get_job(self, db: Session, job_id: int, created_by: int) -> Optional[Job]:
+        """The job, or None if it does not exist or `created_by` did not queue it."""
+        job = job_repository.get(db, id=job_id)
+        if job is None or job.created_by != created_by:
+            return None
+        return job
+
+    def purge_finished(self, db: Session) -> int:
+        """Delete jobs that finished more than JOB_RETENTION_DAYS ago."""
+        before = datetime.now(timezone.utc) - timedelta(
+            days=settings.JOB_RETENTION_DAYS
+        )
+        deleted = 0
+        while True:
+            with unit_of_work(db):
+                batch = job_repository.delete_finished_before(
+                    db, before, limit=PURGE_BATCH_SIZE
+                )
+            deleted += batch
+            if batch < PURGE_BATCH_SIZE:
+                return deleted
+
+
+job_service = JobService()
@@ -0,0 +1,162 @@
+import logging
+import random
+import threading
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.domain.job.models.job import Job
+from app.domain.job.repositories.job import job_repository
+from app.domain.job.schemas.job import JobType
+from app.domain.job.services.context import JobContext
+from app.domain.job.services.handlers import JOB_HANDLERS
+from app.domain.job.services.job import job_service
+from app.infrastructure.core.config import settings
+from app.infrastructure.db.audit import set_actor
+from app.infrastructure.db.session import open_session, tenant_router
+from app.infrastructure.db.sharding import ShardEngines, TenantRoute
+from app.infrastructure.db.unit_of_work import unit_of_work
+
+logger = logging.getLogger(__name__)
+
+
+class JobRunner:
+    """
+    Worker threads that claim jobs from every tenant's jobs table and run them.
+    They connect through their own engines, so a long import never holds a
+    connection the request handlers are waiting for. Runs inside the API
+    process (JOB_RUNNER_IN_PROCESS) or as a sidecar (scripts/run_jobs.py).
+    """
+
+    def __init__(self, concurrency: int, poll_interval: float):
+        self._concurrency = concurrency
+        self._poll_interval = poll_interval
+        # Each worker needs a connection for its job and one for progress updates
+        self._engines = ShardEngines(
+            create_engine(
+                str(settings.SQLALCHEMY_DATABASE_URI),
+                pool_size=concurrency,
+                max_overflow=concurrency,
+            ),
+            settings.SHARD_DATABASE_URIS,
+            settings.SHARD_ENGINE_IDLE_SECONDS,
+            pool_size=concurrency,
+            max_overflow=concurrency,
+        )
+        self._threads: List[threading.Thread] = []
+        self._stopping = threading.Event()
+        self._last_purge: Dict[str, float] = {}
+        self._purge_lock = threading.Lock()
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self._stopping.clear()
+        for i in range(self._concurrency):
+            thread = threading.Thread(
+                target=self._work, name=f"job-worker-{i}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = 30.0) -> None:
+        """
+        Stop claiming jobs and wait for running ones. Jobs still running after
+        `timeout` are picked up again once their lease lapses.
+        """
+        self._stopping.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        self._engines.dispose()
+
+    def run_once(self) -> bool:
+        """Run one job from any tenant. Returns False if none was runnable."""
+        routes = tenant_router.active_routes()
+        # Shuffled so one busy tenant cannot starve the others
+        random.shuffle(routes)
+        return any(self._run_next(route) for route in routes)
+
+    def _work(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                ran = self.run_once()
+            except Exception:
+                logger.exception("Job worker failed to poll for jobs")
+                ran = False
+            if not ran:
+                self._stopping.wait(self._poll_interval)
+
+    def _run_next(self, route: TenantRoute) -> bool:
+        db = open_session(route, self._engines)
+        try:
+            self._purge_finished(db, route)
+            with unit_of_work(db):
+                job = job_repository.claim(db, lease_seconds=settings.JOB_LEASE_SECONDS)
+            if job is None:
+                return False
+            if job.attempts > job.max_attempts:
+                # Its last attempt's worker died without reporting back
+                with unit_of_work(db):
+                    job_repository.mark_failed(
+                        db, job, error="Worker lost while running the job"
+                    )
+                return True
+            self._execute(db, route, job)
+            return True
+        finally:
+            db.close()
+
+    def _execute(self, db: Session, route: TenantRoute, job: Job) -> None:
+        logger.info(
+            "Running job %s (%s) for %s, attempt %d",
+            job.id,
+            job.type,
+            route.key,
+            job.attempts,
+        )
+        try:
+            params_schema, handler = JOB_HANDLERS[JobType(job.type)]
+            set_actor(db, job.created_by)
+            params = {**job.params, **job_repository.get_input(db, job.id)}
+            result = handler(
+                JobContext(db, job.id, route, self._engines),
+                params_schema.model_validate(params),
+            )
+        except Exception as exc:
+            logger.exception("Job %s (%s) failed", job.id, job.type)
+            db.rollback()
+            error = f"{type(exc).__name__}: {exc}"
+            with unit_of_work(db):
+                if job.attempts >= job.max_attempts:
+                    job_repository.mark_failed(db, job, error=error)
+                else:
+                    delay = settings.JOB_RETRY_BACKOFF_SECONDS * 2 ** (job.attempts - 1)
+                    job_repository.retry_later(
+                        db, job, error=error, delay_seconds=delay
+                    )
+            return
+        with unit_of_work(db):
+            job_repository.mark_succeeded(db, job, result=result)
+
+    def _purge_finished(self, db: Session, route: TenantRoute) -> None:
+        # At most once per interval per tenant and runner
+        now = time.monotonic()
+        with self._purge_lock:
+            if (
+                now - self._last_purge.get(route.key, float("-inf"))
+                < settings.JOB_PURGE_INTERVAL_SECONDS
+            ):
+                return
+            self._last_purge[route.key] = now
+        deleted = job_service.purge_finished(db)
+        if deleted:
+            logger.info("Purged %d finished jobs for %s", deleted, route.key)
+
+
+job_runner = JobRunner(
+    concurrency=settings.JOB_WORKER_CONCURRENCY,
+    poll_interval=settings.JOB_POLL_INTERVAL_SECONDS,
+)
@@ -0,0 +1,164 @@
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import REAL, case, cast, func, literal_column, select, tuple_
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.domain.event.models.event import ErrorEvent
+from app.domain.sector.models.sector import Sector
+from app.infrastructure.tracing.tracer import traced_methods
+
+# Search configurations, matching the generated search_vector columns
+SEARCH_CONFIGS = ("english", "portuguese")
+# Matches are wrapped in control characters, swapped for <mark> once the
+# snippet has been HTML-escaped
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_STOP = "\x03"
+HEADLINE_OPTIONS = (
+    f'StartSel="{HIGHLIGHT_START}", StopSel="{HIGHLIGHT_STOP}", '
+    'MaxWords=30, MinWords=10, MaxFragments=2, FragmentDelimiter=" ... "'
+)
+
+# (rank, id) of the last hit of the previous page
+SearchKeyset = Optional[Tuple[float, int]]
+
+
+def _regconfig(config: str) -> ColumnElement:
+    return literal_column(f"'{config}'::regconfig")
+
+
+def _config_tsquery(config: str, text: str) -> ColumnElement:
+    """Web-search syntax ("quoted phrases", or, -exclusions) in one configuration."""
+    return func.websearch_to_tsquery(_regconfig(config), text)
+
+
+def _tsquery(text: str) -> ColumnElement:
+    """The query in every configuration, OR-ed."""
+    queries = [_config_tsquery(config, text) for config in SEARCH_CONFIGS]
+    combined = queries[0]
+    for query in queries[1:]:
+        combined = combined.op("||")(query)
+    return combined
+
+
+def _headline(document: ColumnElement, text: str) -> ColumnElement:
+    """
+    Snippet of `document` with the matches marked. ts_headline stems the
+    document with a single configuration, which misses matches stemmed by
+    another (Portuguese inflections under English), so each row is
+    highlighted in the first configuration whose query matches it.
+    """
+    *firsts, last = SEARCH_CONFIGS
+    whens = []
+    for config in firsts:
+        query = _config_tsquery(config, text)
+        whens.append(
+            (
+                func.to_tsvector(_regconfig(config), document).op("@@")(query),
+                func.ts_headline(_regconfig(config), document, query, HEADLINE_OPTIONS),
+            )
+        )
+    fallback = func.ts_headline(
+        _regconfig(last), document, _config_tsquery(last, text), HEADLINE_OPTIONS
+    )
+    return case(*whens, else_=fallback) if whens else fallback
+
+
+def _after(
+    rank: ColumnElement, id_column: ColumnElement, after: SearchKeyset
+) -> ColumnElement:
+    # ts_rank returns real; compare in real so the cursor's value matches exactly
+    after_rank, after_id = after
+    return tuple_(rank, id_column) < tuple_(cast(after_rank, REAL), after_id)
+
+
+@traced_methods
+class SearchRepository:
+    """
+    Ranked full-text queries over the generated search_vector columns. The
+    page is ranked and limited in a subquery first, so the costly ts_headline
+    only runs for the rows returned.
+    """
+
+    def search_events(
+        self,
+        db: Session,
+        *,
+        text: str,
+        start: datetime,
+        end: datetime,
+        sector_id: Optional[int],
+        after: SearchKeyset,
+        limit: int,
+    ) -> List[Any]:
+        query = _tsquery(text)
+        rank = func.ts_rank(ErrorEvent.search_vector, query)
+        page = select(
+            ErrorEvent.id,
+            ErrorEvent.sector_id,
+            ErrorEvent.severity,
+            ErrorEvent.category,
+            ErrorEvent.occurred_at,
+            ErrorEvent.message,
+            rank.label("rank"),
+        ).where(
+            ErrorEvent.search_vector.op("@@")(query),
+            # Both bounds, so only the partitions in range are searched
+            ErrorEvent.occurred_at >= start,
+            ErrorEvent.occurred_at < end,
+        )
+        if sector_id is not None:
+            page = page.where(ErrorEvent.sector_id == sector_id)
+        if after is not None:
+            page = page.where(_after(rank, ErrorEvent.id, after))
+        page = page.order_by(rank.desc(), ErrorEvent.id.desc()).limit(limit).subquery()
+
+        return db.execute(
+            select(
+                page.c.id,
+                page.c.sector_id,
+                page.c.severity,
+                page.c.category,
+                page.c.occurred_at,
+                page.c.rank,
+                _headline(page.c.message, text).label("snippet"),
+            ).order_by(page.c.rank.desc(), page.c.id.desc())
+        ).all()
+
+    def search_sectors(
+        self,
+        db: Session,
+        *,
+        text: str,
+        path_prefix: Optional[str],
+        after: SearchKeyset,
+        limit: int,
+    ) -> List[Any]:
+        query = _tsquery(text)
+        rank = func.ts_rank(Sector.search_vector, query)
+        page = select(
+            Sector.id,
+            Sector.name,
+            Sector.path,
+            func.concat_ws(" - ", Sector.name, Sector.description).label("document"),
+            rank.label("rank"),
+        ).where(Sector.search_vector.op("@@")(query))
+        if path_prefix is not None:
+            page = page.where(Sector.path.like(f"{path_prefix}%"))
+        if after is not None:
+            page = page.where(_after(rank, Sector.id, after))
+        page = page.order_by(rank.desc(), Sector.id.desc()).limit(limit).subquery()
+
+        return db.execute(
+            select(
+                page.c.id,
+                page.c.name,
+                page.c.path,
+                page.c.rank,
+                _headline(page.c.document, text).label("snippet"),
+            ).order_by(page.c.rank.desc(), page.c.id.desc())
+        ).all()
+
+
+search_repository = SearchRepository()
@@ -0,0 +1,33 @@
+from datetime import datetime
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel
+
+ItemType = TypeVar("ItemType")
+
+
+class SearchPage(BaseModel, Generic[ItemType]):
+    # Best match first
+    items: List[ItemType]
+    # Pass back as `cursor` for the next page of the same query
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+
+
+class EventSearchHit(BaseModel):
+    id: int
+    sector_id: int
+    severity: str
+    category: str
+    occurred_at: datetime
+    rank: float
+    # HTML-escaped excerpt with matches wrapped in <mark></mark>
+    snippet: str
+
+
+class SectorSearchHit(BaseModel):
+    id: int
+    name: str
+    path: str
+    rank: float
+    snippet: str
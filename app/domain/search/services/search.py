@@ -0,0 +1,144 @@
+import html
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, List, Optional, Type
+
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app.domain.common.cursor import decode_cursor, encode_cursor
+from app.domain.search.repositories.search import (
+    HIGHLIGHT_START,
+    HIGHLIGHT_STOP,
+    SearchKeyset,
+    search_repository,
+)
+from app.domain.search.schemas.search import EventSearchHit, SearchPage, SectorSearchHit
+from app.domain.sector.repositories.sector import sector_repository
+from app.infrastructure.core.config import settings
+from app.infrastructure.tracing.tracer import traced_methods
+
+MAX_QUERY_LENGTH = 200
+
+
+def _highlight(snippet: Optional[str]) -> str:
+    escaped = html.escape(snippet or "")
+    return escaped.replace(HIGHLIGHT_START, "<mark>").replace(HIGHLIGHT_STOP, "</mark>")
+
+
+def _search_text(q: str) -> str:
+    text = q.strip()
+    if not text:
+        raise ValueError("Search query cannot be empty")
+    if len(text) > MAX_QUERY_LENGTH:
+        raise ValueError(f"Search query cannot exceed {MAX_QUERY_LENGTH} characters")
+    return text
+
+
+def _decode_search_cursor(cursor: Optional[str]) -> SearchKeyset:
+    if not cursor:
+        return None
+    values = decode_cursor(cursor)
+    try:
+        rank, id_ = values
+        return float(rank), int(id_)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+
+def _page(
+    rows: List[Any],
+    limit: int,
+    item_schema: Type[BaseModel],
+    to_item: Callable[[Any], dict],
+) -> SearchPage:
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_cursor(rows[-1].rank, rows[-1].id) if has_more else None
+    return SearchPage[item_schema](
+        items=[item_schema.model_validate(to_item(row)) for row in rows],
+        next_cursor=next_cursor,
+        has_more=has_more,
+    )
+
+
+@traced_methods
+class SearchService:
+    def search_events(
+        self,
+        db: Session,
+        q: str,
+        *,
+        sector_id: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+    ) -> SearchPage[EventSearchHit]:
+        """
+        Events matching `q`, best match first. The time range defaults to the
+        longest allowed one ending now. Raises ValueError on bad input.
+        """
+        text = _search_text(q)
+        max_range = timedelta(days=settings.EVENT_QUERY_MAX_RANGE_DAYS)
+        end = end or datetime.now(timezone.utc)
+        start = start or end - max_range
+        if start >= end:
+            raise ValueError("start must be before end")
+        if end - start > max_range:
+            raise ValueError(
+                f"Time range cannot exceed {settings.EVENT_QUERY_MAX_RANGE_DAYS} days"
+            )
+        rows = search_repository.search_events(
+            db,
+            text=text,
+            start=start,
+            end=end,
+            sector_id=sector_id,
+            after=_decode_search_cursor(cursor),
+            limit=limit + 1,
+        )
+        return _page(
+            rows,
+            limit,
+            EventSearchHit,
+            lambda row: {**row._asdict(), "snippet": _highlight(row.snippet)},
+        )
+
+    def search_sectors(
+        self,
+        db: Session,
+        q: str,
+        *,
+        within_sector_id: Optional[int] = None,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+    ) -> SearchPage[SectorSearchHit]:
+        """
+        Sectors whose name or description match `q`, best match first,
+        optionally limited to the subtree of `within_sector_id`.
+        """
+        text = _search_text(q)
+        path_prefix = None
+        if within_sector_id is not None:
+            within = sector_repository.get(
+                db, id=within_sector_id, columns=(sector_repository.model.path,)
+            )
+            if within is None:
+                raise ValueError(f"Sector with ID {within_sector_id} not found")
+            path_prefix = within.path
+        rows = search_repository.search_sectors(
+            db,
+            text=text,
+            path_prefix=path_prefix,
+            after=_decode_search_cursor(cursor),
+            limit=limit + 1,
+        )
+        return _page(
+            rows,
+            limit,
+            SectorSearchHit,
+            lambda row: {**row._asdict(), "snippet": _highlight(row.snippet)},
+        )
+
+
+search_service = SearchService()
@@ -1,15 +1,57 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy import (
+    Column,
+    Computed,
+    Integer,
+    String,
+    Boolean,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 
+from app.infrastructure.db.audit import AuditOptions
 from app.infrastructure.db.session import Base
 
+# Indexed in English and Portuguese; the name outranks the description
+SECTOR_SEARCH_VECTOR = (
+    "setweight(to_tsvector('english'::regconfig, name), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('portuguese'::regconfig, name), 'A') || "
+    "setweight(to_tsvector('portuguese'::regconfig, coalesce(description, '')), 'B')"
+)
+
 
 class Sector(Base):
     __tablename__ = "sectors"
+    __table_args__ = (
+        Index("ix_sectors_updated_at_id", "updated_at", "id"),
+        # text_pattern_ops lets `path LIKE '/1/5/%'` use the index under any collation
+        Index("ix_sectors_path", "path", postgresql_ops={"path": "text_pattern_ops"}),
+        Index("ix_sectors_search_vector", "search_vector", postgresql_using="gin"),
+    )
+    # Fetch server-generated columns with RETURNING instead of a refresh SELECT
+    __mapper_args__ = {"eager_defaults": True}
+    __audit__ = AuditOptions("sector")
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     description = Column(String, nullable=True)
     is_active = Column(Boolean, default=True)
+    # Share of repeated error events stored as full rows; NULL uses the global default
+    event_sample_rate = Column(Float, nullable=True)
+    parent_id = Column(Integer, ForeignKey("sectors.id"), nullable=True, index=True)
+    kind = Column(String(20), nullable=True)
+    # Materialized path of ids from the root down, e.g. "/1/5/12/"; maintained
+    # by SectorRepository
+    path = Column(String, nullable=False)
+    depth = Column(Integer, nullable=False, default=0)
+    # Full-text search over name and description, generated by Postgres
+    search_vector = deferred(
+        Column(TSVECTOR, Computed(SECTOR_SEARCH_VECTOR, persisted=True))
+    )
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now()) 
\ No newline at end of file
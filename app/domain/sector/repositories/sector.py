@@ -1,18 +1,135 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import Row, case, func, select, update
 from sqlalchemy.orm import Session
 
-from app.domain.common.repositories.base import BaseRepository
+from app.domain.common.repositories.base import BaseRepository, Columns
 from app.domain.sector.models.sector import Sector
 from app.domain.sector.schemas.sector import SectorCreate, SectorUpdate
+from app.infrastructure.tracing.tracer import traced_methods
 
+# Arbitrary key for the advisory lock serializing hierarchy changes
+HIERARCHY_LOCK_KEY = 0x5EC7
 
+
+def ancestor_ids(path: str) -> List[int]:
+    """Ids of the ancestors encoded in a materialized path, root first."""
+    return [int(part) for part in path.strip("/").split("/")[:-1]]
+
+
+@traced_methods
 class SectorRepository(BaseRepository[Sector, SectorCreate, SectorUpdate]):
+    # Breakdowns of count_by_filter
+    count_facets = {"is_active": Sector.is_active}
+
     def get_by_name(self, db: Session, name: str) -> Optional[Sector]:
         return db.query(Sector).filter(Sector.name == name).first()
 
-    def search_sectors(self, db: Session, id: Optional[int] = None, name: Optional[str] = None, is_active: Optional[bool] = None) -> List[Sector]:
-        return self.get_by_filter(db, id=id, name=name, is_active=is_active)
+    def search_sectors(
+        self,
+        db: Session,
+        id: Optional[int] = None,
+        name: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        columns: Columns = None,
+    ) -> List[Any]:
+        return self.get_by_filter(
+            db, columns=columns, id=id, name=name, is_active=is_active
+        )
+
+    def get_event_sample_rates(self, db: Session) -> Dict[int, float]:
+        rows = db.query(Sector.id, Sector.event_sample_rate).filter(
+            Sector.event_sample_rate.isnot(None)
+        )
+        return {row.id: row.event_sample_rate for row in rows}
+
+    def lock_hierarchy(self, db: Session, *, shared: bool = False) -> None:
+        """
+        Transaction-scoped lock on the tree shape. Moves take it exclusively so
+        paths never interleave; inserts under a parent take it shared.
+        """
+        lock = (
+            func.pg_advisory_xact_lock_shared if shared else func.pg_advisory_xact_lock
+        )
+        db.execute(select(lock(HIERARCHY_LOCK_KEY)))
+
+    def create(
+        self, db: Session, *, obj_in: SectorCreate, parent: Optional[Sector] = None
+    ) -> Sector:
+        # Take the id up front so the row is inserted with its final path
+        sector_id = db.execute(
+            select(func.nextval(func.pg_get_serial_sequence("sectors", "id")))
+        ).scalar_one()
+        obj_in_data = jsonable_encoder(obj_in)
+        obj_in_data["parent_id"] = parent.id if parent else None
+        db_obj = Sector(
+            **obj_in_data,
+            id=sector_id,
+            path=f"{parent.path if parent else '/'}{sector_id}/",
+            depth=parent.depth + 1 if parent else 0,
+        )
+        db.add(db_obj)
+        db.flush()
+        return db_obj
+
+    def get_subtree(
+        self,
+        db: Session,
+        path: str,
+        *,
+        max_depth: Optional[int] = None,
+        columns: Columns = None,
+    ) -> List[Any]:
+        """
+        The sector at `path` and all its descendants, in pre-order, from one
+        prefix scan.
+        """
+        query = self._query(db, columns).filter(Sector.path.like(f"{path}%"))
+        if max_depth is not None:
+            query = query.filter(Sector.depth <= max_depth)
+        return query.order_by(Sector.path).all()
+
+    def get_ancestors(
+        self, db: Session, path: str, *, columns: Columns = None
+    ) -> List[Any]:
+        ids = ancestor_ids(path)
+        if not ids:
+            return []
+        return (
+            self._query(db, columns)
+            .filter(Sector.id.in_(ids))
+            .order_by(Sector.depth)
+            .all()
+        )
+
+    def move_subtree(
+        self, db: Session, *, sector: Sector, parent: Optional[Sector]
+    ) -> List[Row]:
+        """
+        Re-root `sector` and its descendants under `parent` with a single UPDATE.
+        Returns the id, parent_id, path and depth of every row rewritten, as
+        they are after the move.
+        """
+        old_prefix = sector.path
+        new_prefix = f"{parent.path if parent else '/'}{sector.id}/"
+        depth_delta = (parent.depth + 1 if parent else 0) - sector.depth
+        result = db.execute(
+            update(Sector)
+            .where(Sector.path.like(f"{old_prefix}%"))
+            .values(
+                path=new_prefix + func.substr(Sector.path, len(old_prefix) + 1),
+                depth=Sector.depth + depth_delta,
+                # In the same statement, so the ORM has no change of its own to flush
+                parent_id=case(
+                    (Sector.id == sector.id, parent.id if parent else None),
+                    else_=Sector.parent_id,
+                ),
+            )
+            .returning(Sector.id, Sector.parent_id, Sector.path, Sector.depth)
+            .execution_options(synchronize_session="fetch")
+        )
+        return result.all()
 
 
-sector_repository = SectorRepository(Sector) 
\ No newline at end of file
+sector_repository = SectorRepository(Sector)
\ No newline at end of file
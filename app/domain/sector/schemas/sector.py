@@ -1,27 +1,47 @@
 from datetime import datetime
+from enum import Enum
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+
+class SectorKind(str, Enum):
+    HOSPITAL = "hospital"
+    BUILDING = "building"
+    DEPARTMENT = "department"
+    WARD = "ward"
 
 
 class SectorBase(BaseModel):
     name: str
     description: Optional[str] = None
     is_active: bool = True
+    event_sample_rate: Optional[float] = Field(None, ge=0, le=1)
+    kind: Optional[SectorKind] = None
 
 
 class SectorCreate(SectorBase):
-    pass
+    parent_id: Optional[int] = None
 
 
 class SectorUpdate(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
     is_active: Optional[bool] = None
+    event_sample_rate: Optional[float] = Field(None, ge=0, le=1)
+    kind: Optional[SectorKind] = None
+
+
+class SectorMove(BaseModel):
+    # None makes the sector a root
+    parent_id: Optional[int] = None
 
 
 class SectorResponse(SectorBase):
     id: int
+    parent_id: Optional[int] = None
+    path: str
+    depth: int
     created_at: datetime
     updated_at: datetime
 
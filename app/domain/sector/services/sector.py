@@ -1,54 +1,219 @@
-from typing import List, Optional
+from typing import Any, List, Optional
 
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
 
+from app.domain.common.repositories.projection import columns_for
+from app.domain.common.schemas.changes import ChangesPage
+from app.domain.common.schemas.counts import CountMode, CountsResponse
+from app.domain.common.services.changes import get_changes_page
+from app.domain.common.services.counts import count_service
 from app.domain.sector.models.sector import Sector
 from app.domain.sector.repositories.sector import sector_repository
-from app.domain.sector.schemas.sector import SectorCreate, SectorSearch, SectorUpdate
+from app.domain.sector.schemas.sector import (
+    SectorCreate,
+    SectorMove,
+    SectorResponse,
+    SectorSearch,
+    SectorUpdate,
+)
+from app.infrastructure.db.audit import ChangeRecord, change_capture
+from app.infrastructure.db.unit_of_work import unit_of_work
+from app.infrastructure.live.notify import publish_live_messages
+from app.infrastructure.tracing.tracer import traced_methods
 
 
+@traced_methods
 class SectorService:
     def create_sector(self, db: Session, sector_in: SectorCreate) -> Sector:
         # Check if sector with same name already exists
         db_sector = sector_repository.get_by_name(db, name=sector_in.name)
         if db_sector:
             raise ValueError(f"Sector with name '{sector_in.name}' already exists")
-        
+
         # Create new sector
-        return sector_repository.create(db, obj_in=sector_in)
-    
+        with unit_of_work(db):
+            parent = None
+            if sector_in.parent_id is not None:
+                sector_repository.lock_hierarchy(db, shared=True)
+                parent = sector_repository.get(db, id=sector_in.parent_id)
+                if not parent:
+                    raise ValueError(
+                        f"Parent sector with ID {sector_in.parent_id} not found"
+                    )
+            sector = sector_repository.create(db, obj_in=sector_in, parent=parent)
+            self._publish_change(db, sector, "sector.created")
+        return sector
+
     def get_sector(self, db: Session, sector_id: int) -> Optional[Sector]:
         return sector_repository.get(db, id=sector_id)
-    
-    def get_all_sectors(self, db: Session) -> List[Sector]:
-        return sector_repository.get_all(db)
-    
+
+    def read_sector(self, db: Session, sector_id: int) -> Optional[Any]:
+        # Read-only lookup: just the SectorResponse columns, as a plain row
+        return sector_repository.get(
+            db, id=sector_id, columns=columns_for(Sector, SectorResponse)
+        )
+
+    def get_all_sectors(self, db: Session) -> List[Any]:
+        return sector_repository.get_all(
+            db, columns=columns_for(Sector, SectorResponse)
+        )
+
+    def get_sector_changes(
+        self, db: Session, cursor: Optional[str], limit: int
+    ) -> ChangesPage[SectorResponse]:
+        return get_changes_page(sector_repository, SectorResponse, db, cursor, limit)
+
     def update_sector(self, db: Session, sector_id: int, sector_in: SectorUpdate) -> Optional[Sector]:
         sector = sector_repository.get(db, id=sector_id)
         if not sector:
             return None
-        
+
         # Check name uniqueness if updating name
         if sector_in.name and sector_in.name != sector.name:
             existing_sector = sector_repository.get_by_name(db, name=sector_in.name)
             if existing_sector:
                 raise ValueError(f"Sector with name '{sector_in.name}' already exists")
-        
-        return sector_repository.update(db, db_obj=sector, obj_in=sector_in)
-    
-    def search_sectors(self, db: Session, search_params: SectorSearch) -> List[Sector]:
+
+        with unit_of_work(db):
+            sector = sector_repository.update(db, db_obj=sector, obj_in=sector_in)
+            self._publish_change(db, sector, "sector.updated")
+        return sector
+
+    def search_sectors(self, db: Session, search_params: SectorSearch) -> List[Any]:
         return sector_repository.search_sectors(
-            db, 
+            db,
             id=search_params.id,
-            name=search_params.name
+            name=search_params.name,
+            columns=columns_for(Sector, SectorResponse),
         )
-    
+
+    def count_sectors(
+        self, db: Session, mode: CountMode, search_params: Optional[SectorSearch] = None
+    ) -> CountsResponse:
+        """Sectors matching `search_params` (all without), by status."""
+        filters = search_params.model_dump() if search_params else {}
+        return count_service.count(
+            db,
+            sector_repository,
+            mode,
+            facets=sector_repository.count_facets,
+            filters=filters,
+        )
+
+    def get_subtree(
+        self, db: Session, sector_id: int, max_depth: Optional[int] = None
+    ) -> Optional[List[Any]]:
+        root = sector_repository.get(
+            db, id=sector_id, columns=(Sector.path, Sector.depth)
+        )
+        if root is None:
+            return None
+        # max_depth is relative to the requested sector
+        return sector_repository.get_subtree(
+            db,
+            root.path,
+            max_depth=root.depth + max_depth if max_depth is not None else None,
+            columns=columns_for(Sector, SectorResponse),
+        )
+
+    def get_ancestors(self, db: Session, sector_id: int) -> Optional[List[Any]]:
+        sector = sector_repository.get(db, id=sector_id, columns=(Sector.path,))
+        if sector is None:
+            return None
+        return sector_repository.get_ancestors(
+            db, sector.path, columns=columns_for(Sector, SectorResponse)
+        )
+
+    def move_sector(
+        self, db: Session, sector_id: int, move_in: SectorMove
+    ) -> Optional[Sector]:
+        with unit_of_work(db):
+            sector_repository.lock_hierarchy(db)
+            sector = sector_repository.get(db, id=sector_id)
+            if not sector:
+                return None
+
+            parent = None
+            if move_in.parent_id is not None:
+                parent = sector_repository.get(db, id=move_in.parent_id)
+                if not parent:
+                    raise ValueError(
+                        f"Parent sector with ID {move_in.parent_id} not found"
+                    )
+                if parent.path.startswith(sector.path):
+                    raise ValueError(
+                        "A sector cannot be moved under itself "
+                        "or one of its descendants"
+                    )
+
+            if sector.parent_id != move_in.parent_id:
+                old = (sector.parent_id, sector.path, sector.depth)
+                moved = sector_repository.move_subtree(db, sector=sector, parent=parent)
+                # The UPDATE bypasses the ORM, so the rewritten rows are
+                # reported explicitly
+                change_capture.add(db, self._move_records(db, sector_id, moved, *old))
+                self._publish_change(db, sector, "sector.moved")
+        return sector
+
+    def _move_records(
+        self,
+        db: Session,
+        sector_id: int,
+        moved: List[Row],
+        old_parent_id: Optional[int],
+        old_path: str,
+        old_depth: int,
+    ) -> List[ChangeRecord]:
+        """Audit records of a move, given the moved sector's values before it."""
+        root = next(row for row in moved if row.id == sector_id)
+        depth_delta = root.depth - old_depth
+        records = []
+        for row in moved:
+            # Descendants keep their path below the moved sector
+            changes = {"path": [old_path + row.path[len(root.path) :], row.path]}
+            if depth_delta:
+                changes["depth"] = [row.depth - depth_delta, row.depth]
+            if row.id == sector_id:
+                changes["parent_id"] = [old_parent_id, row.parent_id]
+            records.append(
+                change_capture.record(
+                    db, Sector.__audit__.entity, row.id, "update", changes
+                )
+            )
+        return records
+
     def activate_deactivate_sector(self, db: Session, sector_id: int, is_active: bool) -> Optional[Sector]:
         sector = sector_repository.get(db, id=sector_id)
         if sector:
             update_data = {"is_active": is_active}
-            return sector_repository.update(db, db_obj=sector, obj_in=update_data)
+            with unit_of_work(db):
+                sector = sector_repository.update(db, db_obj=sector, obj_in=update_data)
+                self._publish_change(
+                    db,
+                    sector,
+                    "sector.activated" if is_active else "sector.deactivated",
+                )
+            return sector
         return None
 
+    def _publish_change(self, db: Session, sector: Sector, kind: str) -> None:
+        # Payloads stay small (NOTIFY caps them at 8000 bytes); clients refetch details
+        publish_live_messages(
+            db,
+            [
+                {
+                    "type": kind,
+                    "sector_id": sector.id,
+                    "data": {
+                        "name": sector.name,
+                        "parent_id": sector.parent_id,
+                        "is_active": sector.is_active,
+                        "updated_at": sector.updated_at,
+                    },
+                }
+            ],
+        )
+
 
-sector_service = SectorService() 
\ No newline at end of file
+sector_service = SectorService()
\ No newline at end of file
@@ -1,18 +1,25 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, Integer, String
+from sqlalchemy import Boolean, Column, DateTime, Index, Integer, String
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 
+from app.infrastructure.db.audit import AuditOptions
 from app.infrastructure.db.session import Base
 
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (Index("ix_users_updated_at_id", "updated_at", "id"),)
+    # Fetch server-generated columns with RETURNING instead of a refresh SELECT
+    __mapper_args__ = {"eager_defaults": True}
+    __audit__ = AuditOptions("user", redact=("password",))
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     email = Column(String, unique=True, index=True, nullable=False)
-    password = Column(String, nullable=False)
+    # Only the login path needs the hash; it undefers it explicitly
+    password = deferred(Column(String, nullable=False))
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(
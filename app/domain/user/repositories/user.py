@@ -1,15 +1,55 @@
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
 
-from sqlalchemy.orm import Session
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session, undefer
 
-from app.domain.common.repositories.base import BaseRepository
+from app.domain.common.repositories.base import BaseRepository, Columns
 from app.domain.user.models.user import User
 from app.domain.user.schemas.user import UserCreate, UserUpdate
+from app.infrastructure.tracing.tracer import traced_methods
 
 
+@traced_methods
 class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
-    def get_by_email(self, db: Session, email: str) -> Optional[User]:
-        return db.query(User).filter(User.email == email).first()
+    # Breakdowns of count_by_filter
+    count_facets = {
+        "is_active": User.is_active,
+        "email_domain": func.lower(func.split_part(User.email, "@", 2)),
+    }
+
+    def get_by_email(
+        self, db: Session, email: str, *, with_password: bool = False
+    ) -> Optional[User]:
+        query = db.query(User).filter(User.email == email)
+        if with_password:
+            query = query.options(undefer(User.password))
+        return query.first()
+
+    def get_existing_emails(self, db: Session, emails: Iterable[str]) -> Set[str]:
+        emails = set(emails)
+        if not emails:
+            return set()
+        rows = db.query(User.email).filter(User.email.in_(emails)).all()
+        return {row.email for row in rows}
+
+    def bulk_create(
+        self, db: Session, rows: Sequence[Dict[str, Any]]
+    ) -> Dict[str, int]:
+        """
+        Insert `rows` (with hashed passwords) in one statement. Emails registered
+        concurrently are skipped; returns the ids of the users actually
+        inserted, by email.
+        """
+        if not rows:
+            return {}
+        stmt = (
+            insert(User)
+            .values(list(rows))
+            .on_conflict_do_nothing(index_elements=[User.email])
+            .returning(User.email, User.id)
+        )
+        return dict(db.execute(stmt).all())
 
     def search_users(
         self,
@@ -18,9 +58,22 @@ class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
         name: Optional[str] = None,
         email: Optional[str] = None,
         is_active: Optional[bool] = None,
-    ) -> List[User]:
+        columns: Columns = None,
+    ) -> List[Any]:
         return self.get_by_filter(
-            db, id=id, name=name, email=email, is_active=is_active
+            db, columns=columns, id=id, name=name, email=email, is_active=is_active
+        )
+
+    def get_password_hashes(
+        self, db: Session, *, after_id: int, limit: int
+    ) -> List[Any]:
+        """(id, password) rows in id order, for batch audits of the hashes."""
+        return (
+            db.query(User.id, User.password)
+            .filter(User.id > after_id)
+            .order_by(User.id)
+            .limit(limit)
+            .all()
         )
 
     def activate_deactivate(
@@ -30,8 +83,7 @@ class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
         if user:
             user.is_active = is_active
             db.add(user)
-            db.commit()
-            db.refresh(user)
+            db.flush()
         return user
 
 
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, EmailStr
 
@@ -32,4 +32,21 @@ class UserResponse(UserBase):
 class UserSearch(BaseModel):
     id: Optional[int] = None
     name: Optional[str] = None
-    email: Optional[EmailStr] = None 
\ No newline at end of file
+    email: Optional[EmailStr] = None
+
+
+class UserImportRowError(BaseModel):
+    line: int
+    email: Optional[str] = None
+    error: str
+
+
+class UserImportReport(BaseModel):
+    total_rows: int
+    created: int
+    failed: int
+    errors: List[UserImportRowError]
+    # Only the first USER_IMPORT_MAX_ERRORS errors are listed
+    errors_truncated: bool
+    elapsed_seconds: float
+    rows_per_second: float
@@ -1,13 +1,29 @@
-from typing import List, Optional
+from typing import Any, List, Optional
 
 from sqlalchemy.orm import Session
 
-from app.infrastructure.core.security import get_password_hash, verify_password
+from app.infrastructure.core.security import (
+    get_password_hash,
+    verify_and_update_password,
+)
+from app.infrastructure.db.unit_of_work import unit_of_work
+from app.infrastructure.tracing.tracer import traced_methods
+from app.domain.common.repositories.projection import columns_for
+from app.domain.common.schemas.changes import ChangesPage
+from app.domain.common.schemas.counts import CountMode, CountsResponse
+from app.domain.common.services.changes import get_changes_page
+from app.domain.common.services.counts import count_service
 from app.domain.user.models.user import User
 from app.domain.user.repositories.user import user_repository
-from app.domain.user.schemas.user import UserCreate, UserSearch, UserUpdate
+from app.domain.user.schemas.user import (
+    UserCreate,
+    UserResponse,
+    UserSearch,
+    UserUpdate,
+)
 
 
+@traced_methods
 class UserService:
     def create_user(self, db: Session, user_in: UserCreate) -> User:
         # Check if user already exists
@@ -21,30 +37,64 @@ class UserService:
         user_data["password"] = hashed_password
 
         # Create new user
-        return user_repository.create(db, obj_in=UserCreate(**user_data))
+        with unit_of_work(db):
+            return user_repository.create(db, obj_in=UserCreate(**user_data))
 
     def get_user(self, db: Session, user_id: int) -> Optional[User]:
         return user_repository.get(db, id=user_id)
 
+    def read_user(self, db: Session, user_id: int) -> Optional[Any]:
+        # Read-only lookup: just the UserResponse columns, as a plain row
+        return user_repository.get(
+            db, id=user_id, columns=columns_for(User, UserResponse)
+        )
+
     def get_user_by_email(self, db: Session, email: str) -> Optional[User]:
         return user_repository.get_by_email(db, email=email)
 
     def authenticate_user(
         self, db: Session, email: str, password: str
     ) -> Optional[User]:
-        user = self.get_user_by_email(db, email=email)
+        user = user_repository.get_by_email(db, email=email, with_password=True)
         if not user:
             return None
-        if not verify_password(password, user.password):
+        valid, new_hash = verify_and_update_password(password, user.password)
+        if not valid:
             return None
+        if new_hash:
+            # Hashed with outdated settings (e.g. an older bcrypt cost)
+            with unit_of_work(db):
+                user_repository.update(db, db_obj=user, obj_in={"password": new_hash})
         return user
 
-    def get_all_users(self, db: Session) -> List[User]:
-        return user_repository.get_all(db)
+    def get_all_users(self, db: Session) -> List[Any]:
+        return user_repository.get_all(db, columns=columns_for(User, UserResponse))
+
+    def get_user_changes(
+        self, db: Session, cursor: Optional[str], limit: int
+    ) -> ChangesPage[UserResponse]:
+        return get_changes_page(user_repository, UserResponse, db, cursor, limit)
 
-    def search_users(self, db: Session, search_params: UserSearch) -> List[User]:
+    def search_users(self, db: Session, search_params: UserSearch) -> List[Any]:
         return user_repository.search_users(
-            db, id=search_params.id, name=search_params.name, email=search_params.email
+            db,
+            id=search_params.id,
+            name=search_params.name,
+            email=search_params.email,
+            columns=columns_for(User, UserResponse),
+        )
+
+    def count_users(
+        self, db: Session, mode: CountMode, search_params: Optional[UserSearch] = None
+    ) -> CountsResponse:
+        """Users matching `search_params` (all without), by status and email domain."""
+        filters = search_params.model_dump() if search_params else {}
+        return count_service.count(
+            db,
+            user_repository,
+            mode,
+            facets=user_repository.count_facets,
+            filters=filters,
         )
 
     def update_user(
@@ -59,14 +109,16 @@ class UserService:
         if "password" in update_data and update_data["password"]:
             update_data["password"] = get_password_hash(update_data["password"])
 
-        return user_repository.update(db, db_obj=user, obj_in=update_data)
+        with unit_of_work(db):
+            return user_repository.update(db, db_obj=user, obj_in=update_data)
 
     def activate_deactivate_user(
         self, db: Session, user_id: int, is_active: bool
     ) -> Optional[User]:
-        return user_repository.activate_deactivate(
-            db, user_id=user_id, is_active=is_active
-        )
+        with unit_of_work(db):
+            return user_repository.activate_deactivate(
+                db, user_id=user_id, is_active=is_active
+            )
 
 
 user_service = UserService() 
\ No newline at end of file
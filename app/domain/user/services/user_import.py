@@ -0,0 +1,159 @@
+import csv
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app.infrastructure.core.config import settings
+from app.infrastructure.core.security import hash_passwords
+from app.infrastructure.db.audit import change_capture
+from app.infrastructure.db.unit_of_work import unit_of_work
+from app.infrastructure.tracing.tracer import traced_methods
+from app.domain.user.models.user import User
+from app.domain.user.repositories.user import user_repository
+from app.domain.user.schemas.user import (
+    UserCreate,
+    UserImportReport,
+    UserImportRowError,
+)
+
+REQUIRED_COLUMNS = ("name", "email", "password")
+
+# (line number in the file, raw CSV row)
+CsvRow = Tuple[int, Dict[Optional[str], Optional[str]]]
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}"
+        for detail in error.errors()
+    )
+
+
+class _ImportState:
+    def __init__(self, max_errors: int):
+        self.total_rows = 0
+        self.created = 0
+        self.failed = 0
+        self.errors: List[UserImportRowError] = []
+        self.max_errors = max_errors
+
+    def fail(self, line: int, email: Optional[str], error: str) -> None:
+        self.failed += 1
+        # Only the first errors are kept, so a bad file cannot grow the report
+        if len(self.errors) < self.max_errors:
+            self.errors.append(UserImportRowError(line=line, email=email, error=error))
+
+
+@traced_methods
+class UserImportService:
+    """
+    Bulk user creation from CSV (name, email, password[, is_active]).
+
+    Rows are read lazily and handled a chunk at a time: validated with
+    UserCreate, checked against existing emails with one query, hashed across
+    the password hash process pool and inserted with one statement, committed
+    per chunk. Memory use depends on the chunk size, not on the file.
+    """
+
+    def import_csv(
+        self,
+        db: Session,
+        lines: Iterable[str],
+        progress: Optional[Callable[[int], None]] = None,
+        chunk_size: int = settings.USER_IMPORT_CHUNK_SIZE,
+    ) -> UserImportReport:
+        started = time.monotonic()
+        reader = csv.DictReader(lines)
+        if reader.fieldnames is None:
+            raise ValueError("The CSV file is empty")
+        missing = [
+            column for column in REQUIRED_COLUMNS if column not in reader.fieldnames
+        ]
+        if missing:
+            raise ValueError(f"Missing CSV columns: {', '.join(missing)}")
+
+        state = _ImportState(settings.USER_IMPORT_MAX_ERRORS)
+        chunk: List[CsvRow] = []
+        for row in reader:
+            chunk.append((reader.line_num, row))
+            if len(chunk) >= chunk_size:
+                self._import_chunk(db, chunk, state)
+                chunk = []
+                if progress:
+                    progress(state.total_rows)
+        if chunk:
+            self._import_chunk(db, chunk, state)
+            if progress:
+                progress(state.total_rows)
+
+        elapsed = time.monotonic() - started
+        return UserImportReport(
+            total_rows=state.total_rows,
+            created=state.created,
+            failed=state.failed,
+            errors=state.errors,
+            errors_truncated=state.failed > len(state.errors),
+            elapsed_seconds=round(elapsed, 3),
+            rows_per_second=round(state.total_rows / elapsed, 1) if elapsed else 0.0,
+        )
+
+    def _import_chunk(
+        self, db: Session, chunk: List[CsvRow], state: _ImportState
+    ) -> None:
+        state.total_rows += len(chunk)
+
+        valid: Dict[str, Tuple[int, UserCreate]] = {}
+        for line, row in chunk:
+            try:
+                # Empty cells fall back to the schema defaults; extra cells are ignored
+                user_in = UserCreate.model_validate(
+                    {k: v for k, v in row.items() if k and v not in (None, "")}
+                )
+            except ValidationError as e:
+                state.fail(line, row.get("email") or None, _validation_message(e))
+                continue
+            if user_in.email in valid:
+                state.fail(
+                    line, user_in.email, "Email appears more than once in the file"
+                )
+                continue
+            valid[user_in.email] = (line, user_in)
+
+        existing = user_repository.get_existing_emails(db, valid)
+        # Do not hold the read transaction open while hashing
+        db.rollback()
+        for email in existing:
+            line, _ = valid.pop(email)
+            state.fail(line, email, f"Email {email} already registered")
+        if not valid:
+            return
+
+        users = list(valid.values())
+        hashes = hash_passwords([user_in.password for _, user_in in users])
+        rows = [
+            {**user_in.model_dump(), "password": hashed}
+            for (_, user_in), hashed in zip(users, hashes)
+        ]
+        with unit_of_work(db):
+            inserted = user_repository.bulk_create(db, rows)
+            # The bulk INSERT bypasses the ORM, so its users are reported explicitly
+            change_capture.add(
+                db,
+                [
+                    change_capture.record_created(db, User, inserted[row["email"]], row)
+                    for row in rows
+                    if row["email"] in inserted
+                ],
+            )
+        state.created += len(inserted)
+        # Registered by someone else between the lookup and the insert
+        for line, user_in in users:
+            if user_in.email not in inserted:
+                state.fail(
+                    line, user_in.email, f"Email {user_in.email} already registered"
+                )
+
+
+user_import_service = UserImportService()
@@ -0,0 +1,351 @@
+"""
+Compressed, column-oriented segment files for archived rows.
+
+    MAGIC | column blocks ... | footer (JSON) | footer length (8 bytes, LE) | MAGIC
+
+Rows are stored in groups, one per value of the group column (e.g. a
+sector), each sorted by the time column. Every column of a group is one
+zlib-compressed block, so a reader decompresses only the groups and columns
+it asks for. The footer holds
+the column layout, the dictionaries of dictionary-encoded columns and, for the
+file and for each group, the row count and min/max of the time and id columns,
+which let readers skip files and groups without touching their blocks.
+
+Readers memory-map the file: blocks are sliced out of the mapping on demand,
+so only the pages actually read are loaded, and the OS page cache is shared
+between the workers reading the same segment.
+"""
+import bisect
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+MAGIC = b"PFSEG001"
+FORMAT_VERSION = 1
+_FOOTER_TRAILER = struct.Struct("<Q")
+# Footer length and closing MAGIC
+_TRAILER_SIZE = _FOOTER_TRAILER.size + len(MAGIC)
+COMPRESSION_LEVEL = 6
+
+# Column kinds
+INT = "int"  # int64, None allowed
+TIME = "time"  # timezone-aware datetime, stored as int64 microseconds since the epoch
+DICT = (
+    "dict"  # low-cardinality strings, stored as uint32 codes into a per-file dictionary
+)
+TEXT = "text"  # strings without NUL characters (true of all Postgres text)
+JSON = "json"  # any JSON-serializable value, None included
+
+NULL_INT = -(2**63)
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# (name, kind)
+ColumnSpec = Tuple[str, str]
+
+
+class SegmentFormatError(ValueError):
+    pass
+
+
+def to_micros(value: datetime) -> int:
+    delta = value - EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def from_micros(value: int) -> datetime:
+    return EPOCH + timedelta(microseconds=value)
+
+
+def _int_array(values: Sequence[int]) -> bytes:
+    data = array("q", values)
+    if sys.byteorder == "big":
+        data.byteswap()
+    return data.tobytes()
+
+
+def _read_int_array(data: bytes, typecode: str = "q") -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def _fsync_dir(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _footer_size(path: Path, trailer: bytes, file_size: int) -> int:
+    """The footer length recorded in `trailer`, the last bytes of the file."""
+    if file_size < len(MAGIC) + _TRAILER_SIZE or trailer[-len(MAGIC) :] != MAGIC:
+        raise SegmentFormatError(f"{path} is not a segment file")
+    (footer_size,) = _FOOTER_TRAILER.unpack_from(trailer, len(trailer) - _TRAILER_SIZE)
+    if footer_size > file_size - len(MAGIC) - _TRAILER_SIZE:
+        raise SegmentFormatError(f"{path} is not a segment file")
+    return footer_size
+
+
+def _decode_footer(path: Path, data: bytes) -> Dict[str, Any]:
+    footer = json.loads(data)
+    if footer["version"] != FORMAT_VERSION:
+        raise SegmentFormatError(f"{path} has unsupported version {footer['version']}")
+    return footer
+
+
+def read_footer(path: Path) -> Dict[str, Any]:
+    """
+    The footer of a segment file, read without mapping the file: enough to
+    decide from its row count and time/id ranges whether to open it at all.
+    """
+    with open(path, "rb") as f:
+        file_size = f.seek(0, os.SEEK_END)
+        f.seek(max(0, file_size - _TRAILER_SIZE))
+        footer_size = _footer_size(path, f.read(), file_size)
+        f.seek(file_size - _TRAILER_SIZE - footer_size)
+        return _decode_footer(path, f.read(footer_size))
+
+
+class SegmentWriter:
+    """
+    Writes one segment file. Call add_group once per group, then close();
+    the file only appears, atomically, on close. Use as a context manager to
+    discard it on error.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        columns: Sequence[ColumnSpec],
+        *,
+        group_column: str,
+        time_column: str,
+        id_column: str,
+    ):
+        self.path = Path(path)
+        self.columns = list(columns)
+        self.group_column = group_column
+        self.time_column = time_column
+        self.id_column = id_column
+        self.rows = 0
+        self._tmp_path = self.path.with_name(self.path.name + ".tmp")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self._tmp_path, "wb")
+        self._file.write(MAGIC)
+        self._dictionaries: Dict[str, Dict[Optional[str], int]] = {
+            name: {} for name, kind in self.columns if kind == DICT
+        }
+        self._groups: Dict[str, Dict[str, Any]] = {}
+
+    def __enter__(self) -> "SegmentWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def add_group(self, group: int, rows: Sequence[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        if str(group) in self._groups:
+            raise ValueError(f"Group {group} was already written to {self.path}")
+        rows = sorted(rows, key=lambda row: row[self.time_column])
+        blocks = {}
+        for name, kind in self.columns:
+            data = self._encode(name, kind, [row[name] for row in rows])
+            offset = self._file.tell()
+            compressed = zlib.compress(data, COMPRESSION_LEVEL)
+            self._file.write(compressed)
+            blocks[name] = [offset, len(compressed)]
+        ids = [row[self.id_column] for row in rows]
+        self._groups[str(group)] = {
+            "rows": len(rows),
+            "min_time": to_micros(rows[0][self.time_column]),
+            "max_time": to_micros(rows[-1][self.time_column]),
+            "min_id": min(ids),
+            "max_id": max(ids),
+            "blocks": blocks,
+        }
+        self.rows += len(rows)
+
+    def _encode(self, name: str, kind: str, values: List[Any]) -> bytes:
+        if kind == INT:
+            return _int_array([NULL_INT if v is None else v for v in values])
+        if kind == TIME:
+            return _int_array([NULL_INT if v is None else to_micros(v) for v in values])
+        if kind == DICT:
+            dictionary = self._dictionaries[name]
+            codes = array(
+                "I", [dictionary.setdefault(v, len(dictionary)) for v in values]
+            )
+            if sys.byteorder == "big":
+                codes.byteswap()
+            return codes.tobytes()
+        if kind == TEXT:
+            return b"\0".join(v.encode("utf-8") for v in values)
+        if kind == JSON:
+            return b"\0".join(
+                json.dumps(v, separators=(",", ":")).encode("utf-8") for v in values
+            )
+        raise ValueError(f"Unknown column kind '{kind}'")
+
+    def close(self) -> None:
+        groups = self._groups.values()
+        footer = {
+            "version": FORMAT_VERSION,
+            "columns": self.columns,
+            "group_column": self.group_column,
+            "time_column": self.time_column,
+            "id_column": self.id_column,
+            "rows": self.rows,
+            "min_time": min((g["min_time"] for g in groups), default=None),
+            "max_time": max((g["max_time"] for g in groups), default=None),
+            "min_id": min((g["min_id"] for g in groups), default=None),
+            "max_id": max((g["max_id"] for g in groups), default=None),
+            "dictionaries": {
+                name: list(dictionary)
+                for name, dictionary in self._dictionaries.items()
+            },
+            "groups": self._groups,
+        }
+        data = json.dumps(footer, separators=(",", ":")).encode("utf-8")
+        self._file.write(data)
+        self._file.write(_FOOTER_TRAILER.pack(len(data)))
+        self._file.write(MAGIC)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+        # The rename itself is only durable once the directory entry is fsynced
+        _fsync_dir(self.path.parent)
+
+    def abort(self) -> None:
+        self._file.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+
+class SegmentReader:
+    """
+    Memory-mapped, read-only view of a segment file. Safe to share between
+    threads.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        size = len(self._map)
+        if self._map[: len(MAGIC)] != MAGIC:
+            raise SegmentFormatError(f"{self.path} is not a segment file")
+        footer_size = _footer_size(self.path, self._map, size)
+        footer = _decode_footer(
+            self.path,
+            self._map[size - _TRAILER_SIZE - footer_size : size - _TRAILER_SIZE],
+        )
+        self.columns: List[ColumnSpec] = [tuple(column) for column in footer["columns"]]
+        self.group_column: str = footer["group_column"]
+        self.time_column: str = footer["time_column"]
+        self.id_column: str = footer["id_column"]
+        self.rows: int = footer["rows"]
+        self.min_time: Optional[int] = footer["min_time"]
+        self.max_time: Optional[int] = footer["max_time"]
+        self.min_id: Optional[int] = footer["min_id"]
+        self.max_id: Optional[int] = footer["max_id"]
+        self.groups: Dict[int, Dict[str, Any]] = {
+            int(k): v for k, v in footer["groups"].items()
+        }
+        self._dictionaries: Dict[str, List[Optional[str]]] = footer["dictionaries"]
+        self._kinds = dict(self.columns)
+
+    def overlaps(self, start: datetime, end: datetime) -> bool:
+        """Whether the file may hold rows in [start, end)."""
+        return (
+            self.rows > 0
+            and self.min_time < to_micros(end)
+            and self.max_time >= to_micros(start)
+        )
+
+    def _column(self, group: Dict[str, Any], name: str) -> List[Any]:
+        offset, length = group["blocks"][name]
+        data = zlib.decompress(self._map[offset : offset + length])
+        kind = self._kinds[name]
+        if kind == INT:
+            return [None if v == NULL_INT else v for v in _read_int_array(data)]
+        if kind == TIME:
+            return [
+                None if v == NULL_INT else from_micros(v) for v in _read_int_array(data)
+            ]
+        if kind == DICT:
+            dictionary = self._dictionaries[name]
+            return [dictionary[code] for code in _read_int_array(data, "I")]
+        if kind == TEXT:
+            return [v.decode("utf-8") for v in data.split(b"\0")]
+        return [json.loads(v) for v in data.split(b"\0")]
+
+    def _rows(
+        self, key: int, group: Dict[str, Any], lo: int, hi: int
+    ) -> List[Dict[str, Any]]:
+        columns = {name: self._column(group, name)[lo:hi] for name, _ in self.columns}
+        return [
+            {
+                self.group_column: key,
+                **{name: values[i] for name, values in columns.items()},
+            }
+            for i in range(hi - lo)
+        ]
+
+    def read_group(
+        self,
+        key: int,
+        start: datetime,
+        end: datetime,
+        newest: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Rows of group `key` with time in [start, end), oldest first; only the
+        `newest` most recent of them if given.
+        """
+        group = self.groups.get(key)
+        if (
+            group is None
+            or group["min_time"] >= to_micros(end)
+            or group["max_time"] < to_micros(start)
+        ):
+            return []
+        offset, length = group["blocks"][self.time_column]
+        times = _read_int_array(zlib.decompress(self._map[offset : offset + length]))
+        lo = bisect.bisect_left(times, to_micros(start))
+        hi = bisect.bisect_left(times, to_micros(end))
+        if newest is not None:
+            lo = max(lo, hi - newest)
+        if lo >= hi:
+            return []
+        return self._rows(key, group, lo, hi)
+
+    def find(self, id_value: int) -> Optional[Dict[str, Any]]:
+        """The row with id `id_value`, using the id ranges to skip groups."""
+        if self.rows == 0 or not self.min_id <= id_value <= self.max_id:
+            return None
+        for key, group in self.groups.items():
+            if not group["min_id"] <= id_value <= group["max_id"]:
+                continue
+            offset, length = group["blocks"][self.id_column]
+            ids = _read_int_array(zlib.decompress(self._map[offset : offset + length]))
+            try:
+                index = ids.index(id_value)
+            except ValueError:
+                continue
+            return self._rows(key, group, index, index + 1)[0]
+        return None
@@ -0,0 +1,139 @@
+import logging
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.infrastructure.archive.segment import (
+    SegmentFormatError,
+    SegmentReader,
+    read_footer,
+)
+from app.infrastructure.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_SUFFIX = ".seg"
+_UNSAFE_PATH_CHARS = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+def _month(ts: datetime) -> str:
+    return f"{ts:%Y-%m}"
+
+
+class SegmentStore:
+    """
+    Segment files on local disk, one directory per namespace (e.g. tenant)
+    and month: <directory>/<namespace...>/<YYYY-MM>/<name>.seg. Readers of
+    recently used files are kept open, up to `max_open`. The id range of every
+    file seen is kept too, so id lookups open only the files that may match.
+    """
+
+    def __init__(self, directory: str, max_open: int):
+        self.directory = Path(directory)
+        self.max_open = max_open
+        # path -> (mtime, reader)
+        self._readers: "OrderedDict[Path, Tuple[float, SegmentReader]]" = OrderedDict()
+        # path -> (mtime, (min id, max id) or None when empty)
+        self._id_ranges: Dict[Path, Tuple[float, Optional[Tuple[int, int]]]] = {}
+        self._lock = threading.Lock()
+
+    def _namespace_dir(self, namespace: Sequence[str]) -> Path:
+        return self.directory.joinpath(
+            *(_UNSAFE_PATH_CHARS.sub("_", part) or "_" for part in namespace)
+        )
+
+    def segment_path(
+        self, namespace: Sequence[str], month: datetime, name: str
+    ) -> Path:
+        return (
+            self._namespace_dir(namespace) / _month(month) / f"{name}{SEGMENT_SUFFIX}"
+        )
+
+    def segment_paths(
+        self,
+        namespace: Sequence[str],
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[Path]:
+        """Segments of the months overlapping [start, end), or of all months."""
+        root = self._namespace_dir(namespace)
+        if not root.is_dir():
+            return []
+        paths = []
+        for month_dir in sorted(root.iterdir()):
+            month = month_dir.name
+            if start is not None and month < _month(start):
+                continue
+            if end is not None and month > _month(end):
+                continue
+            paths.extend(sorted(month_dir.glob(f"*{SEGMENT_SUFFIX}")))
+        return paths
+
+    def reader(self, path: Path) -> Optional[SegmentReader]:
+        """An open reader of `path`, or None if it vanished or is unreadable."""
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            cached = self._readers.get(path)
+            if cached is not None and cached[0] == mtime:
+                self._readers.move_to_end(path)
+                return cached[1]
+        try:
+            reader = SegmentReader(path)
+        except (OSError, SegmentFormatError):
+            logger.exception("Skipping unreadable archive segment %s", path)
+            return None
+        with self._lock:
+            self._readers[path] = (mtime, reader)
+            self._readers.move_to_end(path)
+            # Evicted readers are not closed: a request may still be reading
+            # them, and the mapping is released once the last reference goes
+            while len(self._readers) > self.max_open:
+                self._readers.popitem(last=False)
+        return reader
+
+    def id_range(self, path: Path) -> Optional[Tuple[int, int]]:
+        """
+        The lowest and highest id in `path`, read from its footer alone; None
+        if it holds no rows, vanished or is unreadable.
+        """
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            with self._lock:
+                self._id_ranges.pop(path, None)
+            return None
+        with self._lock:
+            cached = self._id_ranges.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        try:
+            footer = read_footer(path)
+        except (OSError, ValueError):
+            logger.exception("Skipping unreadable archive segment %s", path)
+            return None
+        id_range = None if not footer["rows"] else (footer["min_id"], footer["max_id"])
+        with self._lock:
+            self._id_ranges[path] = (mtime, id_range)
+        return id_range
+
+    def remove(self, path: Path) -> None:
+        with self._lock:
+            self._readers.pop(path, None)
+            self._id_ranges.pop(path, None)
+        path.unlink(missing_ok=True)
+        try:
+            path.parent.rmdir()
+        except OSError:
+            # Other segments remain in the month
+            pass
+
+
+segment_store = SegmentStore(
+    settings.EVENT_ARCHIVE_DIR, settings.EVENT_ARCHIVE_MAX_OPEN_SEGMENTS
+)
@@ -75,9 +75,167 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Raising the cost re-hashes passwords on each user's next login
+    BCRYPT_ROUNDS: int = 12
+    # Bulk imports hash passwords in this many processes (None: one per CPU)
+    PASSWORD_HASH_WORKERS: Optional[int] = None
+
+    # CSV user imports are validated, hashed and inserted this many rows at a time
+    USER_IMPORT_CHUNK_SIZE: int = 1_000
+    USER_IMPORT_MAX_ERRORS: int = 100
+
     # Environment
     ENVIRONMENT: str = "dev"
 
+    # Error event ingestion
+    EVENT_QUEUE_MAX_SIZE: int = 200_000
+    EVENT_FLUSH_BATCH_SIZE: int = 5_000
+    EVENT_FLUSH_INTERVAL_MS: int = 200
+    EVENT_ENQUEUE_TIMEOUT_MS: int = 50
+    EVENT_BATCH_MAX_SIZE: int = 1_000
+    # "enqueue": acknowledge once queued, "flush": acknowledge once committed
+    EVENT_ACK_MODE: str = "enqueue"
+    EVENT_FLUSH_TIMEOUT_SECONDS: float = 10.0
+
+    # Error event partitioning ("day" or "week")
+    EVENT_PARTITION_INTERVAL: str = "day"
+    EVENT_PARTITION_PREMAKE: int = 7
+    EVENT_PARTITION_BTREE_DAYS: int = 14
+    EVENT_RETENTION_DAYS: int = 730
+    # "detach" keeps expired partitions as standalone tables, "drop" deletes them
+    EVENT_RETENTION_ACTION: str = "detach"
+    EVENT_QUERY_MAX_RANGE_DAYS: int = 31
+    # Sector stats (/sectors/{id}/stats) are public, so both the time range and
+    # the number of buckets a response may hold are capped
+    EVENT_STATS_MAX_RANGE_DAYS: int = 366
+    EVENT_STATS_MAX_BUCKETS: int = 1_500
+    # Cold archive. Partitions older than EVENT_ARCHIVE_AFTER_DAYS are moved
+    # to compressed segment files under EVENT_ARCHIVE_DIR (shared by every API
+    # replica) and dropped; event reads over older ranges include them.
+    # Archiving takes precedence over EVENT_RETENTION_ACTION
+    EVENT_ARCHIVE_ENABLED: bool = False
+    EVENT_ARCHIVE_AFTER_DAYS: int = 90
+    EVENT_ARCHIVE_DIR: str = "/var/lib/pulse-flow/archive"
+    EVENT_ARCHIVE_MAX_OPEN_SEGMENTS: int = 256
+
+    # Error event fingerprinting: share of repeat occurrences kept as full rows
+    # for sectors without their own event_sample_rate
+    EVENT_DEFAULT_SAMPLE_RATE: float = 0.01
+    EVENT_FINGERPRINT_CACHE_SIZE: int = 100_000
+    EVENT_FINGERPRINT_CACHE_TTL_SECONDS: float = 3600.0
+
+    # Audit trail of user and sector changes, written behind the requests
+    # making them in batches of AUDIT_FLUSH_BATCH_SIZE rows. A full buffer
+    # falls back to writing synchronously
+    AUDIT_QUEUE_MAX_SIZE: int = 50_000
+    AUDIT_FLUSH_BATCH_SIZE: int = 1_000
+    AUDIT_FLUSH_INTERVAL_MS: int = 500
+    AUDIT_QUERY_MAX_RANGE_DAYS: int = 366
+
+    # Live feed (SSE / WebSocket)
+    LIVE_FEED_QUEUE_SIZE: int = 100
+    LIVE_FEED_HISTORY_SIZE: int = 500
+    LIVE_FEED_HEARTBEAT_SECONDS: float = 15.0
+
+    # Change feeds hold back rows younger than this so late commits are not skipped
+    CHANGE_FEED_SETTLE_SECONDS: float = 5.0
+    CHANGE_FEED_MAX_LIMIT: int = 1_000
+
+    # Background jobs. Workers use their own connection pool, separate from requests
+    JOB_RUNNER_IN_PROCESS: bool = True
+    JOB_WORKER_CONCURRENCY: int = 2
+    JOB_POLL_INTERVAL_SECONDS: float = 2.0
+    # A running job whose lease lapses (crashed worker) is picked up again
+    JOB_LEASE_SECONDS: float = 300.0
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_BACKOFF_SECONDS: float = 30.0
+    # Finished jobs are deleted this long after finishing, checked by the
+    # runner at most once per JOB_PURGE_INTERVAL_SECONDS per tenant
+    JOB_RETENTION_DAYS: int = 30
+    JOB_PURGE_INTERVAL_SECONDS: float = 3_600.0
+
+    # Multi-tenant routing. The default database doubles as the directory
+    # holding public.tenant_shards; other shards are listed here as JSON,
+    # e.g. SHARD_DATABASE_URIS='{"shard2": "postgresql+psycopg2://..."}'
+    TENANT_ROUTING_ENABLED: bool = False
+    # Requests to <tenant>.<suffix> are routed to <tenant>
+    TENANT_HOST_SUFFIX: Optional[str] = None
+    TENANT_ROUTES_CACHE_TTL_SECONDS: float = 30.0
+    SHARD_DATABASE_URIS: Dict[str, str] = {}
+    SHARD_POOL_SIZE: int = 5
+    SHARD_MAX_OVERFLOW: int = 10
+    SHARD_ENGINE_IDLE_SECONDS: float = 900.0
+
+    # Database budgets per route class. Transactions of a request run with SET
+    # LOCAL statement_timeout, and list reads return at most max_rows rows
+    # (0: no cap). Routes pick a class with Depends(budget("search"))
+    DB_BUDGETS: Dict[str, Dict[str, int]] = {
+        "default": {"statement_timeout_ms": 5_000, "max_rows": 10_000},
+        "search": {"statement_timeout_ms": 1_000, "max_rows": 1_000},
+        "bulk": {"statement_timeout_ms": 120_000, "max_rows": 0},
+    }
+    # Waiting longer than this for a pooled connection answers 503
+    DB_POOL_TIMEOUT_SECONDS: float = 5.0
+    # How often budgeted requests check whether the client is still there
+    DB_DISCONNECT_POLL_SECONDS: float = 0.5
+
+    # List and search counts (count=exact|estimated|auto). "auto" counts
+    # exactly up to COUNT_EXACT_MAX_ROWS estimated rows and estimates above.
+    # Counts are cached for COUNT_CACHE_TTL_SECONDS
+    COUNT_EXACT_MAX_ROWS: int = 100_000
+    COUNT_MAX_FACET_VALUES: int = 20
+    COUNT_CACHE_SIZE: int = 1_000
+    COUNT_CACHE_TTL_SECONDS: float = 10.0
+
+    # Idempotency-Key on POST/PUT/PATCH/DELETE. Responses are replayed to
+    # retries for IDEMPOTENCY_TTL_SECONDS; a duplicate of a running request
+    # waits up to IDEMPOTENCY_WAIT_SECONDS for it, then gets 409. A running
+    # request holds its key for IDEMPOTENCY_LOCK_SECONDS at most, which must
+    # outlast the longest statement_timeout in DB_BUDGETS (bulk: 120 s)
+    IDEMPOTENCY_TTL_SECONDS: int = 86_400
+    IDEMPOTENCY_LOCK_SECONDS: int = 180
+    IDEMPOTENCY_WAIT_SECONDS: float = 10.0
+    IDEMPOTENCY_POLL_INTERVAL_MS: int = 100
+    IDEMPOTENCY_MAX_BODY_BYTES: int = 65_536
+    IDEMPOTENCY_MAX_RESPONSE_BYTES: int = 65_536
+    IDEMPOTENCY_CACHE_SIZE: int = 10_000
+    IDEMPOTENCY_CACHE_TTL_SECONDS: float = 300.0
+    IDEMPOTENCY_PURGE_INTERVAL_SECONDS: float = 300.0
+
+    # Migrations (scripts/migrate.py). DDL gives up on a lock after
+    # MIGRATION_LOCK_TIMEOUT_MS instead of stalling every write queued behind
+    # it, and the upgrade is retried; replicas wait this long for the one
+    # holding the migration lock
+    MIGRATION_LOCK_TIMEOUT_MS: int = 5_000
+    MIGRATION_RETRIES: int = 3
+    MIGRATION_LOCK_WAIT_SECONDS: float = 600.0
+    # Batched backfills (app.infrastructure.db.online_ddl): rows per committed
+    # batch and the statement timeout of each batch
+    MIGRATION_BACKFILL_BATCH_SIZE: int = 5_000
+    MIGRATION_BACKFILL_STATEMENT_TIMEOUT_MS: int = 30_000
+
+    # Request profiling. Off by default: the middleware is not even installed.
+    # When on, a request is profiled if it sends X-Profile-Token matching
+    # PROFILING_TOKEN, or at random with PROFILING_SAMPLE_RATE
+    PROFILING_ENABLED: bool = False
+    PROFILING_TOKEN: Optional[str] = None
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_INTERVAL_MS: float = 5.0
+    PROFILING_DIR: str = "/tmp/pulse-flow-profiles"
+    PROFILING_MAX_KEPT: int = 200
+
+    # Tracing. Requests carrying a sampled W3C traceparent are always traced,
+    # others with TRACING_SAMPLE_RATIO. Spans are exported as OTLP/JSON to a
+    # collector (e.g. http://localhost:4318/v1/traces) and/or a JSON lines file
+    TRACING_ENABLED: bool = False
+    TRACING_SAMPLE_RATIO: float = 0.01
+    TRACING_SERVICE_NAME: str = "pulse-flow-api"
+    TRACING_OTLP_ENDPOINT: Optional[str] = None
+    TRACING_EXPORT_FILE: Optional[str] = None
+    TRACING_QUEUE_MAX_SIZE: int = 10_000
+    TRACING_EXPORT_BATCH_SIZE: int = 512
+    TRACING_EXPORT_INTERVAL_MS: int = 2_000
+
     SQLALCHEMY_DATABASE_URI: Optional[PostgresDsn] = None
 
     @field_validator("POSTGRES_PORT", mode="before")
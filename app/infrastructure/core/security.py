@@ -1,25 +1,89 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-from jose import jwt
+from jose import JWTError, jwt
 from passlib.context import CryptContext
+from starlette.requests import HTTPConnection
 
 from app.infrastructure.core.config import settings
+from app.infrastructure.tracing.tracer import traced, tracer
+
+# Request state entry holding the decoded bearer token (see token_claims)
+_CLAIMS_STATE_KEY = "token_claims"
 
 # Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
 
 
+@traced("bcrypt.verify")
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash."""
     return pwd_context.verify(plain_password, hashed_password)
 
 
+@traced("bcrypt.verify")
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and, if its hash uses outdated settings (e.g. a lower
+    bcrypt cost), return a fresh hash to store in its place.
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    return pwd_context.needs_update(hashed_password)
+
+
+@traced("bcrypt.hash")
 def get_password_hash(password: str) -> str:
     """Generate a password hash."""
     return pwd_context.hash(password)
 
 
+_HASH_WORKERS = settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1
+_hash_pool: Optional[ProcessPoolExecutor] = None
+_hash_pool_lock = threading.Lock()
+
+
+def _get_hash_pool() -> ProcessPoolExecutor:
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            # Spawned, not forked: the parent holds DB pools and worker threads
+            _hash_pool = ProcessPoolExecutor(
+                max_workers=_HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _hash_pool
+
+
+def hash_passwords(passwords: Sequence[str]) -> List[str]:
+    """
+    Hash many passwords across a process pool. bcrypt is CPU-bound, so bulk
+    imports would otherwise be limited to one core.
+    """
+    if len(passwords) <= 1:
+        return [get_password_hash(password) for password in passwords]
+    chunksize = max(1, len(passwords) // (_HASH_WORKERS * 4))
+    return list(_get_hash_pool().map(get_password_hash, passwords, chunksize=chunksize))
+
+
+def shutdown_password_hash_pool() -> None:
+    global _hash_pool
+    with _hash_pool_lock:
+        pool, _hash_pool = _hash_pool, None
+    if pool is not None:
+        pool.shutdown()
+
+
 def create_access_token(
     data: Dict[str, Any], expires_delta: Optional[timedelta] = None
 ) -> str:
@@ -38,4 +102,30 @@ def create_access_token(
         to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
     )
 
-    return encoded_jwt 
\ No newline at end of file
+    return encoded_jwt 
+
+
+def token_claims(connection: HTTPConnection) -> Optional[Dict[str, Any]]:
+    """
+    Claims of the request's bearer token, or None without a valid one. The
+    token is decoded once per request; tenant routing, idempotency keys and
+    authentication all read the result kept in the request state.
+    """
+    authorization = connection.headers.get("authorization", "")
+    state = connection.scope.setdefault("state", {})
+    cached = state.get(_CLAIMS_STATE_KEY)
+    if cached is not None and cached[0] == authorization:
+        return cached[1]
+    claims = None
+    if authorization.lower().startswith("bearer "):
+        try:
+            with tracer.span("jwt.decode"):
+                claims = jwt.decode(
+                    authorization[7:],
+                    settings.SECRET_KEY,
+                    algorithms=[settings.ALGORITHM],
+                )
+        except JWTError:
+            pass
+    state[_CLAIMS_STATE_KEY] = (authorization, claims)
+    return claims
@@ -0,0 +1,205 @@
+"""
+Field-level change capture for audited models.
+
+A model opts in by declaring what it is called in the audit trail:
+
+    class User(Base):
+        __audit__ = AuditOptions("user", redact=("password",))
+
+Diffs of its rows created, updated or deleted through the ORM are collected
+on flush and handed to the registered sink once the transaction commits, so
+rolled-back changes are never reported and the request pays for no extra
+statement. Writes that bypass the ORM (bulk INSERT/UPDATE statements) report
+their changes with `change_capture.add`, e.g. built by `record_created`.
+"""
+import logging
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.infrastructure.db.sharding import TenantRoute, session_route
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "audit_pending"
+_ACTOR_KEY = "audit_actor_id"
+REDACTED = "[redacted]"
+
+
+class AuditOptions(NamedTuple):
+    entity: str
+    # Recorded as changed, without their values
+    redact: Sequence[str] = ()
+    # Not recorded at all
+    ignore: Sequence[str] = ("created_at", "updated_at")
+
+
+class ChangeRecord(NamedTuple):
+    entity: str
+    entity_id: int
+    # "create", "update" or "delete"
+    action: str
+    # field -> [old, new]
+    changes: Dict[str, List[Any]]
+    actor_id: Optional[int]
+    occurred_at: datetime
+
+
+Sink = Callable[[TenantRoute, List[ChangeRecord]], None]
+
+
+def set_actor(db: Session, actor_id: Optional[int]) -> None:
+    """Attribute the changes made through `db` to user `actor_id`."""
+    db.info[_ACTOR_KEY] = actor_id
+
+
+def _plain(value: Any) -> Any:
+    """JSON-friendly form of a column value."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+class ChangeCapture:
+    def __init__(self) -> None:
+        self._sink: Optional[Sink] = None
+
+    def set_sink(self, sink: Sink) -> None:
+        self._sink = sink
+
+    def add(self, db: Session, records: Iterable[ChangeRecord]) -> None:
+        """Report changes made without the ORM; delivered with the ORM's on commit."""
+        db.info.setdefault(_PENDING_KEY, []).extend(records)
+
+    def record(
+        self,
+        db: Session,
+        entity: str,
+        entity_id: int,
+        action: str,
+        changes: Dict[str, List[Any]],
+    ) -> ChangeRecord:
+        """A ChangeRecord attributed to the actor of `db`, stamped now."""
+        return ChangeRecord(
+            entity=entity,
+            entity_id=entity_id,
+            action=action,
+            changes={
+                name: [_plain(old), _plain(new)] for name, (old, new) in changes.items()
+            },
+            actor_id=db.info.get(_ACTOR_KEY),
+            occurred_at=datetime.now(timezone.utc),
+        )
+
+    def record_created(
+        self, db: Session, model: type, entity_id: int, values: Dict[str, Any]
+    ) -> ChangeRecord:
+        """
+        Record of a `model` row inserted without the ORM, with the given column
+        values.
+        """
+        options: AuditOptions = model.__audit__
+        changes = {
+            key: [None, REDACTED if key in options.redact else value]
+            for key, value in values.items()
+            if key not in options.ignore and value is not None
+        }
+        return self.record(db, options.entity, entity_id, "create", changes)
+
+    def _diff(
+        self, obj: Any, options: AuditOptions, action: str
+    ) -> Dict[str, List[Any]]:
+        state = inspect(obj)
+        changes: Dict[str, List[Any]] = {}
+        for attr in state.mapper.column_attrs:
+            key = attr.key
+            if key in options.ignore:
+                continue
+            if action == "update":
+                history = state.attrs[key].history
+                if not history.added and not history.deleted:
+                    continue
+                old = history.deleted[0] if history.deleted else None
+                new = history.added[0] if history.added else None
+                if old == new:
+                    continue
+            elif key not in state.dict:
+                # Deferred and never loaded
+                continue
+            elif action == "create":
+                old, new = None, state.dict[key]
+                if new is None:
+                    continue
+            else:
+                old, new = state.dict[key], None
+            if key in options.redact:
+                old = None if action == "create" else REDACTED
+                new = None if action == "delete" else REDACTED
+            changes[key] = [old, new]
+        return changes
+
+    def _after_flush(self, session: Session, flush_context: Any) -> None:
+        found: List[Tuple[Any, str]] = (
+            [(obj, "create") for obj in session.new]
+            + [(obj, "update") for obj in session.dirty]
+            + [(obj, "delete") for obj in session.deleted]
+        )
+        records = []
+        for obj, action in found:
+            options = getattr(type(obj), "__audit__", None)
+            if options is None:
+                continue
+            changes = self._diff(obj, options, action)
+            if action == "update" and not changes:
+                continue
+            # The identity key is only assigned after this hook; the INSERT has
+            # set the id
+            entity_id = inspect(obj).mapper.primary_key_from_instance(obj)[0]
+            records.append(
+                self.record(session, options.entity, entity_id, action, changes)
+            )
+        if records:
+            self.add(session, records)
+
+    def _after_commit(self, session: Session) -> None:
+        records = session.info.pop(_PENDING_KEY, None)
+        if not records:
+            return
+        if self._sink is None:
+            logger.warning(
+                "Dropped %d audit records: no audit sink is registered", len(records)
+            )
+            return
+        try:
+            self._sink(session_route(session), records)
+        except Exception:
+            # The changes are committed; failing the request now would only
+            # mislead the caller
+            logger.exception("Failed to hand over %d audit records", len(records))
+
+    def _after_rollback(self, session: Session) -> None:
+        session.info.pop(_PENDING_KEY, None)
+
+    def install(self) -> None:
+        event.listen(Session, "after_flush", self._after_flush)
+        event.listen(Session, "after_commit", self._after_commit)
+        event.listen(Session, "after_rollback", self._after_rollback)
+
+
+change_capture = ChangeCapture()
+change_capture.install()
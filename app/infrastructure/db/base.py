@@ -1,4 +1,10 @@
 # Import all models that should be included in the migrations
 from app.infrastructure.db.session import Base
 from app.domain.user.models.user import User
-from app.domain.sector.models.sector import Sector 
\ No newline at end of file
+from app.domain.sector.models.sector import Sector 
+from app.domain.event.models.event import ErrorEvent
+from app.domain.event.models.rollup import SectorEventRollup
+from app.domain.event.models.issue import ErrorIssue
+from app.domain.job.models.job import Job, JobInput
+from app.domain.idempotency.models.idempotency import IdempotencyKey
+from app.domain.audit.models.audit import AuditLog
@@ -0,0 +1,187 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class QueueFullError(Exception):
+    """Raised when the writer cannot accept more items within the timeout."""
+
+
+class WriterStoppedError(Exception):
+    """Raised when items are submitted to a writer that is not running."""
+
+
+class FlushTicket:
+    """
+    Completion handle for one submission.
+    A submission may be split across several flushes; the ticket is done once
+    every item it carried has been flushed (or a flush carrying it failed).
+    """
+
+    def __init__(self, size: int):
+        self._remaining = size
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self.error: Optional[BaseException] = None
+
+    def _settle(self, count: int, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            if error is not None and self.error is None:
+                self.error = error
+            self._remaining -= count
+            if self._remaining <= 0 or error is not None:
+                self._done.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until flushed. Returns False on timeout, raises if the flush failed."""
+        if not self._done.wait(timeout):
+            return False
+        if self.error is not None:
+            raise self.error
+        return True
+
+
+class BatchWriter(Generic[T]):
+    """
+    Bounded in-memory buffer drained by a single background thread.
+
+    Producers call `submit` from request threads; the writer thread hands the
+    buffered items to `flush` whenever `batch_size` items are waiting or the
+    oldest item has waited `flush_interval` seconds, whichever comes first.
+    A full buffer pushes back on producers instead of growing without bound.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        flush: Callable[[List[T]], None],
+        *,
+        max_size: int,
+        batch_size: int,
+        flush_interval: float,
+    ):
+        self.name = name
+        self._flush = flush
+        self._max_size = max_size
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+
+        self._buffer: Deque[Tuple[T, Optional[FlushTicket]]] = deque()
+        self._oldest: float = 0.0
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    def start(self) -> None:
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name=f"{self.name}-writer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop accepting items and wait for the buffer to be drained."""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(
+        self, items: Sequence[T], *, timeout: float = 0.0, track: bool = False
+    ) -> Optional[FlushTicket]:
+        """
+        Enqueue all items or none of them.
+        Waits up to `timeout` seconds for room before raising QueueFullError.
+        With `track=True` a FlushTicket is returned to wait for the flush.
+        """
+        count = len(items)
+        if count > self._max_size:
+            raise QueueFullError(
+                f"Submission of {count} items exceeds {self.name} capacity"
+            )
+        ticket = FlushTicket(count) if track else None
+        deadline = time.monotonic() + timeout
+
+        with self._lock:
+            while self._running and len(self._buffer) + count > self._max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise QueueFullError(f"{self.name} queue is full")
+                self._not_full.wait(remaining)
+            if not self._running:
+                raise WriterStoppedError(f"{self.name} writer is not running")
+
+            if not self._buffer:
+                self._oldest = time.monotonic()
+            self._buffer.extend((item, ticket) for item in items)
+            if len(self._buffer) >= self._batch_size:
+                self._not_empty.notify()
+            elif len(self._buffer) == count:
+                # First items after an idle period: arm the interval timer
+                self._not_empty.notify()
+        return ticket
+
+    def _take_batch(self) -> Optional[List[Tuple[T, Optional[FlushTicket]]]]:
+        with self._lock:
+            while True:
+                if not self._buffer:
+                    if not self._running:
+                        return None
+                    self._not_empty.wait()
+                    continue
+                if len(self._buffer) >= self._batch_size or not self._running:
+                    break
+                remaining = self._oldest + self._flush_interval - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._not_empty.wait(remaining)
+
+            size = min(self._batch_size, len(self._buffer))
+            batch = [self._buffer.popleft() for _ in range(size)]
+            self._oldest = time.monotonic()
+            self._not_full.notify_all()
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._take_batch()
+            if batch is None:
+                return
+            self._flush_batch(batch)
+
+    def _flush_batch(self, batch: List[Tuple[T, Optional[FlushTicket]]]) -> None:
+        error: Optional[BaseException] = None
+        try:
+            self._flush([item for item, _ in batch])
+        except Exception as exc:  # keep the writer alive, report to waiters
+            logger.exception(
+                "%s writer failed to flush %d items", self.name, len(batch)
+            )
+            error = exc
+
+        settled = {}
+        for _, ticket in batch:
+            if ticket is not None:
+                settled[ticket] = settled.get(ticket, 0) + 1
+        for ticket, count in settled.items():
+            ticket._settle(count, error)
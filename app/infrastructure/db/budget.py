@@ -0,0 +1,129 @@
+import logging
+import threading
+from collections import Counter
+from typing import Any, Dict, NamedTuple, Optional
+
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.infrastructure.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGET_NAME = "default"
+# SQLSTATE query_canceled: statement_timeout or a cancel request
+QUERY_CANCELED = "57014"
+
+
+class QueryBudget(NamedTuple):
+    """Database limits for a class of routes."""
+
+    name: str
+    statement_timeout_ms: int
+    # 0 leaves list reads uncapped
+    max_rows: int
+
+
+def _load_budgets(config: Dict[str, Dict[str, int]]) -> Dict[str, QueryBudget]:
+    budgets = {
+        name: QueryBudget(
+            name=name,
+            statement_timeout_ms=int(values.get("statement_timeout_ms", 0)),
+            max_rows=int(values.get("max_rows", 0)),
+        )
+        for name, values in config.items()
+    }
+    budgets.setdefault(DEFAULT_BUDGET_NAME, QueryBudget(DEFAULT_BUDGET_NAME, 0, 0))
+    return budgets
+
+
+BUDGETS = _load_budgets(settings.DB_BUDGETS)
+
+
+def get_budget(name: str) -> QueryBudget:
+    try:
+        return BUDGETS[name]
+    except KeyError:
+        raise ValueError(f"Unknown database budget '{name}'") from None
+
+
+def session_budget(db: Session) -> Optional[QueryBudget]:
+    """The request budget of a session; None for background sessions."""
+    return db.info.get("db_budget")
+
+
+def rows_capped(db: Session) -> bool:
+    """Whether a list read of the session stopped at its budget's max_rows."""
+    return db.info.get("rows_capped", False)
+
+
+def is_query_canceled(exc: BaseException) -> bool:
+    return (
+        isinstance(exc, DBAPIError)
+        and getattr(exc.orig, "pgcode", None) == QUERY_CANCELED
+    )
+
+
+class QueryCanceller:
+    """
+    Lets another thread cancel the statement a session is running, e.g. once
+    the client has disconnected. The DBAPI connection is only attached while
+    the session's transaction holds it, so a cancel never reaches a connection
+    already handed back to the pool.
+    """
+
+    def __init__(self) -> None:
+        self.cancelled = False
+        self._dbapi_connection: Any = None
+        self._lock = threading.Lock()
+
+    def attach(self, dbapi_connection: Any) -> None:
+        with self._lock:
+            self._dbapi_connection = dbapi_connection
+
+    def detach(self) -> None:
+        with self._lock:
+            self._dbapi_connection = None
+
+    def cancel(self) -> bool:
+        """Cancel the running statement, if any. Blocks for a round trip."""
+        with self._lock:
+            self.cancelled = True
+            if self._dbapi_connection is None:
+                return False
+            try:
+                self._dbapi_connection.cancel()
+            except Exception:
+                logger.warning("Could not cancel query", exc_info=True)
+                return False
+            return True
+
+
+class BudgetStats:
+    """Budget violations per budget name, for /internal/db-budgets."""
+
+    EVENTS = (
+        "requests",
+        "statement_timeouts",
+        "pool_timeouts",
+        "rows_capped",
+        "client_disconnects",
+    )
+
+    def __init__(self) -> None:
+        self._counts: Dict[str, Counter] = {}
+        self._lock = threading.Lock()
+
+    def record(self, budget_name: str, event: str) -> None:
+        with self._lock:
+            self._counts.setdefault(budget_name, Counter())[event] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {
+                name: {event: counts[event] for event in self.EVENTS}
+                for name, counts in self._counts.items()
+            }
+
+
+budget_stats = BudgetStats()
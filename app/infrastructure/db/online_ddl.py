@@ -0,0 +1,142 @@
+"""
+Migration operations that keep the tables writable while they run.
+
+A plain CREATE INDEX blocks writes to the table for the whole build, and a
+single UPDATE over a large table holds its row locks until it commits. These
+helpers build indexes CONCURRENTLY and backfill in small committed batches.
+Both run outside the migration's transaction, so a migration using them
+should not mix them with changes that must be atomic.
+
+    from app.infrastructure.db.online_ddl import (
+        backfill_in_batches,
+        create_index_concurrently,
+    )
+
+    def upgrade() -> None:
+        create_index_concurrently("ix_users_name", "users", ["name"])
+"""
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional, Sequence
+
+from alembic import op
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.infrastructure.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@contextmanager
+def _setting(bind: Connection, name: str, value: str) -> Iterator[None]:
+    """Change a session setting for the block, then restore it."""
+    previous = bind.execute(
+        text("SELECT current_setting(:name)"), {"name": name}
+    ).scalar_one()
+    bind.execute(
+        text("SELECT set_config(:name, :value, false)"), {"name": name, "value": value}
+    )
+    try:
+        yield
+    finally:
+        bind.execute(
+            text("SELECT set_config(:name, :value, false)"),
+            {"name": name, "value": previous},
+        )
+
+
+def _index_is_valid(bind: Connection, index_name: str) -> Optional[bool]:
+    """None if the index does not exist; False if a concurrent build left it invalid."""
+    return bind.execute(
+        text("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"),
+        {"name": index_name},
+    ).scalar()
+
+
+def create_index_concurrently(
+    index_name: str, table_name: str, columns: Sequence[Any], **kw: Any
+) -> None:
+    """
+    op.create_index without blocking writes. Safe to rerun: an existing index
+    is kept, and the invalid leftover of an interrupted build is rebuilt.
+    """
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        valid = _index_is_valid(bind, index_name)
+        if valid:
+            return
+        # The build waits for transactions older than itself, never blocks
+        # writers, and can take a while on a large table: no timeouts
+        with _setting(bind, "lock_timeout", "0"), _setting(
+            bind, "statement_timeout", "0"
+        ):
+            if valid is False:
+                op.drop_index(
+                    index_name, table_name=table_name, postgresql_concurrently=True
+                )
+            started = time.monotonic()
+            op.create_index(
+                index_name, table_name, columns, postgresql_concurrently=True, **kw
+            )
+        logger.info("Built index %s in %.1fs", index_name, time.monotonic() - started)
+
+
+def drop_index_concurrently(index_name: str, table_name: str) -> None:
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        if _index_is_valid(bind, index_name) is None:
+            return
+        with _setting(bind, "lock_timeout", "0"):
+            op.drop_index(
+                index_name, table_name=table_name, postgresql_concurrently=True
+            )
+
+
+def backfill_in_batches(
+    table_name: str,
+    set_clause: str,
+    where: str,
+    *,
+    key: str = "id",
+    batch_size: int = settings.MIGRATION_BACKFILL_BATCH_SIZE,
+    statement_timeout_ms: int = settings.MIGRATION_BACKFILL_STATEMENT_TIMEOUT_MS,
+    pause_seconds: float = 0.0,
+) -> int:
+    """
+    UPDATE `table_name` SET `set_clause` on the rows matching `where`, at most
+    `batch_size` rows per committed statement, until no row matches. `where`
+    must stop matching a row once it is updated (e.g. "new_column IS NULL"),
+    and `key` must identify rows. Returns the number of rows updated.
+
+        backfill_in_batches("users", "is_active = true", "is_active IS NULL")
+    """
+    statement = text(
+        f"UPDATE {table_name} SET {set_clause} "
+        f"WHERE {key} IN ("
+        f"SELECT {key} FROM {table_name} WHERE {where} LIMIT :batch_size"
+        ") "
+        f"AND ({where})"
+    )
+    total = 0
+    started = time.monotonic()
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        with _setting(bind, "statement_timeout", str(int(statement_timeout_ms))):
+            while True:
+                updated = bind.execute(statement, {"batch_size": batch_size}).rowcount
+                total += updated
+                if updated == 0:
+                    break
+                logger.info("Backfilled %d rows of %s", total, table_name)
+                if pause_seconds:
+                    # Lets replicas and autovacuum keep up on long backfills
+                    time.sleep(pause_seconds)
+    logger.info(
+        "Backfilled %d rows of %s in %.1fs",
+        total,
+        table_name,
+        time.monotonic() - started,
+    )
+    return total
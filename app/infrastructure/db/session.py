@@ -1,18 +1,120 @@
-from sqlalchemy import create_engine
+from typing import Optional
+
+from fastapi import HTTPException, Request, status
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.requests import HTTPConnection
 
 from app.infrastructure.core.config import settings
+from app.infrastructure.db.budget import BUDGETS, DEFAULT_BUDGET_NAME, budget_stats
+from app.infrastructure.db.sharding import (
+    DEFAULT_ROUTE,
+    ShardEngines,
+    TenantMismatchError,
+    TenantNotFoundError,
+    TenantRoute,
+    TenantRouter,
+    TenantUnavailableError,
+    tenant_from_connection,
+)
+from app.infrastructure.tracing.tracer import tracer
 
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+engine = create_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI), pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS
+)
+# Objects stay loaded after commit so responses serialize without a reload
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
 
 Base = declarative_base()
 
+shard_engines = ShardEngines(
+    engine, settings.SHARD_DATABASE_URIS, settings.SHARD_ENGINE_IDLE_SECONDS
+)
+tenant_router = TenantRouter(
+    engine,
+    enabled=settings.TENANT_ROUTING_ENABLED,
+    ttl=settings.TENANT_ROUTES_CACHE_TTL_SECONDS,
+)
+
+
+@event.listens_for(SessionLocal, "after_begin")
+def _set_transaction_locals(session, transaction, connection) -> None:
+    # SET LOCAL ends with the transaction, so pooled connections come back clean.
+    # Sent as one round trip per transaction
+    statements = []
+    schema = session.info.get("tenant_route", DEFAULT_ROUTE).schema
+    if schema is not None:
+        # Only the tenant's schema: a table missing from it must fail rather
+        # than resolve to another tenant's data in public. Shared tables are
+        # schema-qualified (public.tenant_shards)
+        statements.append(f'SET LOCAL search_path TO "{schema}"')
+    budget = session.info.get("db_budget")
+    if budget is not None and budget.statement_timeout_ms:
+        statements.append(
+            f"SET LOCAL statement_timeout = {int(budget.statement_timeout_ms)}"
+        )
+    if statements:
+        connection.exec_driver_sql("; ".join(statements))
+    canceller = session.info.get("query_canceller")
+    if canceller is not None:
+        canceller.attach(connection.connection.dbapi_connection)
+
+
+@event.listens_for(SessionLocal, "after_transaction_end")
+def _detach_query_canceller(session, transaction) -> None:
+    canceller = session.info.get("query_canceller")
+    if canceller is not None and transaction.parent is None:
+        canceller.detach()
+
+
+def open_session(
+    route: Optional[TenantRoute] = None, engines: Optional[ShardEngines] = None
+) -> Session:
+    """
+    Session on the route's shard, with only its schema on the search_path.
+    Background workers pass their own `engines` to stay off the request pools.
+    """
+    route = route or DEFAULT_ROUTE
+    db = SessionLocal(bind=(engines or shard_engines).get(route.shard))
+    db.info["tenant_route"] = route
+    return db
+
+
+def resolve_route(connection: HTTPConnection) -> TenantRoute:
+    """Route of the tenant a request or WebSocket is for, as HTTP errors if none."""
+    try:
+        return tenant_router.resolve(tenant_from_connection(connection))
+    except TenantMismatchError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    except TenantNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except TenantUnavailableError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "30"},
+        )
+
 
-def get_db():
-    db = SessionLocal()
+def get_db(request: Request):
+    """
+    Request-scoped session on the tenant's shard. Writes are committed by the
+    service's unit of work; anything left uncommitted when the request ends is
+    rolled back on close. Transactions run within the route's database budget
+    (see app.api.budget), else the default one.
+    """
+    with tracer.span("get_db"):
+        db = open_session(resolve_route(request))
+    budget = getattr(request.state, "db_budget", None) or BUDGETS[DEFAULT_BUDGET_NAME]
+    db.info["db_budget"] = budget
+    canceller = getattr(request.state, "query_canceller", None)
+    if canceller is not None:
+        db.info["query_canceller"] = canceller
+    budget_stats.record(budget.name, "requests")
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
@@ -0,0 +1,236 @@
+import logging
+import re
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from starlette.requests import HTTPConnection
+
+from app.infrastructure.core.config import settings
+from app.infrastructure.core.security import token_claims
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SHARD = "default"
+# Tenant schemas are interpolated into SET search_path, so keep them to plain
+# identifiers
+SCHEMA_NAME_PATTERN = re.compile(r"[a-z_][a-z0-9_]{0,62}")
+# Unknown tenants trigger a routing table reload at most this often
+ROUTES_MISS_RELOAD_SECONDS = 1.0
+IDLE_CHECK_INTERVAL_SECONDS = 60.0
+
+
+class TenantRoute(NamedTuple):
+    """Where a tenant's data lives: a shard database and a schema on it."""
+
+    tenant: Optional[str]
+    shard: str
+    # None uses the connection's default search_path (single-tenant deployments)
+    schema: Optional[str]
+
+    @property
+    def key(self) -> str:
+        """Identifies the tenant's data for in-process caches."""
+        return f"{self.shard}/{self.schema or ''}"
+
+
+DEFAULT_ROUTE = TenantRoute(tenant=None, shard=DEFAULT_SHARD, schema=None)
+
+
+class TenantNotFoundError(LookupError):
+    pass
+
+
+class TenantUnavailableError(RuntimeError):
+    """The tenant exists but is not serving, e.g. while it moves between shards."""
+
+
+class TenantMismatchError(ValueError):
+    """The access token was issued for another tenant than the host names."""
+
+
+def session_route(db: Session) -> TenantRoute:
+    return db.info.get("tenant_route", DEFAULT_ROUTE)
+
+
+def tenant_from_connection(connection: HTTPConnection) -> Optional[str]:
+    """
+    Tenant named by the request: the access token's "tenant" claim, else the
+    subdomain in front of TENANT_HOST_SUFFIX. Invalid tokens are ignored here;
+    authentication rejects them later.
+    """
+    claims = token_claims(connection)
+    token_tenant = claims.get("tenant") if claims else None
+
+    host_tenant = None
+    suffix = settings.TENANT_HOST_SUFFIX
+    host = connection.headers.get("host", "").split(":")[0].lower()
+    if suffix and host.endswith(f".{suffix}"):
+        host_tenant = host[: -len(suffix) - 1]
+
+    if token_tenant and host_tenant and token_tenant != host_tenant:
+        raise TenantMismatchError("Access token was issued for another tenant")
+    return token_tenant or host_tenant
+
+
+class ShardEngines:
+    """
+    One engine (and connection pool) per shard, created on first use.
+    Engines of shards nobody has touched for a while are disposed, so a worker
+    serving a few hospitals does not hold idle pools open on every shard.
+    """
+
+    def __init__(
+        self,
+        default_engine: Engine,
+        urls: Dict[str, str],
+        idle_seconds: float,
+        pool_size: int = settings.SHARD_POOL_SIZE,
+        max_overflow: int = settings.SHARD_MAX_OVERFLOW,
+    ):
+        self._default = default_engine
+        self._urls = dict(urls)
+        self._idle_seconds = idle_seconds
+        self._pool_size = pool_size
+        self._max_overflow = max_overflow
+        self._engines: Dict[str, Tuple[Engine, float]] = {}
+        self._last_idle_check = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def shards(self) -> List[str]:
+        return [DEFAULT_SHARD] + [name for name in self._urls if name != DEFAULT_SHARD]
+
+    def url_for(self, shard: str) -> str:
+        if shard == DEFAULT_SHARD:
+            return str(settings.SQLALCHEMY_DATABASE_URI)
+        try:
+            return self._urls[shard]
+        except KeyError:
+            raise TenantNotFoundError(f"Unknown shard '{shard}'") from None
+
+    def get(self, shard: str) -> Engine:
+        if shard == DEFAULT_SHARD:
+            return self._default
+        now = time.monotonic()
+        with self._lock:
+            entry = self._engines.get(shard)
+            if entry is None:
+                shard_engine = create_engine(
+                    self.url_for(shard),
+                    pool_size=self._pool_size,
+                    max_overflow=self._max_overflow,
+                    pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+                    pool_pre_ping=True,
+                )
+            else:
+                shard_engine = entry[0]
+            self._engines[shard] = (shard_engine, now)
+            if now - self._last_idle_check > IDLE_CHECK_INTERVAL_SECONDS:
+                self._last_idle_check = now
+                self._evict_idle(now)
+        return shard_engine
+
+    def dispose(self) -> None:
+        with self._lock:
+            engines, self._engines = self._engines, {}
+        for shard_engine, _ in engines.values():
+            shard_engine.dispose()
+
+    def _evict_idle(self, now: float) -> None:
+        for shard, (shard_engine, last_used) in list(self._engines.items()):
+            # Never pull a pool out from under a session that is still using it
+            if (
+                now - last_used > self._idle_seconds
+                and shard_engine.pool.checkedout() == 0
+            ):
+                del self._engines[shard]
+                shard_engine.dispose()
+                logger.info("Disposed idle engine for shard %s", shard)
+
+
+class TenantRouter:
+    """
+    Resolves tenants to shards from the tenant_shards table in the directory
+    (default) database. The whole table is cached and reloaded every
+    TENANT_ROUTES_CACHE_TTL_SECONDS, so routing costs no query per request.
+    """
+
+    def __init__(self, directory_engine: Engine, enabled: bool, ttl: float):
+        self._engine = directory_engine
+        self._enabled = enabled
+        self._ttl = ttl
+        self._routes: Dict[str, Tuple[TenantRoute, str]] = {}
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    def resolve(self, tenant: Optional[str]) -> TenantRoute:
+        """
+        Route for `tenant`. Raises TenantNotFoundError for unknown tenants and
+        TenantUnavailableError for tenants that are not currently serving.
+        """
+        if not self._enabled:
+            return DEFAULT_ROUTE
+        if not tenant:
+            raise TenantNotFoundError("Tenant could not be determined from the request")
+        entry = self._load().get(tenant)
+        if (
+            entry is None
+            and time.monotonic() - self._loaded_at > ROUTES_MISS_RELOAD_SECONDS
+        ):
+            # Possibly a tenant added since the last load
+            entry = self._load(force=True).get(tenant)
+        if entry is None:
+            raise TenantNotFoundError(f"Unknown tenant '{tenant}'")
+        route, status = entry
+        if status != "active":
+            raise TenantUnavailableError(f"Tenant '{tenant}' is {status}")
+        return route
+
+    def all_routes(self) -> List[TenantRoute]:
+        """Every tenant, for background jobs that run per tenant."""
+        if not self._enabled:
+            return [DEFAULT_ROUTE]
+        return [route for route, _ in self._load(force=True).values()]
+
+    def active_routes(self) -> List[TenantRoute]:
+        """Serving tenants from the cached table, for frequent background polling."""
+        if not self._enabled:
+            return [DEFAULT_ROUTE]
+        return [route for route, status in self._load().values() if status == "active"]
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded_at = 0.0
+
+    def _load(self, force: bool = False) -> Dict[str, Tuple[TenantRoute, str]]:
+        with self._lock:
+            if force or time.monotonic() - self._loaded_at > self._ttl:
+                with self._engine.connect() as connection:
+                    rows = connection.execute(
+                        text(
+                            "SELECT tenant, shard, schema_name, status "
+                            "FROM public.tenant_shards"
+                        )
+                    ).all()
+                routes = {}
+                for row in rows:
+                    if not SCHEMA_NAME_PATTERN.fullmatch(row.schema_name):
+                        logger.warning(
+                            "Ignoring tenant %s with invalid schema name", row.tenant
+                        )
+                        continue
+                    routes[row.tenant] = (
+                        TenantRoute(row.tenant, row.shard, row.schema_name),
+                        row.status,
+                    )
+                self._routes = routes
+                self._loaded_at = time.monotonic()
+            return self._routes
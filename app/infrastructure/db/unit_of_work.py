@@ -0,0 +1,43 @@
+from types import TracebackType
+from typing import Optional, Type
+
+from sqlalchemy.orm import Session
+
+_DEPTH_KEY = "unit_of_work_depth"
+
+
+class UnitOfWork:
+    """
+    One transaction around a service operation.
+
+    Repositories only flush inside it; the outermost unit of work commits once
+    on success and rolls back on error, so a request that touches several rows
+    pays for a single commit and its writes are atomic. Nested units of work
+    join the enclosing one.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def __enter__(self) -> Session:
+        self.db.info[_DEPTH_KEY] = self.db.info.get(_DEPTH_KEY, 0) + 1
+        return self.db
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        depth = self.db.info[_DEPTH_KEY] - 1
+        self.db.info[_DEPTH_KEY] = depth
+        if depth:
+            return
+        if exc_type is None:
+            self.db.commit()
+        else:
+            self.db.rollback()
+
+
+def unit_of_work(db: Session) -> UnitOfWork:
+    return UnitOfWork(db)
@@ -0,0 +1,87 @@
+import asyncio
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+Message = Dict[str, Any]
+# (tenant, sector_id); the tenant is None in single-tenant deployments
+Topic = Tuple[Optional[str], int]
+
+
+class Subscriber:
+    def __init__(self, topic: Topic, queue_size: int):
+        self.topic = topic
+        self.queue: "asyncio.Queue[Message]" = asyncio.Queue(maxsize=queue_size)
+        # Set when the client fell too far behind; its stream should end so it
+        # reconnects and resumes from its last event id
+        self.dropped = False
+
+
+class LiveFeedBroker:
+    """
+    Fans live feed messages out to subscribed clients of one worker.
+    Runs entirely on the event loop: every client is a queue, not a thread.
+    Keeps a short per-sector history so reconnecting clients can resume.
+    Sectors are scoped by tenant, whose ids come from separate sequences.
+    """
+
+    def __init__(self, queue_size: int, history_size: int):
+        self._queue_size = queue_size
+        self._history_size = history_size
+        self._subscribers: Dict[Topic, Set[Subscriber]] = {}
+        self._history: Dict[Topic, Deque[Message]] = {}
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(subs) for subs in self._subscribers.values())
+
+    def subscribe(
+        self,
+        sector_id: int,
+        last_event_id: Optional[int] = None,
+        tenant: Optional[str] = None,
+    ) -> Subscriber:
+        topic = (tenant, sector_id)
+        subscriber = Subscriber(topic, self._queue_size)
+        if last_event_id is not None:
+            for message in self._replay(topic, last_event_id):
+                if subscriber.queue.full():
+                    break
+                subscriber.queue.put_nowait(message)
+        self._subscribers.setdefault(topic, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        subscribers = self._subscribers.get(subscriber.topic)
+        if subscribers is not None:
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del self._subscribers[subscriber.topic]
+
+    def publish(self, message: Message) -> None:
+        sector_id = message.get("sector_id")
+        if sector_id is None:
+            return
+        topic = (message.get("tenant"), sector_id)
+        history = self._history.get(topic)
+        if history is None:
+            history = self._history[topic] = deque(maxlen=self._history_size)
+        history.append(message)
+
+        for subscriber in list(self._subscribers.get(topic, ())):
+            try:
+                subscriber.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                subscriber.dropped = True
+                self.unsubscribe(subscriber)
+
+    def _replay(self, topic: Topic, last_event_id: int) -> List[Message]:
+        # Ids are taken when a transaction queues its messages but arrive in
+        # commit order, so a later message can carry a smaller id: replay what
+        # arrived after the client's last message rather than comparing ids
+        history = list(self._history.get(topic, ()))
+        for index, message in enumerate(history):
+            if message["id"] == last_event_id:
+                return history[index + 1 :]
+        # The message is older than our history or this worker never saw it:
+        # tell the client to refetch its state instead
+        return [{"id": last_event_id, "type": "resync", "sector_id": topic[1]}]
@@ -0,0 +1,119 @@
+import asyncio
+import json
+import logging
+from functools import partial
+from typing import Dict, Optional
+
+import psycopg2
+import psycopg2.extensions
+from sqlalchemy.engine import make_url
+
+from app.infrastructure.core.config import settings
+from app.infrastructure.db.session import shard_engines
+from app.infrastructure.live.broker import LiveFeedBroker
+from app.infrastructure.live.notify import LIVE_FEED_CHANNEL
+
+logger = logging.getLogger(__name__)
+
+RECONNECT_DELAY_SECONDS = 2.0
+
+
+class LiveFeedListener:
+    """
+    Holds one LISTEN connection per shard and worker and feeds its notifications
+    to the broker. The sockets are watched by the event loop, so no thread is used.
+    """
+
+    def __init__(self, broker: LiveFeedBroker):
+        self.broker = broker
+        self._conns: Dict[str, psycopg2.extensions.connection] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._reconnect_tasks: Dict[str, "asyncio.Task[None]"] = {}
+        self._stopping = False
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stopping = False
+        for shard in shard_engines.shards:
+            try:
+                self._connect(shard)
+            except psycopg2.Error:
+                logger.exception(
+                    "Live feed listener could not connect to %s, retrying", shard
+                )
+                self._schedule_reconnect(shard)
+
+    async def stop(self) -> None:
+        self._stopping = True
+        for task in self._reconnect_tasks.values():
+            task.cancel()
+        for shard in list(self._conns):
+            self._disconnect(shard)
+
+    def _connect(self, shard: str) -> None:
+        url = make_url(shard_engines.url_for(shard))
+        params = url.translate_connect_args(username="user", database="dbname")
+        conn = psycopg2.connect(keepalives=1, keepalives_idle=30, **params)
+        conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        with conn.cursor() as cursor:
+            cursor.execute(f"LISTEN {LIVE_FEED_CHANNEL}")
+        self._conns[shard] = conn
+        self._loop.add_reader(conn.fileno(), partial(self._on_readable, shard))
+        logger.info("Live feed listener connected to %s", shard)
+
+    def _disconnect(self, shard: str) -> None:
+        conn = self._conns.pop(shard, None)
+        if conn is None:
+            return
+        try:
+            self._loop.remove_reader(conn.fileno())
+        except (ValueError, OSError):
+            pass
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+
+    def _on_readable(self, shard: str) -> None:
+        conn = self._conns.get(shard)
+        if conn is None:
+            return
+        try:
+            conn.poll()
+        except psycopg2.Error:
+            logger.exception("Live feed listener lost its connection to %s", shard)
+            self._disconnect(shard)
+            self._schedule_reconnect(shard)
+            return
+        while conn.notifies:
+            notify = conn.notifies.pop(0)
+            try:
+                message = json.loads(notify.payload)
+            except ValueError:
+                logger.warning("Ignoring malformed live feed payload")
+                continue
+            self.broker.publish(message)
+
+    def _schedule_reconnect(self, shard: str) -> None:
+        task = self._reconnect_tasks.get(shard)
+        if self._stopping or (task and not task.done()):
+            return
+        self._reconnect_tasks[shard] = self._loop.create_task(self._reconnect(shard))
+
+    async def _reconnect(self, shard: str) -> None:
+        while not self._stopping:
+            await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+            try:
+                self._connect(shard)
+                return
+            except psycopg2.Error:
+                logger.warning(
+                    "Live feed listener reconnect to %s failed, retrying", shard
+                )
+
+
+live_feed_broker = LiveFeedBroker(
+    queue_size=settings.LIVE_FEED_QUEUE_SIZE,
+    history_size=settings.LIVE_FEED_HISTORY_SIZE,
+)
+live_feed_listener = LiveFeedListener(live_feed_broker)
@@ -0,0 +1,37 @@
+import json
+from typing import Any, Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.infrastructure.db.sharding import session_route
+
+LIVE_FEED_CHANNEL = "pulse_flow_live"
+
+
+def publish_live_messages(db: Session, messages: List[Dict[str, Any]]) -> None:
+    """
+    Queue live feed messages on the current transaction with NOTIFY.
+    Postgres delivers them to listeners on commit and drops them on rollback.
+    Each message needs "type" and "sector_id" and is stamped with a global id
+    from live_feed_event_seq, so every worker assigns clients the same ids,
+    and with the session's tenant, since tenants on a shard share the channel.
+    The ids are unique but not ordered: they are taken now, while messages
+    are delivered in commit order.
+    """
+    if not messages:
+        return
+    db.execute(
+        text(
+            "SELECT pg_notify(:channel, "
+            "(m || jsonb_build_object("
+            "'id', nextval('live_feed_event_seq'), 'tenant', CAST(:tenant AS text)"
+            "))::text) "
+            "FROM jsonb_array_elements(CAST(:messages AS jsonb)) AS m"
+        ),
+        {
+            "channel": LIVE_FEED_CHANNEL,
+            "messages": json.dumps(messages, default=str),
+            "tenant": session_route(db).tenant,
+        },
+    )
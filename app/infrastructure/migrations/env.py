@@ -12,6 +12,7 @@ sys.path.append(str(parent_dir))
 # Import the SQLAlchemy metadata and settings
 from app.infrastructure.db.base import Base
 from app.infrastructure.core.config import settings
+from app.infrastructure.db.sharding import DEFAULT_SHARD, SCHEMA_NAME_PATTERN
 
 # This is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -26,13 +27,28 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 target_metadata = Base.metadata
 
+# Multi-tenant deployments migrate one tenant schema at a time:
+#   alembic -x shard=shard2 -x tenant_schema=tenant_stmary upgrade head
+x_args = context.get_x_argument(as_dictionary=True)
+tenant_schema = x_args.get("tenant_schema")
+if tenant_schema and not SCHEMA_NAME_PATTERN.fullmatch(tenant_schema):
+    raise ValueError(f"Invalid tenant schema name: {tenant_schema}")
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
 
 
 def get_url():
-    return str(settings.SQLALCHEMY_DATABASE_URI)
+    shard = x_args.get("shard", DEFAULT_SHARD)
+    if shard == DEFAULT_SHARD:
+        return str(settings.SQLALCHEMY_DATABASE_URI)
+    return settings.SHARD_DATABASE_URIS[shard]
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    # The routing table is managed outside the models
+    return not (type_ == "table" and name == "tenant_shards")
 
 
 def run_migrations_offline() -> None:
@@ -53,6 +69,8 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
+        version_table_schema=tenant_schema,
     )
 
     with context.begin_transaction():
@@ -69,19 +87,45 @@ def run_migrations_online() -> None:
     # Override sqlalchemy.url with our dynamic URL
     configuration = config.get_section(config.config_ini_section)
     configuration["sqlalchemy.url"] = get_url()
-    
+
     # Create engine directly instead of using from_config
     url = get_url()
+    connect_args = {}
+    if tenant_schema:
+        # Unqualified names in the migrations resolve to the tenant's schema
+        # only, never to the default schema's tables in public
+        connect_args["options"] = f"-csearch_path={tenant_schema}"
     connectable = engine_from_config(
         configuration,
         prefix="sqlalchemy.",
         poolclass=pool.NullPool,
+        connect_args=connect_args,
     )
 
     with connectable.connect() as connection:
+        # DDL that cannot get its lock fails fast instead of queueing every
+        # write behind it; scripts/migrate.py retries the upgrade
+        connection.exec_driver_sql(
+            f"SET lock_timeout = {int(settings.MIGRATION_LOCK_TIMEOUT_MS)}"
+        )
+        if tenant_schema:
+            connection.exec_driver_sql(f'CREATE SCHEMA IF NOT EXISTS "{tenant_schema}"')
+        connection.commit()
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+            version_table_schema=tenant_schema,
+            # Each migration commits on its own, so a retry resumes after the
+            # last one applied
+            transaction_per_migration=True,
         )
 
         with context.begin_transaction():
-            context.run_migrations() 
\ No newline at end of file
+            context.run_migrations() 
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,54 @@
+"""Add sector hierarchy
+
+Revision ID: 3c8f1a6d9e2b
+Revises: f2b9c6d3a8e1
+Create Date: 2026-10-20 14:05:22.418305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "3c8f1a6d9e2b"
+down_revision = "f2b9c6d3a8e1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("sectors", sa.Column("parent_id", sa.Integer(), nullable=True))
+    op.add_column("sectors", sa.Column("kind", sa.String(length=20), nullable=True))
+    op.add_column("sectors", sa.Column("path", sa.String(), nullable=True))
+    op.add_column(
+        "sectors", sa.Column("depth", sa.Integer(), server_default="0", nullable=False)
+    )
+    op.create_foreign_key(
+        "sectors_parent_id_fkey", "sectors", "sectors", ["parent_id"], ["id"]
+    )
+
+    # Every existing sector becomes a root
+    op.execute("UPDATE sectors SET path = '/' || id || '/'")
+    op.alter_column("sectors", "path", nullable=False)
+    op.alter_column("sectors", "depth", server_default=None)
+
+    op.create_index(
+        op.f("ix_sectors_parent_id"), "sectors", ["parent_id"], unique=False
+    )
+    op.create_index(
+        "ix_sectors_path",
+        "sectors",
+        ["path"],
+        unique=False,
+        postgresql_ops={"path": "text_pattern_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_sectors_path", table_name="sectors")
+    op.drop_index(op.f("ix_sectors_parent_id"), table_name="sectors")
+    op.drop_constraint("sectors_parent_id_fkey", "sectors", type_="foreignkey")
+    op.drop_column("sectors", "depth")
+    op.drop_column("sectors", "path")
+    op.drop_column("sectors", "kind")
+    op.drop_column("sectors", "parent_id")
@@ -0,0 +1,56 @@
+"""Add tenant shards routing table
+
+Revision ID: 9d4e2b7f1c6a
+Revises: 3c8f1a6d9e2b
+Create Date: 2026-10-20 16:22:37.905114
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "9d4e2b7f1c6a"
+down_revision = "3c8f1a6d9e2b"
+branch_labels = None
+depends_on = None
+
+
+def _is_tenant_run() -> bool:
+    # The routing table lives only in the directory database's public schema,
+    # not in each tenant schema migrated with -x tenant_schema=...
+    return bool(context.get_x_argument(as_dictionary=True).get("tenant_schema"))
+
+
+def upgrade() -> None:
+    if _is_tenant_run():
+        return
+    op.create_table(
+        "tenant_shards",
+        sa.Column("tenant", sa.String(length=63), nullable=False),
+        sa.Column("shard", sa.String(length=63), nullable=False),
+        sa.Column("schema_name", sa.String(length=63), nullable=False),
+        sa.Column(
+            "status", sa.String(length=16), server_default="active", nullable=False
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.CheckConstraint(
+            "status IN ('active', 'moving')", name="ck_tenant_shards_status"
+        ),
+        sa.PrimaryKeyConstraint("tenant"),
+        sa.UniqueConstraint(
+            "shard", "schema_name", name="uq_tenant_shards_shard_schema_name"
+        ),
+        schema="public",
+    )
+
+
+def downgrade() -> None:
+    if _is_tenant_run():
+        return
+    op.drop_table("tenant_shards", schema="public")
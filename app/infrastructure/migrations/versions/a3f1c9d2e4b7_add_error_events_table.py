@@ -0,0 +1,82 @@
+"""Add error events table
+
+Revision ID: a3f1c9d2e4b7
+Revises: 17b0243dc4d1
+Create Date: 2026-10-19 09:12:41.204113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "a3f1c9d2e4b7"
+down_revision = "17b0243dc4d1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The "Add sectors table" revision was generated empty, so databases built
+    # purely from migrations have no sectors table to reference yet.
+    if not sa.inspect(op.get_bind()).has_table("sectors"):
+        op.create_table(
+            "sectors",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("description", sa.String(), nullable=True),
+            sa.Column("is_active", sa.Boolean(), nullable=True),
+            sa.Column(
+                "created_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.text("now()"),
+                nullable=True,
+            ),
+            sa.Column(
+                "updated_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.text("now()"),
+                nullable=True,
+            ),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index(op.f("ix_sectors_id"), "sectors", ["id"], unique=False)
+
+    op.create_table(
+        "error_events",
+        sa.Column("id", sa.BigInteger(), nullable=False),
+        sa.Column("sector_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("severity", sa.String(length=16), nullable=False),
+        sa.Column("category", sa.String(length=100), nullable=False),
+        sa.Column("message", sa.Text(), nullable=False),
+        sa.Column("source", sa.String(length=255), nullable=True),
+        sa.Column("details", sa.JSON(), nullable=True),
+        sa.Column("occurred_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "received_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.ForeignKeyConstraint(
+            ["sector_id"],
+            ["sectors.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_error_events_sector_id_occurred_at",
+        "error_events",
+        ["sector_id", "occurred_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_error_events_sector_id_occurred_at", table_name="error_events")
+    op.drop_table("error_events")
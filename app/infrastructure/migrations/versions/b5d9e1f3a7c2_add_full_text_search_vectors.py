@@ -0,0 +1,86 @@
+"""Add full text search vectors
+
+Revision ID: b5d9e1f3a7c2
+Revises: f4c2a8e6b1d3
+Create Date: 2026-10-21 15:36:08.902114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "b5d9e1f3a7c2"
+down_revision = "f4c2a8e6b1d3"
+branch_labels = None
+depends_on = None
+
+SECTOR_SEARCH_VECTOR = (
+    "setweight(to_tsvector('english'::regconfig, name), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('portuguese'::regconfig, name), 'A') || "
+    "setweight(to_tsvector('portuguese'::regconfig, coalesce(description, '')), 'B')"
+)
+EVENT_SEARCH_VECTOR = (
+    "setweight(to_tsvector('english'::regconfig, message), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, category), 'B') || "
+    "setweight(to_tsvector('portuguese'::regconfig, message), 'A') || "
+    "setweight(to_tsvector('portuguese'::regconfig, category), 'B')"
+)
+
+
+def _event_partitions():
+    rows = op.get_bind().execute(
+        sa.text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST('error_events' AS regclass)"
+        )
+    )
+    return [row.relname for row in rows]
+
+
+def upgrade() -> None:
+    op.add_column(
+        "sectors",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(SECTOR_SEARCH_VECTOR, persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_sectors_search_vector",
+        "sectors",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+    # Added on the partitioned parent, so every partition gets the column.
+    # Indexes are per partition, like the other error_events indexes
+    op.add_column(
+        "error_events",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(EVENT_SEARCH_VECTOR, persisted=True),
+            nullable=True,
+        ),
+    )
+    for name in _event_partitions():
+        op.execute(
+            f'CREATE INDEX IF NOT EXISTS "{name}_search_vector_idx" '
+            f'ON "{name}" USING gin (search_vector)'
+        )
+
+
+def downgrade() -> None:
+    for name in _event_partitions():
+        op.execute(f'DROP INDEX IF EXISTS "{name}_search_vector_idx"')
+    op.drop_column("error_events", "search_vector")
+    op.drop_index(
+        "ix_sectors_search_vector", table_name="sectors", postgresql_using="gin"
+    )
+    op.drop_column("sectors", "search_vector")
@@ -0,0 +1,136 @@
+"""Partition error events by occurred_at
+
+Revision ID: b8e2d4f6a1c3
+Revises: a3f1c9d2e4b7
+Create Date: 2026-10-19 11:40:03.518220
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "b8e2d4f6a1c3"
+down_revision = "a3f1c9d2e4b7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Move the heap table aside, keeping its id sequence for the new parent
+    op.execute("ALTER TABLE error_events RENAME TO error_events_legacy")
+    op.execute("ALTER INDEX error_events_pkey RENAME TO error_events_legacy_pkey")
+    op.execute(
+        "ALTER INDEX ix_error_events_sector_id_occurred_at "
+        "RENAME TO ix_error_events_legacy_sector_id_occurred_at"
+    )
+    op.execute("ALTER SEQUENCE error_events_id_seq OWNED BY NONE")
+
+    op.execute(
+        """
+        CREATE TABLE error_events (
+            id BIGINT NOT NULL DEFAULT nextval('error_events_id_seq'),
+            sector_id INTEGER NOT NULL REFERENCES sectors (id),
+            user_id INTEGER REFERENCES users (id),
+            severity VARCHAR(16) NOT NULL,
+            category VARCHAR(100) NOT NULL,
+            message TEXT NOT NULL,
+            source VARCHAR(255),
+            details JSON,
+            occurred_at TIMESTAMP WITH TIME ZONE NOT NULL,
+            received_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+            CONSTRAINT error_events_pkey PRIMARY KEY (id, occurred_at)
+        ) PARTITION BY RANGE (occurred_at)
+    """
+    )
+    op.execute("ALTER SEQUENCE error_events_id_seq OWNED BY error_events.id")
+
+    # Daily partitions covering existing rows and the coming week; the
+    # maintenance routine takes over from here (BRIN conversion, retention).
+    op.execute(
+        """
+        DO $$
+        DECLARE
+            day_start TIMESTAMPTZ;
+            last_day TIMESTAMPTZ :=
+                date_trunc('day', now() AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'
+                + INTERVAL '8 days';
+            part_name TEXT;
+        BEGIN
+            SELECT date_trunc(
+                'day', coalesce(min(occurred_at), now()) AT TIME ZONE 'UTC'
+            ) AT TIME ZONE 'UTC'
+            INTO day_start
+            FROM error_events_legacy;
+
+            WHILE day_start < last_day LOOP
+                part_name := 'error_events_p'
+                    || to_char(day_start AT TIME ZONE 'UTC', 'YYYYMMDD');
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF error_events '
+                    'FOR VALUES FROM (%L) TO (%L)',
+                    part_name, day_start, day_start + INTERVAL '1 day'
+                );
+                EXECUTE format(
+                    'CREATE INDEX %I ON %I (sector_id, occurred_at)',
+                    part_name || '_sector_id_occurred_at_idx', part_name
+                );
+                day_start := day_start + INTERVAL '1 day';
+            END LOOP;
+        END $$;
+    """
+    )
+
+    op.execute("INSERT INTO error_events SELECT * FROM error_events_legacy")
+    op.execute("DROP TABLE error_events_legacy")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE error_events RENAME TO error_events_partitioned")
+    op.execute("ALTER SEQUENCE error_events_id_seq OWNED BY NONE")
+    op.execute(
+        "ALTER TABLE error_events_partitioned "
+        "RENAME CONSTRAINT error_events_pkey TO error_events_partitioned_pkey"
+    )
+
+    op.create_table(
+        "error_events",
+        sa.Column(
+            "id",
+            sa.BigInteger(),
+            server_default=sa.text("nextval('error_events_id_seq')"),
+            nullable=False,
+        ),
+        sa.Column("sector_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("severity", sa.String(length=16), nullable=False),
+        sa.Column("category", sa.String(length=100), nullable=False),
+        sa.Column("message", sa.Text(), nullable=False),
+        sa.Column("source", sa.String(length=255), nullable=True),
+        sa.Column("details", sa.JSON(), nullable=True),
+        sa.Column("occurred_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "received_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.ForeignKeyConstraint(
+            ["sector_id"],
+            ["sectors.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.execute("INSERT INTO error_events SELECT * FROM error_events_partitioned")
+    op.execute("ALTER SEQUENCE error_events_id_seq OWNED BY error_events.id")
+    op.execute("DROP TABLE error_events_partitioned")
+    op.create_index(
+        "ix_error_events_sector_id_occurred_at",
+        "error_events",
+        ["sector_id", "occurred_at"],
+        unique=False,
+    )
@@ -0,0 +1,54 @@
+"""Add sector event rollups table
+
+Revision ID: c4d7e9a2b5f1
+Revises: b8e2d4f6a1c3
+Create Date: 2026-10-19 14:05:27.390812
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "c4d7e9a2b5f1"
+down_revision = "b8e2d4f6a1c3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "sector_event_rollups",
+        sa.Column("sector_id", sa.Integer(), nullable=False),
+        sa.Column("granularity", sa.String(length=8), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("severity", sa.String(length=16), nullable=False),
+        sa.Column("event_count", sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["sector_id"],
+            ["sectors.id"],
+        ),
+        sa.PrimaryKeyConstraint("sector_id", "granularity", "bucket_start", "severity"),
+    )
+
+    # Seed the rollups from events already stored
+    for granularity in ("minute", "hour", "day"):
+        op.execute(
+            f"""
+            INSERT INTO sector_event_rollups
+                (sector_id, granularity, bucket_start, severity, event_count)
+            SELECT
+                sector_id,
+                '{granularity}',
+                date_trunc('{granularity}', occurred_at AT TIME ZONE 'UTC')
+                    AT TIME ZONE 'UTC',
+                severity,
+                count(*)
+            FROM error_events
+            GROUP BY 1, 2, 3, 4
+        """
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("sector_event_rollups")
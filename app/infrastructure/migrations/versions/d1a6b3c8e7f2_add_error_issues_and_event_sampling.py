@@ -0,0 +1,67 @@
+"""Add error issues and event sampling
+
+Revision ID: d1a6b3c8e7f2
+Revises: c4d7e9a2b5f1
+Create Date: 2026-10-19 16:22:54.871305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "d1a6b3c8e7f2"
+down_revision = "c4d7e9a2b5f1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "error_issues",
+        sa.Column("id", sa.BigInteger(), nullable=False),
+        sa.Column("fingerprint", sa.String(length=40), nullable=False),
+        sa.Column("sector_id", sa.Integer(), nullable=False),
+        sa.Column("category", sa.String(length=100), nullable=False),
+        sa.Column("message_template", sa.Text(), nullable=False),
+        sa.Column("severity", sa.String(length=16), nullable=False),
+        sa.Column("occurrence_count", sa.BigInteger(), nullable=False),
+        sa.Column("stored_count", sa.BigInteger(), nullable=False),
+        sa.Column("first_seen", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_seen", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["sector_id"],
+            ["sectors.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_error_issues_fingerprint"),
+        "error_issues",
+        ["fingerprint"],
+        unique=True,
+    )
+    op.create_index(
+        "ix_error_issues_sector_id_last_seen",
+        "error_issues",
+        ["sector_id", "last_seen"],
+        unique=False,
+    )
+    op.add_column("error_events", sa.Column("issue_id", sa.BigInteger(), nullable=True))
+    op.create_foreign_key(
+        "error_events_issue_id_fkey",
+        "error_events",
+        "error_issues",
+        ["issue_id"],
+        ["id"],
+    )
+    op.add_column("sectors", sa.Column("event_sample_rate", sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("sectors", "event_sample_rate")
+    op.drop_constraint("error_events_issue_id_fkey", "error_events", type_="foreignkey")
+    op.drop_column("error_events", "issue_id")
+    op.drop_index("ix_error_issues_sector_id_last_seen", table_name="error_issues")
+    op.drop_index(op.f("ix_error_issues_fingerprint"), table_name="error_issues")
+    op.drop_table("error_issues")
@@ -0,0 +1,48 @@
+"""Add audit log table
+
+Revision ID: d2f8b4a6c0e1
+Revises: c9e3a7f1d5b8
+Create Date: 2026-10-28 09:12:44.310526
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "d2f8b4a6c0e1"
+down_revision = "c9e3a7f1d5b8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "audit_log",
+        sa.Column("id", sa.BigInteger(), nullable=False),
+        sa.Column("entity", sa.String(length=50), nullable=False),
+        sa.Column("entity_id", sa.BigInteger(), nullable=False),
+        sa.Column("action", sa.String(length=16), nullable=False),
+        sa.Column("changes", sa.JSON(), nullable=False),
+        sa.Column("actor_id", sa.Integer(), nullable=True),
+        sa.Column("occurred_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_audit_log_entity_entity_id_occurred_at",
+        "audit_log",
+        ["entity", "entity_id", "occurred_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_audit_log_entity_occurred_at",
+        "audit_log",
+        ["entity", "occurred_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_audit_log_entity_occurred_at", table_name="audit_log")
+    op.drop_index("ix_audit_log_entity_entity_id_occurred_at", table_name="audit_log")
+    op.drop_table("audit_log")
@@ -0,0 +1,30 @@
+"""Add updated_at id indexes for change feeds
+
+Revision ID: e5f8a2c4d6b9
+Revises: d1a6b3c8e7f2
+Create Date: 2026-10-19 18:47:12.003561
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "e5f8a2c4d6b9"
+down_revision = "d1a6b3c8e7f2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_users_updated_at_id", "users", ["updated_at", "id"], unique=False
+    )
+    op.create_index(
+        "ix_sectors_updated_at_id", "sectors", ["updated_at", "id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_sectors_updated_at_id", table_name="sectors")
+    op.drop_index("ix_users_updated_at_id", table_name="users")
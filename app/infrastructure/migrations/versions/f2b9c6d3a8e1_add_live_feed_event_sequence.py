@@ -0,0 +1,25 @@
+"""Add live feed event sequence
+
+Revision ID: f2b9c6d3a8e1
+Revises: e5f8a2c4d6b9
+Create Date: 2026-10-20 09:31:48.650274
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "f2b9c6d3a8e1"
+down_revision = "e5f8a2c4d6b9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Global ids for live feed messages, shared by every worker
+    op.execute("CREATE SEQUENCE live_feed_event_seq")
+
+
+def downgrade() -> None:
+    op.execute("DROP SEQUENCE live_feed_event_seq")
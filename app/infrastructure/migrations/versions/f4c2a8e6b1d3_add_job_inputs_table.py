@@ -0,0 +1,53 @@
+"""Add job inputs table
+
+Revision ID: f4c2a8e6b1d3
+Revises: e7a1c5f3b9d2
+Create Date: 2026-10-21 09:58:13.204517
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "f4c2a8e6b1d3"
+down_revision = "e7a1c5f3b9d2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "job_inputs",
+        sa.Column("job_id", sa.BigInteger(), nullable=False),
+        sa.Column("params", sa.JSON(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.ForeignKeyConstraint(["job_id"], ["jobs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("job_id"),
+    )
+    op.create_index("ix_jobs_finished_at", "jobs", ["finished_at"], unique=False)
+    # Unfinished imports keep their CSV in job_inputs; finished ones lose it
+    op.execute(
+        "INSERT INTO job_inputs (job_id, params) "
+        "SELECT id, json_build_object('csv', params->'csv') FROM jobs "
+        "WHERE status IN ('queued', 'running') AND params::jsonb ? 'csv'"
+    )
+    op.execute(
+        "UPDATE jobs SET params = (params::jsonb - 'csv')::json "
+        "WHERE params::jsonb ? 'csv'"
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        "UPDATE jobs "
+        "SET params = (jobs.params::jsonb || job_inputs.params::jsonb)::json "
+        "FROM job_inputs WHERE job_inputs.job_id = jobs.id"
+    )
+    op.drop_index("ix_jobs_finished_at", table_name="jobs")
+    op.drop_table("job_inputs")
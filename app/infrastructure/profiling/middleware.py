@@ -0,0 +1,82 @@
+import hmac
+import logging
+import random
+
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.infrastructure.core.config import settings
+from app.infrastructure.profiling.profiler import (
+    RequestProfile,
+    current_profile,
+    install_sql_timing,
+)
+from app.infrastructure.profiling.store import ProfileStore, profile_store
+
+logger = logging.getLogger(__name__)
+
+PROFILE_TOKEN_HEADER = b"x-profile-token"
+PROFILE_ID_HEADER = b"x-profile-id"
+
+
+class ProfilingMiddleware:
+    """
+    Profiles selected requests: those sending X-Profile-Token with the
+    configured PROFILING_TOKEN, plus a PROFILING_SAMPLE_RATE share of the rest.
+    Profiled responses carry X-Profile-Id; fetch the result from
+    /internal/profiles. Only installed when PROFILING_ENABLED is set.
+    """
+
+    def __init__(self, app: ASGIApp, store: ProfileStore = profile_store):
+        self.app = app
+        self.store = store
+        self.token = (settings.PROFILING_TOKEN or "").encode()
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE
+        self.interval = settings.PROFILING_INTERVAL_MS / 1000
+        install_sql_timing()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._selected(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = self.store.new_id()
+        status_code = None
+
+        async def send_with_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (PROFILE_ID_HEADER, profile_id.encode())
+                ]
+            await send(message)
+
+        profile = RequestProfile(self.interval)
+        token = current_profile.set(profile)
+        profile.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            profile.stop()
+            current_profile.reset(token)
+            try:
+                await run_in_threadpool(
+                    self.store.save,
+                    profile_id,
+                    profile,
+                    scope["method"],
+                    scope["path"],
+                    status_code,
+                )
+            except OSError:
+                logger.exception("Could not save profile %s", profile_id)
+
+    def _selected(self, scope: Scope) -> bool:
+        if self.token:
+            for name, value in scope["headers"]:
+                if name == PROFILE_TOKEN_HEADER and hmac.compare_digest(
+                    value, self.token
+                ):
+                    return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
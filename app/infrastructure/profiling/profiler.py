@@ -0,0 +1,133 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Frames a thread sits in while it has nothing to do; such samples are dropped
+_IDLE_FRAMES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+}
+# Keep statements readable in the profile listing
+MAX_STATEMENT_LENGTH = 2_000
+
+
+class StackSampler:
+    """
+    Samples the stacks of the process's threads every `interval` seconds from
+    a background thread and counts them in collapsed-stack form
+    ("thread;outer;...;inner" -> samples), the input of flamegraph.pl and
+    speedscope. Sampling does not slow the profiled code down, but it sees
+    every busy thread: other requests served at the same time show up too,
+    under their own thread names.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self) -> str:
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.samples.most_common()
+        )
+
+    def _run(self) -> None:
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident or self._is_idle(frame):
+                    continue
+                self.samples[self._collapse(names.get(ident, str(ident)), frame)] += 1
+
+    @staticmethod
+    def _is_idle(frame) -> bool:
+        code = frame.f_code
+        return (os.path.basename(code.co_filename), code.co_name) in _IDLE_FRAMES
+
+    @staticmethod
+    def _collapse(thread_name: str, frame) -> str:
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            filename = os.path.basename(code.co_filename)
+            names.append(f"{code.co_name} ({filename}:{code.co_firstlineno})")
+            frame = frame.f_back
+        names.append(thread_name)
+        return ";".join(reversed(names))
+
+
+class RequestProfile:
+    """Stack samples and SQL timings collected for one request."""
+
+    def __init__(self, interval: float):
+        self.sampler = StackSampler(interval)
+        self.statements: List[Dict[str, Any]] = []
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        self.duration_ms = 0.0
+
+    def start(self) -> None:
+        self.sampler.start()
+
+    def stop(self) -> None:
+        self.duration_ms = (time.perf_counter() - self._started) * 1000
+        self.sampler.stop()
+
+    def record_statement(self, statement: str, duration: float) -> None:
+        self.statements.append(
+            {
+                "offset_ms": round(
+                    (time.perf_counter() - self._started - duration) * 1000, 3
+                ),
+                "duration_ms": round(duration * 1000, 3),
+                "statement": statement[:MAX_STATEMENT_LENGTH],
+            }
+        )
+
+
+# The profile of the request being served. Context variables follow the
+# request into the threadpool, so SQL run by sync endpoints is attributed to it
+current_profile: ContextVar[Optional[RequestProfile]] = ContextVar(
+    "current_profile", default=None
+)
+
+_sql_timing_installed = False
+
+
+def install_sql_timing() -> None:
+    """Time statements of profiled requests on every engine, shards included."""
+    global _sql_timing_installed
+    if _sql_timing_installed:
+        return
+    _sql_timing_installed = True
+
+    @event.listens_for(Engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if current_profile.get() is not None:
+            conn.info.setdefault("profile_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(Engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        profile = current_profile.get()
+        if profile is not None and conn.info.get("profile_query_start"):
+            started = conn.info["profile_query_start"].pop()
+            profile.record_statement(statement, time.perf_counter() - started)
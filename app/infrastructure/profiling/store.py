@@ -0,0 +1,111 @@
+import json
+import re
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from app.infrastructure.core.config import settings
+from app.infrastructure.profiling.profiler import RequestProfile
+
+PROFILE_ID_PATTERN = re.compile(r"[0-9]{8}T[0-9]{6}-[0-9a-f]{8}")
+
+
+class ProfileSummary(BaseModel):
+    id: str
+    started_at: datetime
+    method: str
+    path: str
+    status_code: Optional[int] = None
+    duration_ms: float
+    samples: int
+    sql_count: int
+    sql_ms: float
+
+
+class ProfileDetail(ProfileSummary):
+    interval_ms: float
+    statements: List[Dict[str, Any]]
+
+
+class ProfileStore:
+    """
+    Recent profiles on local disk, two files each: <id>.json with the request
+    and its SQL timings, <id>.collapsed with the stack samples. Only the
+    newest `max_kept` are kept. Profiles are per worker process.
+    """
+
+    def __init__(self, directory: str, max_kept: int):
+        self.directory = Path(directory)
+        self.max_kept = max_kept
+
+    @staticmethod
+    def new_id() -> str:
+        return f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+
+    def save(
+        self,
+        profile_id: str,
+        profile: RequestProfile,
+        method: str,
+        path: str,
+        status_code: Optional[int],
+    ) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        detail = ProfileDetail(
+            id=profile_id,
+            started_at=datetime.fromtimestamp(profile.started_at, timezone.utc),
+            method=method,
+            path=path,
+            status_code=status_code,
+            duration_ms=round(profile.duration_ms, 3),
+            samples=sum(profile.sampler.samples.values()),
+            sql_count=len(profile.statements),
+            sql_ms=round(sum(s["duration_ms"] for s in profile.statements), 3),
+            interval_ms=profile.sampler.interval * 1000,
+            statements=profile.statements,
+        )
+        (self.directory / f"{profile_id}.collapsed").write_text(
+            profile.sampler.collapsed()
+        )
+        (self.directory / f"{profile_id}.json").write_text(detail.model_dump_json())
+        self._prune()
+
+    def list(self) -> List[ProfileSummary]:
+        if not self.directory.is_dir():
+            return []
+        summaries = []
+        for path in sorted(self.directory.glob("*.json"), reverse=True):
+            try:
+                summaries.append(ProfileSummary.model_validate_json(path.read_text()))
+            except (OSError, ValueError):
+                continue  # pruned or half-written meanwhile
+        return summaries
+
+    def get(self, profile_id: str) -> Optional[ProfileDetail]:
+        path = self._path(profile_id, "json")
+        if path is None or not path.is_file():
+            return None
+        return ProfileDetail.model_validate(json.loads(path.read_text()))
+
+    def collapsed_path(self, profile_id: str) -> Optional[Path]:
+        path = self._path(profile_id, "collapsed")
+        return path if path is not None and path.is_file() else None
+
+    def _path(self, profile_id: str, suffix: str) -> Optional[Path]:
+        # Ids become file names, so never accept anything else
+        if not PROFILE_ID_PATTERN.fullmatch(profile_id):
+            return None
+        return self.directory / f"{profile_id}.{suffix}"
+
+    def _prune(self) -> None:
+        for path in sorted(self.directory.glob("*.json"), reverse=True)[
+            self.max_kept :
+        ]:
+            path.unlink(missing_ok=True)
+            path.with_suffix(".collapsed").unlink(missing_ok=True)
+
+
+profile_store = ProfileStore(settings.PROFILING_DIR, settings.PROFILING_MAX_KEPT)
@@ -0,0 +1,89 @@
+import json
+import threading
+import urllib.request
+from typing import Any, Dict, List, Optional
+
+from app.infrastructure.tracing.tracer import STATUS_UNSET, Span
+
+EXPORT_TIMEOUT_SECONDS = 10.0
+SCOPE_NAME = "app.infrastructure.tracing"
+
+
+def _any_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _attributes(values: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _any_value(value)} for key, value in values.items()]
+
+
+def _span_json(span: Span) -> Dict[str, Any]:
+    data: Dict[str, Any] = {
+        "traceId": f"{span.trace_id:032x}",
+        "spanId": f"{span.span_id:016x}",
+        "name": span.name,
+        "kind": span.kind,
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": _attributes(span.attributes),
+    }
+    if span.parent_span_id is not None:
+        data["parentSpanId"] = f"{span.parent_span_id:016x}"
+    if span.status_code != STATUS_UNSET:
+        data["status"] = {"code": span.status_code, "message": span.status_message}
+    return data
+
+
+class OtlpJsonExporter:
+    """
+    Writes span batches as OTLP/JSON ExportTraceServiceRequest documents: POSTed
+    to an OTLP/HTTP collector endpoint and/or appended, one per line, to a file.
+    Runs on the BatchWriter thread, so slow exports never block requests.
+    """
+
+    def __init__(
+        self, service_name: str, endpoint: Optional[str], file_path: Optional[str]
+    ):
+        self.endpoint = endpoint
+        self.file_path = file_path
+        self._resource = {"attributes": _attributes({"service.name": service_name})}
+        self._file_lock = threading.Lock()
+
+    def encode(self, spans: List[Span]) -> bytes:
+        document = {
+            "resourceSpans": [
+                {
+                    "resource": self._resource,
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": SCOPE_NAME},
+                            "spans": [_span_json(span) for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+        return json.dumps(document, separators=(",", ":")).encode()
+
+    def export(self, spans: List[Span]) -> None:
+        body = self.encode(spans)
+        if self.file_path:
+            with self._file_lock, open(self.file_path, "ab") as f:
+                f.write(body + b"\n")
+        if self.endpoint:
+            request = urllib.request.Request(
+                self.endpoint,
+                data=body,
+                headers={"Content-Type": "application/json"},
+                method="POST",
+            )
+            with urllib.request.urlopen(
+                request, timeout=EXPORT_TIMEOUT_SECONDS
+            ) as response:
+                response.read()
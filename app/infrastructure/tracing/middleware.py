@@ -0,0 +1,69 @@
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.infrastructure.tracing.sql import install_sql_tracing
+from app.infrastructure.tracing.tracer import (
+    STATUS_ERROR,
+    current_span,
+    format_traceparent,
+    tracer,
+)
+
+TRACEPARENT_HEADER = b"traceparent"
+TRACERESPONSE_HEADER = b"traceresponse"
+
+
+class TracingMiddleware:
+    """
+    Root span per sampled HTTP request, continuing the caller's trace from a
+    W3C traceparent header. Spans of dependencies, services, repositories and
+    SQL statements nest under it through the current_span context variable.
+    Only installed when TRACING_ENABLED is set.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        install_sql_tracing()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        traceparent = None
+        for name, value in scope["headers"]:
+            if name == TRACEPARENT_HEADER:
+                traceparent = value.decode("latin-1")
+                break
+        span = tracer.start_request_span(
+            scope["method"],
+            traceparent,
+            {"http.request.method": scope["method"], "url.path": scope["path"]},
+        )
+        if span is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_trace(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                span.set_attribute("http.response.status_code", status_code)
+                if status_code >= 500:
+                    span.status_code = STATUS_ERROR
+                message["headers"] = list(message.get("headers", [])) + [
+                    (TRACERESPONSE_HEADER, format_traceparent(span).encode())
+                ]
+            await send(message)
+
+        token = current_span.set(span)
+        try:
+            await self.app(scope, receive, send_with_trace)
+        except BaseException as e:
+            span.record_exception(e)
+            raise
+        finally:
+            current_span.reset(token)
+            # Name the span after the matched route template, e.g. GET /users/{user_id}
+            route = scope.get("route")
+            if route is not None:
+                span.name = f"{scope['method']} {route.path}"
+                span.set_attribute("http.route", route.path)
+            span.end()
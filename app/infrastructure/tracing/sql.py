@@ -0,0 +1,47 @@
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.infrastructure.tracing.tracer import SPAN_KIND_CLIENT, current_span, tracer
+
+MAX_STATEMENT_LENGTH = 2_000
+_SPANS_KEY = "trace_spans"
+_installed = False
+
+
+def install_sql_tracing() -> None:
+    """Span per SQL statement of a traced request, on every engine."""
+    global _installed
+    if _installed:
+        return
+    _installed = True
+
+    @event.listens_for(Engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if current_span.get() is None:
+            return
+        span = tracer.start_span(
+            statement.split(None, 1)[0].upper() if statement.strip() else "SQL",
+            kind=SPAN_KIND_CLIENT,
+            attributes={
+                "db.system": "postgresql",
+                "db.statement": statement[:MAX_STATEMENT_LENGTH],
+            },
+        )
+        conn.info.setdefault(_SPANS_KEY, []).append(span)
+
+    @event.listens_for(Engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        spans = conn.info.get(_SPANS_KEY)
+        if spans:
+            span = spans.pop()
+            if cursor.rowcount is not None and cursor.rowcount >= 0:
+                span.set_attribute("db.rows", cursor.rowcount)
+            span.end()
+
+    @event.listens_for(Engine, "handle_error")
+    def _error(context):
+        spans = context.connection.info.get(_SPANS_KEY) if context.connection else None
+        if spans:
+            span = spans.pop()
+            span.record_exception(context.original_exception)
+            span.end()
@@ -0,0 +1,253 @@
+import functools
+import inspect
+import random
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, NamedTuple, Optional, TypeVar
+
+from app.infrastructure.core.config import settings
+from app.infrastructure.db.batch_writer import (
+    BatchWriter,
+    QueueFullError,
+    WriterStoppedError,
+)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# OTLP span kinds
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+# OTLP status codes
+STATUS_UNSET = 0
+STATUS_ERROR = 2
+
+TRACEPARENT_PATTERN = re.compile(r"00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})")
+_RATIO_BOUND = 2**64
+
+
+class TraceParent(NamedTuple):
+    """The remote caller's span, from a W3C traceparent header."""
+
+    trace_id: int
+    span_id: int
+    sampled: bool
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[TraceParent]:
+    if not value:
+        return None
+    match = TRACEPARENT_PATTERN.fullmatch(value.strip().lower())
+    if match is None:
+        return None
+    trace_id, span_id = int(match.group(1), 16), int(match.group(2), 16)
+    if trace_id == 0 or span_id == 0:
+        return None
+    return TraceParent(trace_id, span_id, bool(int(match.group(3), 16) & 1))
+
+
+def format_traceparent(span: "Span") -> str:
+    return f"00-{span.trace_id:032x}-{span.span_id:016x}-01"
+
+
+class Span:
+    __slots__ = (
+        "tracer",
+        "trace_id",
+        "span_id",
+        "parent_span_id",
+        "name",
+        "kind",
+        "start_ns",
+        "end_ns",
+        "attributes",
+        "status_code",
+        "status_message",
+    )
+
+    def __init__(
+        self,
+        tracer: "Tracer",
+        name: str,
+        trace_id: int,
+        parent_span_id: Optional[int],
+        kind: int,
+        attributes: Optional[Dict[str, Any]] = None,
+    ):
+        self.tracer = tracer
+        self.trace_id = trace_id
+        self.span_id = random.getrandbits(64) or 1
+        self.parent_span_id = parent_span_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes: Dict[str, Any] = dict(attributes) if attributes else {}
+        self.status_code = STATUS_UNSET
+        self.status_message = ""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_exception(self, exc: BaseException) -> None:
+        self.status_code = STATUS_ERROR
+        self.status_message = str(exc)
+        self.attributes["exception.type"] = type(exc).__name__
+
+    def end(self) -> None:
+        if not self.end_ns:
+            self.end_ns = time.time_ns()
+            self.tracer._export(self)
+
+
+# The span of the code running now; None when the request is not traced, which
+# is all instrumentation checks before doing anything
+current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class Tracer:
+    """
+    Minimal OpenTelemetry-compatible tracer. Sampling is decided once per
+    request (parent-based, else by trace id ratio); unsampled requests create
+    no spans at all. Finished spans are batched to OTLP/JSON by a BatchWriter
+    and dropped, never waited for, when the export queue is full.
+    """
+
+    def __init__(self, sample_ratio: float):
+        self.sample_ratio = sample_ratio
+        self.dropped = 0
+        self._writer: Optional[BatchWriter[Span]] = None
+
+    def start(self) -> None:
+        # The exporter imports this module for Span
+        from app.infrastructure.tracing.exporter import OtlpJsonExporter
+
+        exporter = OtlpJsonExporter(
+            service_name=settings.TRACING_SERVICE_NAME,
+            endpoint=settings.TRACING_OTLP_ENDPOINT,
+            file_path=settings.TRACING_EXPORT_FILE,
+        )
+        self._writer = BatchWriter(
+            "trace-export",
+            exporter.export,
+            max_size=settings.TRACING_QUEUE_MAX_SIZE,
+            batch_size=settings.TRACING_EXPORT_BATCH_SIZE,
+            flush_interval=settings.TRACING_EXPORT_INTERVAL_MS / 1000,
+        )
+        self._writer.start()
+
+    def stop(self) -> None:
+        if self._writer is not None:
+            self._writer.stop(timeout=settings.EVENT_FLUSH_TIMEOUT_SECONDS)
+            self._writer = None
+
+    def start_request_span(
+        self,
+        name: str,
+        traceparent: Optional[str],
+        attributes: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Span]:
+        """Root span of an incoming request, or None if it is not sampled."""
+        parent = parse_traceparent(traceparent)
+        if parent is not None:
+            if not parent.sampled:
+                return None
+            trace_id, parent_span_id = parent.trace_id, parent.span_id
+        else:
+            trace_id, parent_span_id = random.getrandbits(128) or 1, None
+            # Same decision as OpenTelemetry's TraceIdRatioBased sampler
+            if (trace_id & (_RATIO_BOUND - 1)) >= self.sample_ratio * _RATIO_BOUND:
+                return None
+        return Span(self, name, trace_id, parent_span_id, SPAN_KIND_SERVER, attributes)
+
+    def start_span(
+        self,
+        name: str,
+        kind: int = SPAN_KIND_INTERNAL,
+        attributes: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Span]:
+        """
+        Child of the current span, or None outside a traced request.
+        The span is not made current.
+        """
+        parent = current_span.get()
+        if parent is None:
+            return None
+        return Span(self, name, parent.trace_id, parent.span_id, kind, attributes)
+
+    @contextmanager
+    def span(
+        self, name: str, attributes: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Optional[Span]]:
+        """Run the block in a child span of the current one, if there is one."""
+        span = self.start_span(name, attributes=attributes)
+        if span is None:
+            yield None
+            return
+        token = current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_exception(e)
+            raise
+        finally:
+            current_span.reset(token)
+            span.end()
+
+    def _export(self, span: Span) -> None:
+        if self._writer is None:
+            return
+        try:
+            self._writer.submit([span])
+        except (QueueFullError, WriterStoppedError):
+            self.dropped += 1
+
+
+tracer = Tracer(settings.TRACING_SAMPLE_RATIO)
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """Decorator: run each call in a span named `name` when tracing."""
+
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if current_span.get() is None:
+                return func(*args, **kwargs)
+            with tracer.span(name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def _traced_method(func: Callable[..., Any], method_name: str) -> Callable[..., Any]:
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if current_span.get() is None:
+            return func(self, *args, **kwargs)
+        with tracer.span(f"{type(self).__name__}.{method_name}"):
+            return func(self, *args, **kwargs)
+
+    return wrapper
+
+
+def traced_methods(cls: type) -> type:
+    """
+    Class decorator: trace the public methods defined on the class, in spans
+    named after the runtime class (UserRepository.get, not BaseRepository.get).
+    Generators and coroutines are left alone.
+    """
+    for method_name, attr in list(vars(cls).items()):
+        if (
+            method_name.startswith("_")
+            or not inspect.isfunction(attr)
+            or inspect.isgeneratorfunction(attr)
+            or inspect.iscoroutinefunction(attr)
+        ):
+            continue
+        setattr(cls, method_name, _traced_method(attr, method_name))
+    return cls
@@ -1,18 +1,69 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 
+from app.api.budget import (
+    TRUNCATED_HEADER,
+    pool_timeout_handler,
+    query_canceled_handler,
+)
+from app.api.counts import COUNT_HEADERS
+from app.api.idempotency import IdempotencyMiddleware
 from app.api.v1 import api_router
+from app.domain.audit.services.audit import audit_service
+from app.domain.event.services.event import event_service
+from app.domain.job.services.runner import job_runner
 from app.infrastructure.core.config import settings
+from app.infrastructure.core.security import shutdown_password_hash_pool
+from app.infrastructure.db.session import shard_engines
+from app.infrastructure.live.listener import live_feed_listener
+from app.infrastructure.profiling.middleware import ProfilingMiddleware
+from app.infrastructure.tracing.middleware import TracingMiddleware
+from app.infrastructure.tracing.tracer import tracer
 
 # No longer creating tables directly - use Alembic for migrations instead
 # from app.infrastructure.db.session import Base, engine
 # Base.metadata.create_all(bind=engine)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.TRACING_ENABLED:
+        tracer.start()
+    event_service.start()
+    audit_service.start()
+    await live_feed_listener.start()
+    if settings.JOB_RUNNER_IN_PROCESS:
+        job_runner.start()
+    try:
+        yield
+    finally:
+        # Blocks while running jobs finish, so keep it off the event loop
+        await run_in_threadpool(job_runner.stop)
+        await live_feed_listener.stop()
+        # Drain queued events and audit records before the worker exits
+        event_service.stop()
+        audit_service.stop()
+        shard_engines.dispose()
+        shutdown_password_hash_pool()
+        tracer.stop()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
 )
 
+# Retries carrying an Idempotency-Key get the first response back. Added
+# before CORS so it runs inside it: replays and its 409/422 answers still get
+# the CORS headers, and preflights never reach it
+app.add_middleware(IdempotencyMiddleware)
+
 # Set up CORS
 app.add_middleware(
     CORSMiddleware,
@@ -20,8 +71,20 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[*COUNT_HEADERS, TRUNCATED_HEADER],
 )
 
+# Profiling is opt-in; when disabled the middleware is not in the stack at all
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+# Likewise for tracing; added last so its root span covers the whole request
+if settings.TRACING_ENABLED:
+    app.add_middleware(TracingMiddleware)
+
+# Database budget violations: 504 for statement timeouts, 503 for pool timeouts
+app.add_exception_handler(DBAPIError, query_canceled_handler)
+app.add_exception_handler(PoolTimeoutError, pool_timeout_handler)
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -0,0 +1,462 @@
+"""
+Fill a local database with realistic synthetic users, sectors and error events.
+
+    python scripts/generate_dataset.py --users 10000000 --events 10000000
+    python scripts/generate_dataset.py --events 2000000 --days 60 --tenant stmary
+
+Rows are rendered to CSV a chunk at a time and streamed into COPY ... FROM
+STDIN, so memory stays flat at any scale. Each table is committed and
+ANALYZEd on its own; runs add to what is already there. Sectors form
+hospital > building > department > ward trees with materialized paths.
+Events spread uniformly over the last --days days, and their partitions are
+created as needed. Every user's password is "synthetic-password".
+
+Meant for load tests and local experiments; the query plan tests
+(tests/integration/test_query_plans.py) load a small seeded dataset with it.
+It refuses to run with ENVIRONMENT=production.
+"""
+import argparse
+import csv
+import io
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, Sequence
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.domain.event.schemas.event import EventSeverity
+from app.domain.event.services.partition import event_partition_service
+from app.domain.sector.repositories.sector import sector_repository
+from app.domain.sector.schemas.sector import SectorKind
+from app.infrastructure.core.config import settings
+from app.infrastructure.core.security import get_password_hash
+from app.infrastructure.db.session import open_session, tenant_router
+
+SYNTHETIC_PASSWORD = "synthetic-password"
+COPY_READ_SIZE = 1 << 20
+# Children per node below a hospital: buildings, departments per building,
+# wards per department
+TREE_FANOUT = {SectorKind.HOSPITAL: 4, SectorKind.BUILDING: 6, SectorKind.DEPARTMENT: 8}
+CHILD_KIND = {
+    SectorKind.HOSPITAL: SectorKind.BUILDING,
+    SectorKind.BUILDING: SectorKind.DEPARTMENT,
+    SectorKind.DEPARTMENT: SectorKind.WARD,
+}
+
+FIRST_NAMES = [
+    "Ana",
+    "Bruno",
+    "Carla",
+    "Daniel",
+    "Eduarda",
+    "Felipe",
+    "Gabriela",
+    "Henrique",
+    "Isabela",
+    "João",
+    "Larissa",
+    "Marcos",
+    "Natália",
+    "Otávio",
+    "Paula",
+    "Rafael",
+    "Sofia",
+    "Thiago",
+    "Vitória",
+    "William",
+    "Emma",
+    "Liam",
+    "Olivia",
+    "Noah",
+]
+LAST_NAMES = [
+    "Silva",
+    "Santos",
+    "Oliveira",
+    "Souza",
+    "Rodrigues",
+    "Ferreira",
+    "Alves",
+    "Pereira",
+    "Lima",
+    "Gomes",
+    "Costa",
+    "Ribeiro",
+    "Martins",
+    "Carvalho",
+    "Smith",
+    "Johnson",
+    "Brown",
+    "Taylor",
+    "Miller",
+    "Wilson",
+]
+CITIES = [
+    "São Paulo",
+    "Rio de Janeiro",
+    "Belo Horizonte",
+    "Porto Alegre",
+    "Curitiba",
+    "Recife",
+    "Salvador",
+    "Fortaleza",
+    "Boston",
+    "Chicago",
+    "Lisbon",
+    "Porto",
+]
+DEPARTMENTS = [
+    "Cardiology",
+    "Emergency",
+    "Radiology",
+    "Oncology",
+    "Pediatrics",
+    "Pharmacy",
+    "Laboratory",
+    "Intensive Care",
+    "Surgery",
+    "Neurology",
+    "Maternity",
+    "Orthopedics",
+]
+DESCRIPTIONS = [
+    "Inpatient care with continuous monitoring",
+    "Atendimento de urgência e emergência 24 horas",
+    "Diagnostic imaging and interventional procedures",
+    "Centro de terapia intensiva adulto",
+    "Medication dispensing and infusion preparation",
+    "Coleta de amostras e análises clínicas",
+    "Surgical suites and post-anesthesia recovery",
+    "Internação pediátrica com acompanhante",
+]
+# (category, message templates, sources)
+EVENT_KINDS = [
+    (
+        "medication",
+        [
+            "Dose mismatch for {drug} on infusion pump {n}",
+            "Divergência de dose de {drug} na bomba de infusão {n}",
+            "Barcode scan failed for {drug} before administration",
+        ],
+        ["infusion-pump", "bedside-scanner", "pharmacy-system"],
+    ),
+    (
+        "equipment",
+        [
+            "Ventilator {n} reported pressure sensor failure",
+            "Monitor multiparamétrico {n} sem sinal de oximetria",
+            "Infusion pump {n} battery below threshold",
+        ],
+        ["ventilator", "patient-monitor", "infusion-pump"],
+    ),
+    (
+        "records",
+        [
+            "Lab result for order {n} could not be matched to a patient",
+            "Prescrição {n} sem assinatura do médico responsável",
+            "Duplicate admission record {n} detected",
+        ],
+        ["ehr", "lis", "admission-desk"],
+    ),
+    (
+        "network",
+        [
+            "Timeout sending HL7 message {n} to the EHR",
+            "Falha de conexão com o servidor PACS ao enviar exame {n}",
+        ],
+        ["hl7-gateway", "pacs"],
+    ),
+]
+DRUGS = [
+    "heparin",
+    "insulin",
+    "morphine",
+    "dipirona",
+    "vancomycin",
+    "amoxicilina",
+    "noradrenaline",
+]
+SEVERITY_WEIGHTS = [
+    (EventSeverity.LOW, 50),
+    (EventSeverity.MEDIUM, 35),
+    (EventSeverity.HIGH, 12),
+    (EventSeverity.CRITICAL, 3),
+]
+
+
+class CsvStream:
+    """Read-only file object that renders rows to CSV as COPY asks for data."""
+
+    def __init__(self, rows: Iterator[Sequence[Any]]):
+        self._rows = rows
+        self._buffer = ""
+        self._position = 0
+        self.count = 0
+
+    def _render_chunk(self) -> str:
+        out = io.StringIO()
+        writer = csv.writer(out, lineterminator="\n")
+        for row in self._rows:
+            writer.writerow(["" if value is None else value for value in row])
+            self.count += 1
+            if out.tell() >= COPY_READ_SIZE:
+                break
+        return out.getvalue()
+
+    def read(self, size: int = -1) -> str:
+        if self._position >= len(self._buffer):
+            self._buffer = self._render_chunk()
+            self._position = 0
+        end = len(self._buffer) if size < 0 else self._position + size
+        data = self._buffer[self._position : end]
+        self._position += len(data)
+        return data
+
+
+def copy_rows(
+    db: Session, table: str, columns: Sequence[str], rows: Iterator[Sequence[Any]]
+) -> int:
+    """
+    COPY `rows` into `table` within the session's transaction (on its
+    search_path).
+    """
+    cursor = db.connection().connection.dbapi_connection.cursor()
+    stream = CsvStream(rows)
+    try:
+        # Unquoted empty fields, as written for None, load as NULL in CSV format
+        cursor.copy_expert(
+            f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+            stream,
+            size=COPY_READ_SIZE,
+        )
+    finally:
+        cursor.close()
+    return stream.count
+
+
+def _report(table: str, count: int, started: float) -> None:
+    elapsed = time.monotonic() - started
+    rate = count / elapsed if elapsed else 0.0
+    print(f"{table}: {count:,} rows in {elapsed:.1f}s ({rate:,.0f} rows/s)")
+
+
+def _analyze(db: Session, table: str) -> None:
+    db.execute(text(f"ANALYZE {table}"))
+    db.commit()
+
+
+def generate_users(db: Session, count: int, rng: random.Random) -> None:
+    started = time.monotonic()
+    password = get_password_hash(SYNTHETIC_PASSWORD)
+    # Continue after existing rows so reruns never collide on email
+    offset = db.execute(text("SELECT coalesce(max(id), 0) FROM users")).scalar_one()
+
+    def rows() -> Iterator[Sequence[Any]]:
+        for n in range(offset + 1, offset + count + 1):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            # Last names are ASCII, so emails pass strict validators
+            email = f"{last.lower()}.{n}@synthetic.example"
+            yield f"{first} {last}", email, password, rng.random() < 0.95
+
+    copied = copy_rows(db, "users", ("name", "email", "password", "is_active"), rows())
+    db.commit()
+    _analyze(db, "users")
+    _report("users", copied, started)
+
+
+def _sector_rows(
+    first_id: int, count: int, rng: random.Random
+) -> Iterator[Sequence[Any]]:
+    """Pre-order rows of whole hospital trees, cut off after `count` sectors."""
+    next_id = first_id
+    emitted = 0
+    # (kind, name, parent id, parent path, depth)
+    stack: List[tuple] = []
+    hospital = 0
+    while emitted < count:
+        if not stack:
+            hospital += 1
+            name = f"Hospital {rng.choice(CITIES)} {hospital}"
+            stack.append((SectorKind.HOSPITAL, name, None, "/", 0))
+        kind, name, parent_id, parent_path, depth = stack.pop()
+        sector_id = next_id
+        next_id += 1
+        path = f"{parent_path}{sector_id}/"
+        sample_rate = 0.1 if rng.random() < 0.02 else None
+        yield (
+            sector_id,
+            name,
+            rng.choice(DESCRIPTIONS),
+            rng.random() < 0.97,
+            sample_rate,
+            parent_id,
+            kind.value,
+            path,
+            depth,
+        )
+        emitted += 1
+        child_kind = CHILD_KIND.get(kind)
+        if child_kind is None:
+            continue
+        children = []
+        for i in range(1, TREE_FANOUT[kind] + 1):
+            if child_kind == SectorKind.BUILDING:
+                child_name = f"Building {chr(ord('A') + i - 1)}"
+            elif child_kind == SectorKind.DEPARTMENT:
+                child_name = rng.choice(DEPARTMENTS)
+            else:
+                child_name = f"{name} Ward {i}"
+            children.append((child_kind, child_name, sector_id, path, depth + 1))
+        # Reversed, so children come off the stack in order
+        stack.extend(reversed(children))
+
+
+def generate_sectors(db: Session, count: int, rng: random.Random) -> None:
+    started = time.monotonic()
+    # Ids are assigned here so paths can be written in the same pass
+    sector_repository.lock_hierarchy(db)
+    first_id = db.execute(
+        text("SELECT coalesce(max(id), 0) + 1 FROM sectors")
+    ).scalar_one()
+    columns = (
+        "id",
+        "name",
+        "description",
+        "is_active",
+        "event_sample_rate",
+        "parent_id",
+        "kind",
+        "path",
+        "depth",
+    )
+    copied = copy_rows(db, "sectors", columns, _sector_rows(first_id, count, rng))
+    db.execute(
+        text("SELECT setval(pg_get_serial_sequence('sectors', 'id'), :last_id)"),
+        {"last_id": first_id + copied - 1},
+    )
+    db.commit()
+    _analyze(db, "sectors")
+    _report("sectors", copied, started)
+
+
+def _sample_ids(db: Session, table: str, limit: int) -> List[int]:
+    rows = db.execute(
+        text(f"SELECT id FROM {table} ORDER BY id DESC LIMIT :limit"), {"limit": limit}
+    )
+    return list(rows.scalars())
+
+
+def generate_events(
+    db: Session,
+    count: int,
+    days: int,
+    rng: random.Random,
+    end: Optional[datetime] = None,
+) -> None:
+    """Events over the `days` days before `end` (default: now)."""
+    started = time.monotonic()
+    sector_ids = _sample_ids(db, "sectors", 1_000_000)
+    if not sector_ids:
+        raise SystemExit("Events need sectors: generate some with --sectors first")
+    user_ids = _sample_ids(db, "users", 100_000)
+    end = end or datetime.now(timezone.utc)
+    start = end - timedelta(days=days)
+    event_partition_service.ensure_partitions_for(
+        db, [start + timedelta(days=day) for day in range(days + 1)] + [end]
+    )
+    severities = [severity.value for severity, _ in SEVERITY_WEIGHTS]
+    weights = [weight for _, weight in SEVERITY_WEIGHTS]
+    # A few sectors report most of the events, as in practice
+    hot_sectors = sector_ids[: max(1, len(sector_ids) // 20)]
+    span = (end - start).total_seconds()
+
+    def rows() -> Iterator[Sequence[Any]]:
+        for _ in range(count):
+            category, templates, sources = rng.choice(EVENT_KINDS)
+            message = rng.choice(templates).format(
+                drug=rng.choice(DRUGS), n=rng.randint(1, 999)
+            )
+            sector_id = rng.choice(hot_sectors if rng.random() < 0.5 else sector_ids)
+            user_id = rng.choice(user_ids) if user_ids and rng.random() < 0.7 else None
+            occurred_at = start + timedelta(seconds=rng.random() * span)
+            yield (
+                sector_id,
+                user_id,
+                rng.choices(severities, weights)[0],
+                category,
+                message,
+                rng.choice(sources),
+                occurred_at.isoformat(),
+            )
+
+    columns = (
+        "sector_id",
+        "user_id",
+        "severity",
+        "category",
+        "message",
+        "source",
+        "occurred_at",
+    )
+    copied = copy_rows(db, "error_events", columns, rows())
+    db.commit()
+    _analyze(db, "error_events")
+    _report("error_events", copied, started)
+
+
+def _has_table(db: Session, table: str) -> bool:
+    return db.execute(
+        text("SELECT to_regclass(:table) IS NOT NULL"), {"table": table}
+    ).scalar_one()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--sectors", type=int, default=5_000)
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument(
+        "--days", type=int, default=30, help="spread events over this many past days"
+    )
+    parser.add_argument(
+        "--tenant", help="fill this tenant's schema (with tenant routing enabled)"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=None, help="seed for reproducible data"
+    )
+    args = parser.parse_args(argv)
+
+    if settings.ENVIRONMENT.lower() == "production":
+        raise SystemExit(
+            "Refusing to generate synthetic data with ENVIRONMENT=production"
+        )
+    if args.days < 1:
+        parser.error("--days must be at least 1")
+
+    rng = random.Random(args.seed)
+    route = tenant_router.resolve(args.tenant) if args.tenant else None
+    db = open_session(route)
+    try:
+        if args.users:
+            generate_users(db, args.users, rng)
+        if args.sectors:
+            generate_sectors(db, args.sectors, rng)
+        if args.events:
+            if _has_table(db, "error_events"):
+                generate_events(db, args.events, args.days, rng)
+            else:
+                print("error_events: table not found, skipped")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
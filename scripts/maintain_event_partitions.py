@@ -0,0 +1,52 @@
+"""
+Pre-create upcoming error event partitions, move cold partitions to BRIN
+indexes, archive old partitions (with EVENT_ARCHIVE_ENABLED) and detach or
+drop partitions past the retention window.
+
+    python scripts/maintain_event_partitions.py [--skip-archive]
+
+Safe to run repeatedly and from several replicas at once: a run finding
+another one at work on a schema skips it. Run it at boot with --skip-archive,
+which leaves the (slow) archiving to the daily scheduled run. With tenant
+routing enabled it runs for every tenant on every shard.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.domain.event.services.partition import event_partition_service
+from app.infrastructure.db.session import open_session, tenant_router
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--skip-archive",
+        action="store_true",
+        help="leave partitions due for archiving to a later run",
+    )
+    args = parser.parse_args()
+
+    for route in tenant_router.all_routes():
+        db = open_session(route)
+        try:
+            report = event_partition_service.maintain(db, archive=not args.skip_archive)
+        finally:
+            db.close()
+        if route.tenant:
+            print(f"Tenant {route.tenant} ({route.shard}/{route.schema}):")
+        if report.skipped:
+            print("Skipped: another run is maintaining these partitions")
+            continue
+        print(f"Created partitions: {report.created or '-'}")
+        print(f"Converted to BRIN: {report.converted_to_brin or '-'}")
+        print(f"Archived partitions: {report.archived or '-'}")
+        print(f"Expired partitions: {report.expired or '-'}")
+
+
+if __name__ == "__main__":
+    main()
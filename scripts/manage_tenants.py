@@ -0,0 +1,207 @@
+"""
+Provision tenants and move them between shards.
+
+    python scripts/manage_tenants.py add stmary --shard shard2
+    python scripts/manage_tenants.py move stmary --to default [--drop-source]
+    python scripts/manage_tenants.py migrate
+    python scripts/manage_tenants.py list
+
+Each tenant lives in its own schema (tenant_<name> by default) on one shard.
+`add` migrates the schema and registers the route. `move` marks the tenant as
+moving, so the API answers 503 for it, waits for every worker's routing cache
+to notice, copies the schema with pg_dump | psql, then points the route at
+the new shard and reactivates it. The tenant is unavailable for the copy.
+"""
+import argparse
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+
+from app.infrastructure.core.config import settings
+from app.infrastructure.db.session import engine, shard_engines, tenant_router
+from app.infrastructure.db.sharding import SCHEMA_NAME_PATTERN
+
+ROOT = Path(__file__).parent.parent
+ALEMBIC_INI = ROOT / "app" / "infrastructure" / "alembic.ini"
+
+
+def _libpq_url(shard: str) -> str:
+    # pg_dump and psql do not understand SQLAlchemy driver suffixes
+    url = make_url(shard_engines.url_for(shard)).set(drivername="postgresql")
+    return url.render_as_string(hide_password=False)
+
+
+def _get_route(tenant: str):
+    with engine.connect() as connection:
+        return connection.execute(
+            text(
+                "SELECT shard, schema_name, status FROM public.tenant_shards "
+                "WHERE tenant = :tenant"
+            ),
+            {"tenant": tenant},
+        ).first()
+
+
+def _set_route(tenant: str, **values) -> None:
+    assignments = ", ".join(f"{column} = :{column}" for column in values)
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                f"UPDATE public.tenant_shards SET {assignments}, updated_at = now() "
+                "WHERE tenant = :tenant"
+            ),
+            {"tenant": tenant, **values},
+        )
+
+
+def migrate(shard: str, schema: str) -> None:
+    subprocess.run(
+        [
+            "alembic",
+            "-c",
+            str(ALEMBIC_INI),
+            "-x",
+            f"shard={shard}",
+            "-x",
+            f"tenant_schema={schema}",
+            "upgrade",
+            "head",
+        ],
+        cwd=ROOT,
+        check=True,
+    )
+
+
+def add(args: argparse.Namespace) -> None:
+    schema = args.schema or f"tenant_{args.tenant}"
+    if not SCHEMA_NAME_PATTERN.fullmatch(schema):
+        sys.exit(f"Invalid schema name: {schema}")
+    shard_engines.url_for(args.shard)  # fail early on unknown shards
+    migrate(args.shard, schema)
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO public.tenant_shards (tenant, shard, schema_name) "
+                "VALUES (:tenant, :shard, :schema)"
+            ),
+            {"tenant": args.tenant, "shard": args.shard, "schema": schema},
+        )
+    print(f"Tenant {args.tenant} added on {args.shard} in schema {schema}")
+
+
+def move(args: argparse.Namespace) -> None:
+    route = _get_route(args.tenant)
+    if route is None:
+        sys.exit(f"Unknown tenant: {args.tenant}")
+    if route.shard == args.to:
+        sys.exit(f"Tenant {args.tenant} is already on {args.to}")
+    source, schema = route.shard, route.schema_name
+    shard_engines.url_for(args.to)
+
+    _set_route(args.tenant, status="moving")
+    try:
+        # Workers keep serving from their cached routes until the cache expires,
+        # and queued events may still be flushing to the source shard
+        wait = (
+            settings.TENANT_ROUTES_CACHE_TTL_SECONDS
+            + settings.EVENT_FLUSH_TIMEOUT_SECONDS
+        )
+        print(f"Waiting {wait:.0f}s for workers to stop writing to {source}...")
+        time.sleep(wait)
+
+        print(f"Copying schema {schema} from {source} to {args.to}...")
+        dump = subprocess.Popen(
+            [
+                "pg_dump",
+                "--schema",
+                schema,
+                "--no-owner",
+                "--dbname",
+                _libpq_url(source),
+            ],
+            stdout=subprocess.PIPE,
+        )
+        restore = subprocess.run(
+            [
+                "psql",
+                "--quiet",
+                "--set",
+                "ON_ERROR_STOP=1",
+                "--single-transaction",
+                "--dbname",
+                _libpq_url(args.to),
+            ],
+            stdin=dump.stdout,
+        )
+        dump.stdout.close()
+        if dump.wait() != 0 or restore.returncode != 0:
+            raise RuntimeError(
+                "Schema copy failed; the tenant stays on its source shard"
+            )
+    except BaseException:
+        _set_route(args.tenant, status="active")
+        raise
+
+    _set_route(args.tenant, shard=args.to, status="active")
+    print(f"Tenant {args.tenant} now served from {args.to}")
+
+    if args.drop_source:
+        with shard_engines.get(source).begin() as connection:
+            connection.exec_driver_sql(f'DROP SCHEMA "{schema}" CASCADE')
+        print(f"Dropped schema {schema} on {source}")
+
+
+def migrate_all(args: argparse.Namespace) -> None:
+    # No-op unless tenant routing is enabled
+    for route in tenant_router.all_routes():
+        if route.tenant:
+            print(f"Migrating tenant {route.tenant} ({route.shard}/{route.schema})")
+            migrate(route.shard, route.schema)
+
+
+def list_tenants(args: argparse.Namespace) -> None:
+    with engine.connect() as connection:
+        rows = connection.execute(
+            text(
+                "SELECT tenant, shard, schema_name, status FROM public.tenant_shards "
+                "ORDER BY tenant"
+            )
+        ).all()
+    for row in rows:
+        print(f"{row.tenant}\t{row.shard}\t{row.schema_name}\t{row.status}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add_parser = commands.add_parser("add", help="Create a tenant schema and route")
+    add_parser.add_argument("tenant")
+    add_parser.add_argument("--shard", default="default")
+    add_parser.add_argument("--schema", help="Defaults to tenant_<tenant>")
+    add_parser.set_defaults(func=add)
+
+    move_parser = commands.add_parser("move", help="Move a tenant to another shard")
+    move_parser.add_argument("tenant")
+    move_parser.add_argument("--to", required=True)
+    move_parser.add_argument("--drop-source", action="store_true")
+    move_parser.set_defaults(func=move)
+
+    migrate_parser = commands.add_parser("migrate", help="Upgrade every tenant schema")
+    migrate_parser.set_defaults(func=migrate_all)
+
+    list_parser = commands.add_parser("list", help="Show tenant routes")
+    list_parser.set_defaults(func=list_tenants)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
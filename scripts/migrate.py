@@ -0,0 +1,241 @@
+"""
+Bring every database schema to the head revision; safe to run from each replica.
+
+    python scripts/migrate.py [--check] [--lock-wait SECONDS]
+
+When nothing is pending, boot stays cheap: the head revision is read from the
+migration scripts and compared with alembic_version in one query per schema,
+without loading the app or Alembic's environment. Otherwise the runner takes
+a Postgres advisory lock so a single replica migrates while the others wait,
+checks again (the holder may have done the work), upgrades, and reports how
+long each schema took. Migrations run with a short lock_timeout (see
+MIGRATION_LOCK_TIMEOUT_MS); an upgrade that times out on a lock is retried
+with backoff. With tenant routing enabled, every tenant schema is covered.
+
+--check only compares versions and exits 1 when migrations are pending.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError, ProgrammingError
+from sqlalchemy.pool import NullPool
+
+from app.infrastructure.core.config import settings
+from app.infrastructure.db.sharding import DEFAULT_SHARD, SCHEMA_NAME_PATTERN
+
+ROOT = Path(__file__).parent.parent
+ALEMBIC_INI = ROOT / "app" / "infrastructure" / "alembic.ini"
+MIGRATIONS_DIR = ROOT / "app" / "infrastructure" / "migrations"
+# Arbitrary key for the advisory lock serializing migrations across replicas
+MIGRATION_LOCK_KEY = 0x4D16
+# SQLSTATE lock_not_available: lock_timeout expired
+LOCK_NOT_AVAILABLE = "55P03"
+LOCK_POLL_SECONDS = 1.0
+
+
+class MigrationTarget(NamedTuple):
+    shard: str
+    # None: the default schema, whose alembic_version is found on the search_path
+    schema: Optional[str]
+
+    @property
+    def label(self) -> str:
+        return f"{self.shard}/{self.schema}" if self.schema else self.shard
+
+
+def alembic_config(target: MigrationTarget) -> Config:
+    # Same -x arguments as `alembic -x shard=... -x tenant_schema=...`
+    x_args = []
+    if target.shard != DEFAULT_SHARD:
+        x_args.append(f"shard={target.shard}")
+    if target.schema:
+        x_args.append(f"tenant_schema={target.schema}")
+    config = Config(str(ALEMBIC_INI), cmd_opts=argparse.Namespace(x=x_args))
+    config.set_main_option("script_location", str(MIGRATIONS_DIR))
+    return config
+
+
+class Databases:
+    """One unpooled engine per shard, created on first use."""
+
+    def __init__(self) -> None:
+        self._engines: Dict[str, Engine] = {}
+
+    def get(self, shard: str) -> Engine:
+        if shard not in self._engines:
+            if shard == DEFAULT_SHARD:
+                url = str(settings.SQLALCHEMY_DATABASE_URI)
+            else:
+                url = settings.SHARD_DATABASE_URIS[shard]
+            self._engines[shard] = create_engine(url, poolclass=NullPool)
+        return self._engines[shard]
+
+    def dispose(self) -> None:
+        for engine in self._engines.values():
+            engine.dispose()
+
+
+def list_targets(databases: Databases) -> List[MigrationTarget]:
+    targets = [MigrationTarget(DEFAULT_SHARD, None)]
+    if not settings.TENANT_ROUTING_ENABLED:
+        return targets
+    with databases.get(DEFAULT_SHARD).connect() as connection:
+        try:
+            rows = connection.execute(
+                text(
+                    "SELECT shard, schema_name FROM public.tenant_shards "
+                    "ORDER BY tenant"
+                )
+            ).all()
+        except ProgrammingError:
+            # Routing table not created yet: the default schema's migrations add it
+            return targets
+    for row in rows:
+        if SCHEMA_NAME_PATTERN.fullmatch(row.schema_name):
+            targets.append(MigrationTarget(row.shard, row.schema_name))
+    return targets
+
+
+def current_revisions(connection: Connection, target: MigrationTarget) -> Set[str]:
+    table = f'"{target.schema}".alembic_version' if target.schema else "alembic_version"
+    try:
+        return set(
+            connection.exec_driver_sql(f"SELECT version_num FROM {table}").scalars()
+        )
+    except ProgrammingError:
+        # Never migrated
+        connection.rollback()
+        return set()
+
+
+def pending_targets(
+    databases: Databases, targets: Sequence[MigrationTarget], heads: Set[str]
+) -> List[Tuple[MigrationTarget, Set[str]]]:
+    pending = []
+    for shard in dict.fromkeys(target.shard for target in targets):
+        with databases.get(shard).connect() as connection:
+            for target in targets:
+                if target.shard != shard:
+                    continue
+                current = current_revisions(connection, target)
+                if current != heads:
+                    pending.append((target, current))
+    return pending
+
+
+def acquire_lock(connection: Connection, wait_seconds: float) -> None:
+    deadline = time.monotonic() + wait_seconds
+    waiting = False
+    while not connection.execute(
+        text("SELECT pg_try_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY}
+    ).scalar_one():
+        if not waiting:
+            print("Another replica is migrating; waiting for it to finish...")
+            waiting = True
+        if time.monotonic() >= deadline:
+            raise SystemExit(
+                f"Timed out after {wait_seconds:.0f}s waiting for the migration lock"
+            )
+        time.sleep(LOCK_POLL_SECONDS)
+    # Session-level lock: end the implicit transaction but keep the lock
+    connection.commit()
+
+
+def upgrade(target: MigrationTarget, retries: int) -> None:
+    config = alembic_config(target)
+    for attempt in range(retries + 1):
+        try:
+            command.upgrade(config, "head")
+            return
+        except DBAPIError as e:
+            if (
+                getattr(e.orig, "pgcode", None) != LOCK_NOT_AVAILABLE
+                or attempt == retries
+            ):
+                raise
+            delay = 2**attempt
+            print(f"{target.label}: lock timeout ({e.orig}), retrying in {delay}s")
+            time.sleep(delay)
+
+
+def _revisions(revisions: Set[str]) -> str:
+    return ", ".join(sorted(revisions)) or "empty"
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="only report whether migrations are pending",
+    )
+    parser.add_argument(
+        "--lock-wait", type=float, default=settings.MIGRATION_LOCK_WAIT_SECONDS
+    )
+    parser.add_argument("--retries", type=int, default=settings.MIGRATION_RETRIES)
+    args = parser.parse_args(argv)
+
+    started = time.monotonic()
+    heads = set(
+        ScriptDirectory.from_config(
+            alembic_config(MigrationTarget(DEFAULT_SHARD, None))
+        ).get_heads()
+    )
+    databases = Databases()
+    try:
+        targets = list_targets(databases)
+        pending = pending_targets(databases, targets, heads)
+        if not pending:
+            elapsed_ms = (time.monotonic() - started) * 1000
+            print(
+                f"{len(targets)} schema(s) at head {_revisions(heads)}; "
+                f"checked in {elapsed_ms:.0f} ms"
+            )
+            return 0
+        if args.check:
+            for target, current in pending:
+                print(
+                    f"{target.label}: at {_revisions(current)}, "
+                    f"head is {_revisions(heads)}"
+                )
+            return 1
+
+        with databases.get(DEFAULT_SHARD).connect() as lock_connection:
+            acquire_lock(lock_connection, args.lock_wait)
+            try:
+                # Whoever held the lock may have migrated everything already
+                for target, current in pending_targets(databases, targets, heads):
+                    target_started = time.monotonic()
+                    print(
+                        f"{target.label}: migrating from {_revisions(current)} "
+                        f"to {_revisions(heads)}"
+                    )
+                    upgrade(target, args.retries)
+                    elapsed = time.monotonic() - target_started
+                    print(f"{target.label}: migrated in {elapsed:.1f}s")
+            finally:
+                lock_connection.execute(
+                    text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY}
+                )
+                lock_connection.commit()
+    finally:
+        databases.dispose()
+
+    print(f"Migrations finished in {time.monotonic() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,37 @@
+"""
+Run background jobs in a sidecar process instead of the API workers.
+
+Start it next to the API with JOB_RUNNER_IN_PROCESS=false set for the API.
+Stops on SIGINT/SIGTERM after running jobs finish.
+"""
+import logging
+import signal
+import sys
+import threading
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.domain.audit.services.audit import audit_service
+from app.domain.job.services.runner import job_runner
+from app.infrastructure.core.security import shutdown_password_hash_pool
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    stop = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    audit_service.start()
+    job_runner.start()
+    print("Job runner started")
+    stop.wait()
+    print("Stopping job runner...")
+    job_runner.stop(timeout=None)
+    # Write the audit records of the last jobs
+    audit_service.stop()
+    shutdown_password_hash_pool()
+
+
+if __name__ == "__main__":
+    main()
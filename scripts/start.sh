@@ -69,9 +69,14 @@ sys.exit(1)
 # Verificar conexão com o banco de dados
 check_db_connection
 
-# Aplicar migrações
+# Aplicar migrações (sai logo se já estiver no head; uma réplica migra por vez)
 echo "Running database migrations..."
-alembic -c app/infrastructure/alembic.ini upgrade head
+python scripts/migrate.py
+
+# Garantir partições futuras da tabela de eventos (o arquivamento fica para a
+# execução agendada, para não atrasar o boot)
+echo "Maintaining error event partitions..."
+python scripts/maintain_event_partitions.py --skip-archive
 
 # Iniciar aplicação
 echo "Starting application..."
@@ -0,0 +1,37 @@
+"""
+Settings are read when the app modules are first imported, so the required
+ones get harmless defaults here, before any test imports them. A developer's
+.env.local is deliberately not read.
+
+Integration tests (tests/integration) need disposable Postgres databases:
+TEST_DATABASE_URL becomes the default database and TEST_SHARD_DATABASE_URL,
+if set, a second shard named "shard2". Without them those tests are skipped.
+"""
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+os.environ["ENV_FILE"] = str(Path(__file__).parent / ".env.test")
+os.environ.setdefault("POSTGRES_SERVER", "localhost")
+os.environ.setdefault("POSTGRES_USER", "postgres")
+os.environ.setdefault("POSTGRES_PASSWORD", "postgres")
+os.environ.setdefault("POSTGRES_DB", "pulse_flow_test")
+# The cheapest cost bcrypt accepts; tests hash passwords only to store them
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+TEST_SHARD_DATABASE_URL = os.environ.get("TEST_SHARD_DATABASE_URL")
+if TEST_DATABASE_URL:
+    os.environ["SQLALCHEMY_DATABASE_URI"] = TEST_DATABASE_URL
+if TEST_SHARD_DATABASE_URL:
+    os.environ["SHARD_DATABASE_URIS"] = json.dumps({"shard2": TEST_SHARD_DATABASE_URL})
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--update-plan-baseline",
+        action="store_true",
+        help="record the current query plan costs as the baseline",
+    )
@@ -0,0 +1,85 @@
+import argparse
+import os
+from pathlib import Path
+from typing import Iterator, List
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy.orm import Session
+
+from app.infrastructure.db.session import open_session
+from app.infrastructure.db.sharding import DEFAULT_ROUTE, DEFAULT_SHARD, TenantRoute
+from tests.integration.tenants import ALPHA, BETA, GAMMA
+
+MIGRATIONS_DIR = Path(__file__).parents[2] / "app" / "infrastructure" / "migrations"
+
+# Emptied before each test
+TABLES = (
+    "audit_log",
+    "job_inputs",
+    "jobs",
+    "users",
+    "sectors",
+    "error_events",
+    "error_issues",
+    "sector_event_rollups",
+)
+
+
+def migrate(route: TenantRoute) -> None:
+    x_args = []
+    if route.shard != DEFAULT_SHARD:
+        x_args.append(f"shard={route.shard}")
+    if route.schema:
+        x_args.append(f"tenant_schema={route.schema}")
+    # No config file: Alembic would otherwise reconfigure logging for the run
+    config = Config(cmd_opts=argparse.Namespace(x=x_args))
+    config.set_main_option("script_location", str(MIGRATIONS_DIR))
+    command.upgrade(config, "head")
+
+
+def truncate(route: TenantRoute) -> None:
+    db = open_session(route)
+    try:
+        db.connection().exec_driver_sql(
+            f"TRUNCATE {', '.join(TABLES)} RESTART IDENTITY CASCADE"
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+@pytest.fixture(scope="session")
+def database() -> None:
+    if not os.environ.get("TEST_DATABASE_URL"):
+        pytest.skip("TEST_DATABASE_URL is not set")
+    migrate(DEFAULT_ROUTE)
+
+
+@pytest.fixture(scope="session")
+def tenants(database: None) -> List[TenantRoute]:
+    if not os.environ.get("TEST_SHARD_DATABASE_URL"):
+        pytest.skip("TEST_SHARD_DATABASE_URL is not set")
+    routes = [ALPHA, GAMMA, BETA]
+    for route in routes:
+        migrate(route)
+    return routes
+
+
+@pytest.fixture
+def clean_tenants(tenants: List[TenantRoute]) -> List[TenantRoute]:
+    for route in [DEFAULT_ROUTE, *tenants]:
+        truncate(route)
+    return tenants
+
+
+@pytest.fixture
+def db(database: None) -> Iterator[Session]:
+    """Session on the default schema, emptied before the test."""
+    truncate(DEFAULT_ROUTE)
+    session = open_session()
+    try:
+        yield session
+    finally:
+        session.close()
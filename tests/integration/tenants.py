@@ -0,0 +1,6 @@
+from app.infrastructure.db.sharding import DEFAULT_SHARD, TenantRoute
+
+# Two tenants sharing the default database, and one on the second shard
+ALPHA = TenantRoute("alpha", DEFAULT_SHARD, "tenant_alpha")
+GAMMA = TenantRoute("gamma", DEFAULT_SHARD, "tenant_gamma")
+BETA = TenantRoute("beta", "shard2", "tenant_beta")
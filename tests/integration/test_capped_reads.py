@@ -0,0 +1,32 @@
+from sqlalchemy.orm import Session
+
+from app.domain.user.models.user import User
+from app.domain.user.repositories.user import user_repository
+from app.infrastructure.db.budget import QueryBudget, rows_capped
+
+
+def add_users(db: Session, count: int) -> None:
+    # Inserted out of id order, so an unordered read could return any of them
+    db.add_all(
+        User(id=id_, name=f"user{id_}", email=f"user{id_}@example.com", password="x")
+        for id_ in reversed(range(1, count + 1))
+    )
+    db.commit()
+
+
+def test_capped_reads_keep_the_first_rows_by_id(db: Session) -> None:
+    add_users(db, 5)
+    db.info["db_budget"] = QueryBudget("test", statement_timeout_ms=0, max_rows=3)
+
+    users = user_repository.search_users(db, name="user")
+
+    assert [user.id for user in users] == [1, 2, 3]
+    assert rows_capped(db)
+
+
+def test_reads_within_the_cap_are_not_flagged(db: Session) -> None:
+    add_users(db, 3)
+    db.info["db_budget"] = QueryBudget("test", statement_timeout_ms=0, max_rows=3)
+
+    assert len(user_repository.get_all(db)) == 3
+    assert not rows_capped(db)
@@ -0,0 +1,111 @@
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.domain.audit.models.audit import AuditLog
+from app.domain.audit.services.audit import audit_service
+from app.domain.sector.models.sector import Sector
+from app.domain.sector.schemas.sector import SectorCreate, SectorMove
+from app.domain.sector.services.sector import sector_service
+from app.domain.user.models.user import User
+from app.infrastructure.db.audit import REDACTED, set_actor
+
+Entry = Tuple[str, int, str, Dict[str, List[Any]]]
+
+
+def trail(db: Session, entity: str) -> List[Entry]:
+    """Audit entries of `entity`, oldest first."""
+    db.rollback()
+    entries = reversed(audit_service.list_entries(db, entity))
+    return [(e.entity, e.entity_id, e.action, e.changes) for e in entries]
+
+
+def test_changes_record_only_what_changed(db: Session) -> None:
+    set_actor(db, 42)
+    user = User(name="Ana", email="ana@example.com", password="secret")
+    db.add(user)
+    db.commit()
+    user.name = "Ana Lima"
+    user.password = "other"
+    user.email = "ana@example.com"
+    db.commit()
+    db.delete(user)
+    db.commit()
+
+    create, update, delete = trail(db, "user")
+    assert create[2] == "create"
+    assert create[3]["email"] == [None, "ana@example.com"]
+    assert create[3]["password"] == [None, REDACTED]
+    assert "created_at" not in create[3]
+    assert update[2:] == (
+        "update",
+        {"name": ["Ana", "Ana Lima"], "password": [REDACTED, REDACTED]},
+    )
+    assert delete[2] == "delete"
+    assert delete[3]["name"] == ["Ana Lima", None]
+    assert db.scalars(select(AuditLog.actor_id)).all() == [42, 42, 42]
+
+
+def test_unchanged_update_is_not_recorded(db: Session) -> None:
+    sector = Sector(name="ICU", path="/", depth=0)
+    db.add(sector)
+    db.commit()
+    sector.name = "ICU"
+    db.commit()
+
+    assert [entry[2] for entry in trail(db, "sector")] == ["create"]
+
+
+def test_moving_a_subtree_records_every_rewritten_sector(db: Session) -> None:
+    def create(name: str, parent: Sector = None) -> Sector:
+        parent_id = parent.id if parent else None
+        return sector_service.create_sector(
+            db, SectorCreate(name=name, parent_id=parent_id)
+        )
+
+    north = create("North")
+    south = create("South")
+    ward = create("Ward", north)
+    bed = create("Bed", ward)
+    ids = (north.id, south.id, ward.id, bed.id)
+    created = len(trail(db, "sector"))
+
+    sector_service.move_sector(db, ward.id, SectorMove(parent_id=south.id))
+
+    moves = {entry[1]: entry[3] for entry in trail(db, "sector")[created:]}
+    north_id, south_id, ward_id, bed_id = ids
+    assert moves == {
+        ward_id: {
+            "parent_id": [north_id, south_id],
+            "path": [f"/{north_id}/{ward_id}/", f"/{south_id}/{ward_id}/"],
+        },
+        bed_id: {
+            "path": [
+                f"/{north_id}/{ward_id}/{bed_id}/",
+                f"/{south_id}/{ward_id}/{bed_id}/",
+            ],
+        },
+    }
+
+
+def test_moving_to_the_root_records_the_depth(db: Session) -> None:
+    root = sector_service.create_sector(db, SectorCreate(name="North"))
+    ward = sector_service.create_sector(
+        db, SectorCreate(name="Ward", parent_id=root.id)
+    )
+    ward_id = ward.id
+    created = len(trail(db, "sector"))
+
+    sector_service.move_sector(db, ward_id, SectorMove(parent_id=None))
+
+    (entry,) = trail(db, "sector")[created:]
+    assert entry[1:] == (
+        ward_id,
+        "update",
+        {
+            "parent_id": [root.id, None],
+            "path": [f"/{root.id}/{ward_id}/", f"/{ward_id}/"],
+            "depth": [1, 0],
+        },
+    )
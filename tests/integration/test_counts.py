@@ -0,0 +1,77 @@
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.domain.common.schemas.counts import CountMode
+from app.domain.common.services.counts import CountService
+from app.domain.sector.models.sector import Sector
+from app.domain.sector.repositories.sector import sector_repository
+from app.domain.user.models.user import User
+from app.domain.user.repositories.user import user_repository
+
+
+def add_users(db: Session, *emails: str, active: bool = True) -> None:
+    db.add_all(
+        User(name=email, email=email, password="x", is_active=active)
+        for email in emails
+    )
+    db.commit()
+
+
+def test_facets_fold_into_one_count_per_value(db: Session) -> None:
+    add_users(db, "a@clinic.org", "b@Clinic.org", "c@example.com")
+    add_users(db, "d@clinic.org", active=False)
+
+    total, facets = user_repository.count_by_filter(
+        db, facets=user_repository.count_facets
+    )
+
+    assert total == 4
+    assert facets == {
+        "is_active": {True: 3, False: 1},
+        "email_domain": {"clinic.org": 3, "example.com": 1},
+    }
+
+
+def test_filters_apply_to_the_total_and_the_facets(db: Session) -> None:
+    add_users(db, "ana@clinic.org", "bruno@clinic.org", "ana@example.com")
+
+    total, facets = user_repository.count_by_filter(
+        db, facets=user_repository.count_facets, name="ana"
+    )
+
+    assert total == 2
+    assert facets["email_domain"] == {"clinic.org": 1, "example.com": 1}
+    assert user_repository.count_by_filter(db, name="ana") == (2, {})
+
+
+def test_null_facet_values_are_counted_apart_from_the_total(db: Session) -> None:
+    db.add_all([Sector(name="ICU", path="/", depth=0), Sector(name="ER", path="/")])
+    db.commit()
+    # The ORM would insert the column default instead of None
+    db.execute(update(Sector).where(Sector.name == "ICU").values(is_active=None))
+    db.commit()
+
+    total, facets = sector_repository.count_by_filter(
+        db, facets=sector_repository.count_facets
+    )
+
+    assert total == 2
+    assert facets == {"is_active": {None: 1, True: 1}}
+
+
+def test_counts_are_cached_per_filter(db: Session) -> None:
+    service = CountService()
+    add_users(db, "ana@clinic.org")
+
+    def count(**filters: str) -> int:
+        return service.count(
+            db, user_repository, CountMode.EXACT, filters=filters
+        ).total
+
+    assert count() == 1
+    assert count(name="bruno") == 0
+    add_users(db, "bruno@clinic.org")
+
+    assert count() == 1
+    assert count(name="bruno") == 0
+    assert CountService().count(db, user_repository, CountMode.EXACT).total == 2
@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta, timezone
+from typing import Iterator
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.domain.event.repositories.partition import event_partition_repository
+from app.domain.event.services.partition import (
+    event_partition_service,
+    partition_bounds,
+    partition_name,
+)
+from app.infrastructure.core.config import settings
+from app.infrastructure.db.session import open_session
+
+NOW = datetime.now(timezone.utc)
+
+
+@pytest.fixture
+def other_db(database: None) -> Iterator[Session]:
+    """A second session on the default schema, e.g. another replica's."""
+    session = open_session()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def partition_names(db: Session) -> set:
+    return {p.name for p in event_partition_repository.list_partitions(db)}
+
+
+def test_concurrent_run_is_skipped(db: Session, other_db: Session) -> None:
+    with event_partition_repository.maintenance_lock(other_db) as locked:
+        assert locked
+        report = event_partition_service.maintain(db, NOW)
+
+    assert report.skipped
+    assert report.created == []
+    assert not event_partition_service.maintain(db, NOW).skipped
+
+
+def test_skipping_the_archive_leaves_due_partitions(
+    db: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "EVENT_ARCHIVE_ENABLED", True)
+    old = NOW - timedelta(days=settings.EVENT_ARCHIVE_AFTER_DAYS + 1)
+    start, end = partition_bounds(old, settings.EVENT_PARTITION_INTERVAL)
+    event_partition_repository.create_partition(db, partition_name(start), start, end)
+    db.commit()
+
+    try:
+        report = event_partition_service.maintain(db, NOW, archive=False)
+
+        assert report.archived == []
+        assert partition_name(start) in partition_names(db)
+    finally:
+        db.rollback()
+        (partition,) = [
+            p
+            for p in event_partition_repository.list_partitions(db)
+            if p.name == partition_name(start)
+        ]
+        event_partition_repository.detach_partition(db, partition)
+        event_partition_repository.drop_partition(db, partition)
+        db.commit()
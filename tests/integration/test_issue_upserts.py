@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.domain.event.models.issue import ErrorIssue
+from app.domain.event.repositories.issue import error_issue_repository
+from app.domain.sector.models.sector import Sector
+
+NOW = datetime(2026, 3, 10, 12, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def sector_id(db: Session) -> int:
+    sector = Sector(name="ICU", path="/", depth=0)
+    db.add(sector)
+    db.commit()
+    return sector.id
+
+
+def occurrence(
+    sector_id: int, severity: str, first: datetime, last: datetime
+) -> Dict[str, Any]:
+    return {
+        "fingerprint": "f" * 40,
+        "sector_id": sector_id,
+        "category": "medication",
+        "message_template": "Dose of <num> mg missed",
+        "severity": severity,
+        "occurrence_count": 2,
+        "stored_count": 1,
+        "first_seen": first,
+        "last_seen": last,
+    }
+
+
+def record(db: Session, *occurrences: Dict[str, Any]) -> ErrorIssue:
+    for item in occurrences:
+        error_issue_repository.record_occurrences(db, [item])
+        db.commit()
+    return db.query(ErrorIssue).one()
+
+
+def test_later_batch_sets_the_severity(db: Session, sector_id: int) -> None:
+    earlier = NOW - timedelta(hours=2)
+    issue = record(
+        db,
+        occurrence(sector_id, "low", earlier, earlier + timedelta(hours=1)),
+        occurrence(sector_id, "critical", NOW, NOW),
+    )
+
+    assert issue.severity == "critical"
+    assert issue.occurrence_count == 4
+    assert issue.stored_count == 2
+    assert issue.last_seen == NOW
+
+
+def test_delayed_batch_keeps_the_current_severity(db: Session, sector_id: int) -> None:
+    earlier = NOW - timedelta(days=1)
+    issue = record(
+        db,
+        occurrence(sector_id, "critical", NOW - timedelta(hours=1), NOW),
+        occurrence(sector_id, "low", earlier, earlier + timedelta(hours=1)),
+    )
+
+    assert issue.severity == "critical"
+    assert issue.first_seen == earlier
+    assert issue.last_seen == NOW
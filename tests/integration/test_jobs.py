@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.domain.job.models.job import Job, JobInput
+from app.domain.job.repositories.job import job_repository
+from app.domain.job.schemas.job import JobCreate, JobType
+from app.domain.job.services.job import job_service
+from app.domain.job.services.runner import JobRunner
+from app.domain.sector.models.sector import Sector
+from app.domain.user.models.user import User
+from app.infrastructure.db.sharding import DEFAULT_ROUTE
+
+CSV = "name,description\nCardiology,Heart\nOncology,\n"
+
+
+def add_user(db: Session, email: str) -> User:
+    user = User(name=email, email=email, password="x")
+    db.add(user)
+    db.commit()
+    return user
+
+
+def enqueue_import(db: Session, user: User) -> Job:
+    job_in = JobCreate(type=JobType.IMPORT_SECTORS, params={"csv": CSV})
+    return job_service.enqueue_job(db, job_in, created_by=user.id)
+
+
+def test_upload_is_staged_apart_from_the_job(db: Session) -> None:
+    job = enqueue_import(db, add_user(db, "owner@example.com"))
+
+    assert job.params == {}
+    assert job_repository.get_input(db, job.id) == {"csv": CSV}
+
+
+def test_runner_reads_staged_upload_and_deletes_it(db: Session) -> None:
+    job = enqueue_import(db, add_user(db, "owner@example.com"))
+    runner = JobRunner(concurrency=1, poll_interval=0)
+    try:
+        assert runner._run_next(DEFAULT_ROUTE)
+    finally:
+        runner.stop()
+
+    db.refresh(job)
+    assert job.status == "succeeded"
+    assert job.result is not None and job.result["created"] == 2
+    assert sorted(db.scalars(select(Sector.name))) == ["Cardiology", "Oncology"]
+    assert db.get(JobInput, job.id) is None
+
+
+def test_jobs_are_only_visible_to_their_owner(db: Session) -> None:
+    owner = add_user(db, "owner@example.com")
+    other = add_user(db, "other@example.com")
+    job = enqueue_import(db, owner)
+
+    assert job_service.get_job(db, job.id, created_by=owner.id) is job
+    assert job_service.get_job(db, job.id, created_by=other.id) is None
+
+
+def test_purge_deletes_only_jobs_finished_before_retention(db: Session) -> None:
+    user = add_user(db, "owner@example.com")
+    expired, recent, queued = (enqueue_import(db, user) for _ in range(3))
+    now = datetime.now(timezone.utc)
+    for job, finished_at in ((expired, now - timedelta(days=31)), (recent, now)):
+        job.status = "succeeded"
+        job.finished_at = finished_at
+    db.commit()
+
+    assert job_service.purge_finished(db) == 1
+
+    remaining = db.scalars(select(Job.id).order_by(Job.id))
+    assert list(remaining) == [recent.id, queued.id]
+    assert db.get(JobInput, expired.id) is None
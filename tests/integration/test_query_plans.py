@@ -0,0 +1,397 @@
+"""
+Plans of the repositories' read queries, checked for index regressions.
+
+Every query shape below goes through its real repository method, but the
+statement is intercepted before it reaches the database and planned with
+EXPLAIN (FORMAT JSON) instead. A shape fails when its plan sequentially scans
+a table the statistics put above MIN_ROWS rows (unless the shape is a scan by
+design), or when its estimated total cost exceeds the baseline in
+query_plan_baseline.json by more than TOLERANCE.
+
+The plans are made against a seeded synthetic dataset (see
+scripts/generate_dataset.py). After an intended plan change, record the new
+costs with:
+
+    pytest tests/integration/test_query_plans.py --update-plan-baseline
+"""
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.domain.event.repositories.event import error_event_repository
+from app.domain.event.repositories.issue import error_issue_repository
+from app.domain.event.repositories.rollup import sector_event_rollup_repository
+from app.domain.job.repositories.job import job_repository
+from app.domain.search.repositories.search import search_repository
+from app.domain.sector.repositories.sector import sector_repository
+from app.domain.user.repositories.user import user_repository
+from app.infrastructure.db.budget import DEFAULT_BUDGET_NAME, get_budget
+from app.infrastructure.db.session import open_session
+from app.infrastructure.db.sharding import DEFAULT_ROUTE
+from scripts.generate_dataset import generate_events, generate_sectors, generate_users
+from tests.integration.conftest import truncate
+
+BASELINE_PATH = Path(__file__).parent / "query_plan_baseline.json"
+CAPTURE_KEY = "capture_statement"
+
+# Dataset scale: every table, and each daily events partition, holds more
+# than MIN_ROWS rows, so a lost index shows up as a large sequential scan
+SEED = 42
+USERS = 20_000
+SECTORS = 40_000
+EVENTS = 60_000
+EVENT_DAYS = 3
+MIN_ROWS = 10_000
+# Allowed cost growth over the baseline (0.5 = +50%)
+TOLERANCE = 0.5
+
+
+class CapturedStatement(Exception):
+    """Raised in place of executing the statement being captured."""
+
+    def __init__(self, statement: str, parameters: Any):
+        super().__init__(statement)
+        self.statement = statement
+        self.parameters = parameters
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _capture_statement(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    if conn.info.get(CAPTURE_KEY):
+        raise CapturedStatement(statement, parameters)
+
+
+class Samples(NamedTuple):
+    """Existing rows the query shapes are planned for."""
+
+    user_id: int
+    email: str
+    sector_id: int
+    sector_path: str
+    hospital_path: str
+    now: datetime
+
+
+class QueryShape(NamedTuple):
+    name: str
+    run: Callable[[Session, Samples], Any]
+    budget: str = DEFAULT_BUDGET_NAME
+    # Scans by design, e.g. unanchored ILIKE filters; still cost-checked
+    seq_scan_ok: bool = False
+
+
+def _week(s: Samples) -> Dict[str, datetime]:
+    return {"start": s.now - timedelta(days=7), "end": s.now}
+
+
+# Search terms are selective ones: a term in a large share of the rows is
+# rightly answered with a sequential scan
+QUERY_SHAPES = [
+    QueryShape("users.get", lambda db, s: user_repository.get(db, id=s.user_id)),
+    QueryShape(
+        "users.get_by_email",
+        lambda db, s: user_repository.get_by_email(db, s.email, with_password=True),
+    ),
+    QueryShape(
+        "users.get_existing_emails",
+        lambda db, s: user_repository.get_existing_emails(
+            db, [s.email, "missing@synthetic.example"]
+        ),
+    ),
+    QueryShape(
+        "users.get_password_hashes",
+        lambda db, s: user_repository.get_password_hashes(
+            db, after_id=s.user_id // 2, limit=1000
+        ),
+    ),
+    QueryShape(
+        "users.get_changes",
+        lambda db, s: user_repository.get_changes(
+            db, after=None, settle_seconds=5, limit=500
+        ),
+    ),
+    QueryShape(
+        "users.get_changes.after",
+        lambda db, s: user_repository.get_changes(
+            db, after=(s.now - timedelta(hours=1), 0), settle_seconds=5, limit=500
+        ),
+    ),
+    QueryShape(
+        "users.get_all", lambda db, s: user_repository.get_all(db), seq_scan_ok=True
+    ),
+    QueryShape(
+        "users.search.name",
+        lambda db, s: user_repository.search_users(db, name="silva"),
+        budget="search",
+        seq_scan_ok=True,
+    ),
+    QueryShape(
+        "users.search.email",
+        lambda db, s: user_repository.search_users(db, email=s.email),
+        budget="search",
+        seq_scan_ok=True,
+    ),
+    QueryShape("sectors.get", lambda db, s: sector_repository.get(db, id=s.sector_id)),
+    # Only used when creating sectors; names are not indexed
+    QueryShape(
+        "sectors.get_by_name",
+        lambda db, s: sector_repository.get_by_name(db, "Intensive Care"),
+        seq_scan_ok=True,
+    ),
+    QueryShape(
+        "sectors.get_subtree",
+        lambda db, s: sector_repository.get_subtree(db, s.hospital_path),
+    ),
+    QueryShape(
+        "sectors.get_subtree.max_depth",
+        lambda db, s: sector_repository.get_subtree(db, s.hospital_path, max_depth=2),
+    ),
+    QueryShape(
+        "sectors.get_ancestors",
+        lambda db, s: sector_repository.get_ancestors(db, s.sector_path),
+    ),
+    QueryShape(
+        "sectors.get_existing_ids",
+        lambda db, s: sector_repository.get_existing_ids(db, [s.sector_id, -1]),
+    ),
+    QueryShape(
+        "sectors.get_changes",
+        lambda db, s: sector_repository.get_changes(
+            db, after=None, settle_seconds=5, limit=500
+        ),
+    ),
+    QueryShape(
+        "sectors.get_event_sample_rates",
+        lambda db, s: sector_repository.get_event_sample_rates(db),
+        seq_scan_ok=True,
+    ),
+    QueryShape(
+        "sectors.search.name",
+        lambda db, s: sector_repository.search_sectors(db, name="ward"),
+        budget="search",
+        seq_scan_ok=True,
+    ),
+    QueryShape(
+        "events.list_for_sector",
+        lambda db, s: error_event_repository.list_for_sector(
+            db, sector_id=s.sector_id, limit=100, **_week(s)
+        ),
+    ),
+    QueryShape(
+        "issues.list_for_sector",
+        lambda db, s: error_issue_repository.list_for_sector(
+            db, sector_id=s.sector_id, limit=100
+        ),
+    ),
+    QueryShape(
+        "rollups.list_buckets",
+        lambda db, s: sector_event_rollup_repository.list_buckets(
+            db, sector_id=s.sector_id, granularity="hour", **_week(s)
+        ),
+    ),
+    QueryShape(
+        "search.events",
+        lambda db, s: search_repository.search_events(
+            db, text="heparin barcode", sector_id=None, after=None, limit=20, **_week(s)
+        ),
+        budget="search",
+    ),
+    QueryShape(
+        "search.events.sector",
+        lambda db, s: search_repository.search_events(
+            db,
+            text="heparin barcode",
+            sector_id=s.sector_id,
+            after=None,
+            limit=20,
+            **_week(s),
+        ),
+        budget="search",
+    ),
+    QueryShape(
+        "search.events.after",
+        lambda db, s: search_repository.search_events(
+            db,
+            text="dipirona bomba",
+            sector_id=None,
+            after=(0.1, 2**40),
+            limit=20,
+            **_week(s),
+        ),
+        budget="search",
+    ),
+    QueryShape(
+        "search.sectors",
+        lambda db, s: search_repository.search_sectors(
+            db, text="hospital recife", path_prefix=None, after=None, limit=20
+        ),
+        budget="search",
+    ),
+    QueryShape(
+        "search.sectors.subtree",
+        lambda db, s: search_repository.search_sectors(
+            db, text="ward", path_prefix=s.hospital_path, after=None, limit=20
+        ),
+        budget="search",
+    ),
+    QueryShape("jobs.get", lambda db, s: job_repository.get(db, id=1)),
+]
+
+
+def load_samples(db: Session) -> Samples:
+    user = db.execute(
+        text("SELECT id, email FROM users ORDER BY id DESC LIMIT 1")
+    ).one()
+    # A deepest sector of the first hospital, so subtree and ancestor shapes
+    # cover a full branch of a complete tree
+    sector = db.execute(
+        text("SELECT id, path FROM sectors ORDER BY depth DESC, id LIMIT 1")
+    ).one()
+    root_id = sector.path.strip("/").split("/")[0]
+    return Samples(
+        user_id=user.id,
+        email=user.email,
+        sector_id=sector.id,
+        sector_path=sector.path,
+        hospital_path=f"/{root_id}/",
+        now=datetime.now(timezone.utc),
+    )
+
+
+def capture(db: Session, shape: QueryShape, samples: Samples) -> CapturedStatement:
+    """The first statement `shape` sends, which is not executed."""
+    connection = db.connection()
+    connection.info[CAPTURE_KEY] = True
+    try:
+        shape.run(db, samples)
+    except CapturedStatement as captured:
+        return captured
+    finally:
+        # info belongs to the pooled DBAPI connection
+        connection.info.pop(CAPTURE_KEY, None)
+    raise RuntimeError(f"{shape.name} sent no statement")
+
+
+def explain(db: Session, captured: CapturedStatement) -> Dict[str, Any]:
+    # Straight to the DBAPI cursor, with the parameters exactly as captured
+    cursor = db.connection().connection.dbapi_connection.cursor()
+    try:
+        cursor.execute(
+            "EXPLAIN (FORMAT JSON) " + captured.statement, captured.parameters
+        )
+        plan = cursor.fetchone()[0]
+    finally:
+        cursor.close()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+def _nodes(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from _nodes(child)
+
+
+def large_seq_scans(db: Session, plan: Dict[str, Any]) -> List[str]:
+    """Relations the plan scans sequentially that hold at least MIN_ROWS rows."""
+    scanned = {
+        node["Relation Name"]
+        for node in _nodes(plan)
+        if node["Node Type"] == "Seq Scan"
+    }
+    large = []
+    for relation in sorted(scanned):
+        rows = db.execute(
+            text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:relation)"),
+            {"relation": relation},
+        ).scalar()
+        if rows is not None and rows >= MIN_ROWS:
+            large.append(f"{relation} (~{int(rows):,} rows)")
+    return large
+
+
+@pytest.fixture(scope="module")
+def samples(database: None) -> Iterator[Samples]:
+    truncate(DEFAULT_ROUTE)
+    db = open_session()
+    try:
+        rng = random.Random(SEED)
+        generate_users(db, USERS, rng)
+        generate_sectors(db, SECTORS, rng)
+        # Up to midnight, so every daily partition holds a full day of events
+        midnight = datetime.now(timezone.utc).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        generate_events(db, EVENTS, EVENT_DAYS, rng, end=midnight)
+        yield load_samples(db)
+    finally:
+        db.rollback()
+        db.close()
+        truncate(DEFAULT_ROUTE)
+
+
+@pytest.fixture(scope="module")
+def plans(samples: Samples) -> Dict[str, Dict[str, Any]]:
+    plans = {}
+    for shape in QUERY_SHAPES:
+        db = open_session()
+        db.info["db_budget"] = get_budget(shape.budget)
+        try:
+            plans[shape.name] = explain(db, capture(db, shape, samples))
+        finally:
+            db.close()
+    return plans
+
+
+@pytest.fixture(scope="module")
+def baseline(
+    request: pytest.FixtureRequest, plans: Dict[str, Dict[str, Any]]
+) -> Dict[str, float]:
+    if request.config.getoption("--update-plan-baseline"):
+        costs = {
+            name: round(float(plan["Total Cost"]), 2)
+            for name, plan in sorted(plans.items())
+        }
+        BASELINE_PATH.write_text(json.dumps(costs, indent=2) + "\n")
+    return json.loads(BASELINE_PATH.read_text())
+
+
+@pytest.mark.parametrize(
+    "shape",
+    [shape for shape in QUERY_SHAPES if not shape.seq_scan_ok],
+    ids=lambda shape: shape.name,
+)
+def test_plan_has_no_large_sequential_scans(
+    shape: QueryShape, plans: Dict[str, Dict[str, Any]]
+) -> None:
+    db = open_session()
+    try:
+        assert large_seq_scans(db, plans[shape.name]) == []
+    finally:
+        db.close()
+
+
+@pytest.mark.parametrize("shape", QUERY_SHAPES, ids=lambda shape: shape.name)
+def test_plan_cost_stays_near_the_baseline(
+    shape: QueryShape,
+    plans: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, float],
+) -> None:
+    assert shape.name in baseline, "no baseline; run with --update-plan-baseline"
+    cost = float(plans[shape.name]["Total Cost"])
+    assert cost <= baseline[shape.name] * (1 + TOLERANCE)
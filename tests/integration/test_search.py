@@ -0,0 +1,34 @@
+from typing import List
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.domain.search.services.search import search_service
+from app.domain.sector.schemas.sector import SectorCreate
+from app.domain.sector.services.sector import sector_service
+
+
+def snippets(db: Session, q: str) -> List[str]:
+    page = search_service.search_sectors(db, q)
+    return [hit.snippet for hit in page.items]
+
+
+@pytest.fixture
+def sectors(db: Session) -> None:
+    for name, description in (
+        ("Pharmacy", "Erro de medicações"),
+        ("Surgery", "Infection in the operating rooms"),
+    ):
+        sector_service.create_sector(
+            db, SectorCreate(name=name, description=description)
+        )
+
+
+def test_portuguese_matches_are_highlighted(db: Session, sectors: None) -> None:
+    assert snippets(db, "medicação") == ["Pharmacy - Erro de <mark>medicações</mark>"]
+
+
+def test_english_matches_are_highlighted(db: Session, sectors: None) -> None:
+    assert snippets(db, "infections rooms") == [
+        "Surgery - <mark>Infection</mark> in the operating <mark>rooms</mark>"
+    ]
@@ -0,0 +1,108 @@
+from typing import Iterator, List
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.exc import ProgrammingError
+
+from app.domain.user.models.user import User
+from app.domain.user.repositories.user import user_repository
+from app.infrastructure.db.session import open_session
+from app.infrastructure.db.sharding import DEFAULT_ROUTE, TenantRoute
+from tests.integration.tenants import ALPHA, BETA, GAMMA
+
+
+def add_users(route: TenantRoute, *emails: str) -> None:
+    db = open_session(route)
+    try:
+        db.add_all(User(name=email, email=email, password="x") for email in emails)
+        db.commit()
+    finally:
+        db.close()
+
+
+def emails(route: TenantRoute) -> List[str]:
+    db = open_session(route)
+    try:
+        return list(db.scalars(select(User.email).order_by(User.email)))
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def leak_probe(clean_tenants: List[TenantRoute]) -> Iterator[None]:
+    """A table that exists only in the default schema (public)."""
+    db = open_session(DEFAULT_ROUTE)
+    try:
+        db.execute(text("CREATE TABLE leak_probe AS SELECT 'public row' AS secret"))
+        db.commit()
+        yield
+    finally:
+        db.execute(text("DROP TABLE IF EXISTS leak_probe"))
+        db.commit()
+        db.close()
+
+
+def test_each_tenant_sees_only_its_rows(clean_tenants: List[TenantRoute]) -> None:
+    add_users(DEFAULT_ROUTE, "public@example.com")
+    add_users(ALPHA, "alpha@example.com")
+    add_users(GAMMA, "gamma@example.com")
+    add_users(BETA, "beta@example.com")
+
+    assert emails(DEFAULT_ROUTE) == ["public@example.com"]
+    assert emails(ALPHA) == ["alpha@example.com"]
+    assert emails(GAMMA) == ["gamma@example.com"]
+    assert emails(BETA) == ["beta@example.com"]
+
+
+def test_tenants_are_routed_to_their_shard_and_schema(
+    clean_tenants: List[TenantRoute],
+) -> None:
+    located = {}
+    for route in (ALPHA, GAMMA, BETA):
+        db = open_session(route)
+        try:
+            located[route.tenant] = db.execute(
+                text("SELECT current_database(), current_schemas(false)")
+            ).one()
+        finally:
+            db.close()
+
+    assert located["alpha"][0] == located["gamma"][0] != located["beta"][0]
+    assert located["alpha"][1] == ["tenant_alpha"]
+    assert located["gamma"][1] == ["tenant_gamma"]
+    assert located["beta"][1] == ["tenant_beta"]
+
+
+def test_missing_tenant_table_does_not_resolve_to_public(leak_probe: None) -> None:
+    public = open_session(DEFAULT_ROUTE)
+    tenant = open_session(ALPHA)
+    try:
+        assert public.execute(text("SELECT secret FROM leak_probe")).scalar_one()
+
+        with pytest.raises(ProgrammingError, match="leak_probe"):
+            tenant.execute(text("SELECT secret FROM leak_probe"))
+        tenant.rollback()
+        assert tenant.execute(text("SELECT to_regclass('leak_probe')")).scalar() is None
+    finally:
+        public.close()
+        tenant.close()
+
+
+def test_estimated_counts_read_the_tenant_table(
+    clean_tenants: List[TenantRoute],
+) -> None:
+    add_users(DEFAULT_ROUTE, *(f"public{i}@example.com" for i in range(5)))
+    add_users(ALPHA, "alpha@example.com", "alpha2@example.com")
+    for route in (DEFAULT_ROUTE, ALPHA):
+        db = open_session(route)
+        try:
+            db.execute(text("ANALYZE users"))
+            db.commit()
+        finally:
+            db.close()
+
+    db = open_session(ALPHA)
+    try:
+        assert user_repository.estimate_count(db) == 2
+    finally:
+        db.close()
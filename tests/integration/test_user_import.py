@@ -0,0 +1,48 @@
+from typing import Iterator
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.domain.user.models.user import User
+from app.domain.user.services.user_import import user_import_service
+from app.infrastructure.core.security import shutdown_password_hash_pool
+
+
+@pytest.fixture(autouse=True)
+def hash_pool() -> Iterator[None]:
+    yield
+    shutdown_password_hash_pool()
+
+
+def test_import_reports_rejected_rows(db: Session) -> None:
+    db.add(User(name="Taken", email="taken@example.com", password="x"))
+    db.commit()
+    lines = [
+        "name,email,password\n",
+        "Ana,ana@example.com,secret1\n",
+        "Bruno,not-an-email,secret2\n",
+        "Ana again,ana@example.com,secret3\n",
+        "Taken,taken@example.com,secret4\n",
+        "Caio,caio@example.com,secret5\n",
+    ]
+
+    report = user_import_service.import_csv(db, lines, chunk_size=2)
+
+    assert (report.total_rows, report.created, report.failed) == (5, 2, 3)
+    assert sorted((error.line, error.email) for error in report.errors) == [
+        (3, "not-an-email"),
+        (4, "ana@example.com"),
+        (5, "taken@example.com"),
+    ]
+    emails = db.scalars(select(User.email).order_by(User.email))
+    assert list(emails) == [
+        "ana@example.com",
+        "caio@example.com",
+        "taken@example.com",
+    ]
+
+
+def test_import_requires_the_user_columns(db: Session) -> None:
+    with pytest.raises(ValueError, match="Missing CSV columns: password"):
+        user_import_service.import_csv(db, ["name,email\n", "Ana,ana@example.com\n"])
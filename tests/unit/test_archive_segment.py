@@ -0,0 +1,182 @@
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from app.domain.event.repositories import archive
+from app.domain.event.repositories.archive import (
+    ARCHIVE_COLUMNS,
+    event_archive_repository,
+)
+from app.infrastructure.archive import segment
+from app.infrastructure.archive.segment import (
+    SegmentFormatError,
+    SegmentReader,
+    SegmentWriter,
+    read_footer,
+)
+from app.infrastructure.archive.store import SegmentStore
+from app.infrastructure.db.sharding import DEFAULT_ROUTE
+
+START = datetime(2024, 5, 1, tzinfo=timezone.utc)
+
+
+def event(id_: int, minutes: int, **values: Any) -> Dict[str, Any]:
+    row = {
+        "id": id_,
+        "user_id": None,
+        "issue_id": 7,
+        "severity": "high",
+        "category": "medication",
+        "message": f"event {id_}",
+        "source": None,
+        "details": {"dose": id_},
+        "occurred_at": START + timedelta(minutes=minutes),
+        "received_at": None,
+    }
+    row.update(values)
+    return row
+
+
+def write(path: Path, groups: Dict[int, List[Dict[str, Any]]]) -> None:
+    with SegmentWriter(
+        path,
+        ARCHIVE_COLUMNS,
+        group_column="sector_id",
+        time_column="occurred_at",
+        id_column="id",
+    ) as writer:
+        for group, rows in groups.items():
+            writer.add_group(group, rows)
+
+
+def test_rows_round_trip(tmp_path: Path) -> None:
+    path = tmp_path / "2024-05" / "p.seg"
+    rows = [event(2, 5, severity="low", source="pump"), event(1, 0)]
+    write(path, {10: rows})
+
+    reader = SegmentReader(path)
+
+    assert reader.rows == 2
+    assert reader.read_group(10, START, START + timedelta(days=1)) == [
+        {"sector_id": 10, **rows[1]},
+        {"sector_id": 10, **rows[0]},
+    ]
+
+
+def test_read_group_bounds_the_time_window(tmp_path: Path) -> None:
+    path = tmp_path / "p.seg"
+    write(path, {10: [event(i, i) for i in range(1, 6)], 20: [event(9, 3)]})
+    reader = SegmentReader(path)
+
+    def ids(**kwargs: Any) -> List[int]:
+        return [row["id"] for row in reader.read_group(10, **kwargs)]
+
+    end = START + timedelta(minutes=4)
+    assert ids(start=START + timedelta(minutes=2), end=end) == [2, 3]
+    assert ids(start=START, end=end, newest=2) == [2, 3]
+    assert ids(start=end, end=end + timedelta(days=1)) == [4, 5]
+    assert reader.read_group(30, START, end) == []
+    assert not reader.overlaps(START - timedelta(days=1), START)
+
+
+def test_find_uses_the_id_ranges(tmp_path: Path) -> None:
+    path = tmp_path / "p.seg"
+    write(path, {10: [event(1, 0), event(3, 1)], 20: [event(2, 0)]})
+    reader = SegmentReader(path)
+
+    assert reader.find(2)["sector_id"] == 20
+    assert reader.find(3)["message"] == "event 3"
+    assert reader.find(4) is None
+
+
+def test_file_appears_only_on_close(tmp_path: Path) -> None:
+    path = tmp_path / "p.seg"
+
+    with pytest.raises(RuntimeError):
+        with SegmentWriter(
+            path,
+            ARCHIVE_COLUMNS,
+            group_column="sector_id",
+            time_column="occurred_at",
+            id_column="id",
+        ) as writer:
+            writer.add_group(10, [event(1, 0)])
+            raise RuntimeError("interrupted")
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_close_syncs_the_directory_after_the_rename(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "2024-05" / "p.seg"
+    synced: List[List[str]] = []
+    monkeypatch.setattr(
+        segment, "_fsync_dir", lambda d: synced.append(sorted(os.listdir(d)))
+    )
+
+    write(path, {10: [event(1, 0)]})
+
+    assert synced == [["p.seg"]]
+
+
+def test_read_footer_matches_the_reader(tmp_path: Path) -> None:
+    path = tmp_path / "p.seg"
+    write(path, {10: [event(5, 0), event(8, 1)], 20: [event(6, 2)]})
+
+    footer = read_footer(path)
+
+    assert (footer["rows"], footer["min_id"], footer["max_id"]) == (3, 5, 8)
+    assert footer["groups"].keys() == {"10", "20"}
+
+
+def test_truncated_file_is_rejected(tmp_path: Path) -> None:
+    path = tmp_path / "p.seg"
+    write(path, {10: [event(1, 0)]})
+    path.write_bytes(path.read_bytes()[:-3])
+
+    with pytest.raises(SegmentFormatError):
+        read_footer(path)
+    with pytest.raises(SegmentFormatError):
+        SegmentReader(path)
+
+
+@pytest.fixture
+def store(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> SegmentStore:
+    store = SegmentStore(str(tmp_path), max_open=10)
+    monkeypatch.setattr(archive, "segment_store", store)
+    return store
+
+
+def test_get_opens_only_segments_covering_the_id(
+    store: SegmentStore, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    namespace = archive._namespace(DEFAULT_ROUTE)
+    for day, ids in ((1, (1, 2)), (2, (3, 4)), (3, (5, 6))):
+        path = store.segment_path(namespace, START, f"error_events_p202405{day:02}")
+        write(path, {10: [event(id_, i) for i, id_ in enumerate(ids)]})
+    opened: List[str] = []
+    open_reader = store.reader
+
+    def reader(path: Path) -> SegmentReader:
+        opened.append(path.stem)
+        return open_reader(path)
+
+    monkeypatch.setattr(store, "reader", reader)
+
+    assert event_archive_repository.get(DEFAULT_ROUTE, 3).message == "event 3"
+    assert opened == ["error_events_p20240502"]
+    assert event_archive_repository.get(DEFAULT_ROUTE, 7) is None
+    assert opened == ["error_events_p20240502"]
+
+
+def test_id_range_forgets_removed_segments(store: SegmentStore) -> None:
+    path = store.segment_path(("shard", "schema"), START, "p")
+    write(path, {10: [event(4, 0), event(9, 1)]})
+
+    assert store.id_range(path) == (4, 9)
+    store.remove(path)
+    assert store.id_range(path) is None
@@ -0,0 +1,117 @@
+import threading
+import time
+from typing import Iterator, List
+
+import pytest
+
+from app.infrastructure.db.batch_writer import (
+    BatchWriter,
+    QueueFullError,
+    WriterStoppedError,
+)
+
+
+class Recorder:
+    """Flush callback keeping every batch it was handed."""
+
+    def __init__(self) -> None:
+        self.batches: List[List[int]] = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, items: List[int]) -> None:
+        self.release.wait(5)
+        self.batches.append(items)
+
+
+@pytest.fixture
+def recorder() -> Recorder:
+    return Recorder()
+
+
+@pytest.fixture
+def writer(recorder: Recorder) -> Iterator[BatchWriter[int]]:
+    writer: BatchWriter[int] = BatchWriter(
+        "test", recorder, max_size=10, batch_size=3, flush_interval=60.0
+    )
+    writer.start()
+    yield writer
+    recorder.release.set()
+    writer.stop(timeout=5)
+
+
+def test_flushes_full_batches(writer: BatchWriter[int], recorder: Recorder) -> None:
+    ticket = writer.submit([1, 2, 3, 4, 5, 6], track=True)
+
+    assert ticket is not None and ticket.wait(5)
+    assert recorder.batches == [[1, 2, 3], [4, 5, 6]]
+
+
+def test_flushes_partial_batch_after_interval(recorder: Recorder) -> None:
+    writer: BatchWriter[int] = BatchWriter(
+        "test", recorder, max_size=10, batch_size=100, flush_interval=0.05
+    )
+    writer.start()
+    try:
+        started = time.monotonic()
+        ticket = writer.submit([1, 2], track=True)
+
+        assert ticket is not None and ticket.wait(5)
+        assert time.monotonic() - started >= 0.05
+        assert recorder.batches == [[1, 2]]
+    finally:
+        writer.stop(timeout=5)
+
+
+def test_stop_drains_buffer(writer: BatchWriter[int], recorder: Recorder) -> None:
+    writer.submit([1, 2])
+
+    writer.stop(timeout=5)
+
+    assert recorder.batches == [[1, 2]]
+    assert writer.pending == 0
+
+
+def test_submit_to_stopped_writer_raises(
+    writer: BatchWriter[int], recorder: Recorder
+) -> None:
+    writer.stop(timeout=5)
+
+    with pytest.raises(WriterStoppedError):
+        writer.submit([1])
+
+
+def test_full_buffer_pushes_back(writer: BatchWriter[int], recorder: Recorder) -> None:
+    recorder.release.clear()
+    # The first batch is taken and blocks in flush; the rest fills the buffer
+    writer.submit([1, 2, 3])
+    deadline = time.monotonic() + 5
+    while writer.pending and time.monotonic() < deadline:
+        time.sleep(0.01)
+    writer.submit(list(range(10)))
+
+    with pytest.raises(QueueFullError):
+        writer.submit([99], timeout=0.05)
+
+
+def test_oversized_submission_is_rejected(writer: BatchWriter[int]) -> None:
+    with pytest.raises(QueueFullError):
+        writer.submit(list(range(11)))
+
+
+def test_ticket_reports_flush_error() -> None:
+    def fail(items: List[int]) -> None:
+        raise RuntimeError("database is down")
+
+    writer: BatchWriter[int] = BatchWriter(
+        "test", fail, max_size=10, batch_size=1, flush_interval=60.0
+    )
+    writer.start()
+    try:
+        ticket = writer.submit([1], track=True)
+
+        assert ticket is not None
+        with pytest.raises(RuntimeError, match="database is down"):
+            ticket.wait(5)
+    finally:
+        writer.stop(timeout=5)
@@ -0,0 +1,42 @@
+import pytest
+
+from app.domain.common.schemas.counts import CountsResponse
+from app.domain.common.services import counts
+from app.domain.common.services.counts import CountCache
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> list:
+    now = [100.0]
+    monkeypatch.setattr(counts.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_counts_expire_after_the_ttl(clock: list) -> None:
+    cache = CountCache(max_size=10, ttl=5.0)
+    cache.put("users", CountsResponse(total=3))
+
+    clock[0] += 5.0
+    assert cache.get("users").total == 3
+    clock[0] += 0.1
+    assert cache.get("users") is None
+
+
+def test_least_recently_used_count_is_evicted(clock: list) -> None:
+    cache = CountCache(max_size=2, ttl=5.0)
+    cache.put("users", CountsResponse(total=1))
+    cache.put("sectors", CountsResponse(total=2))
+    cache.get("users")
+
+    cache.put("events", CountsResponse(total=3))
+
+    assert cache.get("sectors") is None
+    assert cache.get("users").total == 1
+    assert cache.get("events").total == 3
+
+
+def test_facet_values_become_header_keys() -> None:
+    assert counts._facet_key(None) == "null"
+    assert counts._facet_key(True) == "true"
+    assert counts._facet_key(False) == "false"
+    assert counts._facet_key("example.com") == "example.com"
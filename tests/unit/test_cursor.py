@@ -0,0 +1,47 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.domain.common.cursor import (
+    decode_change_cursor,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+def test_round_trip() -> None:
+    cursor = encode_cursor(0.25, 42, "abc", None)
+
+    assert decode_cursor(cursor) == [0.25, 42, "abc", None]
+
+
+def test_cursor_is_url_safe_without_padding() -> None:
+    cursor = encode_cursor("??>>", 1)
+
+    assert "=" not in cursor
+    assert set(cursor) <= set(
+        "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+    )
+
+
+def test_change_cursor_round_trip() -> None:
+    updated_at = datetime(2026, 3, 9, 12, 30, 15, 123456, tzinfo=timezone.utc)
+
+    cursor = encode_cursor(updated_at, 17)
+
+    assert decode_change_cursor(cursor) == (updated_at, 17)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not base64!",
+        "e30",  # {}
+        encode_cursor("yesterday", 1),
+        encode_cursor("2026-03-09T12:30:00+00:00"),
+        encode_cursor("2026-03-09T12:30:00+00:00", "x"),
+    ],
+)
+def test_malformed_change_cursor_raises_value_error(cursor: str) -> None:
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_change_cursor(cursor)
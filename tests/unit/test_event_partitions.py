@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta, timezone
+
+from app.domain.event.repositories.partition import (
+    EventPartition,
+    _parse_timestamp,
+    event_partition_repository,
+)
+from app.domain.event.services.partition import partition_bounds, partition_name
+
+UTC = timezone.utc
+
+
+def test_daily_bounds_are_utc_midnights() -> None:
+    # 01:30 in São Paulo is 04:30 UTC on the same day
+    ts = datetime(2026, 3, 10, 1, 30, tzinfo=timezone(timedelta(hours=-3)))
+
+    assert partition_bounds(ts, "day") == (
+        datetime(2026, 3, 10, tzinfo=UTC),
+        datetime(2026, 3, 11, tzinfo=UTC),
+    )
+
+
+def test_daily_bounds_follow_the_utc_date() -> None:
+    ts = datetime(2026, 3, 10, 22, 0, tzinfo=timezone(timedelta(hours=-3)))
+
+    start, end = partition_bounds(ts, "day")
+
+    assert start == datetime(2026, 3, 11, tzinfo=UTC)
+    assert end - start == timedelta(days=1)
+
+
+def test_weekly_bounds_start_on_monday() -> None:
+    # A Thursday
+    ts = datetime(2026, 3, 12, 15, 0, tzinfo=UTC)
+
+    assert partition_bounds(ts, "week") == (
+        datetime(2026, 3, 9, tzinfo=UTC),
+        datetime(2026, 3, 16, tzinfo=UTC),
+    )
+
+
+def test_bounds_contain_their_timestamp() -> None:
+    ts = datetime(2026, 12, 31, 23, 59, 59, 999999, tzinfo=UTC)
+    for interval in ("day", "week"):
+        start, end = partition_bounds(ts, interval)
+        assert start <= ts < end
+
+
+def test_partition_name() -> None:
+    assert partition_name(datetime(2026, 3, 9, tzinfo=UTC)) == "error_events_p20260309"
+
+
+def test_parse_timestamp_accepts_postgres_offsets() -> None:
+    assert _parse_timestamp("2026-03-09 00:00:00+00") == datetime(
+        2026, 3, 9, tzinfo=UTC
+    )
+
+
+def test_find_partition_uses_half_open_ranges() -> None:
+    monday = EventPartition(
+        "error_events_p20260309",
+        datetime(2026, 3, 9, tzinfo=UTC),
+        datetime(2026, 3, 10, tzinfo=UTC),
+        has_brin=False,
+    )
+    tuesday = EventPartition(
+        "error_events_p20260310",
+        datetime(2026, 3, 10, tzinfo=UTC),
+        datetime(2026, 3, 11, tzinfo=UTC),
+        has_brin=False,
+    )
+    partitions = [monday, tuesday]
+
+    find = event_partition_repository.find_partition
+    assert find(partitions, datetime(2026, 3, 10, tzinfo=UTC)) is tuesday
+    assert find(partitions, datetime(2026, 3, 9, 23, 59, tzinfo=UTC)) is monday
+    assert find(partitions, datetime(2026, 3, 11, tzinfo=UTC)) is None
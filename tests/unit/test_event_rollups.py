@@ -0,0 +1,136 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+import pytest
+
+from app.domain.event.models.rollup import SectorEventRollup
+from app.domain.event.schemas.rollup import RollupGranularity
+from app.domain.event.services import rollup
+from app.domain.event.services.rollup import (
+    bucket_count,
+    event_rollup_service,
+    truncate,
+)
+from app.infrastructure.core.config import settings
+
+UTC = timezone.utc
+MIDNIGHT = datetime(2026, 3, 9, tzinfo=UTC)
+# The repository is replaced, so no session is needed
+NO_DB: Any = None
+
+
+class FakeRollupRepository:
+    def __init__(self, rows: List[SectorEventRollup]) -> None:
+        self.rows = rows
+        self.calls: List[Dict[str, Any]] = []
+
+    def list_buckets(self, db: Any, **filters: Any) -> List[SectorEventRollup]:
+        self.calls.append(filters)
+        return self.rows
+
+
+@pytest.fixture
+def repository(monkeypatch: pytest.MonkeyPatch) -> FakeRollupRepository:
+    fake = FakeRollupRepository([])
+    monkeypatch.setattr(rollup, "sector_event_rollup_repository", fake)
+    return fake
+
+
+def test_truncate() -> None:
+    ts = datetime(2026, 3, 9, 13, 47, 12, 5, tzinfo=UTC)
+
+    assert truncate(ts, RollupGranularity.DAY) == MIDNIGHT
+    assert truncate(ts, RollupGranularity.HOUR) == MIDNIGHT + timedelta(hours=13)
+    assert truncate(ts, RollupGranularity.MINUTE) == MIDNIGHT + timedelta(
+        hours=13, minutes=47
+    )
+
+
+def test_bucket_count_widens_to_whole_buckets() -> None:
+    start = MIDNIGHT + timedelta(minutes=30)
+    end = MIDNIGHT + timedelta(hours=2, minutes=1)
+
+    assert bucket_count(start, end, RollupGranularity.HOUR) == 3
+    assert bucket_count(start, end, RollupGranularity.MINUTE) == 91
+
+
+def test_choose_granularity_prefers_exact_tiling() -> None:
+    choose = event_rollup_service.choose_granularity
+
+    assert choose(MIDNIGHT, MIDNIGHT + timedelta(days=7)) == RollupGranularity.DAY
+    assert choose(MIDNIGHT, MIDNIGHT + timedelta(hours=5)) == RollupGranularity.HOUR
+    assert (
+        choose(MIDNIGHT, MIDNIGHT + timedelta(minutes=90)) == RollupGranularity.MINUTE
+    )
+
+
+def test_choose_granularity_falls_back_for_unaligned_ranges() -> None:
+    start = MIDNIGHT + timedelta(seconds=7)
+
+    assert (
+        event_rollup_service.choose_granularity(start, start + timedelta(hours=30))
+        == RollupGranularity.HOUR
+    )
+
+
+def test_choose_granularity_never_exceeds_bucket_cap() -> None:
+    # Hour-aligned, but a year of hourly buckets is over the cap
+    start = MIDNIGHT + timedelta(hours=1)
+    end = start + timedelta(days=300)
+
+    granularity = event_rollup_service.choose_granularity(start, end)
+
+    assert granularity == RollupGranularity.DAY
+    assert bucket_count(start, end, granularity) <= settings.EVENT_STATS_MAX_BUCKETS
+
+
+def test_stats_fold_rows_into_buckets(repository: FakeRollupRepository) -> None:
+    hour = MIDNIGHT + timedelta(hours=1)
+    repository.rows = [
+        SectorEventRollup(bucket_start=MIDNIGHT, severity="error", event_count=3),
+        SectorEventRollup(bucket_start=MIDNIGHT, severity="warning", event_count=1),
+        SectorEventRollup(bucket_start=hour, severity="error", event_count=2),
+    ]
+
+    stats = event_rollup_service.get_sector_stats(
+        NO_DB, 7, MIDNIGHT, MIDNIGHT + timedelta(hours=2)
+    )
+
+    assert stats.granularity == RollupGranularity.HOUR
+    assert stats.total == 6
+    assert stats.by_severity == {"error": 5, "warning": 1}
+    assert [(b.bucket_start, b.total) for b in stats.buckets] == [
+        (MIDNIGHT, 4),
+        (hour, 2),
+    ]
+    assert repository.calls == [
+        {
+            "sector_id": 7,
+            "granularity": "hour",
+            "start": MIDNIGHT,
+            "end": MIDNIGHT + timedelta(hours=2),
+        }
+    ]
+
+
+def test_stats_reject_long_ranges(repository: FakeRollupRepository) -> None:
+    end = MIDNIGHT + timedelta(days=settings.EVENT_STATS_MAX_RANGE_DAYS + 1)
+
+    with pytest.raises(ValueError, match="cannot exceed"):
+        event_rollup_service.get_sector_stats(NO_DB, 7, MIDNIGHT, end)
+    assert repository.calls == []
+
+
+def test_stats_reject_too_many_buckets(repository: FakeRollupRepository) -> None:
+    end = MIDNIGHT + timedelta(days=30)
+
+    with pytest.raises(ValueError, match="minute buckets"):
+        event_rollup_service.get_sector_stats(
+            NO_DB, 7, MIDNIGHT, end, RollupGranularity.MINUTE
+        )
+    assert repository.calls == []
+
+
+def test_stats_reject_empty_ranges(repository: FakeRollupRepository) -> None:
+    with pytest.raises(ValueError, match="start must be before end"):
+        event_rollup_service.get_sector_stats(NO_DB, 7, MIDNIGHT, MIDNIGHT)
@@ -0,0 +1,55 @@
+import time
+
+from app.domain.event.services.fingerprint import (
+    FingerprintCache,
+    compute_fingerprint,
+    message_template,
+)
+
+
+def test_template_strips_variable_parts() -> None:
+    message = (
+        "Timeout after 3000 ms talking to 10.0.4.17:5432 for patient "
+        "3f2b8c1e-9a7d-4e2b-8c1d-2a9e7f6b5c4d (bed B12, 0x1f3a)"
+    )
+
+    assert message_template(message) == (
+        "timeout after <n> ms talking to <ip> for patient <uuid> (bed <id>, <hex>)"
+    )
+
+
+def test_repeats_share_a_template() -> None:
+    first = message_template("Pump 7 failed:   pressure 12.5 above limit")
+    second = message_template("pump 19 failed: pressure 3,2 above limit")
+
+    assert first == second
+
+
+def test_fingerprint_separates_sectors_and_categories() -> None:
+    template = message_template("Pump 7 failed")
+    fingerprint = compute_fingerprint(1, "Device", template)
+
+    assert fingerprint == compute_fingerprint(1, " device ", template)
+    assert fingerprint != compute_fingerprint(2, "device", template)
+    assert fingerprint != compute_fingerprint(1, "network", template)
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    cache = FingerprintCache(max_size=2, ttl=60.0)
+    cache.update({"a": 1, "b": 2})
+    assert cache.get("a") == 1
+
+    cache.update({"c": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_cache_entries_expire() -> None:
+    cache = FingerprintCache(max_size=10, ttl=0.01)
+    cache.update({"a": 1})
+
+    time.sleep(0.02)
+
+    assert cache.get("a") is None
@@ -0,0 +1,165 @@
+import asyncio
+import hashlib
+from typing import Any, Dict, List, Sequence
+
+import pytest
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.types import Message, Receive, Scope, Send
+
+from app.api import idempotency
+from app.api.idempotency import IdempotencyMiddleware
+from app.domain.idempotency.schemas.idempotency import IdempotencyClaim, StoredResponse
+from app.infrastructure.core.config import settings
+from app.infrastructure.core.security import create_access_token
+from app.infrastructure.db.sharding import DEFAULT_ROUTE
+
+ORIGIN = b"https://ward.example.com"
+BODY = b'{"name": "ICU"}'
+
+
+async def endpoint(scope: Scope, receive: Receive, send: Send) -> None:
+    await JSONResponse({"ran": True}, status_code=201)(scope, receive, send)
+
+
+async def echo(scope: Scope, receive: Receive, send: Send) -> None:
+    """Answers with the size of the body it read."""
+    body = await Request(scope, receive).body()
+    await JSONResponse({"size": len(body)}, status_code=201)(scope, receive, send)
+
+
+def stack() -> CORSMiddleware:
+    """The order main.py registers them in: idempotency inside CORS."""
+    return CORSMiddleware(
+        IdempotencyMiddleware(endpoint),
+        allow_origins=["*"],
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+
+def call(
+    app: Any,
+    method: str,
+    headers: Dict[bytes, bytes],
+    chunks: Sequence[bytes] = (BODY,),
+) -> List[Message]:
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": "/api/v1/sectors",
+        "query_string": b"",
+        "headers": list(headers.items()),
+    }
+    sent: List[Message] = []
+    pending = list(chunks)
+
+    async def receive() -> Message:
+        if not pending:
+            return {"type": "http.disconnect"}
+        body = pending.pop(0)
+        return {"type": "http.request", "body": body, "more_body": bool(pending)}
+
+    async def send(message: Message) -> None:
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    return sent
+
+
+def response_headers(sent: List[Message]) -> Dict[bytes, bytes]:
+    return dict(sent[0]["headers"])
+
+
+@pytest.fixture
+def stored(monkeypatch: pytest.MonkeyPatch) -> StoredResponse:
+    """Every key resolves to an already stored response for BODY."""
+    request_hash = hashlib.sha256(b"\n" + BODY).digest()
+    response = StoredResponse(request_hash, 201, "application/json", b'{"id": 1}')
+    monkeypatch.setattr(idempotency, "_resolve_route", lambda scope: DEFAULT_ROUTE)
+    monkeypatch.setattr(
+        idempotency,
+        "_claim",
+        lambda route, key, request_hash: IdempotencyClaim(False, response),
+    )
+    return response
+
+
+def test_replayed_response_carries_cors_headers(stored: StoredResponse) -> None:
+    sent = call(stack(), "POST", {b"origin": ORIGIN, b"idempotency-key": b"retry-1"})
+
+    headers = response_headers(sent)
+    assert sent[0]["status"] == 201
+    assert headers[b"idempotent-replayed"] == b"true"
+    assert headers[b"access-control-allow-origin"] == b"*"
+    assert sent[1]["body"] == stored.body
+
+
+def test_rejected_key_carries_cors_headers() -> None:
+    sent = call(stack(), "POST", {b"origin": ORIGIN, b"idempotency-key": b" "})
+
+    assert sent[0]["status"] == 400
+    assert response_headers(sent)[b"access-control-allow-origin"] == b"*"
+
+
+def test_key_outlives_the_longest_statement_timeout() -> None:
+    longest_ms = max(
+        budget["statement_timeout_ms"] for budget in settings.DB_BUDGETS.values()
+    )
+
+    assert settings.IDEMPOTENCY_LOCK_SECONDS * 1000 > longest_ms
+
+
+@pytest.fixture
+def claimed(monkeypatch: pytest.MonkeyPatch) -> List[bytes]:
+    """Keys claimed; every claim succeeds and nothing is stored."""
+    keys: List[bytes] = []
+
+    def claim(route: Any, key: bytes, request_hash: bytes) -> IdempotencyClaim:
+        keys.append(key)
+        return IdempotencyClaim(True)
+
+    monkeypatch.setattr(idempotency, "_resolve_route", lambda scope: DEFAULT_ROUTE)
+    monkeypatch.setattr(idempotency, "_claim", claim)
+    monkeypatch.setattr(idempotency, "_finish", lambda route, key, response: None)
+    return keys
+
+
+def test_large_body_runs_without_idempotency(claimed: List[bytes]) -> None:
+    size = settings.IDEMPOTENCY_MAX_BODY_BYTES + 1
+    headers = {b"idempotency-key": b"import-1", b"content-length": str(size).encode()}
+
+    sent = call(IdempotencyMiddleware(echo), "POST", headers, [b"x" * size])
+
+    assert sent[0]["status"] == 201
+    assert sent[1]["body"] == f'{{"size":{size}}}'.encode()
+    assert claimed == []
+
+
+def test_large_streamed_body_runs_without_idempotency(claimed: List[bytes]) -> None:
+    chunk = b"x" * 40_000
+    chunks = [chunk] * 3
+
+    sent = call(
+        IdempotencyMiddleware(echo), "POST", {b"idempotency-key": b"import-1"}, chunks
+    )
+
+    assert sent[1]["body"] == f'{{"size":{len(chunk) * 3}}}'.encode()
+    assert claimed == []
+
+
+def test_key_survives_a_token_refresh(claimed: List[bytes]) -> None:
+    for token in (
+        create_access_token({"sub": "7"}),
+        create_access_token({"sub": "7", "refreshed": True}),
+        create_access_token({"sub": "8"}),
+    ):
+        headers = {
+            b"idempotency-key": b"create-1",
+            b"authorization": f"Bearer {token}".encode(),
+        }
+        call(IdempotencyMiddleware(endpoint), "POST", headers)
+
+    first, refreshed, other_user = claimed
+    assert first == refreshed != other_user
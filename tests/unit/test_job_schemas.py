@@ -0,0 +1,22 @@
+from datetime import datetime, timezone
+
+from app.domain.job.schemas.job import REDACTED, JobResponse
+
+
+def test_response_redacts_staged_params() -> None:
+    now = datetime.now(timezone.utc)
+
+    job = JobResponse(
+        id=1,
+        type="import_users",
+        status="queued",
+        params={"csv": "email,password\na@example.com,secret", "dry_run": True},
+        progress_done=0,
+        attempts=0,
+        max_attempts=3,
+        run_after=now,
+        created_at=now,
+    )
+
+    assert job.params == {"csv": REDACTED, "dry_run": True}
+    assert "secret" not in job.model_dump_json()
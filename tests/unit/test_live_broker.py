@@ -0,0 +1,83 @@
+from typing import List, Optional
+
+from app.infrastructure.live.broker import LiveFeedBroker, Message, Subscriber
+
+
+def message(id_: int, sector_id: int = 1, tenant: Optional[str] = None) -> Message:
+    return {"id": id_, "type": "event", "sector_id": sector_id, "tenant": tenant}
+
+
+def drain(subscriber: Subscriber) -> List[int]:
+    ids = []
+    while not subscriber.queue.empty():
+        ids.append(subscriber.queue.get_nowait()["id"])
+    return ids
+
+
+def test_publishes_to_subscribers_of_the_sector() -> None:
+    broker = LiveFeedBroker(queue_size=10, history_size=10)
+    sector_1 = broker.subscribe(1)
+    sector_2 = broker.subscribe(2)
+
+    broker.publish(message(1, sector_id=1))
+    broker.publish(message(2, sector_id=2))
+
+    assert drain(sector_1) == [1]
+    assert drain(sector_2) == [2]
+
+
+def test_sectors_are_scoped_by_tenant() -> None:
+    broker = LiveFeedBroker(queue_size=10, history_size=10)
+    stmary = broker.subscribe(1, tenant="stmary")
+    general = broker.subscribe(1, tenant="general")
+
+    broker.publish(message(1, tenant="stmary"))
+
+    assert drain(stmary) == [1]
+    assert drain(general) == []
+
+
+def test_resubscribing_replays_missed_messages() -> None:
+    broker = LiveFeedBroker(queue_size=10, history_size=10)
+    for id_ in (1, 2, 3):
+        broker.publish(message(id_))
+
+    subscriber = broker.subscribe(1, last_event_id=1)
+
+    assert drain(subscriber) == [2, 3]
+
+
+def test_replay_follows_arrival_order() -> None:
+    broker = LiveFeedBroker(queue_size=10, history_size=10)
+    # Transactions commit in a different order than they took their ids
+    for id_ in (4, 6, 5, 7):
+        broker.publish(message(id_))
+
+    subscriber = broker.subscribe(1, last_event_id=6)
+
+    assert drain(subscriber) == [5, 7]
+
+
+def test_replay_beyond_history_asks_for_resync() -> None:
+    broker = LiveFeedBroker(queue_size=10, history_size=2)
+    for id_ in (1, 2, 3, 4):
+        broker.publish(message(id_))
+
+    subscriber = broker.subscribe(1, last_event_id=1)
+    unseen = broker.subscribe(1, last_event_id=5)
+
+    assert subscriber.queue.get_nowait()["type"] == "resync"
+    assert subscriber.queue.empty()
+    assert unseen.queue.get_nowait()["type"] == "resync"
+
+
+def test_slow_subscriber_is_dropped() -> None:
+    broker = LiveFeedBroker(queue_size=1, history_size=10)
+    subscriber = broker.subscribe(1)
+
+    broker.publish(message(1))
+    broker.publish(message(2))
+
+    assert subscriber.dropped
+    assert broker.subscriber_count == 0
+    assert drain(subscriber) == [1]
@@ -0,0 +1,69 @@
+import sys
+from pathlib import Path
+from typing import Any
+
+from app.infrastructure.profiling.profiler import RequestProfile, StackSampler
+from app.infrastructure.profiling.store import ProfileStore
+
+
+def outer() -> Any:
+    return inner()
+
+
+def inner() -> Any:
+    return sys._getframe()
+
+
+def test_collapse_orders_frames_from_thread_to_innermost() -> None:
+    stack = StackSampler._collapse("worker-1", outer()).split(";")
+
+    assert stack[0] == "worker-1"
+    assert stack[-2].startswith("outer (test_profiler.py:")
+    assert stack[-1].startswith("inner (test_profiler.py:")
+
+
+def test_collapsed_lists_most_sampled_stacks_first() -> None:
+    sampler = StackSampler(interval=0.01)
+    sampler.samples.update({"main;a": 1, "main;a;b": 3})
+
+    assert sampler.collapsed() == "main;a;b 3\nmain;a 1\n"
+
+
+def profile(statements: int) -> RequestProfile:
+    profile = RequestProfile(interval=0.01)
+    profile.sampler.samples.update({"main;handler": 2})
+    for _ in range(statements):
+        profile.record_statement("SELECT 1", 0.002)
+    return profile
+
+
+def test_store_saves_summary_and_stacks(tmp_path: Path) -> None:
+    store = ProfileStore(str(tmp_path), max_kept=10)
+    profile_id = store.new_id()
+
+    store.save(profile_id, profile(statements=2), "GET", "/users", 200)
+
+    detail = store.get(profile_id)
+    assert detail is not None
+    assert (detail.samples, detail.sql_count, detail.sql_ms) == (2, 2, 4.0)
+    collapsed = store.collapsed_path(profile_id)
+    assert collapsed is not None
+    assert collapsed.read_text() == "main;handler 2\n"
+
+
+def test_store_keeps_only_the_newest_profiles(tmp_path: Path) -> None:
+    store = ProfileStore(str(tmp_path), max_kept=2)
+    ids = [f"20261019T10000{i}-0000000{i}" for i in range(3)]
+    for profile_id in ids:
+        store.save(profile_id, profile(statements=0), "GET", "/", 200)
+
+    assert [summary.id for summary in store.list()] == [ids[2], ids[1]]
+    assert store.get(ids[0]) is None
+    assert not (tmp_path / f"{ids[0]}.collapsed").exists()
+
+
+def test_store_rejects_ids_that_are_not_profile_ids(tmp_path: Path) -> None:
+    store = ProfileStore(str(tmp_path), max_kept=2)
+
+    assert store.get("../secrets") is None
+    assert store.collapsed_path("../../etc/passwd") is None
@@ -0,0 +1,36 @@
+from app.domain.common.repositories.projection import columns_for
+from app.domain.sector.models.sector import Sector
+from app.domain.sector.schemas.sector import SectorResponse
+from app.domain.user.models.user import User
+from app.domain.user.schemas.user import UserResponse
+
+
+def test_columns_follow_schema_fields() -> None:
+    columns = columns_for(User, UserResponse)
+
+    assert [column.key for column in columns] == [
+        "name",
+        "email",
+        "is_active",
+        "id",
+        "created_at",
+        "updated_at",
+    ]
+
+
+def test_password_hash_is_never_projected() -> None:
+    assert User.password not in columns_for(User, UserResponse)
+
+
+class SectorWithChildCount(SectorResponse):
+    child_count: int = 0
+
+
+def test_fields_without_columns_are_skipped() -> None:
+    keys = {column.key for column in columns_for(Sector, SectorWithChildCount)}
+
+    assert keys == set(SectorResponse.model_fields)
+
+
+def test_projection_is_cached() -> None:
+    assert columns_for(User, UserResponse) is columns_for(User, UserResponse)
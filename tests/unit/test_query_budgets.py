@@ -0,0 +1,29 @@
+from fastapi import Response
+from sqlalchemy.orm import Session
+
+from app.api.budget import TRUNCATED_HEADER, set_truncated_header
+from app.infrastructure.db.budget import QueryBudget
+
+
+def session(max_rows: int, capped: bool) -> Session:
+    db = Session()
+    db.info["db_budget"] = QueryBudget("search", 1_000, max_rows)
+    if capped:
+        db.info["rows_capped"] = True
+    return db
+
+
+def test_truncated_lists_carry_the_cap() -> None:
+    response = Response()
+
+    set_truncated_header(response, session(max_rows=1_000, capped=True))
+
+    assert response.headers[TRUNCATED_HEADER] == "1000"
+
+
+def test_complete_lists_have_no_truncation_header() -> None:
+    response = Response()
+
+    set_truncated_header(response, session(max_rows=1_000, capped=False))
+
+    assert TRUNCATED_HEADER not in response.headers
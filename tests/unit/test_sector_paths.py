@@ -0,0 +1,9 @@
+from app.domain.sector.repositories.sector import ancestor_ids
+
+
+def test_ancestor_ids_root_first() -> None:
+    assert ancestor_ids("/1/5/12/") == [1, 5]
+
+
+def test_root_has_no_ancestors() -> None:
+    assert ancestor_ids("/7/") == []
@@ -0,0 +1,68 @@
+import asyncio
+from typing import Iterator, List
+
+import pytest
+from starlette.requests import Request
+from starlette.types import Message
+
+from app.api.streaming import _MultipartFilePart, consume_upload_lines
+
+BOUNDARY = b"b0undary"
+BODY = (
+    b"--b0undary\r\n"
+    b'Content-Disposition: form-data; name="note"\r\n\r\n'
+    b"not the file\r\n"
+    b"--b0undary\r\n"
+    b'Content-Disposition: form-data; name="file"; filename="users.csv"\r\n'
+    b"Content-Type: text/csv\r\n\r\n"
+    b"name,email\r\nAna,ana@example.com\r\n"
+    b"--b0undary--\r\n"
+)
+
+
+def request(content_type: str, chunks: List[bytes]) -> Request:
+    messages: List[Message] = [
+        {"type": "http.request", "body": chunk, "more_body": True} for chunk in chunks
+    ]
+    messages.append({"type": "http.request", "body": b"", "more_body": False})
+
+    async def receive() -> Message:
+        return messages.pop(0)
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "headers": [(b"content-type", content_type.encode())],
+    }
+    return Request(scope, receive)
+
+
+@pytest.mark.parametrize("size", [1, 7, len(BODY)])
+def test_multipart_yields_only_the_file_part(size: int) -> None:
+    part = _MultipartFilePart(BOUNDARY)
+
+    chunks = [BODY[start:][:size] for start in range(0, len(BODY), size)]
+    data = b"".join(piece for chunk in chunks for piece in part.feed(chunk))
+
+    assert part.found
+    assert data == b"name,email\r\nAna,ana@example.com"
+
+
+def test_lines_are_reassembled_across_chunks() -> None:
+    upload = request(
+        "text/csv", [b"\xef\xbb\xbfname,em", b"ail\nAna,ana@", b"example.com"]
+    )
+
+    def consume(lines: Iterator[str]) -> List[str]:
+        return list(lines)
+
+    lines = asyncio.run(consume_upload_lines(upload, consume))
+
+    assert lines == ["name,email\n", "Ana,ana@example.com"]
+
+
+def test_unsupported_content_type_is_rejected() -> None:
+    upload = request("application/json", [b"{}"])
+
+    with pytest.raises(ValueError, match="multipart/form-data or text/csv"):
+        asyncio.run(consume_upload_lines(upload, list))
@@ -0,0 +1,52 @@
+from typing import Any, Dict, List
+
+import pytest
+from starlette.requests import HTTPConnection
+
+from app.infrastructure.core import security
+from app.infrastructure.core.security import create_access_token, token_claims
+from app.infrastructure.db.sharding import TenantMismatchError, tenant_from_connection
+
+
+def connection(token: str, host: str = "api.example.com") -> HTTPConnection:
+    headers = [(b"host", host.encode()), (b"authorization", f"Bearer {token}".encode())]
+    return HTTPConnection({"type": "http", "headers": headers})
+
+
+@pytest.fixture
+def decodes(monkeypatch: pytest.MonkeyPatch) -> List[str]:
+    tokens: List[str] = []
+    decode = security.jwt.decode
+
+    def counting_decode(token: str, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        tokens.append(token)
+        return decode(token, *args, **kwargs)
+
+    monkeypatch.setattr(security.jwt, "decode", counting_decode)
+    return tokens
+
+
+def test_token_is_decoded_once_per_request(decodes: List[str]) -> None:
+    request = connection(create_access_token({"sub": "7", "tenant": "stmary"}))
+
+    assert tenant_from_connection(request) == "stmary"
+    assert token_claims(request)["sub"] == "7"
+    assert len(decodes) == 1
+
+
+def test_invalid_token_has_no_claims(decodes: List[str]) -> None:
+    request = connection("not-a-token")
+
+    assert token_claims(request) is None
+    assert token_claims(request) is None
+    assert len(decodes) == 1
+
+
+def test_token_tenant_must_match_the_host(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(security.settings, "TENANT_HOST_SUFFIX", "example.com")
+    request = connection(
+        create_access_token({"sub": "7", "tenant": "stmary"}), "general.example.com"
+    )
+
+    with pytest.raises(TenantMismatchError):
+        tenant_from_connection(request)
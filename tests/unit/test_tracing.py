@@ -0,0 +1,106 @@
+import json
+from typing import Optional
+
+import pytest
+
+from app.infrastructure.tracing.exporter import OtlpJsonExporter
+from app.infrastructure.tracing.tracer import (
+    TraceParent,
+    Tracer,
+    current_span,
+    format_traceparent,
+    parse_traceparent,
+)
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+SPAN_ID = "00f067aa0ba902b7"
+
+
+@pytest.mark.parametrize(
+    "value, sampled",
+    [
+        (f"00-{TRACE_ID}-{SPAN_ID}-01", True),
+        (f" 00-{TRACE_ID.upper()}-{SPAN_ID}-03 ", True),
+        (f"00-{TRACE_ID}-{SPAN_ID}-00", False),
+    ],
+)
+def test_parse_traceparent(value: str, sampled: bool) -> None:
+    assert parse_traceparent(value) == TraceParent(
+        int(TRACE_ID, 16), int(SPAN_ID, 16), sampled
+    )
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        None,
+        "",
+        f"01-{TRACE_ID}-{SPAN_ID}-01",  # unknown version
+        f"00-{TRACE_ID[:-1]}-{SPAN_ID}-01",
+        f"00-{'0' * 32}-{SPAN_ID}-01",  # all-zero ids are invalid
+        f"00-{TRACE_ID}-{'0' * 16}-01",
+        f"00-{TRACE_ID}-{SPAN_ID}-01-extra",
+    ],
+)
+def test_invalid_traceparent_is_ignored(value: Optional[str]) -> None:
+    assert parse_traceparent(value) is None
+
+
+def test_request_span_continues_the_callers_trace() -> None:
+    tracer = Tracer(sample_ratio=0.0)
+
+    span = tracer.start_request_span("GET /users", f"00-{TRACE_ID}-{SPAN_ID}-01")
+
+    assert span is not None
+    assert (span.trace_id, span.parent_span_id) == (int(TRACE_ID, 16), int(SPAN_ID, 16))
+    assert format_traceparent(span) == f"00-{TRACE_ID}-{span.span_id:016x}-01"
+
+
+def test_sampling_follows_the_caller_then_the_ratio() -> None:
+    unsampled_parent = f"00-{TRACE_ID}-{SPAN_ID}-00"
+
+    assert Tracer(1.0).start_request_span("GET /", unsampled_parent) is None
+    assert Tracer(0.0).start_request_span("GET /", None) is None
+    assert Tracer(1.0).start_request_span("GET /", None) is not None
+
+
+def test_child_spans_nest_under_the_current_span() -> None:
+    tracer = Tracer(sample_ratio=1.0)
+    root = tracer.start_request_span("GET /", None)
+    assert root is not None
+    token = current_span.set(root)
+    try:
+        with tracer.span("outer") as outer, tracer.span("inner") as inner:
+            assert outer is not None and inner is not None
+    finally:
+        current_span.reset(token)
+
+    assert outer.parent_span_id == root.span_id
+    assert inner.parent_span_id == outer.span_id
+    assert inner.trace_id == root.trace_id
+    assert outer.end_ns and inner.end_ns
+
+
+def test_spans_outside_a_traced_request_are_not_created() -> None:
+    with Tracer(sample_ratio=1.0).span("orphan") as span:
+        assert span is None
+
+
+def test_exporter_encodes_otlp_json() -> None:
+    tracer = Tracer(sample_ratio=1.0)
+    span = tracer.start_request_span(
+        "GET /", f"00-{TRACE_ID}-{SPAN_ID}-01", {"http.status_code": 200}
+    )
+    assert span is not None
+    span.record_exception(ValueError("boom"))
+    span.end()
+
+    document = json.loads(OtlpJsonExporter("api", None, None).encode([span]))
+
+    encoded = document["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+    assert encoded["traceId"] == TRACE_ID
+    assert encoded["parentSpanId"] == SPAN_ID
+    assert encoded["status"] == {"code": 2, "message": "boom"}
+    assert {"key": "http.status_code", "value": {"intValue": "200"}} in encoded[
+        "attributes"
+    ]
@@ -0,0 +1,59 @@
+from typing import Any, Dict, List
+
+import pytest
+
+from app.infrastructure.db.unit_of_work import unit_of_work
+
+
+class RecordingSession:
+    def __init__(self) -> None:
+        self.info: Dict[str, Any] = {}
+        self.calls: List[str] = []
+
+    def commit(self) -> None:
+        self.calls.append("commit")
+
+    def rollback(self) -> None:
+        self.calls.append("rollback")
+
+
+@pytest.fixture
+def db() -> Any:
+    return RecordingSession()
+
+
+def test_commits_once_on_success(db: Any) -> None:
+    with unit_of_work(db) as session:
+        assert session is db
+
+    assert db.calls == ["commit"]
+
+
+def test_rolls_back_on_error(db: Any) -> None:
+    with pytest.raises(ValueError):
+        with unit_of_work(db):
+            raise ValueError("invalid sector")
+
+    assert db.calls == ["rollback"]
+
+
+def test_nested_units_join_the_outermost(db: Any) -> None:
+    with unit_of_work(db):
+        with unit_of_work(db):
+            pass
+        assert db.calls == []
+
+    assert db.calls == ["commit"]
+
+
+def test_nested_error_rolls_back_once(db: Any) -> None:
+    with pytest.raises(ValueError):
+        with unit_of_work(db):
+            with unit_of_work(db):
+                raise ValueError("invalid sector")
+
+    assert db.calls == ["rollback"]
+    # The session is usable by a following unit of work
+    with unit_of_work(db):
+        pass
+    assert db.calls == ["rollback", "commit"]